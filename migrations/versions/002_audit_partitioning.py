@@ -0,0 +1,157 @@
+"""Partition audit logs by month and add composite indexes.
+
+Revision ID: 002_audit_partitioning
+Revises: 001_initial
+Create Date: 2026-10-18
+
+"""
+import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "002_audit_partitioning"
+down_revision = "001_initial"
+branch_labels = None
+depends_on = None
+
+
+def _month_start(value):
+    return datetime.datetime(value.year, value.month, 1)
+
+
+def _next_month(value):
+    return (value + datetime.timedelta(days=32)).replace(day=1)
+
+
+def upgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        # SQLite and others keep a single audit_logs table; the Audit Manager
+        # adds rollover tables per period on SQLite
+        op.create_index(
+            "ix_audit_logs_timestamp_user_id",
+            "audit_logs",
+            ["timestamp", "user_id"],
+            unique=False,
+        )
+        op.create_index(
+            "ix_audit_logs_resource",
+            "audit_logs",
+            ["resource_type", "resource_id"],
+            unique=False,
+        )
+        # Covered by ix_audit_logs_timestamp_user_id
+        op.drop_index(op.f("ix_audit_logs_timestamp"), table_name="audit_logs")
+        return
+
+    # Move the existing table aside; its indexes and primary key free up
+    # their names for the partitioned table
+    op.drop_index(op.f("ix_audit_logs_timestamp"), table_name="audit_logs")
+    op.drop_index(op.f("ix_audit_logs_user_id"), table_name="audit_logs")
+    op.drop_index(op.f("ix_audit_logs_action_type"), table_name="audit_logs")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_unpartitioned")
+    op.execute(
+        "ALTER TABLE audit_logs_unpartitioned "
+        "RENAME CONSTRAINT audit_logs_pkey TO audit_logs_unpartitioned_pkey"
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+
+    # The partition key has to be part of the primary key
+    op.execute(
+        "CREATE TABLE audit_logs "
+        "(LIKE audit_logs_unpartitioned INCLUDING DEFAULTS) "
+        'PARTITION BY RANGE ("timestamp")'
+    )
+    op.execute('ALTER TABLE audit_logs ADD PRIMARY KEY (id, "timestamp")')
+    op.create_foreign_key(
+        "audit_logs_user_id_fkey", "audit_logs", "users", ["user_id"], ["id"]
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+
+    # Indexes on the parent are created on every partition
+    op.create_index(
+        "ix_audit_logs_timestamp_user_id",
+        "audit_logs",
+        ["timestamp", "user_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_audit_logs_resource",
+        "audit_logs",
+        ["resource_type", "resource_id"],
+        unique=False,
+    )
+    op.create_index(
+        op.f("ix_audit_logs_user_id"), "audit_logs", ["user_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_audit_logs_action_type"), "audit_logs", ["action_type"], unique=False
+    )
+
+    # Catches rows outside every partition, so inserts never fail
+    op.execute("CREATE TABLE audit_logs_default PARTITION OF audit_logs DEFAULT")
+
+    # One partition per month from the oldest row through next month
+    oldest = bind.execute(
+        sa.text('SELECT min("timestamp") FROM audit_logs_unpartitioned')
+    ).scalar()
+    now = datetime.datetime.now()
+    month = _month_start(oldest or now)
+    last = _next_month(_month_start(now))
+    while month <= last:
+        end = _next_month(month)
+        op.execute(
+            f"CREATE TABLE audit_logs_p{month:%Y%m} PARTITION OF audit_logs "
+            f"FOR VALUES FROM ('{month.isoformat()}') TO ('{end.isoformat()}')"
+        )
+        month = end
+
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_unpartitioned")
+    op.execute("DROP TABLE audit_logs_unpartitioned")
+
+
+def downgrade():
+    bind = op.get_bind()
+
+    if bind.dialect.name != "postgresql":
+        op.create_index(
+            op.f("ix_audit_logs_timestamp"), "audit_logs", ["timestamp"], unique=False
+        )
+        op.drop_index("ix_audit_logs_resource", table_name="audit_logs")
+        op.drop_index("ix_audit_logs_timestamp_user_id", table_name="audit_logs")
+        return
+
+    # Dropping an index on the parent drops it on every partition
+    op.drop_index("ix_audit_logs_resource", table_name="audit_logs")
+    op.drop_index("ix_audit_logs_timestamp_user_id", table_name="audit_logs")
+    op.drop_index(op.f("ix_audit_logs_user_id"), table_name="audit_logs")
+    op.drop_index(op.f("ix_audit_logs_action_type"), table_name="audit_logs")
+    op.execute("ALTER TABLE audit_logs RENAME TO audit_logs_partitioned")
+    op.execute("ALTER TABLE audit_logs_partitioned DROP CONSTRAINT audit_logs_pkey")
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY NONE")
+
+    op.execute(
+        "CREATE TABLE audit_logs (LIKE audit_logs_partitioned INCLUDING DEFAULTS)"
+    )
+    op.execute("ALTER TABLE audit_logs ADD PRIMARY KEY (id)")
+    op.create_foreign_key(
+        "audit_logs_user_id_fkey", "audit_logs", "users", ["user_id"], ["id"]
+    )
+    op.execute("ALTER SEQUENCE audit_logs_id_seq OWNED BY audit_logs.id")
+    op.execute("INSERT INTO audit_logs SELECT * FROM audit_logs_partitioned")
+
+    # Drops every partition with it
+    op.execute("DROP TABLE audit_logs_partitioned")
+
+    op.create_index(
+        op.f("ix_audit_logs_timestamp"), "audit_logs", ["timestamp"], unique=False
+    )
+    op.create_index(
+        op.f("ix_audit_logs_user_id"), "audit_logs", ["user_id"], unique=False
+    )
+    op.create_index(
+        op.f("ix_audit_logs_action_type"), "audit_logs", ["action_type"], unique=False
+    )
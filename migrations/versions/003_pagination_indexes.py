@@ -0,0 +1,26 @@
+"""Add sort indexes for paginated listings.
+
+Revision ID: 003_pagination_indexes
+Revises: 002_audit_partitioning
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "003_pagination_indexes"
+down_revision = "002_audit_partitioning"
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Users are listed by (created_at, id); plugins by their unique name,
+    # which already has an index
+    op.create_index(
+        "ix_users_created_at_id", "users", ["created_at", "id"], unique=False
+    )
+
+
+def downgrade():
+    op.drop_index("ix_users_created_at_id", table_name="users")
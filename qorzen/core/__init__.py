@@ -1,5 +1,6 @@
 """Core package containing the essential managers and components."""
 
+from qorzen.core.audit_manager import AuditManager
 from qorzen.core.base import BaseManager, QorzenManager
 from qorzen.core.cloud_manager import CloudManager
 from qorzen.core.config_manager import ConfigManager
@@ -7,13 +7,33 @@ import sys
 import threading
 import time
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Type, Union, cast
+from typing import (
+    Any,
+    AsyncGenerator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+    cast,
+)
 
 try:
     import fastapi
     import pydantic
     import uvicorn
-    from fastapi import Depends, FastAPI, HTTPException, Request, Security, status
+    from fastapi import (
+        Depends,
+        FastAPI,
+        HTTPException,
+        Query,
+        Request,
+        Security,
+        status,
+    )
     from fastapi.middleware.cors import CORSMiddleware
     from fastapi.responses import JSONResponse
     from fastapi.routing import APIRouter
@@ -30,6 +50,7 @@ except ImportError as e:
 from qorzen.core.base import QorzenManager
 from qorzen.utils.exceptions import (
     APIError,
+    EventBusError,
     ManagerInitializationError,
     ManagerShutdownError,
 )
@@ -111,6 +132,22 @@ if fastapi:
             default_factory=dict, description="Additional metadata"
         )
 
+    class UserPage(BaseModel):
+        """Model for one page of users."""
+
+        items: List[UserResponse] = Field(..., description="Users on this page")
+        next_cursor: Optional[str] = Field(
+            None, description="Cursor for the next page, null on the last page"
+        )
+
+    class PluginPage(BaseModel):
+        """Model for one page of plugins."""
+
+        items: List[PluginResponse] = Field(..., description="Plugins on this page")
+        next_cursor: Optional[str] = Field(
+            None, description="Cursor for the next page, null on the last page"
+        )
+
     class StatusResponse(BaseModel):
         """Model for system status response."""
 
@@ -161,6 +198,7 @@ class APIManager(QorzenManager):
         event_bus_manager: Any,
         thread_manager: Any,
         registry: Optional[Dict[str, Any]] = None,
+        database_manager: Optional[Any] = None,
     ) -> None:
         """Initialize the API Manager.
 
@@ -171,6 +209,8 @@ class APIManager(QorzenManager):
             event_bus_manager: The Event Bus Manager for publishing API events.
             thread_manager: The Thread Manager for running the API server.
             registry: Optional registry of manager instances for API access.
+            database_manager: Optional Database Manager whose async engine is
+                bound to the server's event loop.
         """
         super().__init__(name="APIManager")
         self._config_manager = config_manager
@@ -179,6 +219,7 @@ class APIManager(QorzenManager):
         self._event_bus = event_bus_manager
         self._thread_manager = thread_manager
         self._registry = registry or {}
+        self._database_manager = database_manager
 
         # API server settings
         self._enabled = True
@@ -195,6 +236,9 @@ class APIManager(QorzenManager):
         self._rate_limit_enabled = True
         self._rate_limit_requests = 100  # Requests per minute
 
+        # Publish api/request events for state-changing requests
+        self._audit_requests = True
+
         # FastAPI app and routers
         self._app: Optional[FastAPI] = None
         self._routers: Dict[str, APIRouter] = {}
@@ -249,6 +293,8 @@ class APIManager(QorzenManager):
                 "requests_per_minute", 100
             )
 
+            self._audit_requests = api_config.get("audit_requests", True)
+
             # Create FastAPI app
             self._app = FastAPI(
                 title="Qorzen API",
@@ -272,6 +318,14 @@ class APIManager(QorzenManager):
             if self._rate_limit_enabled:
                 self._add_rate_limiting_middleware()
 
+            # Add audit middleware if enabled
+            if self._audit_requests:
+                self._add_audit_middleware()
+
+            # Run the async database engine on the server's event loop
+            if self._database_manager is not None:
+                self._add_database_lifecycle()
+
             # Set up OAuth2 scheme
             self._oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/v1/auth/token")
 
@@ -312,6 +366,54 @@ class APIManager(QorzenManager):
                 manager_name=self.name,
             ) from e
 
+    def _add_database_lifecycle(self) -> None:
+        """Bind the async database engine to the server's event loop.
+
+        Async connections belong to the loop that opened them, so the engine
+        is bound when the server starts and its connections are closed on the
+        same loop when the server stops.
+        """
+        if not self._app:
+            return
+
+        database_manager = self._database_manager
+
+        @self._app.on_event("startup")
+        async def bind_database() -> None:
+            database_manager.bind_event_loop(asyncio.get_running_loop())
+
+        @self._app.on_event("shutdown")
+        async def dispose_database() -> None:
+            try:
+                await database_manager.dispose_async()
+            except Exception as e:
+                self._logger.warning(f"Failed to close async connections: {str(e)}")
+            finally:
+                database_manager.bind_event_loop(None)
+
+    async def db_session(self) -> AsyncGenerator[Any, None]:
+        """FastAPI dependency that yields an async database session.
+
+        The session is committed when the request handler returns and rolled
+        back if it raises, without blocking the server's event loop:
+
+        ```python
+        async def handler(session=Depends(api_manager.db_session)):
+            ...
+        ```
+
+        Yields:
+            AsyncSession: An async SQLAlchemy session.
+
+        Raises:
+            APIError: If no Database Manager is available.
+        """
+        if self._database_manager is None:
+            raise APIError("No database is available to the API", status_code=503)
+
+        async with self._database_manager.async_session() as session:
+            yield session
+
     def _add_rate_limiting_middleware(self) -> None:
         """Add rate limiting middleware to the FastAPI app."""
         if not self._app:
@@ -369,6 +471,46 @@ class APIManager(QorzenManager):
             # Process the request
             return await call_next(request)
 
+    def _add_audit_middleware(self) -> None:
+        """Add middleware that publishes an event for each state-changing request.
+
+        The Audit Manager records these api/request events, so POST, PUT,
+        PATCH and DELETE calls end up in the audit log without each route
+        having to log them.
+        """
+        if not self._app:
+            return
+
+        audited_methods = {"POST", "PUT", "PATCH", "DELETE"}
+
+        @self._app.middleware("http")
+        async def audit_middleware(request: Request, call_next: Callable) -> Any:
+            if request.method not in audited_methods:
+                return await call_next(request)
+
+            start = time.perf_counter()
+            response = await call_next(request)
+
+            try:
+                self._event_bus.publish(
+                    event_type="api/request",
+                    source="api_manager",
+                    payload={
+                        "method": request.method,
+                        "path": request.url.path,
+                        "status_code": response.status_code,
+                        "client_ip": request.client.host if request.client else None,
+                        "user_agent": request.headers.get("user-agent"),
+                        "duration_ms": round(
+                            (time.perf_counter() - start) * 1000, 2
+                        ),
+                    },
+                )
+            except EventBusError as e:
+                self._logger.warning(f"Failed to publish API audit event: {str(e)}")
+
+            return response
+
     def _setup_exception_handlers(self) -> None:
         """Set up exception handlers for the FastAPI app."""
         if not self._app:
@@ -520,12 +662,22 @@ class APIManager(QorzenManager):
         """
         router = APIRouter()
 
-        @router.get("/", response_model=List[UserResponse])
-        async def get_users(
-            current_user: Dict[str, Any] = Depends(self._get_current_admin_user)
-        ) -> List[Dict[str, Any]]:
-            """Get all users (admin only)."""
-            return self._security_manager.get_all_users()
+        # A plain def: FastAPI runs it on its thread pool, so the database
+        # query in list_users() doesn't block the event loop
+        @router.get("/", response_model=UserPage)
+        def get_users(
+            limit: int = Query(100, ge=1, le=1000),
+            cursor: Optional[str] = None,
+            current_user: Dict[str, Any] = Depends(self._get_current_admin_user),
+        ) -> Dict[str, Any]:
+            """Get a page of users (admin only)."""
+            try:
+                return self._security_manager.list_users(limit=limit, cursor=cursor)
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e),
+                )
 
         @router.post(
             "/", response_model=UserResponse, status_code=status.HTTP_201_CREATED
@@ -718,20 +870,30 @@ class APIManager(QorzenManager):
         """
         router = APIRouter()
 
-        @router.get("/", response_model=List[PluginResponse])
+        @router.get("/", response_model=PluginPage)
         async def get_plugins(
+            limit: int = Query(100, ge=1, le=1000),
+            cursor: Optional[str] = None,
             current_user: Dict[str, Any] = Depends(
                 self._get_current_user_with_permission("plugins.view")
             ),
-        ) -> List[Dict[str, Any]]:
-            """Get all plugins."""
+        ) -> Dict[str, Any]:
+            """Get a page of plugins, sorted by name."""
             if "plugin_manager" not in self._registry:
                 raise HTTPException(
                     status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
                     detail="Plugin Manager not available",
                 )
 
-            return self._registry["plugin_manager"].get_all_plugins()
+            try:
+                return self._registry["plugin_manager"].list_plugins(
+                    limit=limit, cursor=cursor
+                )
+            except ValueError as e:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=str(e),
+                )
 
         @router.get("/{plugin_name}", response_model=PluginResponse)
         async def get_plugin(
@@ -11,6 +11,7 @@ from typing import Any, Dict, List, Optional, Type, cast
 from qorzen.core import QorzenManager
 from qorzen.core import ResourceMonitoringManager
 from qorzen.core import APIManager
+from qorzen.core import AuditManager
 from qorzen.core import ConfigManager
 from qorzen.core import EventBusManager
 from qorzen.core import LoggingManager
@@ -76,18 +77,23 @@ class ApplicationCore:
             thread_manager.initialize()
             self._managers["thread_manager"] = thread_manager
 
-            file_manager = FileManager(config_manager, logging_manager)
+            file_manager = FileManager(config_manager, logging_manager, event_bus_manager)
             file_manager.initialize()
             self._managers["file_manager"] = file_manager
+            config_manager.watch_file(file_manager)
 
             resource_manager = ResourceMonitoringManager(config_manager, logging_manager, event_bus_manager, thread_manager)
             resource_manager.initialize()
             self._managers["resource_manager"] = resource_manager
 
-            database_manager = DatabaseManager(config_manager, logging_manager)
+            database_manager = DatabaseManager(config_manager, logging_manager, event_bus_manager)
             database_manager.initialize()
             self._managers["database_manager"] = database_manager
 
+            audit_manager = AuditManager(config_manager, logging_manager, event_bus_manager, database_manager)
+            audit_manager.initialize()
+            self._managers["audit_manager"] = audit_manager
+
             plugin_manager = PluginManager(config_manager, logging_manager, event_bus_manager, file_manager)
             plugin_manager.initialize()
             self._managers["plugin_manager"] = plugin_manager
@@ -100,7 +106,7 @@ class ApplicationCore:
             security_manager.initialize()
             self._managers["security_manager"] = security_manager
 
-            api_manager = APIManager(config_manager, logging_manager, security_manager, event_bus_manager, thread_manager)
+            api_manager = APIManager(config_manager, logging_manager, security_manager, event_bus_manager, thread_manager, database_manager=database_manager)
             api_manager.initialize()
             self._managers["api_manager"] = api_manager
 
@@ -113,6 +119,7 @@ class ApplicationCore:
             # - File Manager
             # - Resource Manager
             # - Database Manager
+            # - Audit Manager
             # - Plugin Manager
             # - Remote Services Manager
             # - Monitoring Manager
@@ -0,0 +1,1136 @@
+from __future__ import annotations
+
+import datetime
+import fnmatch
+import itertools
+import json
+import os
+import re
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Tuple
+
+from sqlalchemy import Column, Index, MetaData, Table, inspect, select, text
+
+from qorzen.core.base import QorzenManager
+from qorzen.models.audit import AuditActionType, AuditLog
+from qorzen.utils.exceptions import (
+    DatabaseError,
+    ManagerInitializationError,
+    ManagerShutdownError,
+)
+
+# Audit action and resource type for known event types
+_EVENT_ACTIONS: Dict[str, Tuple[AuditActionType, str]] = {
+    "security/user_created": (AuditActionType.CREATE, "user"),
+    "security/user_updated": (AuditActionType.UPDATE, "user"),
+    "security/user_deleted": (AuditActionType.DELETE, "user"),
+    "security/user_login": (AuditActionType.LOGIN, "user"),
+    "security/token_revoked": (AuditActionType.LOGOUT, "token"),
+    "config/changed": (AuditActionType.CONFIG, "config"),
+}
+
+# Audit action for API requests, by HTTP method
+_METHOD_ACTIONS: Dict[str, AuditActionType] = {
+    "POST": AuditActionType.CREATE,
+    "PUT": AuditActionType.UPDATE,
+    "PATCH": AuditActionType.UPDATE,
+    "DELETE": AuditActionType.DELETE,
+}
+
+# strftime format of partition names, by partition interval
+_PARTITION_FORMATS: Dict[str, str] = {"month": "%Y%m", "day": "%Y%m%d"}
+
+# Partition tables are named audit_logs_p202610 (month) or audit_logs_p20261018
+_PARTITION_NAME_PATTERN = re.compile(r"^audit_logs_p(\d{6}|\d{8})$")
+
+
+def _period_start(timestamp: datetime.datetime, interval: str) -> datetime.datetime:
+    """Get the start of the partition period containing a timestamp."""
+    start = timestamp.replace(hour=0, minute=0, second=0, microsecond=0)
+    return start.replace(day=1) if interval == "month" else start
+
+
+def _next_period(start: datetime.datetime, interval: str) -> datetime.datetime:
+    """Get the start of the partition period after the one starting at start."""
+    if interval == "month":
+        return (start + datetime.timedelta(days=32)).replace(day=1)
+    return start + datetime.timedelta(days=1)
+
+
+class _AuditPartitions:
+    """Time-range partitions of the audit log.
+
+    Partitioning uses one of three modes, picked from the database:
+
+    - native: audit_logs is a partitioned PostgreSQL table (see migration
+      002). PostgreSQL routes inserts and prunes partitions from timestamp
+      predicates; partitions are created ahead of time here.
+    - rollover: SQLite has no partitioning, so each period gets its own
+      table with the same columns and indexes. Inserts and queries are routed
+      here; rows in audit_logs itself predate partitioning. IDs are unique
+      within a partition only.
+    - none: a single audit_logs table, e.g. an unmigrated PostgreSQL
+      database or another dialect.
+
+    In every mode retention is cheap for whole periods: expired partitions
+    are dropped rather than deleted row by row.
+    """
+
+    def __init__(self, database_manager: Any, interval: str, logger: Any) -> None:
+        """Initialize the partition helper.
+
+        Args:
+            database_manager: The Database Manager holding the audit log.
+            interval: The partition period, "month" or "day".
+            logger: The logger to use.
+        """
+        if interval not in _PARTITION_FORMATS:
+            raise ValueError(f"Unsupported audit partition interval: {interval}")
+
+        self._db = database_manager
+        self._interval = interval
+        self._logger = logger
+        self._metadata = MetaData()
+        self._tables: Dict[str, Table] = {}
+        self._known: Dict[str, Tuple[datetime.datetime, datetime.datetime]] = {}
+        # Guards _known and _tables, and keeps partition DDL and refreshes from
+        # interleaving
+        self._lock = threading.RLock()
+        self.mode = "none"
+
+    def detect(self, enabled: bool) -> None:
+        """Pick the partitioning mode and load the existing partitions.
+
+        Args:
+            enabled: Whether partitioning is enabled in configuration.
+        """
+        dialect = self._db.get_engine().dialect.name
+
+        if not enabled:
+            self.mode = "none"
+        elif dialect == "sqlite":
+            self.mode = "rollover"
+        elif dialect == "postgresql":
+            partitioned = self._db.execute_raw(
+                "SELECT 1 FROM pg_partitioned_table pt "
+                "JOIN pg_class c ON c.oid = pt.partrelid "
+                "WHERE c.relname = 'audit_logs'",
+                cache=False,
+                use_primary=True,
+            )
+            self.mode = "native" if partitioned else "none"
+            if not partitioned:
+                self._logger.warning(
+                    "audit_logs is not partitioned; run the database migrations "
+                    "to enable native partitioning"
+                )
+        else:
+            self.mode = "none"
+
+        self.refresh()
+
+    def refresh(self) -> None:
+        """Reload the list of partitions from the database."""
+        with self._lock:
+            known = {}
+            for name in self._partition_names():
+                bounds = self._bounds(name)
+                if bounds is not None:
+                    known[name] = bounds
+            self._known = known
+
+    def _partition_names(self) -> List[str]:
+        """List the tables in the database that may be partitions."""
+        if self.mode == "native":
+            return [
+                row["name"]
+                for row in self._db.execute_raw(
+                    "SELECT c.relname AS name FROM pg_inherits i "
+                    "JOIN pg_class c ON c.oid = i.inhrelid "
+                    "JOIN pg_class p ON p.oid = i.inhparent "
+                    "WHERE p.relname = 'audit_logs'",
+                    cache=False,
+                    use_primary=True,
+                )
+            ]
+        if self.mode == "rollover":
+            return inspect(self._db.get_engine()).get_table_names()
+        return []
+
+    def _bounds(
+        self, name: str
+    ) -> Optional[Tuple[datetime.datetime, datetime.datetime]]:
+        """Get the time range covered by a partition from its name."""
+        match = _PARTITION_NAME_PATTERN.match(name)
+        if not match:
+            return None
+
+        # Partitions made with an earlier interval setting keep their own range
+        interval = "month" if len(match.group(1)) == 6 else "day"
+        start = datetime.datetime.strptime(match.group(1), _PARTITION_FORMATS[interval])
+        return start, _next_period(start, interval)
+
+    def name_for(self, timestamp: datetime.datetime) -> str:
+        """Get the name of the partition holding a timestamp."""
+        start = _period_start(timestamp, self._interval)
+        return "audit_logs_p" + start.strftime(_PARTITION_FORMATS[self._interval])
+
+    def table(self, name: str) -> Table:
+        """Get the table of a rollover partition.
+
+        Args:
+            name: The partition name.
+
+        Returns:
+            Table: A table with the columns and indexes of AuditLog.
+        """
+        # The flush thread and query() can both define a new partition, and
+        # the shared MetaData rejects a second definition
+        with self._lock:
+            table = self._tables.get(name)
+            if table is None:
+                source = AuditLog.__table__
+                columns = [
+                    Column(
+                        c.name, c.type, primary_key=c.primary_key, nullable=c.nullable
+                    )
+                    for c in source.columns
+                ]
+                indexes = [
+                    Index(
+                        index.name.replace(source.name, name, 1),
+                        *[c.name for c in index.columns],
+                    )
+                    for index in source.indexes
+                ]
+                table = Table(name, self._metadata, *columns, *indexes)
+                self._tables[name] = table
+        return table
+
+    def ensure(self, start: datetime.datetime, periods: int = 1) -> List[str]:
+        """Create the partitions for a number of periods, if missing.
+
+        Args:
+            start: A timestamp in the first period to create.
+            periods: How many consecutive periods to create.
+
+        Returns:
+            List[str]: The names of the partitions that were created.
+        """
+        if self.mode == "none":
+            return []
+
+        created = []
+        period = _period_start(start, self._interval)
+        for _ in range(periods):
+            end = _next_period(period, self._interval)
+            name = self.name_for(period)
+
+            with self._lock:
+                if name not in self._known:
+                    with self._db.session() as session:
+                        if self.mode == "native":
+                            self._create_native(session, name, period, end)
+                        else:
+                            self.table(name).create(
+                                session.connection(), checkfirst=True
+                            )
+
+                    self._known[name] = (period, end)
+                    created.append(name)
+
+            period = end
+
+        if created:
+            self._logger.info(f"Created audit partitions: {', '.join(created)}")
+        return created
+
+    @staticmethod
+    def _create_native(
+        session: Any, name: str, start: datetime.datetime, end: datetime.datetime
+    ) -> None:
+        """Create a native partition in a session's transaction.
+
+        PostgreSQL refuses to attach a range that rows in the default
+        partition fall into, so those rows are moved into the new partition.
+        """
+        bounds = {"start": start, "end": end}
+        session.execute(
+            text(
+                "CREATE TEMPORARY TABLE audit_logs_moved "
+                "(LIKE audit_logs) ON COMMIT DROP"
+            )
+        )
+        session.execute(
+            text(
+                "WITH moved AS (DELETE FROM audit_logs_default "
+                'WHERE "timestamp" >= :start AND "timestamp" < :end RETURNING *) '
+                "INSERT INTO audit_logs_moved SELECT * FROM moved"
+            ),
+            bounds,
+        )
+        session.execute(
+            text(
+                f"CREATE TABLE IF NOT EXISTS {name} "
+                f"PARTITION OF audit_logs FOR VALUES "
+                f"FROM ('{start.isoformat()}') TO ('{end.isoformat()}')"
+            )
+        )
+        session.execute(text("INSERT INTO audit_logs SELECT * FROM audit_logs_moved"))
+
+    def route(
+        self, rows: List[Dict[str, Any]]
+    ) -> Iterator[Tuple[Any, List[Dict[str, Any]]]]:
+        """Split rows into runs that go to the same table, keeping their order.
+
+        Args:
+            rows: The AuditLog column values.
+
+        Yields:
+            Tuple[Any, List[Dict[str, Any]]]: A table and the rows to insert into it.
+        """
+        if self.mode != "rollover":
+            yield AuditLog.__table__, rows
+            return
+
+        for name, group in itertools.groupby(
+            rows, key=lambda row: self.name_for(row["timestamp"])
+        ):
+            group_rows = list(group)
+            # Late rows, e.g. replayed from the spill file, may need an old period
+            self.ensure(group_rows[0]["timestamp"])
+            yield self.table(name), group_rows
+
+    def tables_for_range(
+        self,
+        start: Optional[datetime.datetime],
+        end: Optional[datetime.datetime],
+    ) -> List[Table]:
+        """Get the tables that can hold rows in a time range, newest first.
+
+        Only rollover partitions overlapping the range are returned, followed
+        by audit_logs itself. In the other modes this is just audit_logs.
+
+        Args:
+            start: Inclusive start of the range, or None for no lower bound.
+            end: Exclusive end of the range, or None for no upper bound.
+
+        Returns:
+            List[Table]: The tables to query.
+        """
+        if self.mode != "rollover":
+            return [AuditLog.__table__]
+
+        with self._lock:
+            known = sorted(
+                self._known.items(), key=lambda item: item[1][0], reverse=True
+            )
+
+        return [
+            self.table(name)
+            for name, (period_start, period_end) in known
+            if (start is None or period_end > start)
+            and (end is None or period_start < end)
+        ] + [AuditLog.__table__]
+
+    def drop_before(self, cutoff: datetime.datetime) -> List[str]:
+        """Drop partitions whose whole period is before a cutoff.
+
+        Args:
+            cutoff: Partitions ending at or before this time are dropped.
+
+        Returns:
+            List[str]: The names of the dropped partitions.
+        """
+        dropped = []
+        with self._lock:
+            expired = sorted(
+                name for name, (_, end) in self._known.items() if end <= cutoff
+            )
+
+            for name in expired:
+                with self._db.session() as session:
+                    if self.mode == "native":
+                        session.execute(
+                            text(f"ALTER TABLE audit_logs DETACH PARTITION {name}")
+                        )
+                    session.execute(text(f"DROP TABLE IF EXISTS {name}"))
+
+                del self._known[name]
+                self._tables.pop(name, None)
+                dropped.append(name)
+
+        if dropped:
+            self._logger.info(f"Dropped expired audit partitions: {', '.join(dropped)}")
+        return dropped
+
+    def status(self) -> Dict[str, Any]:
+        """Get the partitioning status."""
+        with self._lock:
+            periods = sorted(start for start, _ in self._known.values())
+
+        return {
+            "mode": self.mode,
+            "interval": self._interval,
+            "count": len(periods),
+            "oldest": periods[0].isoformat() if periods else None,
+            "newest": periods[-1].isoformat() if periods else None,
+        }
+
+
+class AuditManager(QorzenManager):
+    """Records audit events to the AuditLog table in batches.
+
+    The Audit Manager subscribes to security, API and plugin events on the
+    event bus and buffers them as AuditLog rows in memory. A background thread
+    writes the buffer with a single batched insert whenever it reaches
+    batch_size rows or flush_interval seconds pass, so auditing adds one
+    transaction per batch rather than one per action.
+
+    Memory is bounded by max_buffer rows. When the buffer is full, or the
+    database can't be written, rows are appended to a spill file (one JSON
+    object per line, fsynced) and replayed once writes succeed again,
+    including after a restart.
+
+    The audit log is partitioned by time (see _AuditPartitions). The flush
+    thread creates upcoming partitions and drops those older than
+    retention_days, and query() only reads the partitions a time range
+    touches.
+    """
+
+    def __init__(
+        self,
+        config_manager: Any,
+        logger_manager: Any,
+        event_bus_manager: Any,
+        database_manager: Any,
+    ) -> None:
+        """Initialize the Audit Manager.
+
+        Args:
+            config_manager: The Configuration Manager for audit settings.
+            logger_manager: The Logging Manager for logging.
+            event_bus_manager: The Event Bus Manager to receive events from.
+            database_manager: The Database Manager to write audit logs with.
+        """
+        super().__init__(name="AuditManager")
+        self._config_manager = config_manager
+        self._logger = logger_manager.get_logger("audit_manager")
+        self._event_bus = event_bus_manager
+        self._db_manager = database_manager
+
+        # Settings
+        self._event_patterns: List[str] = ["security/*", "api/*", "plugin/*"]
+        self._batch_size = 500
+        self._flush_interval = 1.0  # Seconds
+        self._max_buffer = 10000
+        self._spill_path: Optional[Path] = None
+
+        # Partitioning and retention
+        self._partitions: Optional[_AuditPartitions] = None
+        self._premake_partitions = 1
+        self._retention_days = 0  # 0 keeps everything
+        self._maintenance_interval = 3600.0  # Seconds
+        self._next_maintenance = 0.0
+        self._last_maintenance: Optional[datetime.datetime] = None
+        self._rows_expired = 0
+
+        # Buffered rows, guarded by the condition's lock
+        self._buffer: Deque[Dict[str, Any]] = deque()
+        self._condition = threading.Condition()
+
+        # One flush, spill or replay at a time
+        self._flush_lock = threading.Lock()
+        self._spill_lock = threading.Lock()
+        self._spill_pending = False
+
+        self._subscriber_id: Optional[str] = None
+        self._flush_thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+
+        # Metrics
+        self._received = 0
+        self._written = 0
+        self._batches = 0
+        self._spilled = 0
+        self._replayed = 0
+        self._dropped = 0
+        self._flush_failures = 0
+        self._backpressure_events = 0
+        self._buffer_high_water = 0
+        self._last_flush_ms = 0.0
+        self._last_error: Optional[str] = None
+
+    def initialize(self) -> None:
+        """Initialize the Audit Manager.
+
+        Creates the audit table if needed, subscribes to events, and starts
+        the flush thread. Rows spilled by a previous run are replayed.
+
+        Raises:
+            ManagerInitializationError: If initialization fails.
+        """
+        try:
+            audit_config = self._config_manager.get("audit", {})
+            if not audit_config.get("enabled", True):
+                self._logger.info("Audit logging is disabled in configuration")
+                self._initialized = True
+                self._healthy = True
+                return
+
+            self._event_patterns = audit_config.get("event_types", self._event_patterns)
+            self._batch_size = max(1, audit_config.get("batch_size", 500))
+            self._flush_interval = audit_config.get("flush_interval", 1.0)
+            self._max_buffer = max(
+                self._batch_size, audit_config.get("max_buffer", 10000)
+            )
+            self._spill_path = Path(
+                audit_config.get("spill_file", "data/audit_spill.jsonl")
+            )
+            self._spill_path.parent.mkdir(parents=True, exist_ok=True)
+            self._spill_pending = (
+                self._spill_path.exists() or self._replay_path.exists()
+            )
+
+            self._ensure_table()
+
+            partition_config = audit_config.get("partitioning", {})
+            self._premake_partitions = partition_config.get("premake", 1)
+            self._retention_days = partition_config.get("retention_days", 0)
+            self._maintenance_interval = partition_config.get(
+                "maintenance_interval", 3600.0
+            )
+            self._partitions = _AuditPartitions(
+                self._db_manager,
+                partition_config.get("interval", "month"),
+                self._logger,
+            )
+            try:
+                self._partitions.detect(partition_config.get("enabled", True))
+            except Exception as e:
+                self._partitions.mode = "none"
+                self._logger.warning(f"Could not set up audit partitioning: {str(e)}")
+
+            self._subscriber_id = self._event_bus.subscribe(
+                event_type="*",
+                callback=self._on_event,
+                subscriber_id="audit_manager",
+            )
+
+            self._stop_event.clear()
+            self._flush_thread = threading.Thread(
+                target=self._flush_worker, name="audit-flusher", daemon=True
+            )
+            self._flush_thread.start()
+
+            self._config_manager.register_listener("audit", self._on_config_changed)
+
+            self._logger.info(
+                "Audit Manager initialized",
+                extra={
+                    "batch_size": self._batch_size,
+                    "flush_interval": self._flush_interval,
+                    "max_buffer": self._max_buffer,
+                },
+            )
+
+            self._initialized = True
+            self._healthy = True
+
+        except Exception as e:
+            self._logger.error(f"Failed to initialize Audit Manager: {str(e)}")
+            raise ManagerInitializationError(
+                f"Failed to initialize AuditManager: {str(e)}",
+                manager_name=self.name,
+            ) from e
+
+    @property
+    def _replay_path(self) -> Path:
+        """The spill file while it is being replayed."""
+        return self._spill_path.with_name(self._spill_path.name + ".replay")
+
+    def _ensure_table(self) -> None:
+        """Create the audit table and its indexes if they don't exist yet."""
+        try:
+            engine = self._db_manager.get_engine()
+            AuditLog.__table__.create(engine, checkfirst=True)
+
+            # Tables created before the indexes were added to the model
+            for index in AuditLog.__table__.indexes:
+                index.create(engine, checkfirst=True)
+        except Exception as e:
+            # Rows are spilled until the table is available
+            self._logger.warning(f"Could not create audit table: {str(e)}")
+
+    def record(
+        self,
+        action_type: AuditActionType,
+        resource_type: str,
+        resource_id: Optional[str] = None,
+        user_id: Optional[int] = None,
+        user_name: Optional[str] = None,
+        description: Optional[str] = None,
+        ip_address: Optional[str] = None,
+        user_agent: Optional[str] = None,
+        details: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[datetime.datetime] = None,
+    ) -> None:
+        """Queue an audit log entry.
+
+        The entry is written with the next batch; call flush() to write it
+        immediately.
+
+        Args:
+            action_type: The kind of action performed.
+            resource_type: The type of resource acted on.
+            resource_id: Optional ID of the resource acted on.
+            user_id: Optional database ID of the acting user.
+            user_name: Optional name of the acting user.
+            description: Optional description of the action.
+            ip_address: Optional IP address the action came from.
+            user_agent: Optional user agent the action came from.
+            details: Optional JSON-serializable details.
+            timestamp: When the action happened. Defaults to now.
+        """
+        if self._partitions is None:
+            # Audit logging is disabled
+            return
+
+        self._enqueue(
+            {
+                "timestamp": timestamp or datetime.datetime.now(),
+                "user_id": user_id,
+                "user_name": str(user_name)[:32] if user_name else None,
+                "action_type": action_type,
+                "resource_type": resource_type[:64],
+                "resource_id": str(resource_id)[:64] if resource_id else None,
+                "description": str(description)[:255] if description else None,
+                "ip_address": str(ip_address)[:45] if ip_address else None,
+                "user_agent": str(user_agent)[:255] if user_agent else None,
+                "details": details,
+            }
+        )
+
+    def _on_event(self, event: Any) -> None:
+        """Event bus callback that queues matching events as audit entries.
+
+        Args:
+            event: The published event.
+        """
+        if not any(
+            fnmatch.fnmatchcase(event.event_type, p) for p in self._event_patterns
+        ):
+            return
+
+        payload = event.payload or {}
+        prefix, _, _ = event.event_type.partition("/")
+
+        if event.event_type in _EVENT_ACTIONS:
+            action_type, resource_type = _EVENT_ACTIONS[event.event_type]
+        elif event.event_type == "api/request":
+            action_type = _METHOD_ACTIONS.get(
+                str(payload.get("method", "")).upper(), AuditActionType.READ
+            )
+            resource_type = "api"
+        elif prefix == "plugin":
+            action_type, resource_type = AuditActionType.PLUGIN, "plugin"
+        elif prefix == "api":
+            action_type, resource_type = AuditActionType.SYSTEM, "api"
+        else:
+            action_type, resource_type = AuditActionType.CUSTOM, prefix
+
+        resource_id = (
+            payload.get("user_id")
+            or payload.get("plugin_name")
+            or payload.get("name")
+            or payload.get("path")
+        )
+
+        # Users are identified by UUID, which doesn't fit the integer user_id
+        user_id = payload.get("user_id")
+        if not isinstance(user_id, int):
+            user_id = None
+
+        self.record(
+            action_type,
+            resource_type,
+            resource_id=resource_id,
+            user_id=user_id,
+            user_name=payload.get("username"),
+            description=event.event_type,
+            ip_address=payload.get("client_ip"),
+            user_agent=payload.get("user_agent"),
+            details=json.loads(json.dumps(payload, default=str)),
+            timestamp=event.timestamp,
+        )
+
+    def _enqueue(self, row: Dict[str, Any]) -> None:
+        """Add a row to the buffer, spilling the buffer to disk when it is full.
+
+        Args:
+            row: The AuditLog column values.
+        """
+        overflow: Optional[List[Dict[str, Any]]] = None
+
+        with self._condition:
+            self._received += 1
+
+            if len(self._buffer) >= self._max_buffer:
+                # Backpressure: move the whole buffer to disk in one write
+                overflow = list(self._buffer)
+                overflow.append(row)
+                self._buffer.clear()
+                self._backpressure_events += 1
+            else:
+                self._buffer.append(row)
+                self._buffer_high_water = max(
+                    self._buffer_high_water, len(self._buffer)
+                )
+                if len(self._buffer) >= self._batch_size:
+                    self._condition.notify()
+
+        if overflow is not None:
+            self._logger.warning(
+                f"Audit buffer full, spilling {len(overflow)} rows to disk"
+            )
+            self._spill(overflow)
+
+    def _flush_worker(self) -> None:
+        """Flush thread: writes batches by size or time, and replays spills."""
+        if self._spill_pending:
+            try:
+                self._replay_spill()
+            except Exception as e:
+                self._logger.error(f"Failed to replay audit spill file: {str(e)}")
+
+        while not self._stop_event.is_set():
+            if time.monotonic() >= self._next_maintenance:
+                try:
+                    self.maintain_partitions()
+                except Exception as e:
+                    self._logger.error(f"Audit partition maintenance failed: {str(e)}")
+                self._next_maintenance = time.monotonic() + self._maintenance_interval
+
+            with self._condition:
+                self._condition.wait_for(
+                    lambda: len(self._buffer) >= self._batch_size
+                    or self._stop_event.is_set(),
+                    timeout=self._flush_interval,
+                )
+
+            try:
+                if self.flush() >= 0 and self._spill_pending:
+                    self._replay_spill()
+            except Exception as e:
+                self._logger.error(f"Unexpected error in audit flush thread: {str(e)}")
+
+    def flush(self) -> int:
+        """Write all buffered rows to the database now.
+
+        Rows that can't be written are spilled to disk and retried later.
+
+        Returns:
+            int: The number of rows written, or -1 if the write failed.
+        """
+        with self._flush_lock:
+            with self._condition:
+                rows = list(self._buffer)
+                self._buffer.clear()
+
+            if not rows:
+                return 0
+
+            written = self._write(rows)
+            if written < len(rows):
+                self._spill(rows[written:])
+                return -1
+
+            return written
+
+    def _write(self, rows: List[Dict[str, Any]]) -> int:
+        """Insert rows in batches.
+
+        Args:
+            rows: The AuditLog column values.
+
+        Returns:
+            int: The number of rows committed; fewer than given on failure.
+        """
+        start = time.perf_counter()
+        committed = 0
+        try:
+            for table, table_rows in self._partitions.route(rows):
+                self._db_manager.bulk_insert(
+                    table, table_rows, chunk_size=self._batch_size
+                )
+                committed += len(table_rows)
+        except Exception as e:
+            if isinstance(e, DatabaseError):
+                committed += e.details.get("rows_committed", 0)
+
+            self._flush_failures += 1
+            self._written += committed
+            self._last_error = str(e)
+            self._healthy = False
+            self._logger.error(
+                f"Failed to write audit logs: {str(e)}",
+                extra={"rows": len(rows), "rows_committed": committed},
+            )
+            return committed
+
+        self._written += len(rows)
+        self._batches += 1
+        self._last_flush_ms = round((time.perf_counter() - start) * 1000, 2)
+        self._last_error = None
+        self._healthy = True
+        return len(rows)
+
+    def _spill(self, rows: List[Dict[str, Any]]) -> None:
+        """Append rows to the spill file and sync it to disk.
+
+        Args:
+            rows: The AuditLog column values.
+        """
+        if self._spill_path is None:
+            self._dropped += len(rows)
+            return
+
+        lines = "".join(
+            json.dumps(self._serialize(row), default=str) + "\n" for row in rows
+        )
+
+        with self._spill_lock:
+            try:
+                with open(self._spill_path, "a", encoding="utf-8") as f:
+                    f.write(lines)
+                    f.flush()
+                    os.fsync(f.fileno())
+                self._spilled += len(rows)
+                self._spill_pending = True
+            except OSError as e:
+                self._dropped += len(rows)
+                self._logger.error(
+                    f"Failed to spill {len(rows)} audit rows, dropping them: {str(e)}"
+                )
+
+    def _replay_spill(self) -> None:
+        """Write spilled rows to the database and remove the spill file.
+
+        The spill file is renamed before replaying so new spills go to a fresh
+        file. A replay interrupted by a crash resumes from the renamed file on
+        the next run; rows of the batch in flight may then be written twice.
+        """
+        with self._flush_lock:
+            with self._spill_lock:
+                if not self._replay_path.exists():
+                    if not self._spill_path.exists():
+                        self._spill_pending = False
+                        return
+                    os.replace(self._spill_path, self._replay_path)
+                self._spill_pending = self._spill_path.exists()
+
+            replayed = 0
+            with open(self._replay_path, "r", encoding="utf-8") as f:
+                while True:
+                    lines = list(itertools.islice(f, self._batch_size))
+                    if not lines:
+                        break
+
+                    rows = self._drop_expired(self._parse_lines(lines))
+                    written = self._write(rows)
+                    replayed += written
+                    if written < len(rows):
+                        # Keep what is left for the next attempt
+                        remaining = rows[written:] + self._drop_expired(
+                            self._parse_lines(f)
+                        )
+                        self._spill(remaining)
+                        break
+
+            self._replay_path.unlink()
+            self._replayed += replayed
+            if replayed:
+                self._logger.info(f"Replayed {replayed} spilled audit rows")
+
+    def _drop_expired(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop rows older than the retention period.
+
+        Late rows, e.g. replayed from the spill file, would otherwise recreate
+        partitions that retention already dropped.
+        """
+        if self._retention_days <= 0:
+            return rows
+
+        cutoff = datetime.datetime.now() - datetime.timedelta(days=self._retention_days)
+        kept = [row for row in rows if row["timestamp"] >= cutoff]
+        self._rows_expired += len(rows) - len(kept)
+        return kept
+
+    def _parse_lines(self, lines: Iterable[str]) -> List[Dict[str, Any]]:
+        """Parse spill file lines, skipping any that are corrupt."""
+        rows = []
+        for line in lines:
+            try:
+                rows.append(self._deserialize(json.loads(line)))
+            except (ValueError, KeyError) as e:
+                self._dropped += 1
+                self._logger.warning(f"Skipping corrupt audit spill line: {str(e)}")
+        return rows
+
+    @staticmethod
+    def _serialize(row: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a row to JSON-compatible values."""
+        return {
+            **row,
+            "timestamp": row["timestamp"].isoformat(),
+            "action_type": row["action_type"].name,
+        }
+
+    @staticmethod
+    def _deserialize(data: Dict[str, Any]) -> Dict[str, Any]:
+        """Convert a spilled row back to column values."""
+        return {
+            **data,
+            "timestamp": datetime.datetime.fromisoformat(data["timestamp"]),
+            "action_type": AuditActionType[data["action_type"]],
+        }
+
+    def query(
+        self,
+        start: Optional[datetime.datetime] = None,
+        end: Optional[datetime.datetime] = None,
+        user_id: Optional[int] = None,
+        user_name: Optional[str] = None,
+        action_type: Optional[AuditActionType] = None,
+        resource_type: Optional[str] = None,
+        resource_id: Optional[str] = None,
+        limit: int = 100,
+    ) -> List[Dict[str, Any]]:
+        """Query audit log entries, newest first.
+
+        Only partitions overlapping [start, end) are read, so bounding the time
+        range keeps queries cheap as the log grows. Rows still buffered in
+        memory are not included; call flush() first to see them.
+
+        Args:
+            start: Optional inclusive lower bound on the timestamp.
+            end: Optional exclusive upper bound on the timestamp.
+            user_id: Optional database ID of the acting user.
+            user_name: Optional name of the acting user.
+            action_type: Optional kind of action.
+            resource_type: Optional type of resource acted on.
+            resource_id: Optional ID of the resource acted on; the composite
+                index is only used together with resource_type.
+            limit: The maximum number of entries to return.
+
+        Returns:
+            List[Dict[str, Any]]: The matching entries as dictionaries.
+
+        Raises:
+            DatabaseError: If the query fails.
+        """
+        filters = {
+            "user_id": user_id,
+            "user_name": user_name,
+            "action_type": action_type,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+        }
+
+        results: List[Dict[str, Any]] = []
+        for table in self._partitions.tables_for_range(start, end):
+            statement = select(table)
+            if start is not None:
+                statement = statement.where(table.c.timestamp >= start)
+            if end is not None:
+                statement = statement.where(table.c.timestamp < end)
+            for column, value in filters.items():
+                if value is not None:
+                    statement = statement.where(table.c[column] == value)
+
+            # Partitions are disjoint and newest first, so stop once full
+            results.extend(
+                self._db_manager.execute(
+                    statement.order_by(
+                        table.c.timestamp.desc(), table.c.id.desc()
+                    ).limit(limit - len(results))
+                )
+            )
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def maintain_partitions(self) -> Dict[str, Any]:
+        """Create upcoming audit partitions and apply the retention period.
+
+        Called periodically by the flush thread. Partitions that end before
+        the retention cutoff are dropped whole; rows older than the cutoff
+        that sit in a partially expired or unpartitioned table are deleted.
+
+        Returns:
+            Dict[str, Any]: The partitions created and dropped, and the
+            number of rows deleted.
+        """
+        if self._partitions is None:
+            return {"created": [], "dropped": [], "rows_deleted": 0}
+
+        now = datetime.datetime.now()
+        self._partitions.refresh()
+        created = self._partitions.ensure(now, 1 + self._premake_partitions)
+
+        dropped: List[str] = []
+        rows_deleted = 0
+        if self._retention_days > 0:
+            cutoff = now - datetime.timedelta(days=self._retention_days)
+            dropped = self._partitions.drop_before(cutoff)
+
+            with self._db_manager.session() as session:
+                result = session.execute(
+                    AuditLog.__table__.delete().where(
+                        AuditLog.__table__.c.timestamp < cutoff
+                    )
+                )
+                rows_deleted = max(result.rowcount, 0)
+            self._rows_expired += rows_deleted
+
+        self._last_maintenance = now
+        return {"created": created, "dropped": dropped, "rows_deleted": rows_deleted}
+
+    def _on_config_changed(self, key: str, value: Any) -> None:
+        """Handle configuration changes for audit logging.
+
+        Args:
+            key: The configuration key that changed.
+            value: The new value.
+        """
+        if key == "audit.flush_interval":
+            self._flush_interval = value
+        elif key == "audit.batch_size":
+            self._batch_size = max(1, value)
+        elif key == "audit.partitioning.retention_days":
+            self._retention_days = value
+        elif key == "audit.partitioning.premake":
+            self._premake_partitions = value
+        elif key.startswith("audit."):
+            self._logger.warning(
+                f"Configuration change to {key} requires restart to take effect",
+                extra={"key": key},
+            )
+
+    def shutdown(self) -> None:
+        """Shut down the Audit Manager.
+
+        Unsubscribes from events and writes, or spills, everything buffered.
+
+        Raises:
+            ManagerShutdownError: If shutdown fails.
+        """
+        if not self._initialized:
+            return
+
+        try:
+            self._logger.info("Shutting down Audit Manager")
+
+            if self._subscriber_id is not None:
+                try:
+                    self._event_bus.unsubscribe(self._subscriber_id)
+                except Exception:
+                    pass
+                self._subscriber_id = None
+
+            if self._flush_thread is not None:
+                self._stop_event.set()
+                with self._condition:
+                    self._condition.notify_all()
+                self._flush_thread.join(timeout=10.0)
+                self._flush_thread = None
+
+                # Anything that arrived after the last flush
+                self.flush()
+
+                self._config_manager.unregister_listener(
+                    "audit", self._on_config_changed
+                )
+
+            self._initialized = False
+            self._healthy = False
+
+            self._logger.info("Audit Manager shut down successfully")
+
+        except Exception as e:
+            self._logger.error(f"Failed to shut down Audit Manager: {str(e)}")
+            raise ManagerShutdownError(
+                f"Failed to shut down AuditManager: {str(e)}",
+                manager_name=self.name,
+            ) from e
+
+    def status(self) -> Dict[str, Any]:
+        """Get the status of the Audit Manager.
+
+        Returns:
+            Dict[str, Any]: Status information about the Audit Manager.
+        """
+        status = super().status()
+
+        if self._initialized:
+            with self._condition:
+                buffered = len(self._buffer)
+
+            spill_bytes = 0
+            if self._spill_path is not None:
+                for path in (self._spill_path, self._replay_path):
+                    try:
+                        spill_bytes += path.stat().st_size
+                    except OSError:
+                        pass
+
+            status.update(
+                {
+                    "buffer": {
+                        "size": buffered,
+                        "max": self._max_buffer,
+                        "high_water": self._buffer_high_water,
+                        "utilization": round(buffered / self._max_buffer * 100, 2),
+                    },
+                    "rows": {
+                        "received": self._received,
+                        "written": self._written,
+                        "spilled": self._spilled,
+                        "replayed": self._replayed,
+                        "dropped": self._dropped,
+                    },
+                    "flush": {
+                        "batches": self._batches,
+                        "failures": self._flush_failures,
+                        "last_duration_ms": self._last_flush_ms,
+                        "last_error": self._last_error,
+                    },
+                    "backpressure": {
+                        "events": self._backpressure_events,
+                        "spill_file": (
+                            str(self._spill_path) if self._spill_path else None
+                        ),
+                        "spill_bytes": spill_bytes,
+                    },
+                }
+            )
+
+            if self._partitions is not None:
+                status["partitions"] = self._partitions.status()
+                status["partitions"].update(
+                    {
+                        "retention_days": self._retention_days,
+                        "rows_expired": self._rows_expired,
+                        "last_maintenance": (
+                            self._last_maintenance.isoformat()
+                            if self._last_maintenance
+                            else None
+                        ),
+                    }
+                )
+
+        return status
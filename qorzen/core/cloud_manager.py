@@ -302,8 +302,8 @@ class LocalStorageService(BaseCloudService):
 
         try:
             if self._file_manager:
-                # Use file manager to list files
-                files = self._file_manager.list_files(
+                # Answered from the file manager's metadata index when enabled
+                files = self._file_manager.list_indexed_files(
                     path=os.path.join(self._base_directory, remote_path),
                     directory_type="base",
                     recursive=True,
@@ -3,6 +3,8 @@ from __future__ import annotations
 import json
 import os
 import pathlib
+import threading
+import time
 from copy import deepcopy
 from typing import Any, Callable, Dict, List, Optional, Set, Union
 
@@ -31,7 +33,53 @@ class ConfigSchema(BaseModel):
             "password": "",
             "pool_size": 5,
             "max_overflow": 10,
+            "pool_pre_ping": True,
+            "statement_cache": {
+                "size": 512,
+                "compiled_size": 500,
+                "prepare_threshold": 5,
+                "prepared_statement_cache_size": 100,
+            },
             "echo": False,
+            "replicas": [],
+            "replica_max_lag_seconds": 10.0,
+            "replica_check_interval": 30.0,
+            "sqlite": {
+                "pragmas": {
+                    "journal_mode": "wal",
+                    "synchronous": "normal",
+                    "cache_size": -65536,
+                    "mmap_size": 268435456,
+                    "busy_timeout": 5000,
+                    "temp_store": "memory",
+                },
+                "writer": {
+                    "enabled": True,
+                    "max_batch": 64,
+                    "group_commit_ms": 2.0,
+                },
+                "writer_timeout": 30.0,
+            },
+            "query_stats": {
+                "slow_query_ms": 1000,
+                "explain_slow_queries": False,
+                "slow_query_log_size": 100,
+                "max_statements": 500,
+                "sample_size": 1000,
+                "prometheus": True,
+            },
+            "query_cache": {
+                "enabled": False,
+                "max_entries": 1024,
+                "ttl_seconds": 30.0,
+            },
+            "pool_monitor": {
+                "leak_threshold_seconds": 30.0,
+                "capture_stacks": True,
+                "stack_depth": 12,
+                "check_interval": 10.0,
+                "exhaustion_event_interval": 10.0,
+            },
         },
         description="Database connection settings",
     )
@@ -91,6 +139,7 @@ class ConfigSchema(BaseModel):
             "worker_threads": 4,
             "max_queue_size": 100,
             "thread_name_prefix": "nexus-worker",
+            "task_shards": 16,
         },
         description="Thread pool settings",
     )
@@ -111,10 +160,31 @@ class ConfigSchema(BaseModel):
                 "enabled": True,
                 "requests_per_minute": 100,
             },
+            "audit_requests": True,
         },
         description="REST API settings",
     )
 
+    # Audit log configuration
+    audit: Dict[str, Any] = Field(
+        default_factory=lambda: {
+            "enabled": True,
+            "event_types": ["security/*", "api/*", "plugin/*"],
+            "batch_size": 500,
+            "flush_interval": 1.0,
+            "max_buffer": 10000,
+            "spill_file": "data/audit_spill.jsonl",
+            "partitioning": {
+                "enabled": True,
+                "interval": "month",
+                "premake": 1,
+                "retention_days": 0,
+                "maintenance_interval": 3600.0,
+            },
+        },
+        description="Audit log settings",
+    )
+
     @model_validator(mode="after")
     def validate_api_port(self) -> "ConfigSchema":
         """Ensure `api.port` is a valid integer."""
@@ -160,6 +230,52 @@ class ConfigSchema(BaseModel):
             "temp_directory": "data/temp",
             "plugin_data_directory": "data/plugins",
             "backup_directory": "data/backups",
+            "workers": 16,
+            "walk_workers": 8,
+            "locks": {"stripes": 64, "interprocess": False, "path": None},
+            "copy": {"workers": 8, "reflink": True},
+            "compression": {
+                "workers": 4,
+                "block_size": 4194304,
+                "temp_files": "none",
+            },
+            "backup": {
+                "chunk_size": 1048576,
+                "compression": "none",
+                "workers": 4,
+                "retention": {
+                    "keep_last": 10,
+                    "keep_daily": 7,
+                    "keep_weekly": 4,
+                    "keep_monthly": 12,
+                },
+            },
+            "fsync": "none",
+            "write_behind": {
+                "enabled": True,
+                "flush_interval": 1.0,
+                "max_bytes": 8388608,
+            },
+            "hash_workers": 4,
+            "hash_cache": {
+                "enabled": True,
+                "path": None,
+                "max_entries": 100000,
+            },
+            "index": {
+                "enabled": True,
+                "path": None,
+                "refresh_interval": 60.0,
+                "hash_files": False,
+                "tombstone_retention_days": 7,
+            },
+            "watcher": {
+                "enabled": True,
+                "backend": "auto",
+                "debounce_ms": 200,
+                "max_delay_ms": 2000,
+                "poll_interval": 2.0,
+            },
         },
         description="File management settings",
     )
@@ -243,6 +359,9 @@ class ConfigManager(QorzenManager):
     to configuration values, and handling dynamic configuration changes.
     """
 
+    # Minimum seconds between config file mtime checks without a watcher
+    FILE_CHECK_INTERVAL = 1.0
+
     def __init__(
         self,
         config_path: Optional[Union[str, pathlib.Path]] = None,
@@ -267,6 +386,13 @@ class ConfigManager(QorzenManager):
         self._env_vars_applied: Set[str] = set()
         self._listeners: Dict[str, List[Callable[[str, Any], None]]] = {}
 
+        # The config file's mtime when it was loaded, and when it was last
+        # checked; a File Manager watch replaces the checks once attached
+        self._file_mtime_ns: Optional[int] = None
+        self._file_checked_at = 0.0
+        self._file_watch_id: Optional[str] = None
+        self._reload_lock = threading.RLock()
+
     def initialize(self) -> None:
         """Initialize the Configuration Manager.
 
@@ -279,24 +405,22 @@ class ConfigManager(QorzenManager):
         """
         try:
             # Start with default configuration
-            self._config = (
-                ConfigSchema().model_dump()
-            )  # Changed from dict() to model_dump()
+            config = ConfigSchema().model_dump()
 
             # Load from file if available
-            self._load_from_file()
+            self._load_from_file(config)
 
             # Apply environment variables
-            self._apply_env_vars()
+            self._apply_env_vars(config)
 
             # Validate the final configuration
-            self._validate_config()
+            self._config = self._validate_config(config)
 
-            # Set up file watcher if using a file
+            # Until watch_file() attaches a watcher, get() checks the
+            # file's mtime at most every FILE_CHECK_INTERVAL seconds
             if self._loaded_from_file:
-                # For now, we'll just check the file on each access
-                # In a more sophisticated implementation, we'd use a file watcher
-                pass
+                self._file_mtime_ns = self._config_path.stat().st_mtime_ns
+                self._file_checked_at = time.monotonic()
 
             self._initialized = True
             self._healthy = True
@@ -307,17 +431,23 @@ class ConfigManager(QorzenManager):
                 manager_name=self.name,
             ) from e
 
-    def _load_from_file(self) -> None:
+    def _load_from_file(self, config: Dict[str, Any]) -> bool:
         """Load configuration from the config file.
 
-        If the file exists, load and merge its contents with the default config.
+        If the file exists, load and merge its contents into config.
+
+        Args:
+            config: The configuration to merge the file into.
+
+        Returns:
+            bool: Whether the file exists and has any settings.
 
         Raises:
             ConfigurationError: If the file exists but cannot be loaded.
 
         """
         if not self._config_path.exists():
-            return
+            return False
 
         try:
             with self._config_path.open("r", encoding="utf-8") as f:
@@ -331,9 +461,11 @@ class ConfigManager(QorzenManager):
                         config_key="config_path",
                     )
 
-                if file_config:
-                    self._merge_config(file_config)
-                    self._loaded_from_file = True
+                if not file_config:
+                    return False
+                self._merge_config(file_config, config)
+                self._loaded_from_file = True
+                return True
 
         except (yaml.YAMLError, json.JSONDecodeError) as e:
             raise ConfigurationError(
@@ -341,7 +473,7 @@ class ConfigManager(QorzenManager):
                 config_key="config_path",
             ) from e
 
-    def _apply_env_vars(self) -> None:
+    def _apply_env_vars(self, config: Dict[str, Any]) -> None:
         """Apply environment variables to the configuration.
 
         Environment variables override file configuration. Format is:
@@ -351,6 +483,9 @@ class ConfigManager(QorzenManager):
             NEXUS_DATABASE_HOST=localhost
             NEXUS_LOGGING_LEVEL=DEBUG
 
+        Args:
+            config: The configuration to apply them to.
+
         """
         for env_name, env_value in os.environ.items():
             if not env_name.startswith(self._env_prefix):
@@ -361,13 +496,10 @@ class ConfigManager(QorzenManager):
 
             # Apply to config
             self._set_nested_value(
-                self._config, config_path, self._parse_env_value(env_value)
+                config, config_path, self._parse_env_value(env_value)
             )
             self._env_vars_applied.add(env_name)
 
-        # **Ensure re-validation after applying environment variables**
-        self._validate_config()
-
     @staticmethod
     def _parse_env_value(value: str) -> Any:
         """Parse an environment variable value to the appropriate type.
@@ -424,18 +556,21 @@ class ConfigManager(QorzenManager):
 
         self._set_nested_value(config[key], path[1:], value)
 
-    def _validate_config(self) -> None:
-        """Validate the configuration against the schema.
+    def _validate_config(self, config: Dict[str, Any]) -> Dict[str, Any]:
+        """Validate a configuration against the schema.
+
+        Args:
+            config: The configuration to validate.
+
+        Returns:
+            Dict[str, Any]: The validated configuration, with defaults filled in.
 
         Raises:
             ConfigurationError: If the configuration is invalid.
 
         """
         try:
-            validated_config = ConfigSchema(
-                **self._config
-            ).model_dump()  # Changed from dict() to model_dump()
-            self._config = validated_config
+            return ConfigSchema(**config).model_dump()
         except ValidationError as e:
             errors = e.errors()
             error_details = ", ".join(
@@ -526,9 +661,102 @@ class ConfigManager(QorzenManager):
 
     def _check_file_updated(self) -> None:
         """Check if the configuration file has been updated and reload if needed."""
-        # In a real implementation, we'd compare modified times or use a file watcher
-        # For simplicity, we're not implementing this yet
-        pass
+        if self._file_watch_id is not None:
+            return  # The watcher reloads the file when it changes
+
+        now = time.monotonic()
+        if now - self._file_checked_at < self.FILE_CHECK_INTERVAL:
+            return
+        self._file_checked_at = now
+
+        try:
+            mtime_ns = self._config_path.stat().st_mtime_ns
+        except OSError:
+            return
+        if mtime_ns == self._file_mtime_ns:
+            return
+
+        try:
+            self.reload()
+        except ConfigurationError as e:
+            # Keep the current configuration until the file is fixed
+            self._file_mtime_ns = mtime_ns
+            print(f"Error reloading configuration from {self._config_path}: {str(e)}")
+
+    def reload(self) -> bool:
+        """Reload the configuration from the config file and environment.
+
+        Listeners are notified of each top-level section that changed.
+
+        Returns:
+            bool: Whether the configuration changed.
+
+        The new configuration is built separately and swapped in at once, so
+        get() never sees a partly loaded one.
+
+        Raises:
+            ConfigurationError: If the file is empty, as an editor can leave it
+                mid-save, or the file or the resulting configuration is
+                invalid. The current configuration is kept.
+        """
+        with self._reload_lock:
+            config = ConfigSchema().model_dump()
+            mtime_ns = None
+            if self._config_path.exists():
+                mtime_ns = self._config_path.stat().st_mtime_ns
+                if not self._load_from_file(config):
+                    raise ConfigurationError(
+                        f"Config file {self._config_path} is empty",
+                        config_key="config_path",
+                    )
+            self._apply_env_vars(config)
+            config = self._validate_config(config)
+
+            previous, self._config = self._config, config
+            if mtime_ns is not None:
+                self._file_mtime_ns = mtime_ns
+
+            changed = [
+                key for key, value in config.items() if previous.get(key) != value
+            ]
+
+        for key in changed:
+            self._notify_listeners(key, config[key])
+        return bool(changed)
+
+    def watch_file(self, file_manager: Any) -> bool:
+        """Reload the config file as soon as the File Manager reports a change.
+
+        Replaces the periodic mtime checks in get().
+
+        Args:
+            file_manager: An initialized File Manager.
+
+        Returns:
+            bool: Whether the file is now watched; False if there is no config
+            file or the File Manager's watcher isn't running.
+        """
+        if not self._loaded_from_file or self._file_watch_id is not None:
+            return self._file_watch_id is not None
+
+        try:
+            self._file_watch_id = file_manager.watch(
+                self._config_path.absolute(), self._on_file_changed
+            )
+        except Exception as e:
+            print(f"Cannot watch configuration file {self._config_path}: {str(e)}")
+            return False
+        return True
+
+    def _on_file_changed(self, changes: List[Any]) -> None:
+        """Reload the configuration after the File Manager reports a change."""
+        if not self._config_path.exists():
+            return  # Deleted, or about to be replaced; wait for the new file
+
+        try:
+            self.reload()
+        except ConfigurationError as e:
+            print(f"Error reloading configuration from {self._config_path}: {str(e)}")
 
     def _save_to_file(self) -> None:
         """Save the current configuration to the config file."""
@@ -541,6 +769,8 @@ class ConfigManager(QorzenManager):
                     yaml.safe_dump(self._config, f, default_flow_style=False)
                 elif self._config_path.suffix.lower() == ".json":
                     json.dump(self._config, f, indent=2)
+            # Our own write isn't a change to reload
+            self._file_mtime_ns = self._config_path.stat().st_mtime_ns
 
         except Exception as e:
             # Log the error but don't raise - config is still valid in memory
@@ -561,11 +791,11 @@ class ConfigManager(QorzenManager):
 
         for key, value in from_config.items():
             if (
-                key in self._config
-                and isinstance(self._config[key], dict)
+                key in to_config
+                and isinstance(to_config[key], dict)
                 and isinstance(value, dict)
             ):
-                self._merge_config(value, self._config[key])
+                self._merge_config(value, to_config[key])
             else:
                 # Only overwrite if the new value is not None, not empty, and not an empty dictionary
                 if value not in [None, "", {}]:
@@ -1,35 +1,83 @@
 from __future__ import annotations
 
+import array
+import asyncio
+import bisect
 import contextlib
+import contextvars
+import copy
 import functools
+import hashlib
+import itertools
+import os
+import queue
+import re
+import sys
 import threading
 import time
+import traceback
+from collections import OrderedDict, deque
+from concurrent.futures import Future
+from dataclasses import dataclass
+from enum import Enum
 from typing import (
     Any,
+    AsyncGenerator,
     Callable,
+    ContextManager,
+    Deque,
     Dict,
+    FrozenSet,
     Generator,
+    Iterable,
+    Iterator,
     List,
     Optional,
+    Sequence,
     Set,
     Tuple,
+    Type,
     TypeVar,
     Union,
     cast,
 )
 
 import sqlalchemy
-from sqlalchemy import URL, Connection, Engine, MetaData, create_engine, event, select
-from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, create_async_engine
+from sqlalchemy import (
+    URL,
+    Connection,
+    Engine,
+    MetaData,
+    Select,
+    Table,
+    create_engine,
+    event,
+    literal,
+    select,
+    tuple_,
+)
+from sqlalchemy.exc import DBAPIError, SQLAlchemyError
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool, QueuePool, StaticPool
+from sqlalchemy.pool.base import _ConnectionRecord
+from sqlalchemy.sql import visitors
+from sqlalchemy.sql.elements import Label, TextClause
 
 from qorzen.core.base import QorzenManager
 from qorzen.utils.exceptions import (
     DatabaseError,
+    EventBusError,
     ManagerInitializationError,
     ManagerShutdownError,
 )
+from qorzen.utils.pagination import decode_cursor, encode_cursor
 
 # Type variables for function overloading
 T = TypeVar("T")
@@ -50,6 +98,911 @@ class Base(DeclarativeBase):
     )
 
 
+class ResultFormat(Enum):
+    """Shapes in which query results can be returned."""
+
+    DICTS = "dicts"  # List of dictionaries, one per row (default)
+    TUPLES = "tuples"  # TupleResult: plain tuples sharing one column list
+    COLUMNS = "columns"  # Dict of column name to NumPy array, array.array or list
+    ARROW = "arrow"  # pyarrow.Table (requires pyarrow)
+
+
+@dataclass
+class TupleResult:
+    """Query results as plain tuples that share a single list of column names."""
+
+    columns: List[str]  # Column names, in row order
+    rows: List[Tuple[Any, ...]]  # One tuple per row
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __iter__(self) -> Iterator[Tuple[Any, ...]]:
+        return iter(self.rows)
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        """Convert the rows to dictionaries keyed by column name."""
+        return [dict(zip(self.columns, row)) for row in self.rows]
+
+
+# Statements that write to the table named right after the matched keywords
+_WRITE_TABLE_PATTERN = re.compile(
+    r"^\s*(?:INSERT\s+(?:OR\s+\w+\s+)?INTO|REPLACE\s+INTO|UPDATE(?:\s+OR\s+\w+)?"
+    r"|DELETE\s+FROM|TRUNCATE(?:\s+TABLE)?|DROP\s+TABLE(?:\s+IF\s+EXISTS)?"
+    r"|ALTER\s+TABLE|CREATE\s+TABLE(?:\s+IF\s+NOT\s+EXISTS)?)"
+    r"\s+[\"`\[]?([\w.]+)",
+    re.IGNORECASE,
+)
+
+# Row-locking clauses of a raw SELECT (PostgreSQL, MySQL and others)
+_LOCKING_READ_PATTERN = re.compile(
+    r"\bFOR\s+(?:NO\s+KEY\s+)?UPDATE\b|\bFOR\s+(?:KEY\s+)?SHARE\b"
+    r"|\bLOCK\s+IN\s+SHARE\s+MODE\b",
+    re.IGNORECASE,
+)
+
+# A table name, optionally quoted and schema-qualified
+_IDENTIFIER = r"(?:\"[^\"]+\"|`[^`]+`|\[[^\]]+\]|\w+)"
+
+# Tables read by a raw SELECT statement
+_READ_TABLE_PATTERN = re.compile(
+    rf"\b(?:FROM|JOIN)\s+({_IDENTIFIER}(?:\s*\.\s*{_IDENTIFIER})*)", re.IGNORECASE
+)
+
+# Clauses that end the FROM clause of a SELECT
+_FROM_CLAUSE_END_PATTERN = re.compile(
+    r"\b(?:WHERE|GROUP\s+BY|HAVING|WINDOW|ORDER\s+BY|LIMIT|OFFSET|FETCH|FOR"
+    r"|UNION|INTERSECT|EXCEPT)\b|;",
+    re.IGNORECASE,
+)
+
+
+def _raw_read_tables(sql: str) -> Optional[FrozenSet[str]]:
+    """Find the tables a raw SELECT reads.
+
+    Only simple statements are resolved: a FROM clause naming tables joined
+    with JOIN. Comma joins, subqueries, CTEs and compound selects are not.
+
+    Args:
+        sql: A raw SQL statement.
+
+    Returns:
+        Optional[FrozenSet[str]]: The lower-case table names, or None if the
+            statement is not a SELECT whose tables can all be found.
+    """
+    if sql.lstrip()[:6].upper() != "SELECT":
+        return None
+
+    # A second SELECT means a subquery or a compound select
+    if len(re.findall(r"\bSELECT\b", sql, re.IGNORECASE)) != 1:
+        return None
+
+    match = _READ_TABLE_PATTERN.search(sql)
+    if match is None:
+        return None
+
+    # A comma in the FROM clause may join tables the pattern doesn't see
+    end = _FROM_CLAUSE_END_PATTERN.search(sql, match.start())
+    if "," in sql[match.start() : end.start() if end else len(sql)]:
+        return None
+
+    tables = set()
+    for name in _READ_TABLE_PATTERN.findall(sql):
+        last = re.split(r"\s*\.\s*", name)[-1]
+        tables.add(last.strip('"`[]').lower())
+    return frozenset(tables)
+
+
+class _QueryCache:
+    """LRU cache of query results with TTL expiry and table-based invalidation.
+
+    Every entry records the tables it was read from. Writing to a table bumps
+    that table's version and evicts its entries; a result is only stored if
+    none of its tables changed while the query was running, so a slow read
+    can't repopulate the cache with data that a concurrent write replaced.
+    """
+
+    def __init__(self, max_entries: int = 1024, ttl_seconds: float = 30.0) -> None:
+        """Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached results.
+            ttl_seconds: Maximum age of a cached result in seconds.
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+
+        self._entries: (
+            "OrderedDict[Tuple[Any, ...], Tuple[float, Any, FrozenSet[str]]]"
+        ) = OrderedDict()
+        self._table_keys: Dict[str, Set[Tuple[Any, ...]]] = {}
+        self._table_versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def versions(self, tables: FrozenSet[str]) -> Tuple[int, ...]:
+        """Get the current versions of a set of tables, in sorted order."""
+        with self._lock:
+            return tuple(self._table_versions.get(t, 0) for t in sorted(tables))
+
+    def get(self, key: Tuple[Any, ...]) -> Tuple[bool, Any]:
+        """Look up a cached result.
+
+        Returns:
+            Tuple[bool, Any]: Whether the key was found, and the cached value.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            stored_at, value, _ = entry
+            if time.monotonic() - stored_at > self.ttl_seconds:
+                self._remove(key)
+                self.misses += 1
+                return False, None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def put(
+        self,
+        key: Tuple[Any, ...],
+        value: Any,
+        tables: FrozenSet[str],
+        versions: Tuple[int, ...],
+    ) -> bool:
+        """Store a result unless one of its tables was written meanwhile.
+
+        Args:
+            key: The cache key.
+            value: The result to cache.
+            tables: The tables the result was read from.
+            versions: The table versions captured before the query ran.
+
+        Returns:
+            bool: True if the result was stored.
+        """
+        with self._lock:
+            current = tuple(self._table_versions.get(t, 0) for t in sorted(tables))
+            if current != versions:
+                return False
+
+            if key in self._entries:
+                self._remove(key)
+
+            self._entries[key] = (time.monotonic(), value, tables)
+            for table in tables:
+                self._table_keys.setdefault(table, set()).add(key)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+            return True
+
+    def invalidate(self, tables: Iterable[str]) -> int:
+        """Evict all results that depend on any of the given tables.
+
+        Returns:
+            int: The number of entries evicted.
+        """
+        evicted = 0
+        with self._lock:
+            for table in tables:
+                table = table.lower()
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+                for key in list(self._table_keys.pop(table, ())):
+                    if key in self._entries:
+                        self._remove(key)
+                        evicted += 1
+
+            self.invalidations += evicted
+        return evicted
+
+    def clear(self) -> None:
+        """Evict every entry."""
+        with self._lock:
+            for table in self._table_keys:
+                self._table_versions[table] = self._table_versions.get(table, 0) + 1
+            self._entries.clear()
+            self._table_keys.clear()
+
+    def _remove(self, key: Tuple[Any, ...]) -> None:
+        """Remove an entry and its table index references. Caller holds the lock."""
+        _, _, tables = self._entries.pop(key)
+        for table in tables:
+            keys = self._table_keys.get(table)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._table_keys[table]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": True,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+# Rewrites applied in order to reduce a SQL statement to its fingerprint
+_NORMALIZE_PATTERNS = [
+    (re.compile(r"'(?:[^']|'')*'"), "?"),  # String literals
+    (re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+"), "?"),  # Bind parameters
+    (re.compile(r"\b\d+(?:\.\d+)?\b"), "?"),  # Numeric literals
+    (re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)"), "(?+)"),  # IN lists and VALUES rows
+    (re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+"), "(?+), ..."),  # Multi-row VALUES
+    (re.compile(r"\s+"), " "),
+]
+
+# Dialects whose EXPLAIN returns the plan as rows
+_EXPLAIN_PREFIXES = {
+    "sqlite": "EXPLAIN QUERY PLAN ",
+    "postgresql": "EXPLAIN ",
+    "mysql": "EXPLAIN ",
+    "mariadb": "EXPLAIN ",
+}
+
+# Prometheus metrics shared by every DatabaseManager in the process
+_prometheus_metrics: Optional[Dict[str, Any]] = None
+_prometheus_metrics_lock = threading.Lock()
+
+# Frames under this directory are skipped when capturing checkout stacks
+_SQLALCHEMY_DIR = os.path.dirname(sqlalchemy.__file__) + os.sep
+
+
+@functools.lru_cache(maxsize=4096)
+def _fingerprint_statement(statement: str) -> Tuple[str, str]:
+    """Normalize a SQL statement so queries differing only in values group together.
+
+    Args:
+        statement: The SQL statement as sent to the database.
+
+    Returns:
+        Tuple[str, str]: A short fingerprint id and the normalized statement.
+    """
+    normalized = statement.strip()
+    for pattern, replacement in _NORMALIZE_PATTERNS:
+        normalized = pattern.sub(replacement, normalized)
+
+    fingerprint = hashlib.sha1(normalized.encode("utf-8")).hexdigest()[:16]
+    return fingerprint, normalized
+
+
+def _percentile(sorted_samples: List[float], percent: float) -> float:
+    """Get the nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return 0.0
+    index = max(0, int(round(percent / 100 * len(sorted_samples) + 0.5)) - 1)
+    return sorted_samples[min(index, len(sorted_samples) - 1)]
+
+
+class _StatementStats:
+    """Running statistics for one statement fingerprint.
+
+    Latency percentiles are computed from a bounded window of the most recent
+    samples, so they follow the current workload rather than all history.
+    """
+
+    def __init__(self, fingerprint: str, statement: str, sample_size: int) -> None:
+        self.fingerprint = fingerprint
+        self.statement = statement
+        self.count = 0
+        self.errors = 0
+        self.slow = 0
+        self.rows = 0
+        self.total_time = 0.0
+        self.max_time = 0.0
+        self.samples: Deque[float] = deque(maxlen=sample_size)
+        self.plan: Optional[List[str]] = None
+
+    def record(self, duration: float, rows: int) -> None:
+        """Record one execution. Caller holds the metrics lock."""
+        self.count += 1
+        self.rows += rows
+        self.total_time += duration
+        if duration > self.max_time:
+            self.max_time = duration
+        self.samples.append(duration)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics to a dictionary. Caller holds the metrics lock."""
+        samples = sorted(self.samples)
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement[:1000],
+            "count": self.count,
+            "errors": self.errors,
+            "slow": self.slow,
+            "rows": self.rows,
+            "total_time_ms": round(self.total_time * 1000, 2),
+            "mean_time_ms": (
+                round(self.total_time / self.count * 1000, 2) if self.count else 0.0
+            ),
+            "p50_ms": round(_percentile(samples, 50) * 1000, 2),
+            "p95_ms": round(_percentile(samples, 95) * 1000, 2),
+            "p99_ms": round(_percentile(samples, 99) * 1000, 2),
+            "max_time_ms": round(self.max_time * 1000, 2),
+            "plan": self.plan,
+        }
+
+
+class _TextClauseCache:
+    """Bounded LRU of text() constructs keyed by their SQL string.
+
+    Building a text() parses its bind parameters with a regular expression;
+    reusing the construct also gives SQLAlchemy's compiled cache a stable
+    object to key on, so a repeated raw statement is only compiled once.
+    """
+
+    def __init__(self, max_entries: int = 512) -> None:
+        self.max_entries = max(1, max_entries)
+        self._entries: "OrderedDict[str, TextClause]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, sql: str) -> TextClause:
+        """Get the text() construct for a SQL string, creating it if needed."""
+        with self._lock:
+            clause = self._entries.get(sql)
+            if clause is not None:
+                self._entries.move_to_end(sql)
+                self.hits += 1
+                return clause
+
+            self.misses += 1
+
+        clause = sqlalchemy.text(sql)
+        with self._lock:
+            self._entries[sql] = clause
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return clause
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+            }
+
+
+@dataclass
+class _Checkout:
+    """A connection that is checked out of a pool."""
+
+    started: float  # time.monotonic() at checkout
+    thread: str
+    stack: Optional[traceback.StackSummary]  # Where it was checked out, if captured
+    reported: bool = False  # Whether it has been reported as long-held
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        """Convert the checkout to a dictionary."""
+        return {
+            "held_seconds": round(now - self.started, 3),
+            "thread": self.thread,
+            "stack": self.stack.format() if self.stack is not None else None,
+        }
+
+
+def _capture_stack(depth: int) -> traceback.StackSummary:
+    """Capture the caller's stack, leaving out SQLAlchemy's own frames.
+
+    Source lines are looked up only when the stack is formatted, which keeps
+    the capture cheap enough to do on every checkout.
+    """
+    frames = []
+    for frame, lineno in traceback.walk_stack(sys._getframe(1)):
+        if frame.f_code.co_filename.startswith(_SQLALCHEMY_DIR):
+            continue
+        frames.append((frame, lineno))
+        if len(frames) >= depth:
+            break
+    frames.reverse()
+    return traceback.StackSummary.extract(iter(frames), lookup_lines=False)
+
+
+def _histogram(buckets: Sequence[float], counts: Sequence[int]) -> Dict[str, int]:
+    """Label histogram counts by their upper bound, the last being +Inf."""
+    labels = [str(b) for b in buckets] + ["+Inf"]
+    return dict(zip(labels, counts))
+
+
+class _CheckoutStats:
+    """How long callers waited for pool connections and how long they held them."""
+
+    # Waits longer than this mean the pool was exhausted and the caller queued
+    CONTENDED_SECONDS = 0.01
+
+    # Upper bounds of the wait and held time histograms, in milliseconds
+    WAIT_BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+    HELD_BUCKETS_MS = (1, 10, 100, 1000, 10000, 60000)
+
+    def __init__(self) -> None:
+        self.checkouts = 0
+        self.contended = 0
+        self.timeouts = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.wait_buckets = [0] * (len(self.WAIT_BUCKETS_MS) + 1)
+        self.checkins = 0
+        self.total_held = 0.0
+        self.max_held = 0.0
+        self.held_buckets = [0] * (len(self.HELD_BUCKETS_MS) + 1)
+        self.long_held_total = 0
+
+        # Connections checked out now, by id() of their pool connection record
+        self.checked_out: Dict[int, _Checkout] = {}
+        self.leak_threshold: Optional[float] = None  # Seconds
+
+        self.observer: Optional[Callable[[float], None]] = None
+        self.held_observer: Optional[Callable[[float], None]] = None
+        # Called with (wait, timed_out) when a caller had to queue
+        self.on_contended: Optional[Callable[[float, bool], None]] = None
+        self._lock = threading.Lock()
+
+    def record(self, wait: float, timed_out: bool = False) -> None:
+        """Record one checkout attempt."""
+        contended = timed_out or wait >= self.CONTENDED_SECONDS
+        with self._lock:
+            self.checkouts += 1
+            self.total_wait += wait
+            if wait > self.max_wait:
+                self.max_wait = wait
+            self.wait_buckets[
+                bisect.bisect_left(self.WAIT_BUCKETS_MS, wait * 1000)
+            ] += 1
+            if contended:
+                self.contended += 1
+            if timed_out:
+                self.timeouts += 1
+
+        if self.observer is not None:
+            self.observer(wait)
+        if contended and self.on_contended is not None:
+            self.on_contended(wait, timed_out)
+
+    def checkout(self, record_id: int, stack: Optional[traceback.StackSummary]) -> None:
+        """Start timing a connection handed out by the pool."""
+        entry = _Checkout(time.monotonic(), threading.current_thread().name, stack)
+        with self._lock:
+            self.checked_out[record_id] = entry
+
+    def checkin(self, record_id: int) -> None:
+        """Stop timing a connection returned to (or detached from) the pool."""
+        with self._lock:
+            entry = self.checked_out.pop(record_id, None)
+            if entry is None:
+                return
+            held = time.monotonic() - entry.started
+            self.checkins += 1
+            self.total_held += held
+            if held > self.max_held:
+                self.max_held = held
+            self.held_buckets[
+                bisect.bisect_left(self.HELD_BUCKETS_MS, held * 1000)
+            ] += 1
+
+        if self.held_observer is not None:
+            self.held_observer(held)
+
+    def find_long_held(
+        self, threshold: float
+    ) -> Tuple[List[_Checkout], List[_Checkout]]:
+        """Find connections held for at least threshold seconds.
+
+        Returns:
+            Tuple[List[_Checkout], List[_Checkout]]: All long-held connections,
+                and those among them not reported before, which are now marked
+                as reported.
+        """
+        now = time.monotonic()
+        with self._lock:
+            long_held = [
+                e for e in self.checked_out.values() if now - e.started >= threshold
+            ]
+            new = [e for e in long_held if not e.reported]
+            for entry in new:
+                entry.reported = True
+            self.long_held_total += len(new)
+        return long_held, new
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the statistics to a dictionary."""
+        now = time.monotonic()
+        with self._lock:
+            long_held = (
+                [
+                    e
+                    for e in self.checked_out.values()
+                    if now - e.started >= self.leak_threshold
+                ]
+                if self.leak_threshold is not None
+                else []
+            )
+            stats = {
+                "checkouts": self.checkouts,
+                "contended": self.contended,
+                "timeouts": self.timeouts,
+                "avg_wait_ms": (
+                    round(self.total_wait / self.checkouts * 1000, 3)
+                    if self.checkouts
+                    else 0.0
+                ),
+                "max_wait_ms": round(self.max_wait * 1000, 3),
+                "wait_histogram_ms": _histogram(
+                    self.WAIT_BUCKETS_MS, self.wait_buckets
+                ),
+                "held": {
+                    "checked_out": len(self.checked_out),
+                    "checkins": self.checkins,
+                    "avg_ms": (
+                        round(self.total_held / self.checkins * 1000, 3)
+                        if self.checkins
+                        else 0.0
+                    ),
+                    "max_ms": round(self.max_held * 1000, 3),
+                    "histogram_ms": _histogram(self.HELD_BUCKETS_MS, self.held_buckets),
+                    "long_held_total": self.long_held_total,
+                },
+            }
+
+        # Stacks are formatted outside the lock; that reads source files
+        stats["held"]["long_held"] = [e.to_dict(now) for e in long_held]
+        return stats
+
+
+# Set while a pool checkout is timed; context variables are per greenlet,
+# so this also holds for async engines
+_IN_CHECKOUT: contextvars.ContextVar[bool] = contextvars.ContextVar(
+    "qorzen_in_checkout", default=False
+)
+
+
+class _CheckoutTimingMixin:
+    """Pool mixin that times how long each checkout waited for the pool.
+
+    Time spent opening a new connection is left out, so a slow server isn't
+    mistaken for an exhausted pool.
+    """
+
+    checkout_stats: _CheckoutStats
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.checkout_stats = _CheckoutStats()
+
+    def _do_get(self) -> Any:
+        # QueuePool retries by calling _do_get() again; the outer call records
+        if _IN_CHECKOUT.get():
+            return super()._do_get()
+
+        token = _IN_CHECKOUT.set(True)
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.checkout_stats.record(time.perf_counter() - start, timed_out=True)
+            raise
+        finally:
+            _IN_CHECKOUT.reset(token)
+
+        connect_time = record.__dict__.pop("_qorzen_connect_time", 0.0)
+        self.checkout_stats.record(time.perf_counter() - start - connect_time)
+        return record
+
+    def _create_connection(self) -> Any:
+        start = time.perf_counter()
+        record = super()._create_connection()
+        record._qorzen_connect_time = time.perf_counter() - start
+        return record
+
+    def recreate(self) -> Any:
+        # Keep the statistics when the engine is disposed and the pool rebuilt
+        pool = super().recreate()
+        pool.checkout_stats = self.checkout_stats
+        return pool
+
+
+class _TimedQueuePool(_CheckoutTimingMixin, QueuePool):
+    """QueuePool that records checkout wait times."""
+
+
+class _TimedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records checkout wait times."""
+
+
+class _JoinedConnection:
+    """A DBAPI connection lent to a nested checkout on the owning thread.
+
+    Its commits and rollbacks are left to the outer checkout, whose
+    transaction the nested one joins.
+    """
+
+    def __init__(self, dbapi_connection: Any) -> None:
+        self._dbapi_connection = dbapi_connection
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+    def close(self) -> None:
+        pass
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._dbapi_connection, name)
+
+
+class _SerializedStaticPool(StaticPool):
+    """StaticPool that lends its one connection to one thread at a time.
+
+    Other threads wait for the connection instead of interleaving their
+    transactions on it. A nested checkout on the owning thread joins the
+    outer checkout's transaction through a second record, so each checkin
+    is counted and the last one frees the connection.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._owner_condition = threading.Condition()
+        self._owner: Optional[int] = None
+        self._checkouts = 0  # Held by the owner, nested ones included
+
+    def _do_get(self) -> Any:
+        thread_id = threading.get_ident()
+        with self._owner_condition:
+            while self._owner not in (None, thread_id):
+                self._owner_condition.wait()
+            self._owner = thread_id
+            self._checkouts += 1
+            nested = self._checkouts > 1
+
+        try:
+            record = super()._do_get()
+            if not nested:
+                return record
+            # The shared record is already checked out, and checking it out
+            # again would lose the outer checkin
+            shared = _ConnectionRecord(self, connect=False)
+            shared.dbapi_connection = _JoinedConnection(record.dbapi_connection)
+            shared.starttime = record.starttime
+            return shared
+        except BaseException:
+            self._release_owner()
+            raise
+
+    def _do_return_conn(self, record: Any) -> None:
+        super()._do_return_conn(record)
+        self._release_owner()
+
+    def _release_owner(self) -> None:
+        with self._owner_condition:
+            self._checkouts -= 1
+            if self._checkouts == 0:
+                self._owner = None
+                self._owner_condition.notify()
+
+
+class _Replica:
+    """A read replica engine with its health and replication lag."""
+
+    def __init__(self, name: str, engine: Engine) -> None:
+        self.name = name
+        self.engine = engine
+        self.healthy = True
+        self.lag: Optional[float] = None  # Seconds behind the primary
+        self.last_checked = 0.0  # time.monotonic() of the last lag check
+        self.error: Optional[str] = None
+        self.reads = 0
+        self.check_lock = threading.Lock()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the replica state to a dictionary."""
+        return {
+            "name": self.name,
+            "healthy": self.healthy,
+            "lag_seconds": self.lag,
+            "error": self.error,
+            "reads": self.reads,
+            "pool": _pool_status(self.engine.pool),
+        }
+
+
+def _pool_sizes(pool: Pool) -> Dict[str, Any]:
+    """Get a pool's sizing; pools without sizing, like StaticPool, omit it."""
+    sizes: Dict[str, Any] = {}
+    for name in ("size", "checkedin", "checkedout", "overflow"):
+        method = getattr(pool, name, None)
+        if callable(method):
+            sizes[name] = method()
+    return sizes
+
+
+def _pool_status(pool: Pool) -> Dict[str, Any]:
+    """Describe a connection pool, its checkout waits and held connections."""
+    stats = getattr(pool, "checkout_stats", None)
+    status: Dict[str, Any] = {"class": type(pool).__name__, **_pool_sizes(pool)}
+    status["checkout_wait"] = stats.to_dict() if stats is not None else None
+    return status
+
+
+# Tuned defaults for the SQLite profile (database.sqlite)
+_SQLITE_PRAGMA_DEFAULTS: Dict[str, Any] = {
+    "journal_mode": "wal",  # Readers don't block the writer and vice versa
+    "synchronous": "normal",  # Durable at checkpoints; safe with WAL
+    "cache_size": -65536,  # Negative values are KiB: 64 MiB page cache
+    "mmap_size": 268435456,  # Map up to 256 MiB of the file
+    "busy_timeout": 5000,  # Milliseconds to wait for a lock before failing
+    "temp_store": "memory",
+}
+
+_PRAGMA_VALUE_PATTERN = re.compile(r"^-?\w+$")
+
+
+class _SQLiteWriter:
+    """Dedicated thread that applies queued writes with group commit.
+
+    Writes queued within group_commit_ms of each other, up to max_batch, are
+    applied in a single transaction, so the cost of the commit (and fsync) is
+    shared. Each write runs in its own SAVEPOINT, so one failing write doesn't
+    roll back the others; futures are resolved only once the commit is done.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        logger: Any,
+        max_batch: int = 64,
+        group_commit_ms: float = 2.0,
+    ) -> None:
+        self._session_factory = session_factory
+        self._logger = logger
+        self._max_batch = max(1, max_batch)
+        self._window = max(0.0, group_commit_ms) / 1000.0
+        self._queue: (
+            "queue.Queue[Optional[Tuple[Callable[[Session], Any], Future]]]"
+        ) = queue.Queue()
+        self._thread = threading.Thread(
+            target=self._run, name="qorzen-sqlite-writer", daemon=True
+        )
+        self._stopped = False
+
+        self.writes = 0
+        self.failed = 0
+        self.batches = 0
+        self.largest_batch = 0
+
+    def start(self) -> None:
+        """Start the writer thread."""
+        self._thread.start()
+
+    def stop(self, timeout: Optional[float] = 10.0) -> None:
+        """Apply the writes already queued, then stop the writer thread."""
+        self._stopped = True
+        self._queue.put(None)
+        self._thread.join(timeout)
+
+    def submit(self, func: Callable[[Session], T]) -> "Future[T]":
+        """Queue a write.
+
+        Args:
+            func: Performs the write with the given session. It must not wait
+                on other queued writes, which would deadlock the writer.
+
+        Returns:
+            Future[T]: Resolves to the return value of func once committed.
+
+        Raises:
+            DatabaseError: If the writer has been stopped.
+        """
+        if self._stopped:
+            raise DatabaseError("SQLite writer is stopped")
+
+        future: "Future[T]" = Future()
+        self._queue.put((func, future))
+        return future
+
+    @property
+    def thread(self) -> threading.Thread:
+        """The writer thread."""
+        return self._thread
+
+    def _run(self) -> None:
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            if item is None:
+                break
+
+            batch = [item]
+            deadline = time.monotonic() + self._window
+            while len(batch) < self._max_batch:
+                try:
+                    remaining = deadline - time.monotonic()
+                    if remaining > 0:
+                        item = self._queue.get(timeout=remaining)
+                    else:
+                        item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+
+            self._apply(batch)
+
+    def _apply(self, batch: List[Tuple[Callable[[Session], Any], Future]]) -> None:
+        outcomes: List[Tuple[Future, Any, Optional[BaseException]]] = []
+
+        try:
+            with self._session_factory() as session, session.begin():
+                for func, future in batch:
+                    if not future.set_running_or_notify_cancel():
+                        continue
+                    try:
+                        with session.begin_nested():
+                            result = func(session)
+                        outcomes.append((future, result, None))
+                    except Exception as e:
+                        outcomes.append((future, None, e))
+
+        except Exception as e:
+            self._logger.error(f"SQLite group commit failed: {str(e)}")
+            error = DatabaseError(f"Group commit failed: {str(e)}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(error)
+            self.failed += len(batch)
+            return
+
+        self.batches += 1
+        self.largest_batch = max(self.largest_batch, len(batch))
+        for future, result, error in outcomes:
+            if error is not None:
+                self.failed += 1
+                future.set_exception(error)
+            else:
+                self.writes += 1
+                future.set_result(result)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get writer statistics."""
+        return {
+            "running": self._thread.is_alive(),
+            "queued": self._queue.qsize(),
+            "writes": self.writes,
+            "failed": self.failed,
+            "batches": self.batches,
+            "largest_batch": self.largest_batch,
+            "avg_batch": round(self.writes / self.batches, 2) if self.batches else 0.0,
+        }
+
+
 class DatabaseManager(QorzenManager):
     """Manages database connections and operations.
 
@@ -59,27 +1012,43 @@ class DatabaseManager(QorzenManager):
     interface for other components to use.
     """
 
-    def __init__(self, config_manager: Any, logger_manager: Any) -> None:
+    def __init__(
+        self,
+        config_manager: Any,
+        logger_manager: Any,
+        event_bus_manager: Optional[Any] = None,
+    ) -> None:
         """Initialize the Database Manager.
 
         Args:
             config_manager: The Configuration Manager to use for database settings.
             logger_manager: The Logging Manager to use for logging.
+            event_bus_manager: The Event Bus Manager to publish pool events to,
+                or None to only log them.
         """
         super().__init__(name="DatabaseManager")
         self._config_manager = config_manager
         self._logger = logger_manager.get_logger("database_manager")
+        self._event_bus = event_bus_manager
 
         # Database engine and session factories
         self._engine: Optional[Engine] = None
         self._async_engine: Optional[AsyncEngine] = None
         self._session_factory: Optional[sessionmaker] = None
-        self._async_session_factory: Optional[sessionmaker] = None
+        self._async_session_factory: Optional[async_sessionmaker[AsyncSession]] = None
 
         # Track active sessions
         self._active_sessions: Set[Session] = set()
+        self._active_async_sessions: Set[AsyncSession] = set()
         self._active_sessions_lock = threading.RLock()
 
+        # Per thread: the sessions open in session(), innermost last, and how
+        # many SQLite writer connections are checked out
+        self._thread_state = threading.local()
+
+        # The event loop that owns the async engine's connections, if bound
+        self._event_loop: Optional[asyncio.AbstractEventLoop] = None
+
         # Database connection info
         self._db_type: str = "postgresql"  # sqlite, postgresql, mysql, etc.
         self._db_url: Optional[str] = None
@@ -88,13 +1057,63 @@ class DatabaseManager(QorzenManager):
         self._max_overflow: int = 10
         self._pool_recycle: int = 3600  # Recycle connections after 1 hour
         self._echo: bool = False  # Log SQL statements
+        self._pool_pre_ping: bool = True  # Test connections before use
+
+        # Statement caching (database.statement_cache)
+        self._text_cache = _TextClauseCache()
+        self._compiled_cache_size: int = 500  # SQLAlchemy compiled cache entries
+        self._prepare_threshold: Optional[int] = 5  # psycopg server-side prepare
+        self._prepared_statement_cache_size: int = 100  # asyncpg, per connection
+
+        # SQLite profile (database.sqlite): single-connection writer engine,
+        # group commit writer thread and the pragmas applied to connections
+        self._writer_engine: Optional[Engine] = None
+        self._sqlite_writer: Optional[_SQLiteWriter] = None
+        self._sqlite_pragmas: Dict[str, Any] = {}
+
+        # Read replicas (database.replicas)
+        self._replicas: List[_Replica] = []
+        self._replica_max_lag: float = 10.0  # Seconds
+        self._replica_check_interval: float = 30.0  # Seconds
+        self._replica_counter = itertools.count()
+        self._primary_reads: int = 0
+        self._replica_fallbacks: int = 0
+
+        # Optional query result cache (database.query_cache)
+        self._query_cache: Optional[_QueryCache] = None
+
+        # Pool monitoring (database.pool_monitor): engines by pool name,
+        # long-held connection detection and pool exhaustion events
+        self._monitored_engines: Dict[str, Engine] = {}
+        self._leak_threshold: float = 30.0  # Seconds
+        self._checkout_stack_depth: int = 12  # 0 disables stack capture
+        self._leak_check_interval: float = 10.0  # Seconds
+        self._exhaustion_event_interval: float = 10.0  # Seconds, per pool
+        self._exhaustion_last_event: Dict[str, float] = {}
+        self._exhaustion_suppressed: Dict[str, int] = {}
+        self._pool_events_lock = threading.Lock()
+        self._leak_monitor_thread: Optional[threading.Thread] = None
+        self._leak_monitor_stop = threading.Event()
+
+        # Tables reflected by name for bulk operations
+        self._reflected_tables: Dict[str, Table] = {}
+        self._reflected_tables_lock = threading.Lock()
 
         # Metrics
         self._queries_total: int = 0
         self._queries_failed: int = 0
-        self._query_times: List[float] = []  # Track the last 100 query times
+        self._query_times: Deque[float] = deque(maxlen=100)  # Last 100 query times
         self._metrics_lock = threading.RLock()
 
+        # Per-statement statistics and slow query log (database.query_stats)
+        self._statement_stats: Dict[str, _StatementStats] = {}
+        self._slow_queries: Deque[Dict[str, Any]] = deque(maxlen=100)
+        self._slow_query_threshold: float = 1.0  # Seconds
+        self._explain_slow_queries: bool = False
+        self._max_statements: int = 500
+        self._stats_sample_size: int = 1000
+        self._prometheus: Optional[Dict[str, Any]] = None
+
     def initialize(self) -> None:
         """Initialize the Database Manager.
 
@@ -111,49 +1130,62 @@ class DatabaseManager(QorzenManager):
             host = db_config.get("host", "localhost")
             port = db_config.get("port", self._get_default_port(self._db_type))
             name = db_config.get("name", "qorzen")
-            user = db_config.get("user", "")
-            password = db_config.get("password", "")
 
             self._pool_size = db_config.get("pool_size", 5)
             self._max_overflow = db_config.get("max_overflow", 10)
             self._pool_recycle = db_config.get("pool_recycle", 3600)
             self._echo = db_config.get("echo", False)
 
-            # Construct database URL
-            if self._db_type == "sqlite":
-                # For SQLite, the name is the file path
-                self._db_url = f"sqlite:///{name}"
-                self._db_async_url = f"sqlite+aiosqlite:///{name}"
-            else:
-                # For other databases, construct a URL
-                self._db_url = URL.create(
-                    self._db_type,
-                    username=user,
-                    password=password,
-                    host=host,
-                    port=port,
-                    database=name,
+            stats_config = db_config.get("query_stats", {})
+            self._slow_query_threshold = (
+                stats_config.get("slow_query_ms", 1000) / 1000.0
+            )
+            self._explain_slow_queries = stats_config.get("explain_slow_queries", False)
+            self._max_statements = stats_config.get("max_statements", 500)
+            self._stats_sample_size = stats_config.get("sample_size", 1000)
+            self._slow_queries = deque(
+                maxlen=stats_config.get("slow_query_log_size", 100)
+            )
+            if stats_config.get("prometheus", True):
+                self._prometheus = self._get_prometheus_metrics()
+
+            cache_config = db_config.get("query_cache", {})
+            if cache_config.get("enabled", False):
+                self._query_cache = _QueryCache(
+                    max_entries=cache_config.get("max_entries", 1024),
+                    ttl_seconds=cache_config.get("ttl_seconds", 30.0),
                 )
 
-                # Construct async URL (not all dialects support async)
-                if self._db_type == "postgresql":
-                    self._db_async_url = URL.create(
-                        "postgresql+asyncpg",
-                        username=user,
-                        password=password,
-                        host=host,
-                        port=port,
-                        database=name,
-                    )
+            self._pool_pre_ping = db_config.get("pool_pre_ping", True)
 
-            # Create database engines
-            self._engine = create_engine(
-                self._db_url,
-                pool_size=self._pool_size,
-                max_overflow=self._max_overflow,
-                pool_recycle=self._pool_recycle,
-                echo=self._echo,
+            statement_config = db_config.get("statement_cache", {})
+            self._text_cache = _TextClauseCache(statement_config.get("size", 512))
+            self._compiled_cache_size = statement_config.get("compiled_size", 500)
+            self._prepare_threshold = statement_config.get("prepare_threshold", 5)
+            self._prepared_statement_cache_size = statement_config.get(
+                "prepared_statement_cache_size", 100
             )
+            self._replica_max_lag = db_config.get("replica_max_lag_seconds", 10.0)
+            self._replica_check_interval = db_config.get("replica_check_interval", 30.0)
+
+            monitor_config = db_config.get("pool_monitor", {})
+            self._leak_threshold = monitor_config.get("leak_threshold_seconds", 30.0)
+            self._checkout_stack_depth = (
+                monitor_config.get("stack_depth", 12)
+                if monitor_config.get("capture_stacks", True)
+                else 0
+            )
+            self._leak_check_interval = monitor_config.get("check_interval", 10.0)
+            self._exhaustion_event_interval = monitor_config.get(
+                "exhaustion_event_interval", 10.0
+            )
+
+            # Create database engines
+            self._db_url, self._db_async_url = self._build_urls(db_config)
+            if self._db_type == "sqlite":
+                self._create_sqlite_engines(name, db_config.get("sqlite", {}))
+            else:
+                self._engine = self._create_engine(self._db_url, name)
 
             if self._db_async_url:
                 self._async_engine = create_async_engine(
@@ -162,225 +1194,1913 @@ class DatabaseManager(QorzenManager):
                     pool_size=self._pool_size,
                     max_overflow=self._max_overflow,
                     pool_recycle=self._pool_recycle,
+                    pool_pre_ping=self._pool_pre_ping,
+                    query_cache_size=self._compiled_cache_size,
+                    **self._pool_class_kwargs(name, _TimedAsyncQueuePool),
                 )
+                if self._db_type == "sqlite":
+                    self._configure_sqlite_engine(self._async_engine.sync_engine, None)
+
+            # Replicas inherit any connection setting they don't override
+            for index, replica_config in enumerate(db_config.get("replicas") or []):
+                merged = {**db_config, **replica_config}
+                replica_url, _ = self._build_urls(merged)
+                replica = _Replica(
+                    replica_config.get("label", f"replica-{index}"),
+                    self._create_engine(replica_url, merged.get("name", "qorzen")),
+                )
+                self._replicas.append(replica)
 
-            # Create session factories
+            # Create session factories; sessions write, so they use the
+            # dedicated writer engine when there is one
             self._session_factory = sessionmaker(
-                bind=self._engine,
+                bind=self._writer_engine or self._engine,
                 expire_on_commit=False,
             )
 
             if self._async_engine:
-                self._async_session_factory = sessionmaker(
-                    bind=self._async_engine,
-                    expire_on_commit=False,
-                    class_=AsyncSession,
+                self._async_session_factory = async_sessionmaker(
+                    self._async_engine, expire_on_commit=False
+                )
+
+            engines = [self._engine]
+            if self._writer_engine:
+                engines.append(self._writer_engine)
+            if self._async_engine:
+                engines.append(self._async_engine.sync_engine)
+
+            # Set up event listeners for metrics
+            for engine in engines + [r.engine for r in self._replicas]:
+                event.listen(
+                    engine, "before_cursor_execute", self._before_cursor_execute
+                )
+                event.listen(engine, "after_cursor_execute", self._after_cursor_execute)
+                event.listen(engine, "handle_error", self._handle_error)
+
+            self._monitor_pool("primary", self._engine)
+            if self._writer_engine:
+                self._monitor_pool("primary-writer", self._writer_engine)
+            if self._async_engine:
+                self._monitor_pool("primary-async", self._async_engine.sync_engine)
+            for replica in self._replicas:
+                self._monitor_pool(replica.name, replica.engine)
+
+            # Invalidate cached results on writes from either engine
+            if self._query_cache is not None:
+                for engine in engines:
+                    event.listen(engine, "after_cursor_execute", self._track_writes)
+                    event.listen(engine, "commit", self._on_commit)
+                    event.listen(engine, "rollback", self._on_rollback)
+
+            # Test database connection
+            with self._engine.connect() as connection:
+                # Execute a simple query to test the connection
+                connection.execute(sqlalchemy.text("SELECT 1"))
+
+            if self._db_type == "sqlite" and self._writer_engine is not None:
+                writer_config = db_config.get("sqlite", {}).get("writer", {})
+                if writer_config.get("enabled", True):
+                    self._sqlite_writer = _SQLiteWriter(
+                        self._session_factory,
+                        self._logger,
+                        max_batch=writer_config.get("max_batch", 64),
+                        group_commit_ms=writer_config.get("group_commit_ms", 2.0),
+                    )
+                    self._sqlite_writer.start()
+
+            if self._monitored_engines and self._leak_check_interval > 0:
+                self._leak_monitor_stop.clear()
+                self._leak_monitor_thread = threading.Thread(
+                    target=self._leak_monitor_worker,
+                    name="qorzen-db-leak-monitor",
+                    daemon=True,
                 )
+                self._leak_monitor_thread.start()
+
+            # Register for config changes
+            self._config_manager.register_listener("database", self._on_config_changed)
+
+            self._logger.info(
+                f"Database Manager initialized with {self._db_type} database",
+                extra={
+                    "host": host,
+                    "port": port,
+                    "database": name,
+                    "replicas": len(self._replicas),
+                },
+            )
+
+            self._initialized = True
+            self._healthy = True
+
+        except Exception as e:
+            self._logger.error(f"Failed to initialize Database Manager: {str(e)}")
+            raise ManagerInitializationError(
+                f"Failed to initialize DatabaseManager: {str(e)}",
+                manager_name=self.name,
+            ) from e
+
+    def _build_urls(
+        self, db_config: Dict[str, Any]
+    ) -> Tuple[Union[str, URL], Optional[Union[str, URL]]]:
+        """Build the sync and async database URLs for a connection config.
+
+        Args:
+            db_config: The connection settings (host, port, name, user, password).
+
+        Returns:
+            Tuple[Union[str, URL], Optional[Union[str, URL]]]: The sync URL and
+                the async URL, or None if the dialect has no async driver.
+        """
+        host = db_config.get("host", "localhost")
+        port = db_config.get("port", self._get_default_port(self._db_type))
+        name = db_config.get("name", "qorzen")
+        user = db_config.get("user", "")
+        password = db_config.get("password", "")
+
+        if self._db_type == "sqlite":
+            # For SQLite, the name is the file path. An in-memory database is
+            # private to its connection, so a separate async engine can't see it.
+            if name == ":memory:":
+                return "sqlite://", None
+            return f"sqlite:///{name}", f"sqlite+aiosqlite:///{name}"
+
+        # For other databases, construct a URL; "driver" picks a DBAPI other
+        # than the dialect default, e.g. "psycopg" for psycopg 3
+        driver = db_config.get("driver")
+        url = URL.create(
+            f"{self._db_type}+{driver}" if driver else self._db_type,
+            username=user,
+            password=password,
+            host=host,
+            port=port,
+            database=name,
+        )
+
+        # Construct async URL (not all dialects support async)
+        async_url = None
+        if self._db_type == "postgresql":
+            # asyncpg prepares statements server-side and caches them per
+            # connection, keyed by SQL
+            async_url = url.set(
+                drivername="postgresql+asyncpg",
+                query={
+                    "prepared_statement_cache_size": str(
+                        self._prepared_statement_cache_size
+                    )
+                },
+            )
+
+        return url, async_url
+
+    def _create_engine(self, url: Union[str, URL], name: str) -> Engine:
+        """Create a sync engine with the configured pool settings.
+
+        Args:
+            url: The database URL.
+            name: The database name, used to detect in-memory SQLite.
+
+        Returns:
+            Engine: The new engine.
+        """
+        return create_engine(
+            url,
+            pool_size=self._pool_size,
+            max_overflow=self._max_overflow,
+            pool_recycle=self._pool_recycle,
+            pool_pre_ping=self._pool_pre_ping,
+            echo=self._echo,
+            query_cache_size=self._compiled_cache_size,
+            **self._pool_class_kwargs(name, _TimedQueuePool),
+            **self._prepared_statement_kwargs(url),
+        )
+
+    def _prepared_statement_kwargs(self, url: Union[str, URL]) -> Dict[str, Any]:
+        """Get the engine arguments that enable server-side prepared statements.
+
+        psycopg 3 prepares a statement on the server once it has run
+        prepare_threshold times on a connection. Other sync drivers, such as
+        psycopg2, have no prepared statement support and get no arguments.
+        """
+        if not isinstance(url, URL) or self._prepare_threshold is None:
+            return {}
+        if url.get_driver_name() != "psycopg":
+            return {}
+        return {"connect_args": {"prepare_threshold": self._prepare_threshold}}
+
+    def _create_sqlite_engines(self, name: str, sqlite_config: Dict[str, Any]) -> None:
+        """Create the engines for the SQLite profile.
+
+        File databases get a reader pool (self._engine) and a writer engine
+        holding a single connection, so concurrent writers queue for the pool
+        instead of failing with "database is locked". The writer connection
+        opens its transactions with BEGIN IMMEDIATE to take the write lock up
+        front. An in-memory database lives in one connection, which serves
+        both roles and is used by one thread at a time.
+
+        Args:
+            name: The database file path, or ":memory:".
+            sqlite_config: The database.sqlite settings.
+        """
+        pragmas = {**_SQLITE_PRAGMA_DEFAULTS, **sqlite_config.get("pragmas", {})}
+        for key, value in pragmas.items():
+            if not _PRAGMA_VALUE_PATTERN.match(str(value)):
+                raise DatabaseError(f"Invalid value for SQLite pragma {key}: {value}")
+
+        if name == ":memory:":
+            # WAL and memory mapping don't apply to in-memory databases
+            pragmas.pop("journal_mode", None)
+            pragmas.pop("mmap_size", None)
+            self._sqlite_pragmas = pragmas
+            self._engine = create_engine(
+                self._db_url,
+                poolclass=_SerializedStaticPool,
+                connect_args={"check_same_thread": False},
+                echo=self._echo,
+                query_cache_size=self._compiled_cache_size,
+            )
+            self._configure_sqlite_engine(self._engine, "BEGIN")
+            return
+
+        self._sqlite_pragmas = pragmas
+        self._engine = create_engine(
+            self._db_url,
+            poolclass=_TimedQueuePool,
+            pool_size=sqlite_config.get("reader_pool_size", self._pool_size),
+            max_overflow=self._max_overflow,
+            pool_recycle=self._pool_recycle,
+            pool_pre_ping=self._pool_pre_ping,
+            echo=self._echo,
+            query_cache_size=self._compiled_cache_size,
+        )
+        self._configure_sqlite_engine(self._engine, "BEGIN")
+
+        self._writer_engine = create_engine(
+            self._db_url,
+            poolclass=_TimedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=sqlite_config.get("writer_timeout", 30.0),
+            pool_recycle=self._pool_recycle,
+            echo=self._echo,
+            query_cache_size=self._compiled_cache_size,
+        )
+        self._configure_sqlite_engine(self._writer_engine, "BEGIN IMMEDIATE")
+        event.listen(self._writer_engine, "checkout", self._on_writer_checkout)
+        event.listen(self._writer_engine, "checkin", self._on_writer_checkin)
+
+    def _on_writer_checkout(
+        self, dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+    ) -> None:
+        """Count the SQLite writer connections this thread holds."""
+        state = self._thread_state
+        state.writer_checkouts = getattr(state, "writer_checkouts", 0) + 1
+
+    def _on_writer_checkin(self, dbapi_connection: Any, connection_record: Any) -> None:
+        """Count a SQLite writer connection returned by this thread."""
+        state = self._thread_state
+        state.writer_checkouts = max(0, getattr(state, "writer_checkouts", 0) - 1)
+
+    def _held_connection(self, engine: Engine) -> Optional[Connection]:
+        """Get the connection a session open on this thread holds on engine.
+
+        SQLite's write engine has a single connection, so a statement run
+        inside session() shares the session's connection and transaction.
+        Checking out another would wait on the session until writer_timeout,
+        and on an in-memory database would end the session's transaction.
+
+        Args:
+            engine: The engine the statement would otherwise use.
+
+        Returns:
+            Optional[Connection]: The session's connection, or None if no
+            session on this thread is in a transaction on engine.
+
+        Raises:
+            DatabaseError: If this thread holds the writer connection outside
+                a session, where it can't be shared.
+        """
+        if self._db_type != "sqlite":
+            return None
+
+        for session in reversed(getattr(self._thread_state, "sessions", ())):
+            if session.get_bind() is engine and session.in_transaction():
+                return session.connection()
+
+        if engine is self._writer_engine and getattr(
+            self._thread_state, "writer_checkouts", 0
+        ):
+            raise DatabaseError(
+                "This thread already holds the SQLite writer connection; "
+                "write through it or after releasing it"
+            )
+        return None
+
+    def _configure_sqlite_engine(self, engine: Engine, begin: Optional[str]) -> None:
+        """Apply the pragmas and explicit transaction handling to an engine.
+
+        pysqlite's own implicit transactions break SAVEPOINTs and defer the
+        write lock, so the driver is put in autocommit mode and SQLAlchemy
+        emits the BEGIN itself.
+
+        Args:
+            engine: The SQLite engine.
+            begin: The statement that starts a transaction, or None to leave
+                transaction handling to the driver.
+        """
+        pragmas = [
+            f"PRAGMA {key} = {int(value) if isinstance(value, bool) else value}"
+            for key, value in self._sqlite_pragmas.items()
+        ]
+
+        @event.listens_for(engine, "connect")
+        def _on_connect(dbapi_connection: Any, connection_record: Any) -> None:
+            if begin is not None:
+                dbapi_connection.isolation_level = None
+            cursor = dbapi_connection.cursor()
+            try:
+                for pragma in pragmas:
+                    cursor.execute(pragma)
+            finally:
+                cursor.close()
+
+        if begin is not None:
+
+            # Sent on the DBAPI cursor so the hook's own statement isn't
+            # tracked like the caller's statements. A nested checkout of an
+            # in-memory database's connection joins the open transaction.
+            @event.listens_for(engine, "begin")
+            def _on_begin(conn: Connection) -> None:
+                if conn.connection.dbapi_connection.in_transaction:
+                    return
+                cursor = conn.connection.cursor()
+                try:
+                    cursor.execute(begin)
+                finally:
+                    cursor.close()
+
+    def _get_write_engine(self) -> Engine:
+        """Get the engine that writes should use."""
+        return self._writer_engine or self._engine
+
+    def submit_write(self, func: Callable[[Session], T]) -> "Future[T]":
+        """Queue a write to run in a session, with group commit on SQLite.
+
+        On SQLite the write is applied by the dedicated writer thread, batched
+        with other writes queued at about the same time into one transaction;
+        each write still succeeds or fails on its own. On other databases, or
+        when the writer is disabled, the write runs immediately in its own
+        session.
+
+        ```python
+        future = db_manager.submit_write(lambda s: s.add(AuditLog(...)))
+        future.result()  # Wait until committed
+        ```
+
+        Args:
+            func: Performs the write with the given session and returns a
+                value. It must not wait on other queued writes.
+
+        Returns:
+            Future[T]: Resolves to the return value of func once committed.
+
+        Raises:
+            DatabaseError: If the Database Manager is not initialized.
+        """
+        if not self._initialized:
+            raise DatabaseError("Database Manager not initialized")
+
+        if self._sqlite_writer is not None:
+            return self._sqlite_writer.submit(func)
+
+        future: "Future[T]" = Future()
+        try:
+            with self.session() as session:
+                result = func(session)
+        except Exception as e:
+            future.set_exception(e)
+        else:
+            future.set_result(result)
+        return future
+
+    def write(self, func: Callable[[Session], T], timeout: Optional[float] = None) -> T:
+        """Run a write and wait for it to be committed.
+
+        Args:
+            func: Performs the write with the given session.
+            timeout: Maximum seconds to wait for the commit.
+
+        Returns:
+            T: The return value of func.
+
+        Raises:
+            DatabaseError: If called from the SQLite writer thread, which
+                would deadlock.
+        """
+        if (
+            self._sqlite_writer is not None
+            and threading.current_thread() is self._sqlite_writer.thread
+        ):
+            raise DatabaseError("write() cannot be called from a queued write")
+
+        return self.submit_write(func).result(timeout)
+
+    def _pool_class_kwargs(self, name: str, pool_class: Type[Any]) -> Dict[str, Any]:
+        """Get the engine arguments that select a checkout-timing pool.
+
+        In-memory SQLite keeps its dialect default pool, since every pooled
+        connection would otherwise open a separate empty database.
+        """
+        if self._db_type == "sqlite" and name == ":memory:":
+            return {}
+        return {"poolclass": pool_class}
+
+    def _monitor_pool(self, pool_name: str, engine: Engine) -> None:
+        """Track an engine's checked-out connections and pool exhaustion.
+
+        Checkout wait and held times are fed into Prometheus, and queued or
+        timed out checkouts are reported by _on_pool_contended(). Pool event
+        listeners carry over to the new pool when the engine is disposed.
+
+        Args:
+            pool_name: The name of the pool in status and events.
+            engine: The engine whose pool to monitor.
+        """
+        stats = getattr(engine.pool, "checkout_stats", None)
+        if stats is None:
+            return
+
+        self._monitored_engines[pool_name] = engine
+        stats.leak_threshold = self._leak_threshold
+        stats.on_contended = functools.partial(
+            self._on_pool_contended, pool_name, engine
+        )
+        if self._prometheus is not None:
+            stats.observer = self._prometheus["checkout_wait"].labels(pool_name).observe
+            stats.held_observer = (
+                self._prometheus["checkout_held"].labels(pool_name).observe
+            )
+
+        stack_depth = self._checkout_stack_depth
+
+        def on_checkout(
+            dbapi_connection: Any, connection_record: Any, connection_proxy: Any
+        ) -> None:
+            stack = _capture_stack(stack_depth) if stack_depth > 0 else None
+            engine.pool.checkout_stats.checkout(id(connection_record), stack)
+
+        def on_checkin(dbapi_connection: Any, connection_record: Any) -> None:
+            engine.pool.checkout_stats.checkin(id(connection_record))
+
+        event.listen(engine, "checkout", on_checkout)
+        event.listen(engine, "checkin", on_checkin)
+        event.listen(engine, "detach", on_checkin)
+
+    def _on_pool_contended(
+        self, pool_name: str, engine: Engine, wait: float, timed_out: bool
+    ) -> None:
+        """Report a checkout that queued because every connection was in use.
+
+        Events are published at most once per exhaustion_event_interval per
+        pool; the number of checkouts left unreported in between is included
+        in the next event.
+
+        Args:
+            pool_name: The name of the pool.
+            engine: The engine the pool belongs to.
+            wait: Seconds the caller waited.
+            timed_out: Whether the caller gave up waiting.
+        """
+        if self._prometheus is not None:
+            self._prometheus["pool_exhausted"].labels(pool_name).inc()
+
+        now = time.monotonic()
+        with self._pool_events_lock:
+            last = self._exhaustion_last_event.get(pool_name)
+            if last is not None and now - last < self._exhaustion_event_interval:
+                self._exhaustion_suppressed[pool_name] = (
+                    self._exhaustion_suppressed.get(pool_name, 0) + 1
+                )
+                return
+            self._exhaustion_last_event[pool_name] = now
+            suppressed = self._exhaustion_suppressed.pop(pool_name, 0)
+
+        payload = {
+            "pool": pool_name,
+            "waited_ms": round(wait * 1000, 3),
+            "timed_out": timed_out,
+            "suppressed": suppressed,
+            **_pool_sizes(engine.pool),
+        }
+        self._logger.warning(
+            f"Connection pool {pool_name} exhausted: waited "
+            f"{payload['waited_ms']} ms for a connection",
+            extra=payload,
+        )
+        self._publish_pool_event("database/pool_exhausted", payload)
+
+    def _publish_pool_event(self, event_type: str, payload: Dict[str, Any]) -> None:
+        """Publish a pool event if there is an event bus."""
+        if self._event_bus is None:
+            return
+
+        try:
+            self._event_bus.publish(
+                event_type=event_type, source="database_manager", payload=payload
+            )
+        except EventBusError as e:
+            self._logger.warning(f"Failed to publish {event_type} event: {str(e)}")
+
+    def check_connection_leaks(self) -> List[Dict[str, Any]]:
+        """Find connections held longer than leak_threshold_seconds.
+
+        Each long-held connection is logged and published as a
+        database/connection_leak event once, with the stack that checked it
+        out if stack capture is enabled.
+
+        Returns:
+            List[Dict[str, Any]]: Every connection currently held too long.
+        """
+        now = time.monotonic()
+        result = []
+        for pool_name, engine in list(self._monitored_engines.items()):
+            stats = getattr(engine.pool, "checkout_stats", None)
+            if stats is None:
+                continue
+
+            long_held, new = stats.find_long_held(self._leak_threshold)
+            for entry in new:
+                payload = {"pool": pool_name, **entry.to_dict(now)}
+                stack = "".join(payload["stack"] or [])
+                self._logger.warning(
+                    f"Connection from pool {pool_name} held for "
+                    f"{payload['held_seconds']} s by thread {entry.thread}"
+                    + (f"; checked out at:\n{stack}" if stack else ""),
+                    extra={"pool": pool_name, "held_seconds": payload["held_seconds"]},
+                )
+                if self._prometheus is not None:
+                    self._prometheus["long_held"].labels(pool_name).inc()
+                self._publish_pool_event("database/connection_leak", payload)
+
+            result.extend({"pool": pool_name, **e.to_dict(now)} for e in long_held)
+        return result
+
+    def _leak_monitor_worker(self) -> None:
+        """Check for long-held connections until the manager shuts down."""
+        while not self._leak_monitor_stop.wait(self._leak_check_interval):
+            try:
+                self.check_connection_leaks()
+            except Exception as e:
+                self._logger.error(f"Connection leak check failed: {str(e)}")
+
+    @staticmethod
+    def _is_read_statement(statement: Any) -> bool:
+        """Check whether a statement is a plain SELECT that a replica can serve."""
+        if isinstance(statement, TextClause):
+            statement = statement.text
+        if isinstance(statement, str):
+            return (
+                statement.lstrip()[:6].upper() == "SELECT"
+                and _LOCKING_READ_PATTERN.search(statement) is None
+            )
+        # SELECT ... FOR UPDATE/SHARE takes row locks, which only the primary can
+        return (
+            bool(getattr(statement, "is_select", False))
+            and getattr(statement, "_for_update_arg", None) is None
+        )
+
+    def _choose_replica(self, statement: Any, use_primary: bool) -> Optional[_Replica]:
+        """Pick a replica to serve a read, or None to use the primary.
+
+        Replicas are used round-robin. A replica is skipped while it is
+        unreachable or lagging more than replica_max_lag_seconds behind the
+        primary; its state is re-checked every replica_check_interval seconds.
+
+        Args:
+            statement: The statement to run.
+            use_primary: Whether the caller asked for the primary.
+
+        Returns:
+            Optional[_Replica]: The chosen replica, or None.
+        """
+        if not self._is_read_statement(statement):
+            return None
+
+        if not self._replicas or use_primary:
+            with self._metrics_lock:
+                self._primary_reads += 1
+            return None
+
+        offset = next(self._replica_counter)
+        count = len(self._replicas)
+        for i in range(count):
+            replica = self._replicas[(offset + i) % count]
+            if time.monotonic() - replica.last_checked >= self._replica_check_interval:
+                self._check_replica(replica)
+
+            if replica.healthy and (
+                replica.lag is None or replica.lag <= self._replica_max_lag
+            ):
+                with self._metrics_lock:
+                    replica.reads += 1
+                return replica
+
+        with self._metrics_lock:
+            self._primary_reads += 1
+            self._replica_fallbacks += 1
+        return None
+
+    def _check_replica(self, replica: _Replica) -> None:
+        """Refresh a replica's reachability and replication lag.
+
+        Only one thread checks a replica at a time; others keep using the
+        last known state.
+        """
+        if not replica.check_lock.acquire(blocking=False):
+            return
+
+        try:
+            with replica.engine.connect() as connection:
+                replica.lag = self._replica_lag(connection)
+            replica.healthy = True
+            replica.error = None
+        except Exception as e:
+            replica.healthy = False
+            replica.error = str(e)
+            self._logger.warning(
+                f"Read replica {replica.name} is unavailable: {str(e)}",
+                extra={"replica": replica.name},
+            )
+        finally:
+            replica.last_checked = time.monotonic()
+            replica.check_lock.release()
+
+        if replica.lag is not None and replica.lag > self._replica_max_lag:
+            self._logger.warning(
+                f"Read replica {replica.name} is {replica.lag:.1f}s behind the primary",
+                extra={"replica": replica.name, "lag_seconds": replica.lag},
+            )
+
+    def _replica_lag(self, connection: Connection) -> Optional[float]:
+        """Query how far a replica is behind its primary, in seconds.
+
+        Returns:
+            Optional[float]: The lag, 0.0 if it can't be measured for the
+                dialect, or infinity if replication is stopped.
+        """
+        if self._db_type == "postgresql":
+            lag = connection.exec_driver_sql(
+                "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() "
+                "THEN 0 ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) "
+                "END"
+            ).scalar()
+            return float(lag) if lag is not None else 0.0
+
+        if self._db_type in ("mysql", "mariadb"):
+            for sql in ("SHOW REPLICA STATUS", "SHOW SLAVE STATUS"):
+                try:
+                    row = connection.exec_driver_sql(sql).mappings().first()
+                except DBAPIError:
+                    continue
+                if row is None:
+                    return 0.0  # Not configured as a replica
+                lag = row.get("Seconds_Behind_Source", row.get("Seconds_Behind_Master"))
+                return float(lag) if lag is not None else float("inf")
+
+        connection.exec_driver_sql("SELECT 1")
+        return 0.0
+
+    def _run_read(
+        self, statement: Any, use_primary: bool, func: Callable[[Connection], T]
+    ) -> T:
+        """Run a read on a replica, falling back to the primary if it fails.
+
+        Falls back when the replica can't be connected to or the connection
+        drops mid-query; other errors, such as bad SQL, are raised as usual.
+
+        Args:
+            statement: The statement being run, used for routing.
+            use_primary: Whether the caller asked for the primary.
+            func: Runs the read on the given connection.
+
+        Returns:
+            T: The result of func.
+        """
+        if not self._is_read_statement(statement):
+            # Writes run in their own transaction; on SQLite this queues them
+            # for the single writer connection, unless a session on this
+            # thread holds it
+            held = self._held_connection(self._get_write_engine())
+            if held is not None:
+                return func(held)
+            with self._get_write_engine().begin() as connection:
+                return func(connection)
+
+        replica = self._choose_replica(statement, use_primary)
+        if replica is not None:
+            try:
+                with replica.engine.connect() as connection:
+                    return func(connection)
+            except DBAPIError as e:
+                if not (e.connection_invalidated or e.statement is None):
+                    raise
+                self._mark_replica_down(replica, e)
+
+        held = self._held_connection(self._engine)
+        if held is not None:
+            return func(held)
+        with self._engine.connect() as connection:
+            return func(connection)
+
+    def _mark_replica_down(self, replica: _Replica, error: Exception) -> None:
+        """Take a replica out of rotation until its next check."""
+        replica.healthy = False
+        replica.error = str(error)
+        replica.last_checked = time.monotonic()
+        with self._metrics_lock:
+            self._replica_fallbacks += 1
+        self._logger.warning(
+            f"Read replica {replica.name} failed, falling back to primary: {str(error)}",
+            extra={"replica": replica.name},
+        )
+
+    def _get_default_port(self, db_type: str) -> int:
+        """Get the default port for a database type.
+
+        Args:
+            db_type: The type of database.
+
+        Returns:
+            int: The default port for the database type.
+        """
+        default_ports = {
+            "postgresql": 5432,
+            "mysql": 3306,
+            "mariadb": 3306,
+            "oracle": 1521,
+            "mssql": 1433,
+            "sqlite": 0,  # SQLite doesn't use a port
+        }
+
+        return default_ports.get(db_type, 0)
+
+    @contextlib.contextmanager
+    def session(self) -> Generator[Session, None, None]:
+        """Get a database session for transactional operations.
+
+        This context manager provides a session that is automatically committed
+        on success or rolled back on exception.
+
+        Yields:
+            Session: A SQLAlchemy Session object.
+
+        Raises:
+            DatabaseError: If a database error occurs.
+        """
+        if not self._initialized or not self._session_factory:
+            raise DatabaseError("Database Manager not initialized")
+
+        session = self._session_factory()
+
+        # Track the session
+        with self._active_sessions_lock:
+            self._active_sessions.add(session)
+        if not hasattr(self._thread_state, "sessions"):
+            self._thread_state.sessions = []
+        self._thread_state.sessions.append(session)
+
+        try:
+            yield session
+            session.commit()
+        except SQLAlchemyError as e:
+            session.rollback()
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}") from e
+        except Exception as e:
+            session.rollback()
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Error during database operation: {str(e)}")
+            raise
+        finally:
+            self._thread_state.sessions.remove(session)
+            session.close()
+            # Remove the session from tracking
+            with self._active_sessions_lock:
+                self._active_sessions.discard(session)
+
+    @contextlib.asynccontextmanager
+    async def async_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Get an async database session for transactional operations.
+
+        The async counterpart of session(): the session is committed on
+        success, rolled back on exception and closed either way.
+
+        On a SQLite file the session uses the async driver's own connections,
+        not the single writer, so its writes wait for the writer's lock up to
+        the busy_timeout pragma. Keep async transactions short there, or use
+        bulk_insert_async()/bulk_upsert_async(), which go through the writer.
+
+        ```python
+        async with db_manager.async_session() as session:
+            session.add(obj)
+        ```
+
+        Yields:
+            AsyncSession: An async SQLAlchemy Session object.
+
+        Raises:
+            DatabaseError: If async database is not supported or not
+                initialized, or a database error occurs.
+        """
+        self._require_async()
+        session = self._async_session_factory()
+
+        with self._active_sessions_lock:
+            self._active_async_sessions.add(session)
+
+        try:
+            yield session
+            await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}") from e
+        except Exception as e:
+            await session.rollback()
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Error during async database operation: {str(e)}")
+            raise
+        finally:
+            await session.close()
+            with self._active_sessions_lock:
+                self._active_async_sessions.discard(session)
+
+    def _require_async(self) -> AsyncEngine:
+        """Get the async engine, checking it can be used from this event loop.
+
+        Async driver connections belong to the event loop that opened them,
+        so once bind_event_loop() is called the engine is only usable there.
+
+        Returns:
+            AsyncEngine: The async engine.
+
+        Raises:
+            DatabaseError: If async database is not supported or not
+                initialized, or this is not the bound event loop.
+        """
+        if not self._initialized or not self._async_engine:
+            raise DatabaseError("Async database not initialized")
+
+        if (
+            self._event_loop is not None
+            and asyncio.get_running_loop() is not self._event_loop
+        ):
+            raise DatabaseError(
+                "The async database is bound to another event loop; "
+                "use it from that loop"
+            )
+        return self._async_engine
+
+    def bind_event_loop(self, loop: Optional[asyncio.AbstractEventLoop]) -> None:
+        """Bind the async engine to the event loop that will use it.
+
+        The API Manager binds its server loop on startup. While bound, async
+        operations from other loops fail fast instead of corrupting pooled
+        connections, and shutdown() disposes of the async engine on this loop.
+
+        Args:
+            loop: The event loop, or None to unbind.
+        """
+        self._event_loop = loop
+
+    async def dispose_async(self) -> None:
+        """Close the async engine's pooled connections on the running loop.
+
+        The engine opens new connections if it is used again afterwards.
+        """
+        if self._async_engine is not None:
+            await self._async_engine.dispose()
+
+    def execute(
+        self,
+        statement: Any,
+        result_format: Union[ResultFormat, str] = ResultFormat.DICTS,
+        cache: Optional[bool] = None,
+        use_primary: bool = False,
+    ) -> Any:
+        """Execute a SQLAlchemy statement and return the results as dictionaries.
+
+        SELECT statements are served by a read replica when any are configured.
+        Other statements run in their own committed transaction on the write
+        engine, which on SQLite is the single writer connection. On SQLite,
+        inside session() they run in the session's transaction instead.
+
+        Args:
+            statement: A SQLAlchemy statement to execute.
+            result_format: The shape of the results. Non-dict formats skip
+                building a dictionary per row; see ResultFormat.
+            cache: Whether to use the query cache for a SELECT. None uses it
+                whenever database.query_cache is enabled; False bypasses it.
+            use_primary: Read from the primary even if replicas are configured,
+                e.g. to see a write that replicas may not have applied yet.
+
+        Returns:
+            Any: The query results, by default as a list of dictionaries.
+
+        Raises:
+            DatabaseError: If a database error occurs.
+        """
+        if not self._initialized or not self._engine:
+            raise DatabaseError("Database Manager not initialized")
+
+        result_format = self._result_format(result_format)
+
+        plan = self._cache_plan(statement, None, result_format, cache)
+        if plan is not None:
+            hit, value = self._query_cache.get(plan[0])
+            if hit:
+                return self._copy_result(value)
+            versions = self._query_cache.versions(plan[1])
+
+        try:
+            value = self._run_read(
+                statement,
+                use_primary,
+                lambda connection: self._format_result(
+                    connection.execute(statement), result_format
+                ),
+            )
+
+            if plan is not None:
+                self._query_cache.put(plan[0], value, plan[1], versions)
+                value = self._copy_result(value)
+
+            return value
+
+        except SQLAlchemyError as e:
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}") from e
+
+    def execute_raw(
+        self,
+        sql: str,
+        params: Optional[Dict[str, Any]] = None,
+        result_format: Union[ResultFormat, str] = ResultFormat.DICTS,
+        cache: Optional[bool] = None,
+        use_primary: bool = False,
+    ) -> Any:
+        """Execute a raw SQL statement and return the results as dictionaries.
+
+        SELECT statements are served by a read replica when any are configured.
+        Other statements run in their own committed transaction on the write
+        engine, which on SQLite is the single writer connection. On SQLite,
+        inside session() they run in the session's transaction instead.
+
+        Args:
+            sql: A SQL statement to execute.
+            params: Optional parameters for the SQL statement.
+            result_format: The shape of the results; see ResultFormat.
+            cache: Whether to use the query cache for a SELECT. None uses it
+                whenever database.query_cache is enabled; False bypasses it.
+            use_primary: Read from the primary even if replicas are configured.
+
+        Returns:
+            Any: The query results, by default as a list of dictionaries.
+
+        Raises:
+            DatabaseError: If a database error occurs.
+        """
+        if not self._initialized or not self._engine:
+            raise DatabaseError("Database Manager not initialized")
+
+        result_format = self._result_format(result_format)
+
+        plan = self._cache_plan(sql, params, result_format, cache)
+        if plan is not None:
+            hit, value = self._query_cache.get(plan[0])
+            if hit:
+                return self._copy_result(value)
+            versions = self._query_cache.versions(plan[1])
+
+        try:
+            value = self._run_read(
+                sql,
+                use_primary,
+                lambda connection: self._format_result(
+                    connection.execute(self._text_cache.get(sql), params or {}),
+                    result_format,
+                ),
+            )
+
+            if plan is not None:
+                self._query_cache.put(plan[0], value, plan[1], versions)
+                value = self._copy_result(value)
+
+            return value
+
+        except SQLAlchemyError as e:
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}", query=sql) from e
+
+    async def execute_async(
+        self,
+        statement: Any,
+        result_format: Union[ResultFormat, str] = ResultFormat.DICTS,
+    ) -> Any:
+        """Execute a SQLAlchemy statement asynchronously and return the results as dictionaries.
+
+        Args:
+            statement: A SQLAlchemy statement to execute.
+            result_format: The shape of the results; see ResultFormat.
+
+        Returns:
+            Any: The query results, by default as a list of dictionaries.
+
+        Raises:
+            DatabaseError: If a database error occurs or async is not supported.
+        """
+        engine = self._require_async()
+        result_format = self._result_format(result_format)
+        statement = self._coerce_statement(statement)
+
+        try:
+            async with engine.connect() as connection:
+                result = await connection.execute(statement)
+                return self._format_result(result, result_format)
+
+        except SQLAlchemyError as e:
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}") from e
+
+        except Exception as e:
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Error during async database operation: {str(e)}")
+            raise
+
+    def stream(
+        self,
+        statement: Any,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        batched: bool = False,
+        use_primary: bool = False,
+    ) -> Generator[Union[Dict[str, Any], List[Dict[str, Any]]], None, None]:
+        """Stream query results without loading the whole result set.
+
+        Uses a server-side cursor (``stream_results``) and fetches
+        ``batch_size`` rows at a time, so memory stays flat regardless of the
+        size of the result. The connection is held until the generator is
+        exhausted or closed. SELECT statements are served by a read replica
+        when any are configured.
+
+        ```python
+        for row in db_manager.stream(select(AuditLog)):
+            ...
+        ```
+
+        Args:
+            statement: A SQLAlchemy statement or a raw SQL string.
+            params: Optional parameters for the statement.
+            batch_size: Number of rows fetched from the cursor at a time.
+            batched: If True, yield lists of up to batch_size rows instead of
+                individual rows.
+            use_primary: Read from the primary even if replicas are configured.
+
+        Yields:
+            Union[Dict[str, Any], List[Dict[str, Any]]]: Rows as dictionaries,
+                or lists of rows if batched is True.
+
+        Raises:
+            DatabaseError: If a database error occurs.
+        """
+        if not self._initialized or not self._engine:
+            raise DatabaseError("Database Manager not initialized")
+
+        statement = self._coerce_statement(statement)
+
+        try:
+            with self._connect_for_read(statement, use_primary) as connection:
+                result = connection.execute(
+                    statement,
+                    params or {},
+                    execution_options={"stream_results": True, "yield_per": batch_size},
+                )
+
+                for partition in result.mappings().partitions(batch_size):
+                    self._record_rows(result, len(partition))
+                    if batched:
+                        yield [dict(row) for row in partition]
+                    else:
+                        for row in partition:
+                            yield dict(row)
+
+        except SQLAlchemyError as e:
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}") from e
+
+    async def stream_async(
+        self,
+        statement: Any,
+        params: Optional[Dict[str, Any]] = None,
+        batch_size: int = 1000,
+        batched: bool = False,
+    ) -> AsyncGenerator[Union[Dict[str, Any], List[Dict[str, Any]]], None]:
+        """Stream query results asynchronously without loading them all.
+
+        The async counterpart of stream(), backed by the async engine's
+        server-side cursor support.
+
+        ```python
+        async for batch in db_manager.stream_async(query, batched=True):
+            ...
+        ```
+
+        Args:
+            statement: A SQLAlchemy statement or a raw SQL string.
+            params: Optional parameters for the statement.
+            batch_size: Number of rows fetched from the cursor at a time.
+            batched: If True, yield lists of up to batch_size rows instead of
+                individual rows.
+
+        Yields:
+            Union[Dict[str, Any], List[Dict[str, Any]]]: Rows as dictionaries,
+                or lists of rows if batched is True.
+
+        Raises:
+            DatabaseError: If a database error occurs or async is not supported.
+        """
+        engine = self._require_async()
+        statement = self._coerce_statement(statement)
+
+        try:
+            async with engine.connect() as connection:
+                result = await connection.stream(
+                    statement.execution_options(yield_per=batch_size), params or {}
+                )
+
+                async for partition in result.mappings().partitions(batch_size):
+                    if batched:
+                        yield [dict(row) for row in partition]
+                    else:
+                        for row in partition:
+                            yield dict(row)
+
+        except SQLAlchemyError as e:
+            with self._metrics_lock:
+                self._queries_failed += 1
+            self._logger.error(f"Database error: {str(e)}")
+            raise DatabaseError(f"Database error: {str(e)}") from e
+
+    def paginate(
+        self,
+        statement: Select,
+        order_by: Sequence[Any],
+        limit: int = 100,
+        cursor: Optional[str] = None,
+        descending: bool = False,
+        use_primary: bool = False,
+    ) -> Dict[str, Any]:
+        """Fetch one page of a SELECT using keyset (cursor) pagination.
+
+        Rather than OFFSET, which makes the database read and discard every
+        earlier row, each page continues after the sort key of the previous
+        page's last row, so deep pages cost the same as the first one when
+        an index covers order_by.
+
+        ```python
+        page = db_manager.paginate(select(User), [User.created_at, User.id])
+        page = db_manager.paginate(
+            select(User), [User.created_at, User.id], cursor=page["next_cursor"]
+        )
+        ```
+
+        Args:
+            statement: The SELECT to paginate, without ORDER BY or LIMIT.
+            order_by: Columns that uniquely identify a row, e.g. ending with
+                the primary key. They must be among the selected columns.
+            limit: The maximum number of rows on the page.
+            cursor: The next_cursor of the previous page, or None for the
+                first page.
+            descending: Sort by order_by descending instead of ascending.
+            use_primary: Read from the primary even if replicas are configured.
+
+        Returns:
+            Dict[str, Any]: The page's rows under "items" and the cursor of
+                the next page under "next_cursor", which is None on the last
+                page.
+
+        Raises:
+            ValueError: If the cursor is malformed or limit is not positive.
+            DatabaseError: If a database error occurs.
+        """
+        if limit < 1:
+            raise ValueError("limit must be at least 1")
+
+        keys = list(order_by)
+        positions = self._selected_positions(statement, keys)
+
+        if cursor is not None:
+            types = []
+            for key in keys:
+                try:
+                    types.append(key.type.python_type)
+                except NotImplementedError:
+                    types.append(None)
+            values = [
+                literal(value, key.type)
+                for key, value in zip(keys, decode_cursor(cursor, len(keys), types))
+            ]
+            # Row value comparison, so a composite index serves the range scan
+            if len(keys) == 1:
+                left, right = keys[0], values[0]
+            else:
+                left, right = tuple_(*keys), tuple_(*values)
+            statement = statement.where(left < right if descending else left > right)
+
+        statement = statement.order_by(
+            *[key.desc() if descending else key.asc() for key in keys]
+        ).limit(limit + 1)
+
+        # One extra row tells whether there is a next page
+        result = self.execute(
+            statement, result_format=ResultFormat.TUPLES, use_primary=use_primary
+        )
+        rows = result.rows
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor([rows[-1][i] for i in positions])
+
+        return {
+            "items": [dict(zip(result.columns, row)) for row in rows],
+            "next_cursor": next_cursor,
+        }
+
+    @staticmethod
+    def _selected_positions(statement: Select, keys: Sequence[Any]) -> List[int]:
+        """Find where each sort key is among a SELECT's columns.
+
+        Rows are read by position, since a column's label in the results can
+        differ from its attribute key.
+
+        Raises:
+            ValueError: If a sort key is not selected.
+        """
+        selected = list(statement.selected_columns)
+        positions = []
+        for key in keys:
+            expression = (
+                key.__clause_element__() if hasattr(key, "__clause_element__") else key
+            )
+            for index, column in enumerate(selected):
+                if isinstance(column, Label):
+                    column = column.element
+                if column.compare(expression):
+                    positions.append(index)
+                    break
+            else:
+                raise ValueError(f"Sort key {key} is not among the selected columns")
+        return positions
+
+    def _connect_for_read(
+        self, statement: Any, use_primary: bool
+    ) -> ContextManager[Connection]:
+        """Open a connection for a read, on a replica when one is usable.
+
+        Unlike _run_read() this can only fall back while connecting, since
+        rows may already have been handed to the caller when a stream fails.
+        A connection held by a session on this thread is used but not closed.
+        """
+        replica = self._choose_replica(statement, use_primary)
+        if replica is not None:
+            try:
+                return replica.engine.connect()
+            except DBAPIError as e:
+                self._mark_replica_down(replica, e)
+
+        held = self._held_connection(self._engine)
+        if held is not None:
+            return contextlib.nullcontext(held)
+        return self._engine.connect()
+
+    def invalidate_cache(self, tables: Optional[Iterable[str]] = None) -> int:
+        """Evict cached query results.
+
+        Writes made through this manager invalidate the cache automatically;
+        this is for data changed by other processes.
+
+        Args:
+            tables: Names of the tables whose results to evict. If None, the
+                whole cache is cleared.
+
+        Returns:
+            int: The number of entries evicted, or -1 if the cache was cleared.
+        """
+        if self._query_cache is None:
+            return 0
+
+        if tables is None:
+            self._query_cache.clear()
+            return -1
+
+        return self._query_cache.invalidate(tables)
+
+    def _cache_plan(
+        self,
+        statement: Any,
+        params: Optional[Dict[str, Any]],
+        result_format: ResultFormat,
+        cache: Optional[bool],
+    ) -> Optional[Tuple[Tuple[Any, ...], FrozenSet[str]]]:
+        """Work out the cache key and table dependencies of a read.
+
+        Args:
+            statement: A SQLAlchemy statement or a raw SQL string.
+            params: Parameters for a raw SQL string.
+            result_format: The requested result shape.
+            cache: The caller's cache preference.
+
+        Returns:
+            Optional[Tuple[Tuple[Any, ...], FrozenSet[str]]]: The cache key and
+                the tables read, or None if the query should not be cached.
+        """
+        # Locking reads are never cached, since they must take their locks,
+        # nor are reads in a session's transaction, which see its writes
+        if (
+            self._query_cache is None
+            or cache is False
+            or not self._is_read_statement(statement)
+            or self._held_connection(self._engine) is not None
+        ):
+            return None
+
+        try:
+            if isinstance(statement, str):
+                tables = _raw_read_tables(statement)
+                if tables is None:
+                    return None
+                sql, bound = statement, params or {}
+            else:
+                tables = frozenset(
+                    element.name.lower()
+                    for element in visitors.iterate(statement)
+                    if isinstance(element, Table)
+                )
+                compiled = statement.compile(dialect=self._engine.dialect)
+                sql, bound = str(compiled), compiled.params
+
+        except Exception:
+            return None
+
+        if not tables:
+            return None
+
+        frozen_params = tuple(sorted((k, repr(v)) for k, v in bound.items()))
+        return (sql, frozen_params, result_format.value), tables
+
+    @staticmethod
+    def _copy_result(value: Any) -> Any:
+        """Copy a cached result so callers can't mutate the cached one.
+
+        Arrow tables are immutable, so they are shared as they are.
+        """
+        if isinstance(value, list):
+            return [dict(row) for row in value]
+        if isinstance(value, TupleResult):
+            return TupleResult(columns=list(value.columns), rows=list(value.rows))
+        if isinstance(value, dict):
+            # Columns: NumPy arrays, array.array and lists all copy this way
+            return {name: copy.copy(values) for name, values in value.items()}
+        return value
+
+    def _track_writes(
+        self,
+        conn: Connection,
+        cursor: Any,
+        statement: str,
+        parameters: Any,
+        context: Any,
+        executemany: bool,
+    ) -> None:
+        """Event hook that invalidates cached results for written tables.
+
+        Entries are evicted as soon as the write executes, and again when the
+        transaction commits so reads that ran in between can't linger.
+        """
+        match = _WRITE_TABLE_PATTERN.match(statement)
+        if match is None or self._query_cache is None:
+            return
+
+        table = match.group(1).split(".")[-1].lower()
+        conn.info.setdefault("qorzen_written_tables", set()).add(table)
+        self._query_cache.invalidate([table])
+
+    def _on_commit(self, conn: Connection) -> None:
+        """Event hook that invalidates tables written in the committed transaction."""
+        tables = conn.info.pop("qorzen_written_tables", None)
+        if tables and self._query_cache is not None:
+            self._query_cache.invalidate(tables)
+
+    def _on_rollback(self, conn: Connection) -> None:
+        """Event hook that forgets tables written in a rolled back transaction."""
+        conn.info.pop("qorzen_written_tables", None)
+
+    @staticmethod
+    def _result_format(result_format: Union[ResultFormat, str]) -> ResultFormat:
+        """Convert a result format name to a ResultFormat.
+
+        Raises:
+            DatabaseError: If the format is not a ResultFormat value.
+        """
+        try:
+            return ResultFormat(result_format)
+        except ValueError as e:
+            raise DatabaseError(f"Unknown result format: {result_format!r}") from e
+
+    def _format_result(self, result: Any, result_format: ResultFormat) -> Any:
+        """Shape a buffered SQLAlchemy result.
+
+        Args:
+            result: The SQLAlchemy result to consume.
+            result_format: The requested shape.
+
+        Returns:
+            Any: The results in the requested shape.
+
+        Raises:
+            DatabaseError: If the shape needs an optional package that is missing.
+        """
+        # Writes without RETURNING have no rows or columns
+        rows_in = result if result.returns_rows else ()
+
+        if result_format == ResultFormat.DICTS:
+            dicts = [dict(row._mapping) for row in rows_in]
+            self._record_rows(result, len(dicts))
+            return dicts
+
+        columns = list(result.keys()) if result.returns_rows else []
+
+        if result_format == ResultFormat.TUPLES:
+            rows = [tuple(row) for row in rows_in]
+            self._record_rows(result, len(rows))
+            return TupleResult(columns=columns, rows=rows)
+
+        # Fill the columns straight from the cursor, without keeping the rows
+        column_values: List[List[Any]] = [[] for _ in columns]
+        appends = [values.append for values in column_values]
+        count = 0
+        for row in rows_in:
+            for append, value in zip(appends, row):
+                append(value)
+            count += 1
+        self._record_rows(result, count)
+
+        if result_format == ResultFormat.ARROW:
+            try:
+                import pyarrow
+            except ImportError as e:
+                self._logger.error(
+                    "Failed to import pyarrow. Please install with 'pip install pyarrow'"
+                )
+                raise DatabaseError("The arrow result format requires pyarrow") from e
+
+            return pyarrow.table(dict(zip(columns, column_values)))
+
+        arrays = {}
+        for index, name in enumerate(columns):
+            arrays[name] = self._to_column_array(column_values[index])
+            column_values[index] = []  # Free each list once it is converted
+        return arrays
+
+    @staticmethod
+    def _to_column_array(values: Sequence[Any]) -> Any:
+        """Convert a column of values to a compact array.
+
+        Uses NumPy when it is installed. Otherwise homogeneous integer and
+        float columns become array.array and everything else stays a list.
+
+        Args:
+            values: The values of one column.
+
+        Returns:
+            Any: A NumPy array, an array.array or a list.
+        """
+        try:
+            import numpy
+
+            return numpy.asarray(values)
+        except ImportError:
+            pass
+
+        if values and all(type(v) is int for v in values):
+            try:
+                return array.array("q", values)
+            except OverflowError:
+                return list(values)
+
+        if values and all(type(v) is float for v in values):
+            return array.array("d", values)
+
+        return list(values)
+
+    def _coerce_statement(self, statement: Any) -> Any:
+        """Wrap raw SQL strings in a cached text() construct.
+
+        Args:
+            statement: A SQLAlchemy statement or a raw SQL string.
+
+        Returns:
+            Any: An executable SQLAlchemy statement.
+        """
+        if isinstance(statement, str):
+            return self._text_cache.get(statement)
+        return statement
 
-            # Set up event listeners for metrics
-            event.listen(
-                self._engine, "before_cursor_execute", self._before_cursor_execute
-            )
-            event.listen(
-                self._engine, "after_cursor_execute", self._after_cursor_execute
-            )
+    def bulk_insert(
+        self,
+        table: Union[Table, Type[Any], str],
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> int:
+        """Insert many rows into a table using batched executemany.
 
-            # Test database connection
-            with self._engine.connect() as connection:
-                # Execute a simple query to test the connection
-                connection.execute(sqlalchemy.text("SELECT 1"))
+        Rows are sent in chunks, each in its own transaction. SQLAlchemy turns
+        each chunk into multi-row INSERT ... VALUES statements where the dialect
+        supports it, which is far cheaper than adding ORM objects one by one.
+        If a chunk fails, earlier chunks stay committed.
 
-            # Register for config changes
-            self._config_manager.register_listener("database", self._on_config_changed)
+        Args:
+            table: A Table, a mapped model class, or the name of a table.
+            rows: The rows to insert, as dictionaries keyed by column name.
+            chunk_size: Maximum number of rows per chunk and transaction.
 
-            self._logger.info(
-                f"Database Manager initialized with {self._db_type} database",
-                extra={"host": host, "port": port, "database": name},
-            )
+        Returns:
+            int: The number of rows inserted.
 
-            self._initialized = True
-            self._healthy = True
+        Raises:
+            DatabaseError: If a database error occurs.
+        """
+        if not self._initialized or not self._engine:
+            raise DatabaseError("Database Manager not initialized")
 
-        except Exception as e:
-            self._logger.error(f"Failed to initialize Database Manager: {str(e)}")
-            raise ManagerInitializationError(
-                f"Failed to initialize DatabaseManager: {str(e)}",
-                manager_name=self.name,
-            ) from e
+        target = self._resolve_table(table)
+        return self._execute_chunked(target, target.insert(), rows, chunk_size)
 
-    def _get_default_port(self, db_type: str) -> int:
-        """Get the default port for a database type.
+    def bulk_upsert(
+        self,
+        table: Union[Table, Type[Any], str],
+        rows: Iterable[Dict[str, Any]],
+        conflict_keys: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Insert many rows, updating existing rows that conflict on a key.
+
+        Uses the dialect-native upsert: ``INSERT ... ON CONFLICT DO UPDATE`` on
+        PostgreSQL and SQLite, ``ON DUPLICATE KEY UPDATE`` on MySQL/MariaDB.
+        Rows are chunked the same way as in bulk_insert().
 
         Args:
-            db_type: The type of database.
+            table: A Table, a mapped model class, or the name of a table.
+            rows: The rows to upsert, as dictionaries keyed by column name.
+            conflict_keys: Columns of the unique constraint that identifies a row.
+            update_columns: Columns to overwrite on conflict. Defaults to all
+                non-key columns present in the first row.
+            chunk_size: Maximum number of rows per chunk and transaction.
 
         Returns:
-            int: The default port for the database type.
+            int: The number of rows processed.
+
+        Raises:
+            DatabaseError: If the dialect has no native upsert or a database
+                error occurs.
         """
-        default_ports = {
-            "postgresql": 5432,
-            "mysql": 3306,
-            "mariadb": 3306,
-            "oracle": 1521,
-            "mssql": 1433,
-            "sqlite": 0,  # SQLite doesn't use a port
-        }
+        if not self._initialized or not self._engine:
+            raise DatabaseError("Database Manager not initialized")
 
-        return default_ports.get(db_type, 0)
+        if not conflict_keys:
+            raise DatabaseError("bulk_upsert requires at least one conflict key")
 
-    @contextlib.contextmanager
-    def session(self) -> Generator[Session, None, None]:
-        """Get a database session for transactional operations.
+        target = self._resolve_table(table)
+        iterator = iter(rows)
+        first_row = next(iterator, None)
+        if first_row is None:
+            return 0
 
-        This context manager provides a session that is automatically committed
-        on success or rolled back on exception.
+        if update_columns is None:
+            update_columns = [c for c in first_row if c not in conflict_keys]
 
-        Yields:
-            Session: A SQLAlchemy Session object.
+        stmt = self._upsert_statement(target, conflict_keys, update_columns)
+        return self._execute_chunked(
+            target, stmt, itertools.chain([first_row], iterator), chunk_size
+        )
+
+    def _upsert_statement(
+        self, target: Table, conflict_keys: Sequence[str], update_columns: Sequence[str]
+    ) -> Any:
+        """Build the dialect-native upsert for bulk_upsert().
+
+        Args:
+            target: The table to upsert into.
+            conflict_keys: Columns of the unique constraint that identifies a row.
+            update_columns: Columns to overwrite on conflict.
+
+        Returns:
+            Any: The INSERT statement with its conflict clause.
 
         Raises:
-            DatabaseError: If a database error occurs.
+            DatabaseError: If the dialect has no native upsert.
         """
-        if not self._initialized or not self._session_factory:
-            raise DatabaseError("Database Manager not initialized")
+        dialect = self._engine.dialect.name
+        if dialect in ("postgresql", "sqlite"):
+            if dialect == "postgresql":
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
 
-        session = self._session_factory()
+            stmt = dialect_insert(target)
+            if update_columns:
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=list(conflict_keys),
+                    set_={c: stmt.excluded[c] for c in update_columns},
+                )
+            else:
+                stmt = stmt.on_conflict_do_nothing(index_elements=list(conflict_keys))
 
-        # Track the session
-        with self._active_sessions_lock:
-            self._active_sessions.add(session)
+        elif dialect in ("mysql", "mariadb"):
+            from sqlalchemy.dialects.mysql import insert as dialect_insert
 
-        try:
-            yield session
-            session.commit()
-        except SQLAlchemyError as e:
-            session.rollback()
-            with self._metrics_lock:
-                self._queries_failed += 1
-            self._logger.error(f"Database error: {str(e)}")
-            raise DatabaseError(f"Database error: {str(e)}") from e
-        except Exception as e:
-            session.rollback()
-            with self._metrics_lock:
-                self._queries_failed += 1
-            self._logger.error(f"Error during database operation: {str(e)}")
-            raise
-        finally:
-            session.close()
-            # Remove the session from tracking
-            with self._active_sessions_lock:
-                self._active_sessions.discard(session)
+            stmt = dialect_insert(target)
+            stmt = stmt.on_duplicate_key_update(
+                {c: stmt.inserted[c] for c in (update_columns or conflict_keys)}
+            )
 
-    async def async_session(self) -> AsyncSession:
-        """Get an async database session for transactional operations.
+        else:
+            raise DatabaseError(f"bulk_upsert is not supported for {dialect}")
 
-        Use this as an async context manager:
+        return stmt
 
-        ```python
-        async with db_manager.async_session() as session:
-            # Use session here
-        ```
+    async def bulk_insert_async(
+        self,
+        table: Union[Table, Type[Any], str],
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int = 1000,
+    ) -> int:
+        """Insert many rows into a table asynchronously.
+
+        The async counterpart of bulk_insert(), with the same chunking and
+        per-chunk transactions.
+
+        Args:
+            table: A Table, a mapped model class, or the name of a table.
+            rows: The rows to insert, as dictionaries keyed by column name.
+            chunk_size: Maximum number of rows per chunk and transaction.
 
         Returns:
-            AsyncSession: An async SQLAlchemy Session object.
+            int: The number of rows inserted.
 
         Raises:
-            DatabaseError: If async database is not supported or not initialized.
+            DatabaseError: If a database error occurs or async is not supported.
         """
-        if not self._initialized or not self._async_session_factory:
-            raise DatabaseError("Async database not initialized")
+        engine = self._require_async()
+        target = self._resolve_table(table)
+        return await self._execute_chunked_async(
+            engine, target, target.insert(), rows, chunk_size
+        )
 
-        return self._async_session_factory()
+    async def bulk_upsert_async(
+        self,
+        table: Union[Table, Type[Any], str],
+        rows: Iterable[Dict[str, Any]],
+        conflict_keys: Sequence[str],
+        update_columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> int:
+        """Insert or update many rows asynchronously.
 
-    def execute(self, statement: Any) -> List[Dict[str, Any]]:
-        """Execute a SQLAlchemy statement and return the results as dictionaries.
+        The async counterpart of bulk_upsert().
 
         Args:
-            statement: A SQLAlchemy statement to execute.
+            table: A Table, a mapped model class, or the name of a table.
+            rows: The rows to upsert, as dictionaries keyed by column name.
+            conflict_keys: Columns of the unique constraint that identifies a row.
+            update_columns: Columns to overwrite on conflict. Defaults to all
+                non-key columns present in the first row.
+            chunk_size: Maximum number of rows per chunk and transaction.
+
+        Returns:
+            int: The number of rows processed.
+
+        Raises:
+            DatabaseError: If the dialect has no native upsert, a database
+                error occurs or async is not supported.
+        """
+        engine = self._require_async()
+        if not conflict_keys:
+            raise DatabaseError("bulk_upsert requires at least one conflict key")
+
+        target = self._resolve_table(table)
+        iterator = iter(rows)
+        first_row = next(iterator, None)
+        if first_row is None:
+            return 0
+
+        if update_columns is None:
+            update_columns = [c for c in first_row if c not in conflict_keys]
+
+        stmt = self._upsert_statement(target, conflict_keys, update_columns)
+        return await self._execute_chunked_async(
+            engine, target, stmt, itertools.chain([first_row], iterator), chunk_size
+        )
+
+    def _execute_chunked(
+        self,
+        table: Table,
+        statement: Any,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int,
+    ) -> int:
+        """Execute a statement as executemany over chunks of rows.
+
+        Each chunk runs in its own transaction on a single pooled connection,
+        or in a savepoint of the session's transaction when a session on this
+        thread holds the SQLite write connection.
+
+        Args:
+            table: The target table, for logging.
+            statement: The INSERT statement to execute for each chunk.
+            rows: The parameter rows.
+            chunk_size: Maximum number of rows per chunk.
 
         Returns:
-            List[Dict[str, Any]]: The query results as a list of dictionaries.
+            int: The total number of rows executed.
 
         Raises:
             DatabaseError: If a database error occurs.
         """
-        if not self._initialized or not self._engine:
-            raise DatabaseError("Database Manager not initialized")
+        chunk_size = max(1, chunk_size)
+        iterator = iter(rows)
+        total = 0
+        chunk_index = 0
 
         try:
-            with self._engine.connect() as connection:
-                result = connection.execute(statement)
-                # Convert to dictionaries
-                return [dict(row._mapping) for row in result]
+            engine = self._get_write_engine()
+            held = self._held_connection(engine)
+            with (
+                contextlib.nullcontext(held) if held is not None else engine.connect()
+            ) as connection:
+                while True:
+                    chunk = list(itertools.islice(iterator, chunk_size))
+                    if not chunk:
+                        break
+
+                    # Inside a session each chunk is a savepoint of its
+                    # transaction, which commits them
+                    with (
+                        connection.begin_nested()
+                        if held is not None
+                        else connection.begin()
+                    ):
+                        connection.execute(statement, chunk)
+
+                    total += len(chunk)
+                    chunk_index += 1
 
         except SQLAlchemyError as e:
             with self._metrics_lock:
                 self._queries_failed += 1
-            self._logger.error(f"Database error: {str(e)}")
-            raise DatabaseError(f"Database error: {str(e)}") from e
+            self._logger.error(
+                f"Bulk write to {table.name} failed: {str(e)}",
+                extra={"chunk": chunk_index, "rows_committed": total},
+            )
+            raise DatabaseError(
+                f"Bulk write to {table.name} failed after {total} rows: {str(e)}",
+                details={"chunk": chunk_index, "rows_committed": total},
+            ) from e
 
-    def execute_raw(
-        self, sql: str, params: Optional[Dict[str, Any]] = None
-    ) -> List[Dict[str, Any]]:
-        """Execute a raw SQL statement and return the results as dictionaries.
+        self._logger.debug(
+            f"Bulk wrote {total} rows to {table.name} in {chunk_index} chunks"
+        )
+        return total
+
+    async def _execute_chunked_async(
+        self,
+        engine: AsyncEngine,
+        table: Table,
+        statement: Any,
+        rows: Iterable[Dict[str, Any]],
+        chunk_size: int,
+    ) -> int:
+        """Execute a statement as executemany over chunks of rows asynchronously.
+
+        The async counterpart of _execute_chunked(). On SQLite with a single
+        writer the chunks go through that writer on a worker thread, so async
+        bulk writes queue behind sync writes instead of racing them for the
+        database lock.
 
         Args:
-            sql: A SQL statement to execute.
-            params: Optional parameters for the SQL statement.
+            engine: The async engine returned by _require_async().
+            table: The target table, for logging.
+            statement: The INSERT statement to execute for each chunk.
+            rows: The parameter rows.
+            chunk_size: Maximum number of rows per chunk.
 
         Returns:
-            List[Dict[str, Any]]: The query results as a list of dictionaries.
+            int: The total number of rows executed.
 
         Raises:
             DatabaseError: If a database error occurs.
         """
-        if not self._initialized or not self._engine:
-            raise DatabaseError("Database Manager not initialized")
+        if self._writer_engine is not None:
+            return await asyncio.to_thread(
+                self._execute_chunked, table, statement, rows, chunk_size
+            )
+
+        chunk_size = max(1, chunk_size)
+        iterator = iter(rows)
+        total = 0
+        chunk_index = 0
 
         try:
-            with self._engine.connect() as connection:
-                result = connection.execute(sqlalchemy.text(sql), params or {})
-                # Convert to dictionaries
-                return [dict(row._mapping) for row in result]
+            async with engine.connect() as connection:
+                while True:
+                    chunk = list(itertools.islice(iterator, chunk_size))
+                    if not chunk:
+                        break
+
+                    async with connection.begin():
+                        await connection.execute(statement, chunk)
+
+                    total += len(chunk)
+                    chunk_index += 1
 
         except SQLAlchemyError as e:
             with self._metrics_lock:
                 self._queries_failed += 1
-            self._logger.error(f"Database error: {str(e)}")
-            raise DatabaseError(f"Database error: {str(e)}", query=sql) from e
+            self._logger.error(
+                f"Bulk write to {table.name} failed: {str(e)}",
+                extra={"chunk": chunk_index, "rows_committed": total},
+            )
+            raise DatabaseError(
+                f"Bulk write to {table.name} failed after {total} rows: {str(e)}",
+                details={"chunk": chunk_index, "rows_committed": total},
+            ) from e
 
-    async def execute_async(self, statement: Any) -> List[Dict[str, Any]]:
-        """Execute a SQLAlchemy statement asynchronously and return the results as dictionaries.
+        self._logger.debug(
+            f"Bulk wrote {total} rows to {table.name} in {chunk_index} chunks"
+        )
+        return total
+
+    def _resolve_table(self, table: Union[Table, Type[Any], str]) -> Table:
+        """Resolve a table argument to a SQLAlchemy Table.
 
         Args:
-            statement: A SQLAlchemy statement to execute.
+            table: A Table, a mapped model class, or the name of a table.
 
         Returns:
-            List[Dict[str, Any]]: The query results as a list of dictionaries.
+            Table: The resolved table. Unknown names are reflected from the
+                database once and cached.
 
         Raises:
-            DatabaseError: If a database error occurs or async is not supported.
+            DatabaseError: If the table cannot be resolved.
         """
-        if not self._initialized or not self._async_engine:
-            raise DatabaseError("Async database not initialized")
+        if isinstance(table, Table):
+            return table
 
-        try:
-            async with self._async_engine.connect() as connection:
-                result = await connection.execute(statement)
-                # Convert to dictionaries
-                return [dict(row._mapping) for row in result]
+        if hasattr(table, "__table__"):
+            return cast(Table, table.__table__)
 
-        except SQLAlchemyError as e:
-            with self._metrics_lock:
-                self._queries_failed += 1
-            self._logger.error(f"Database error: {str(e)}")
-            raise DatabaseError(f"Database error: {str(e)}") from e
+        if isinstance(table, str):
+            if table in Base.metadata.tables:
+                return Base.metadata.tables[table]
 
-        except Exception as e:
-            with self._metrics_lock:
-                self._queries_failed += 1
-            self._logger.error(f"Error during async database operation: {str(e)}")
-            raise
+            with self._reflected_tables_lock:
+                if table not in self._reflected_tables:
+                    try:
+                        self._reflected_tables[table] = Table(
+                            table, MetaData(), autoload_with=self._engine
+                        )
+                    except SQLAlchemyError as e:
+                        raise DatabaseError(f"Unknown table {table}: {str(e)}") from e
+
+                return self._reflected_tables[table]
+
+        raise DatabaseError(f"Cannot resolve table from {table!r}")
 
     def create_tables(self) -> None:
         """Create all tables defined in the Base class.
@@ -392,7 +3112,7 @@ class DatabaseManager(QorzenManager):
             raise DatabaseError("Database Manager not initialized")
 
         try:
-            Base.metadata.create_all(self._engine)
+            Base.metadata.create_all(self._get_write_engine())
             self._logger.info("Created database tables")
 
         except SQLAlchemyError as e:
@@ -405,11 +3125,10 @@ class DatabaseManager(QorzenManager):
         Raises:
             DatabaseError: If the tables cannot be created or async is not supported.
         """
-        if not self._initialized or not self._async_engine:
-            raise DatabaseError("Async database not initialized")
+        engine = self._require_async()
 
         try:
-            async with self._async_engine.begin() as conn:
+            async with engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
             self._logger.info("Created database tables asynchronously")
 
@@ -471,8 +3190,8 @@ class DatabaseManager(QorzenManager):
             context: The execution context.
             executemany: Whether this is an executemany operation.
         """
-        # Store the start time in the connection info
-        context._query_start_time = time.time()
+        # Store the start time in the execution context
+        context._query_start_time = time.perf_counter()
 
     def _after_cursor_execute(
         self,
@@ -494,25 +3213,284 @@ class DatabaseManager(QorzenManager):
             executemany: Whether this is an executemany operation.
         """
         # Calculate the query time
-        query_time = time.time() - context._query_start_time
+        query_time = time.perf_counter() - context._query_start_time
+
+        # Statements that return no rows report the rows they affected
+        rows = 0
+        if cursor.description is None and cursor.rowcount and cursor.rowcount > 0:
+            rows = cursor.rowcount
+
+        slow = query_time >= self._slow_query_threshold
+        explain = False
 
         with self._metrics_lock:
             self._queries_total += 1
-
-            # Keep only the last 100 query times
             self._query_times.append(query_time)
-            if len(self._query_times) > 100:
-                self._query_times.pop(0)
 
-            # Log slow queries
-            if query_time > 1.0:  # 1 second
+            stats = self._get_statement_stats(statement)
+            stats.record(query_time, rows)
+
+            if slow:
+                stats.slow += 1
+                explain = (
+                    self._explain_slow_queries
+                    and stats.plan is None
+                    and not executemany
+                    and statement.lstrip()[:6].upper() == "SELECT"
+                )
+
+        # Remembered so rows fetched later can be attributed to the statement
+        context._qorzen_fingerprint = stats.fingerprint
+
+        if self._prometheus is not None:
+            self._prometheus["duration"].labels(stats.fingerprint).observe(query_time)
+            if rows:
+                self._prometheus["rows"].labels(stats.fingerprint).inc(rows)
+            if slow:
+                self._prometheus["slow"].labels(stats.fingerprint).inc()
+
+        if not slow:
+            return
+
+        plan = self._explain(conn, statement, parameters) if explain else None
+        entry = {
+            "timestamp": time.time(),
+            "fingerprint": stats.fingerprint,
+            "duration_ms": round(query_time * 1000, 2),
+            "statement": statement[:1000],  # Truncate long queries
+            "plan": plan,
+        }
+
+        with self._metrics_lock:
+            if plan is not None:
+                stats.plan = plan
+            self._slow_queries.append(entry)
+
+        self._logger.warning(
+            f"Slow query: {query_time:.3f}s",
+            extra={
+                "query_time": query_time,
+                "fingerprint": stats.fingerprint,
+                "statement": statement[:1000],
+            },
+        )
+
+    def _handle_error(self, exception_context: Any) -> None:
+        """Event hook that counts failed executions per statement.
+
+        Args:
+            exception_context: The SQLAlchemy exception context.
+        """
+        statement = exception_context.statement
+        if not statement:
+            return
+
+        with self._metrics_lock:
+            self._get_statement_stats(statement).errors += 1
+
+    def _get_statement_stats(self, statement: str) -> _StatementStats:
+        """Get or create the statistics for a statement. Caller holds the lock.
+
+        Once max_statements fingerprints are tracked, further statements are
+        grouped under a single "other" entry to bound memory and label count.
+        """
+        fingerprint, normalized = _fingerprint_statement(statement)
+        stats = self._statement_stats.get(fingerprint)
+        if stats is not None:
+            return stats
+
+        if len(self._statement_stats) >= self._max_statements:
+            fingerprint, normalized = "other", "<other statements>"
+            stats = self._statement_stats.get(fingerprint)
+            if stats is not None:
+                return stats
+
+        stats = _StatementStats(fingerprint, normalized, self._stats_sample_size)
+        self._statement_stats[fingerprint] = stats
+        return stats
+
+    def _record_rows(self, result: Any, rows: int) -> None:
+        """Attribute rows fetched from a result to its statement."""
+        context = getattr(result, "context", None)
+        fingerprint = getattr(context, "_qorzen_fingerprint", None)
+        if fingerprint is None or not rows:
+            return
+
+        with self._metrics_lock:
+            stats = self._statement_stats.get(fingerprint)
+            if stats is not None:
+                stats.rows += rows
+
+        if self._prometheus is not None:
+            self._prometheus["rows"].labels(fingerprint).inc(rows)
+
+    def _explain(
+        self, conn: Connection, statement: str, parameters: Any
+    ) -> Optional[List[str]]:
+        """Capture the query plan of a slow statement.
+
+        The EXPLAIN runs on a raw cursor of the same connection so it sees the
+        same transaction and doesn't fire the cursor events again.
+
+        Args:
+            conn: The SQLAlchemy connection the statement ran on.
+            statement: The SQL statement.
+            parameters: The DBAPI parameters the statement ran with.
+
+        Returns:
+            Optional[List[str]]: One line per plan row, or None if unavailable.
+        """
+        prefix = _EXPLAIN_PREFIXES.get(self._db_type)
+        if prefix is None:
+            return None
+
+        try:
+            cursor = conn.connection.dbapi_connection.cursor()
+            try:
+                cursor.execute(prefix + statement, parameters)
+                return [
+                    " | ".join(str(value) for value in row) for row in cursor.fetchall()
+                ]
+            finally:
+                cursor.close()
+        except Exception as e:
+            self._logger.debug(f"Failed to explain slow query: {str(e)}")
+            return None
+
+    def _get_prometheus_metrics(self) -> Optional[Dict[str, Any]]:
+        """Get the process-wide Prometheus query metrics, creating them once.
+
+        Returns:
+            Optional[Dict[str, Any]]: The metrics, or None if prometheus_client
+                is not installed.
+        """
+        global _prometheus_metrics
+
+        with _prometheus_metrics_lock:
+            if _prometheus_metrics is not None:
+                return _prometheus_metrics
+
+            try:
+                from prometheus_client import Counter, Histogram
+            except ImportError:
                 self._logger.warning(
-                    f"Slow query: {query_time:.3f}s",
-                    extra={
-                        "query_time": query_time,
-                        "statement": statement[:1000],  # Truncate long queries
-                    },
+                    "Failed to import prometheus_client. Please install with "
+                    "'pip install prometheus-client'"
                 )
+                return None
+
+            _prometheus_metrics = {
+                "duration": Histogram(
+                    "qorzen_db_query_duration_seconds",
+                    "Database query execution time by statement fingerprint",
+                    ["fingerprint"],
+                    buckets=(
+                        0.001,
+                        0.005,
+                        0.01,
+                        0.025,
+                        0.05,
+                        0.1,
+                        0.25,
+                        0.5,
+                        1.0,
+                        2.5,
+                        5.0,
+                        10.0,
+                    ),
+                ),
+                "rows": Counter(
+                    "qorzen_db_query_rows_total",
+                    "Rows returned or affected by statement fingerprint",
+                    ["fingerprint"],
+                ),
+                "slow": Counter(
+                    "qorzen_db_slow_queries_total",
+                    "Queries slower than the slow query threshold",
+                    ["fingerprint"],
+                ),
+                "checkout_wait": Histogram(
+                    "qorzen_db_pool_checkout_wait_seconds",
+                    "Time spent waiting to check a connection out of a pool",
+                    ["pool"],
+                    buckets=(
+                        0.0001,
+                        0.0005,
+                        0.001,
+                        0.005,
+                        0.01,
+                        0.05,
+                        0.1,
+                        0.5,
+                        1.0,
+                        5.0,
+                        30.0,
+                    ),
+                ),
+                "checkout_held": Histogram(
+                    "qorzen_db_pool_connection_held_seconds",
+                    "Time a connection was checked out of a pool before its return",
+                    ["pool"],
+                    buckets=(
+                        0.001,
+                        0.01,
+                        0.1,
+                        0.5,
+                        1.0,
+                        5.0,
+                        10.0,
+                        30.0,
+                        60.0,
+                        300.0,
+                    ),
+                ),
+                "pool_exhausted": Counter(
+                    "qorzen_db_pool_exhausted_total",
+                    "Checkouts that queued or timed out because a pool was exhausted",
+                    ["pool"],
+                ),
+                "long_held": Counter(
+                    "qorzen_db_pool_long_held_connections_total",
+                    "Connections held longer than the leak threshold",
+                    ["pool"],
+                ),
+            }
+            return _prometheus_metrics
+
+    def get_query_stats(
+        self, limit: int = 20, order_by: str = "total_time_ms"
+    ) -> List[Dict[str, Any]]:
+        """Get per-statement statistics, most expensive first.
+
+        Args:
+            limit: Maximum number of statements to return.
+            order_by: The statistic to sort by, e.g. "total_time_ms", "count",
+                "p95_ms" or "rows".
+
+        Returns:
+            List[Dict[str, Any]]: Statistics for each statement fingerprint.
+        """
+        with self._metrics_lock:
+            stats = [s.to_dict() for s in self._statement_stats.values()]
+
+        stats.sort(key=lambda s: s.get(order_by) or 0, reverse=True)
+        return stats[:limit]
+
+    def get_slow_queries(self) -> List[Dict[str, Any]]:
+        """Get the most recent slow queries, oldest first.
+
+        Returns:
+            List[Dict[str, Any]]: The slow query log entries.
+        """
+        with self._metrics_lock:
+            return list(self._slow_queries)
+
+    def reset_query_stats(self) -> None:
+        """Clear per-statement statistics and the slow query log."""
+        with self._metrics_lock:
+            self._statement_stats.clear()
+            self._slow_queries.clear()
+            self._query_times.clear()
 
     def _on_config_changed(self, key: str, value: Any) -> None:
         """Handle configuration changes for the database.
@@ -541,6 +3519,11 @@ class DatabaseManager(QorzenManager):
         try:
             self._logger.info("Shutting down Database Manager")
 
+            if self._leak_monitor_thread is not None:
+                self._leak_monitor_stop.set()
+                self._leak_monitor_thread.join(timeout=5.0)
+                self._leak_monitor_thread = None
+
             # Close any active sessions
             with self._active_sessions_lock:
                 for session in list(self._active_sessions):
@@ -550,13 +3533,27 @@ class DatabaseManager(QorzenManager):
                         pass
                 self._active_sessions.clear()
 
+            if self._sqlite_writer is not None:
+                self._sqlite_writer.stop()
+                self._sqlite_writer = None
+
+            if self._query_cache is not None:
+                self._query_cache.clear()
+
             # Dispose of engines
             if self._engine:
                 self._engine.dispose()
 
+            if self._writer_engine:
+                self._writer_engine.dispose()
+
+            for replica in self._replicas:
+                replica.engine.dispose()
+            self._replicas.clear()
+            self._monitored_engines.clear()
+
             if self._async_engine:
-                # Async engines need to be disposed differently
-                pass  # No direct way to dispose async engines, they will be garbage collected
+                self._dispose_async_engine()
 
             # Unregister config listener
             self._config_manager.unregister_listener(
@@ -575,6 +3572,38 @@ class DatabaseManager(QorzenManager):
                 manager_name=self.name,
             ) from e
 
+    def _dispose_async_engine(self) -> None:
+        """Close the async engine's connections from synchronous code.
+
+        The connections are closed on the bound event loop if it is still
+        running, otherwise on a temporary loop. When neither is possible, as
+        when called from inside a running loop, the pool is dropped without
+        closing its connections.
+        """
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+
+        loop = self._event_loop
+        try:
+            if running is not None:
+                # Blocking here would deadlock the loop the dispose runs on
+                self._async_engine.sync_engine.dispose(close=False)
+            elif loop is not None and loop.is_running():
+                asyncio.run_coroutine_threadsafe(
+                    self._async_engine.dispose(), loop
+                ).result(timeout=5.0)
+            else:
+                asyncio.run(self._async_engine.dispose())
+        except Exception as e:
+            self._logger.warning(f"Failed to close async connections: {str(e)}")
+            self._async_engine.sync_engine.dispose(close=False)
+
+        with self._active_sessions_lock:
+            self._active_async_sessions.clear()
+        self._event_loop = None
+
     def status(self) -> Dict[str, Any]:
         """Get the status of the Database Manager.
 
@@ -588,16 +3617,27 @@ class DatabaseManager(QorzenManager):
             pool_status = {}
             if self._engine:
                 try:
-                    pool = self._engine.pool
-                    pool_status = {
-                        "size": pool.size(),
-                        "checkedin": pool.checkedin(),
-                        "checkedout": pool.checkedout(),
-                        "overflow": getattr(pool, "overflow", 0),
-                    }
+                    pool_status = _pool_status(self._engine.pool)
+                    pool_status["pre_ping"] = self._pool_pre_ping
+                    if self._writer_engine:
+                        pool_status["writer"] = _pool_status(self._writer_engine.pool)
+                    if self._async_engine:
+                        pool_status["async"] = _pool_status(
+                            self._async_engine.sync_engine.pool
+                        )
+                    pool_status["leak_threshold_seconds"] = self._leak_threshold
                 except:
                     pool_status = {"error": "Failed to get pool status"}
 
+            with self._metrics_lock:
+                replica_status = {
+                    "count": len(self._replicas),
+                    "max_lag_seconds": self._replica_max_lag,
+                    "primary_reads": self._primary_reads,
+                    "fallbacks": self._replica_fallbacks,
+                    "replicas": [r.to_dict() for r in self._replicas],
+                }
+
             # Calculate query statistics
             with self._metrics_lock:
                 query_stats = {
@@ -624,6 +3664,19 @@ class DatabaseManager(QorzenManager):
                         }
                     )
 
+                query_stats.update(
+                    {
+                        "slow_threshold_ms": round(
+                            self._slow_query_threshold * 1000, 2
+                        ),
+                        "slow_queries": len(self._slow_queries),
+                        "statements_tracked": len(self._statement_stats),
+                    }
+                )
+
+            query_stats["top_statements"] = self.get_query_stats(limit=10)
+            query_stats["recent_slow_queries"] = self.get_slow_queries()[-10:]
+
             # Check connection
             connection_ok = self.check_connection()
 
@@ -633,12 +3686,36 @@ class DatabaseManager(QorzenManager):
                         "type": self._db_type,
                         "connection_ok": connection_ok,
                         "async_supported": self._async_engine is not None,
+                        "event_loop_bound": self._event_loop is not None,
                     },
                     "pool": pool_status,
+                    "replicas": replica_status,
+                    "sqlite": (
+                        {
+                            "pragmas": self._sqlite_pragmas,
+                            "writer": (
+                                self._sqlite_writer.stats()
+                                if self._sqlite_writer is not None
+                                else None
+                            ),
+                        }
+                        if self._db_type == "sqlite"
+                        else None
+                    ),
                     "sessions": {
                         "active": len(self._active_sessions),
+                        "async_active": len(self._active_async_sessions),
                     },
                     "queries": query_stats,
+                    "statement_cache": {
+                        **self._text_cache.stats(),
+                        "compiled_cache_size": self._compiled_cache_size,
+                    },
+                    "query_cache": (
+                        self._query_cache.stats()
+                        if self._query_cache is not None
+                        else {"enabled": False}
+                    ),
                 }
             )
 
@@ -1,17 +1,53 @@
 from __future__ import annotations
 
+import collections
+import concurrent.futures
+import contextlib
+import ctypes
+import datetime
+import errno
+import fnmatch
+import gzip
 import hashlib
+import io
+import json
+import mmap
 import os
 import pathlib
+import select
 import shutil
+import sqlite3
+import stat
+import struct
+import sys
+import tarfile
 import threading
 import time
+import uuid
+import zipfile
+import zlib
 from dataclasses import dataclass
 from enum import Enum
-from typing import Any, BinaryIO, Dict, List, Optional, Set, Tuple, Union, cast
+from typing import (
+    Any,
+    BinaryIO,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+    cast,
+)
 
 from qorzen.core.base import QorzenManager
 from qorzen.utils.exceptions import (
+    EventBusError,
     FileError,
     ManagerInitializationError,
     ManagerShutdownError,
@@ -50,441 +86,4637 @@ class FileInfo:
     metadata: Dict[str, Any] = None  # Additional metadata
 
 
-class FileManager(QorzenManager):
-    """Manages file system interactions for the application.
+class ChangeType(Enum):
+    """Types of changes reported by the file watcher."""
 
-    The File Manager is responsible for handling file system operations such as
-    reading, writing, and managing directories. It provides a standardized way
-    for other components to interact with the file system and ensures proper
-    error handling, locking, and organization of files.
-    """
+    CREATED = "created"
+    MODIFIED = "modified"
+    DELETED = "deleted"
 
-    def __init__(self, config_manager: Any, logger_manager: Any) -> None:
-        """Initialize the File Manager.
 
-        Args:
-            config_manager: The Configuration Manager to use for file settings.
-            logger_manager: The Logging Manager to use for logging.
-        """
-        super().__init__(name="FileManager")
-        self._config_manager = config_manager
-        self._logger = logger_manager.get_logger("file_manager")
+@dataclass
+class FileChange:
+    """The net change to one path over a debounce window."""
+
+    path: str  # Absolute path that changed
+    change_type: ChangeType  # What happened to it
+    is_directory: bool  # Whether the path is a directory
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the change to a dictionary for event payloads."""
+        return {
+            "path": self.path,
+            "change_type": self.change_type.value,
+            "is_directory": self.is_directory,
+        }
 
-        # File paths
-        self._base_directory: Optional[pathlib.Path] = None
-        self._temp_directory: Optional[pathlib.Path] = None
-        self._plugin_data_directory: Optional[pathlib.Path] = None
-        self._backup_directory: Optional[pathlib.Path] = None
 
-        # Map of file extensions to file types
-        self._file_type_mapping: Dict[str, FileType] = {
-            # Text files
-            ".txt": FileType.TEXT,
-            ".md": FileType.TEXT,
-            ".csv": FileType.TEXT,
-            ".json": FileType.TEXT,
-            ".xml": FileType.TEXT,
-            ".html": FileType.TEXT,
-            ".htm": FileType.TEXT,
-            ".css": FileType.TEXT,
-            ".js": FileType.TEXT,
-            ".py": FileType.TEXT,
-            # Config files
-            ".yaml": FileType.CONFIG,
-            ".yml": FileType.CONFIG,
-            ".ini": FileType.CONFIG,
-            ".conf": FileType.CONFIG,
-            ".cfg": FileType.CONFIG,
-            ".toml": FileType.CONFIG,
-            # Log files
-            ".log": FileType.LOG,
-            # Data files
-            ".db": FileType.DATA,
-            ".sqlite": FileType.DATA,
-            ".sqlite3": FileType.DATA,
-            ".parquet": FileType.DATA,
-            ".avro": FileType.DATA,
-            # Image files
-            ".jpg": FileType.IMAGE,
-            ".jpeg": FileType.IMAGE,
-            ".png": FileType.IMAGE,
-            ".gif": FileType.IMAGE,
-            ".bmp": FileType.IMAGE,
-            ".svg": FileType.IMAGE,
-            ".webp": FileType.IMAGE,
-            # Document files
-            ".pdf": FileType.DOCUMENT,
-            ".doc": FileType.DOCUMENT,
-            ".docx": FileType.DOCUMENT,
-            ".xls": FileType.DOCUMENT,
-            ".xlsx": FileType.DOCUMENT,
-            ".ppt": FileType.DOCUMENT,
-            ".pptx": FileType.DOCUMENT,
-            ".odt": FileType.DOCUMENT,
-            ".ods": FileType.DOCUMENT,
-            # Audio files
-            ".mp3": FileType.AUDIO,
-            ".wav": FileType.AUDIO,
-            ".flac": FileType.AUDIO,
-            ".ogg": FileType.AUDIO,
-            ".aac": FileType.AUDIO,
-            # Video files
-            ".mp4": FileType.VIDEO,
-            ".avi": FileType.VIDEO,
-            ".mkv": FileType.VIDEO,
-            ".mov": FileType.VIDEO,
-            ".webm": FileType.VIDEO,
-        }
+# Algorithms compute_file_hash() accepts. xxh3_128 needs the xxhash package
+# and isn't cryptographic, so it only suits deduplication and change checks.
+_HASH_ALGORITHMS = ("sha256", "sha1", "md5", "blake2b", "xxh3_128")
 
-        # File locks for thread safety
-        self._file_locks: Dict[str, threading.RLock] = {}
-        self._locks_lock = threading.RLock()
 
-    def initialize(self) -> None:
-        """Initialize the File Manager.
+def _new_hasher(algorithm: str) -> Any:
+    """Create a hash object for one of _HASH_ALGORITHMS."""
+    if algorithm == "xxh3_128":
+        import xxhash
 
-        Creates necessary directories and sets up file paths based on configuration.
+        return xxhash.xxh3_128()
+    return hashlib.new(algorithm)
 
-        Raises:
-            ManagerInitializationError: If initialization fails.
-        """
-        try:
-            # Get configuration
-            file_config = self._config_manager.get("files", {})
-            base_dir = file_config.get("base_directory", "data")
-            temp_dir = file_config.get("temp_directory", "data/temp")
-            plugin_data_dir = file_config.get("plugin_data_directory", "data/plugins")
-            backup_dir = file_config.get("backup_directory", "data/backups")
 
-            # Convert to absolute paths if not already
-            self._base_directory = pathlib.Path(base_dir).absolute()
-            self._temp_directory = pathlib.Path(temp_dir).absolute()
-            self._plugin_data_directory = pathlib.Path(plugin_data_dir).absolute()
-            self._backup_directory = pathlib.Path(backup_dir).absolute()
+def _hash_file(path: str, algorithm: str = "sha256") -> str:
+    """Compute the hash of a file's contents."""
+    with open(path, "rb") as f:
+        return hashlib.file_digest(f, lambda: _new_hasher(algorithm)).hexdigest()
 
-            # Create directories if they don't exist
-            os.makedirs(self._base_directory, exist_ok=True)
-            os.makedirs(self._temp_directory, exist_ok=True)
-            os.makedirs(self._plugin_data_directory, exist_ok=True)
-            os.makedirs(self._backup_directory, exist_ok=True)
 
-            # Register for config changes
-            self._config_manager.register_listener("files", self._on_config_changed)
+def _hash_version(
+    path: str, algorithm: str, attempts: int = 3
+) -> Tuple[str, Optional[os.stat_result]]:
+    """Hash a file and get the version of it that was hashed.
 
-            self._logger.info(
-                f"File Manager initialized with base directory: {self._base_directory}"
-            )
-            self._initialized = True
-            self._healthy = True
+    The file is statted through the open descriptor before and after reading,
+    and read again if it changed in between.
 
-        except Exception as e:
-            self._logger.error(f"Failed to initialize File Manager: {str(e)}")
-            raise ManagerInitializationError(
-                f"Failed to initialize FileManager: {str(e)}",
-                manager_name=self.name,
-            ) from e
+    Returns:
+        Tuple[str, Optional[os.stat_result]]: The hexadecimal hash, and the
+        file's stat result, or None if it kept changing while being read.
+    """
+    for _ in range(attempts):
+        with open(path, "rb") as f:
+            before = os.fstat(f.fileno())
+            digest = hashlib.file_digest(f, lambda: _new_hasher(algorithm))
+            after = os.fstat(f.fileno())
+        if _HashCache.key(before, algorithm) == _HashCache.key(after, algorithm):
+            return digest.hexdigest(), after
+    return digest.hexdigest(), None
 
-    def get_file_path(self, path: str, directory_type: str = "base") -> pathlib.Path:
-        """Get the absolute path for a file, relative to a specified directory.
 
-        Args:
-            path: The path to the file, relative to the specified directory.
-            directory_type: The type of directory to use as the base. One of:
-                            "base", "temp", "plugin_data", "backup".
+def _subtree_bounds(path: str) -> Tuple[str, str]:
+    """Get the range of strings that are paths strictly below a directory.
 
-        Returns:
-            pathlib.Path: The absolute path to the file.
+    "0" sorts right after "/", so every path below the directory falls in
+    [path + "/", path + "0") and the range is served by the path index.
+    """
+    return path + "/", path + "0"
 
-        Raises:
-            FileError: If the directory type is invalid or the manager is not initialized.
-        """
-        if not self._initialized:
-            raise FileError(
-                "File Manager not initialized",
-                file_path=path,
-            )
 
-        # Get the base directory for the specified type
-        if directory_type == "base":
-            base_dir = self._base_directory
-        elif directory_type == "temp":
-            base_dir = self._temp_directory
-        elif directory_type == "plugin_data":
-            base_dir = self._plugin_data_directory
-        elif directory_type == "backup":
-            base_dir = self._backup_directory
-        else:
-            raise FileError(
-                f"Invalid directory type: {directory_type}",
-                file_path=path,
-            )
+class _FileIndex:
+    """Persistent file metadata for the managed directories, kept in SQLite.
 
-        # Convert the path to an absolute path
-        path_obj = pathlib.Path(path)
-        if path_obj.is_absolute():
-            # Check if the path is within the allowed directories
-            for allowed_dir in [
-                self._base_directory,
-                self._temp_directory,
-                self._plugin_data_directory,
-                self._backup_directory,
-            ]:
-                if str(path_obj).startswith(str(allowed_dir)):
-                    return path_obj
+    Each row holds what a listing needs (size, times, inode, type and an
+    optional content hash), so listings, directory sizes and change queries
+    are answered without touching the disk.
 
-            raise FileError(
-                f"Path is outside of allowed directories: {path}",
-                file_path=path,
-            )
+    refresh() stats every indexed directory but re-lists only those whose
+    mtime changed, which is when entries were added, removed or renamed.
+    Files rewritten in place don't change their directory's mtime; writes
+    made through the File Manager update the index directly, and a full
+    refresh restats everything else.
+    """
 
-        # Join the path with the base directory
-        return base_dir / path
+    # A directory modified this recently may change again within the same
+    # mtime tick, so it is re-listed on the next refresh
+    RACY_SECONDS = 2.0
 
-    def ensure_directory(self, path: str, directory_type: str = "base") -> pathlib.Path:
-        """Ensure that a directory exists, creating it if necessary.
+    # Stored as a directory's mtime until it has been listed
+    UNSCANNED = -1
 
-        Args:
-            path: The path to the directory, relative to the specified directory.
-            directory_type: The type of directory to use as the base. One of:
-                            "base", "temp", "plugin_data", "backup".
+    # Values of the is_dir column; symlinks to directories aren't descended into
+    FILE = 0
+    DIRECTORY = 1
+    DIRECTORY_LINK = 2
 
-        Returns:
-            pathlib.Path: The absolute path to the directory.
+    def __init__(
+        self,
+        path: str,
+        roots: Sequence[str],
+        file_type_for: Callable[[str, bool], FileType],
+        logger: Any,
+        hash_files: bool = False,
+        tombstone_retention: float = 7 * 86400.0,
+        hash_file: Optional[Callable[[str], str]] = None,
+        excluded: Sequence[str] = (),
+    ) -> None:
+        self.path = path
+        # Nested roots are already covered by the roots containing them
+        self.roots = [
+            r
+            for r in sorted(set(roots))
+            if not any(r.startswith(o + os.sep) for o in roots if o != r)
+        ]
+        self.hash_files = hash_files
+        self.tombstone_retention = tombstone_retention
+        self._file_type_for = file_type_for
+        self._logger = logger
+        self._hash_file = hash_file or _hash_file
+        # Our own database files, and other databases in the roots
+        self._excluded = {
+            p + suffix
+            for p in (path, *excluded)
+            for suffix in ("", "-wal", "-shm", "-journal")
+        }
 
-        Raises:
-            FileError: If the directory cannot be created.
-        """
-        try:
-            full_path = self.get_file_path(path, directory_type)
-            os.makedirs(full_path, exist_ok=True)
-            return full_path
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()  # Guards the connection
+        self._refresh_lock = threading.Lock()  # One refresh at a time
+
+        self.ready = False  # Whether a refresh has completed
+        self.last_refresh: Optional[float] = None
+        self.last_refresh_stats: Dict[str, Any] = {}
+
+    def open(self) -> None:
+        """Open the index database, creating its tables if needed."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS files (
+                    path TEXT PRIMARY KEY,
+                    parent TEXT NOT NULL,
+                    name TEXT NOT NULL,
+                    is_dir INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    mtime REAL NOT NULL,
+                    ctime REAL NOT NULL,
+                    inode INTEGER NOT NULL,
+                    file_type TEXT NOT NULL,
+                    content_hash TEXT,
+                    indexed_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_files_parent ON files (parent);
+                CREATE INDEX IF NOT EXISTS ix_files_indexed_at ON files (indexed_at);
+                CREATE TABLE IF NOT EXISTS deleted (
+                    path TEXT PRIMARY KEY,
+                    deleted_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS ix_deleted_deleted_at
+                    ON deleted (deleted_at);
+                """
+            )
 
-        except Exception as e:
-            raise FileError(
-                f"Failed to create directory: {str(e)}",
-                file_path=path,
-            ) from e
+    def close(self) -> None:
+        """Close the index database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
 
-    def read_text(self, path: str, directory_type: str = "base") -> str:
-        """Read text from a file.
+    def covers(self, path: str) -> bool:
+        """Check whether a path is inside one of the indexed roots."""
+        return any(path == r or path.startswith(r + os.sep) for r in self.roots)
+
+    def refresh(
+        self, full: bool = False, start: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Bring the index up to date with the disk.
 
         Args:
-            path: The path to the file, relative to the specified directory.
-            directory_type: The type of directory to use as the base.
+            full: Re-list every directory and restat every file, instead of
+                only the directories whose mtime changed.
+            start: Refresh only this directory and what is below it.
 
         Returns:
-            str: The text content of the file.
-
-        Raises:
-            FileError: If the file cannot be read.
+            Dict[str, Any]: Counts of directories checked and listed, and of
+                entries added, updated and removed.
         """
-        try:
-            full_path = self.get_file_path(path, directory_type)
+        counts = {"checked": 0, "listed": 0, "added": 0, "updated": 0, "removed": 0}
+        started = time.perf_counter()
 
-            # Get a lock for this file
-            lock = self._get_file_lock(str(full_path))
+        with self._refresh_lock:
+            stack = [start] if start is not None else list(reversed(self.roots))
+            while stack:
+                directory = stack.pop()
+                try:
+                    st = os.stat(directory)
+                except FileNotFoundError:
+                    counts["removed"] += self._remove(directory, time.time())
+                    continue
+                except OSError as e:
+                    self._logger.warning(
+                        f"Failed to index {directory}: {str(e)}",
+                        extra={"file_path": directory},
+                    )
+                    continue
 
-            with lock:
-                with open(full_path, "r", encoding="utf-8") as f:
-                    return f.read()
+                counts["checked"] += 1
+                row = self._fetchone(
+                    "SELECT mtime_ns FROM files WHERE path = ?", (directory,)
+                )
+                if full or row is None or row[0] != st.st_mtime_ns:
+                    subdirs = self._scan(directory, st, full, counts)
+                    counts["listed"] += 1
+                else:
+                    subdirs = [
+                        r[0]
+                        for r in self._fetchall(
+                            "SELECT path FROM files WHERE parent = ? AND is_dir = 1",
+                            (directory,),
+                        )
+                    ]
+                stack.extend(reversed(subdirs))
 
-        except Exception as e:
-            raise FileError(
-                f"Failed to read text file: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
-            ) from e
+            if start is None:
+                self._execute(
+                    "DELETE FROM deleted WHERE deleted_at < ?",
+                    (time.time() - self.tombstone_retention,),
+                )
+                self.ready = True
+                self.last_refresh = time.time()
+                counts["duration_ms"] = round((time.perf_counter() - started) * 1000, 2)
+                self.last_refresh_stats = counts
 
-    def write_text(
-        self,
-        path: str,
-        content: str,
-        directory_type: str = "base",
-        create_dirs: bool = True,
-    ) -> None:
-        """Write text to a file.
+        return counts
 
-        Args:
-            path: The path to the file, relative to the specified directory.
-            content: The text content to write.
-            directory_type: The type of directory to use as the base.
-            create_dirs: Whether to create parent directories if they don't exist.
+    def _scan(
+        self, directory: str, st: os.stat_result, full: bool, counts: Dict[str, Any]
+    ) -> List[str]:
+        """List one directory and apply the differences to the index.
 
-        Raises:
-            FileError: If the file cannot be written.
+        Returns:
+            List[str]: The subdirectories to visit next.
         """
-        try:
-            full_path = self.get_file_path(path, directory_type)
-
-            # Create parent directories if needed
-            if create_dirs:
-                os.makedirs(full_path.parent, exist_ok=True)
+        known = {
+            r[0]: r[1:]
+            for r in self._fetchall(
+                "SELECT name, is_dir, size, mtime_ns, inode, content_hash "
+                "FROM files WHERE parent = ?",
+                (directory,),
+            )
+        }
+        now = time.time()
+        rows: List[Tuple[Any, ...]] = []
+        subdirs: List[str] = []
+        seen: Set[str] = set()
 
-            # Get a lock for this file
-            lock = self._get_file_lock(str(full_path))
+        try:
+            with os.scandir(directory) as iterator:
+                for entry in iterator:
+                    if entry.path in self._excluded:
+                        continue
+                    try:
+                        entry_st = entry.stat()
+                        kind = self.DIRECTORY if entry.is_dir() else self.FILE
+                        if kind == self.DIRECTORY and entry.is_symlink():
+                            kind = self.DIRECTORY_LINK
+                    except OSError:
+                        continue  # Broken symlink or removed while listing
+
+                    seen.add(entry.name)
+                    if kind == self.DIRECTORY:
+                        subdirs.append(entry.path)
+
+                    old = known.get(entry.name)
+                    if kind != self.FILE:
+                        if old is not None and old[0] == kind:
+                            continue  # Updated when the directory itself is listed
+                        rows.append(
+                            self._row(entry.path, entry_st, kind, self.UNSCANNED, now)
+                        )
+                        counts["added" if old is None else "updated"] += 1
+                        continue
 
-            with lock:
-                # Write to a temporary file, then rename to ensure atomic write
-                temp_path = str(full_path) + ".tmp"
-                with open(temp_path, "w", encoding="utf-8") as f:
-                    f.write(content)
+                    unchanged = (
+                        old is not None
+                        and old[0] == self.FILE
+                        and old[1:4]
+                        == (entry_st.st_size, entry_st.st_mtime_ns, entry_st.st_ino)
+                    )
+                    if unchanged and not (full and self.hash_files and old[4] is None):
+                        continue
 
-                # Rename the temporary file to the target file
-                os.replace(temp_path, full_path)
+                    rows.append(
+                        self._row(
+                            entry.path, entry_st, self.FILE, entry_st.st_mtime_ns, now
+                        )
+                    )
+                    counts["added" if old is None else "updated"] += 1
 
-        except Exception as e:
-            raise FileError(
+        except OSError as e:
+            self._logger.warning(
+                f"Failed to list {directory}: {str(e)}",
+                extra={"file_path": directory},
+            )
+            return []
+
+        # A directory that just changed may change again unnoticed within
+        # the same mtime tick, so it stays marked for re-listing
+        racy = now - st.st_mtime < self.RACY_SECONDS
+        own = self._row(
+            directory,
+            st,
+            self.DIRECTORY,
+            self.UNSCANNED if racy else st.st_mtime_ns,
+            now,
+        )
+
+        with self._lock:
+            self._conn.execute("BEGIN")
+            try:
+                for name in set(known) - seen:
+                    counts["removed"] += self._remove(
+                        os.path.join(directory, name), now
+                    )
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO files VALUES "
+                    "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._conn.executemany(
+                    "DELETE FROM deleted WHERE path = ?", [(r[0],) for r in rows]
+                )
+                # Keep the directory's indexed_at unless it is new
+                self._conn.execute(
+                    "INSERT INTO files VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT (path) DO UPDATE SET mtime_ns = excluded.mtime_ns, "
+                    "mtime = excluded.mtime, size = excluded.size, "
+                    "ctime = excluded.ctime",
+                    own,
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+
+        return subdirs
+
+    def _row(
+        self, path: str, st: os.stat_result, kind: int, mtime_ns: int, now: float
+    ) -> Tuple[Any, ...]:
+        """Build an index row for a path."""
+        name = os.path.basename(path)
+        content_hash = None
+        if self.hash_files and kind == self.FILE:
+            try:
+                content_hash = self._hash_file(path)
+            except OSError:
+                pass
+        return (
+            path,
+            os.path.dirname(path),
+            name,
+            kind,
+            st.st_size,
+            mtime_ns,
+            st.st_mtime,
+            st.st_ctime,
+            st.st_ino,
+            self._file_type_for(name, kind != self.FILE).value,
+            content_hash,
+            now,
+        )
+
+    def update(self, path: str) -> None:
+        """Re-index one path after it was written, copied, moved or deleted.
+
+        Args:
+            path: The absolute path that changed.
+        """
+        if self._conn is None or path in self._excluded or not self.covers(path):
+            return
+
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            self._remove(path, time.time())
+            return
+
+        if os.path.isdir(path):
+            self.refresh(full=True, start=path)
+            return
+
+        row = self._row(path, st, self.FILE, st.st_mtime_ns, time.time())
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO files VALUES "
+                "(?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                row,
+            )
+            self._conn.execute("DELETE FROM deleted WHERE path = ?", (path,))
+
+    def _remove(self, path: str, now: float) -> int:
+        """Remove a path and everything below it, leaving tombstones.
+
+        Returns:
+            int: The number of rows removed.
+        """
+        low, high = _subtree_bounds(path)
+        with self._lock:
+            paths = [
+                r[0]
+                for r in self._conn.execute(
+                    "SELECT path FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+                    (path, low, high),
+                )
+            ]
+            if not paths:
+                return 0
+            self._conn.execute(
+                "DELETE FROM files WHERE path = ? OR (path >= ? AND path < ?)",
+                (path, low, high),
+            )
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO deleted VALUES (?, ?)",
+                [(p, now) for p in paths],
+            )
+        return len(paths)
+
+    def list(self, directory: str, recursive: bool) -> List[Tuple[Any, ...]]:
+        """Get the rows of the entries in a directory, or below it."""
+        if recursive:
+            low, high = _subtree_bounds(directory)
+            return self._fetchall(
+                "SELECT * FROM files WHERE path >= ? AND path < ? ORDER BY path",
+                (low, high),
+            )
+        return self._fetchall(
+            "SELECT * FROM files WHERE parent = ? ORDER BY path", (directory,)
+        )
+
+    def size(self, directory: str) -> Tuple[int, int]:
+        """Get the total size and number of the files below a directory."""
+        low, high = _subtree_bounds(directory)
+        row = self._fetchone(
+            "SELECT COALESCE(SUM(size), 0), COUNT(*) FROM files "
+            "WHERE path >= ? AND path < ? AND is_dir = 0",
+            (low, high),
+        )
+        return row[0], row[1]
+
+    def changed_since(
+        self, since: float, directory: str
+    ) -> Tuple[List[Tuple[Any, ...]], List[str]]:
+        """Get the rows indexed and the paths deleted after a time."""
+        low, high = _subtree_bounds(directory)
+        changed = self._fetchall(
+            "SELECT * FROM files WHERE indexed_at > ? AND path >= ? AND path < ? "
+            "ORDER BY indexed_at",
+            (since, low, high),
+        )
+        deleted = [
+            r[0]
+            for r in self._fetchall(
+                "SELECT path FROM deleted WHERE deleted_at > ? AND path >= ? "
+                "AND path < ? ORDER BY deleted_at",
+                (since, low, high),
+            )
+        ]
+        return changed, deleted
+
+    def stats(self) -> Dict[str, Any]:
+        """Get index statistics."""
+        files, directories = self._fetchone(
+            "SELECT COALESCE(SUM(is_dir = 0), 0), COALESCE(SUM(is_dir != 0), 0) "
+            "FROM files"
+        )
+        return {
+            "path": self.path,
+            "roots": self.roots,
+            "ready": self.ready,
+            "files": files,
+            "directories": directories,
+            "hash_files": self.hash_files,
+            "last_refresh": self.last_refresh,
+            "last_refresh_stats": self.last_refresh_stats,
+        }
+
+    def _execute(self, sql: str, params: Sequence[Any] = ()) -> None:
+        with self._lock:
+            self._conn.execute(sql, params)
+
+    def _fetchone(self, sql: str, params: Sequence[Any] = ()) -> Any:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchone()
+
+    def _fetchall(self, sql: str, params: Sequence[Any] = ()) -> List[Any]:
+        with self._lock:
+            return self._conn.execute(sql, params).fetchall()
+
+
+class _HashCache:
+    """Persistent content hashes keyed by file identity and version.
+
+    A file's device, inode, size and mtime_ns change whenever its content
+    can have changed, so a hash stored under them holds until then and an
+    unchanged file is never read twice.
+    """
+
+    # A file modified this recently may be written again within the same
+    # mtime tick without changing its key, so its hash isn't stored yet
+    RACY_SECONDS = 2.0
+
+    def __init__(self, path: str, max_entries: int = 100000) -> None:
+        self.path = path
+        self.max_entries = max_entries
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()  # Guards the connection and counters
+        self._entries = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(st: os.stat_result, algorithm: str) -> Tuple[int, int, int, int, str]:
+        """Get the cache key of a file version."""
+        return st.st_dev, st.st_ino, st.st_size, st.st_mtime_ns, algorithm
+
+    def open(self) -> None:
+        """Open the cache database, creating its table if needed."""
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._conn = sqlite3.connect(
+            self.path, check_same_thread=False, isolation_level=None
+        )
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS hashes (
+                    dev INTEGER NOT NULL,
+                    ino INTEGER NOT NULL,
+                    size INTEGER NOT NULL,
+                    mtime_ns INTEGER NOT NULL,
+                    algorithm TEXT NOT NULL,
+                    digest TEXT NOT NULL,
+                    hashed_at REAL NOT NULL,
+                    PRIMARY KEY (dev, ino, size, mtime_ns, algorithm)
+                ) WITHOUT ROWID;
+                CREATE INDEX IF NOT EXISTS ix_hashes_hashed_at ON hashes (hashed_at);
+                """
+            )
+            row = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()
+            self._entries = row[0]
+
+    def close(self) -> None:
+        """Close the cache database."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def get_many(
+        self, keys: Sequence[Tuple[int, int, int, int, str]]
+    ) -> Dict[Tuple[int, int, int, int, str], str]:
+        """Get the cached hashes of file versions.
+
+        Returns:
+            Dict[Tuple[int, int, int, int, str], str]: The hash of each key
+            found in the cache.
+        """
+        found = {}
+        with self._lock:
+            if self._conn is None:
+                return found
+            for key in keys:
+                row = self._conn.execute(
+                    "SELECT digest FROM hashes WHERE dev = ? AND ino = ? AND size = ? "
+                    "AND mtime_ns = ? AND algorithm = ?",
+                    key,
+                ).fetchone()
+                if row is not None:
+                    found[key] = row[0]
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def put_many(
+        self, entries: Sequence[Tuple[Tuple[int, int, int, int, str], str]]
+    ) -> int:
+        """Store the hashes of file versions, skipping recently modified ones.
+
+        Returns:
+            int: The number of hashes stored.
+        """
+        now = time.time()
+        racy_after = time.time_ns() - int(self.RACY_SECONDS * 1e9)
+        rows = [(*key, digest, now) for key, digest in entries if key[3] < racy_after]
+        if not rows:
+            return 0
+
+        with self._lock:
+            if self._conn is None:
+                return 0
+            self._conn.execute("BEGIN")
+            try:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO hashes VALUES (?, ?, ?, ?, ?, ?, ?)", rows
+                )
+                self._entries += len(rows)
+                if self._entries > self.max_entries * 1.1:
+                    self._prune()
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return len(rows)
+
+    def _prune(self) -> None:
+        """Drop the oldest hashes down to max_entries."""
+        self._conn.execute(
+            "DELETE FROM hashes WHERE hashed_at <= (SELECT hashed_at FROM hashes "
+            "ORDER BY hashed_at DESC LIMIT 1 OFFSET ?)",
+            (self.max_entries,),
+        )
+        self._entries = self._conn.execute("SELECT COUNT(*) FROM hashes").fetchone()[0]
+
+    def stats(self) -> Dict[str, Any]:
+        """Get cache statistics."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "path": self.path,
+                "entries": self._entries,
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }
+
+
+# Net effect of two changes to a path within one debounce window; None means
+# the path ends up as it was before the window. Repeats of a change keep it.
+_COALESCED: Dict[Tuple[ChangeType, ChangeType], Optional[ChangeType]] = {
+    (ChangeType.CREATED, ChangeType.MODIFIED): ChangeType.CREATED,
+    (ChangeType.CREATED, ChangeType.DELETED): None,
+    (ChangeType.MODIFIED, ChangeType.CREATED): ChangeType.MODIFIED,
+    (ChangeType.MODIFIED, ChangeType.DELETED): ChangeType.DELETED,
+    (ChangeType.DELETED, ChangeType.CREATED): ChangeType.MODIFIED,
+    (ChangeType.DELETED, ChangeType.MODIFIED): ChangeType.MODIFIED,
+}
+
+# A change reported by a watcher backend: path, change type, is_directory
+_RawChange = Tuple[str, ChangeType, bool]
+
+
+def _in_tree(path: str, root: str, recursive: bool) -> bool:
+    """Check whether a path is a root, or below it if the root is recursive."""
+    return path == root or (recursive and path.startswith(root + os.sep))
+
+
+class _Inotify:
+    """Watches directories with Linux inotify.
+
+    An inotify watch covers a single directory, so every directory below a
+    recursive root gets its own watch, and directories created later are
+    watched as their creation is reported.
+    """
+
+    IN_MODIFY = 0x00000002
+    IN_ATTRIB = 0x00000004
+    IN_CLOSE_WRITE = 0x00000008
+    IN_MOVED_FROM = 0x00000040
+    IN_MOVED_TO = 0x00000080
+    IN_CREATE = 0x00000100
+    IN_DELETE = 0x00000200
+    IN_DELETE_SELF = 0x00000400
+    IN_MOVE_SELF = 0x00000800
+    IN_Q_OVERFLOW = 0x00004000
+    IN_IGNORED = 0x00008000
+    IN_ONLYDIR = 0x01000000
+    IN_ISDIR = 0x40000000
+    IN_NONBLOCK = 0o4000
+    IN_CLOEXEC = 0o2000000
+
+    MASK = (
+        IN_MODIFY
+        | IN_ATTRIB
+        | IN_CLOSE_WRITE
+        | IN_MOVED_FROM
+        | IN_MOVED_TO
+        | IN_CREATE
+        | IN_DELETE
+        | IN_DELETE_SELF
+        | IN_MOVE_SELF
+        | IN_ONLYDIR
+    )
+
+    # struct inotify_event: wd, mask, cookie and len, followed by len bytes
+    # of NUL-padded name
+    _EVENT = struct.Struct("iIII")
+
+    def __init__(self, libc: Any) -> None:
+        self._libc = libc
+        self._fd = libc.inotify_init1(self.IN_NONBLOCK | self.IN_CLOEXEC)
+        if self._fd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno))
+
+        self.roots: Dict[str, bool] = {}  # Root -> recursive
+        self._paths: Dict[int, str] = {}  # Watch descriptor -> directory
+        self._wds: Dict[str, int] = {}  # Directory -> watch descriptor
+        self.overflowed = False  # Set when the kernel queue overflowed
+
+    @staticmethod
+    def load() -> Optional[Any]:
+        """Get libc with the inotify functions, or None where unavailable."""
+        if not sys.platform.startswith("linux"):
+            return None
+
+        try:
+            libc = ctypes.CDLL(None, use_errno=True)
+            libc.inotify_init1.argtypes = [ctypes.c_int]
+            libc.inotify_add_watch.argtypes = [
+                ctypes.c_int,
+                ctypes.c_char_p,
+                ctypes.c_uint32,
+            ]
+            libc.inotify_rm_watch.argtypes = [ctypes.c_int, ctypes.c_int]
+        except (OSError, AttributeError):
+            return None
+        return libc
+
+    @property
+    def watch_count(self) -> int:
+        return len(self._wds)
+
+    def close(self) -> None:
+        """Close the inotify instance, removing every watch."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+        self._paths.clear()
+        self._wds.clear()
+
+    def add(self, root: str, recursive: bool) -> None:
+        """Watch a directory, and every directory below it if recursive.
+
+        Raises:
+            OSError: If a directory can't be watched, e.g. because it doesn't
+                exist or fs.inotify.max_user_watches was reached.
+        """
+        self.roots[root] = recursive or self.roots.get(root, False)
+        try:
+            self._watch(root)
+            if recursive:
+                self._watch_tree(root)
+        except OSError:
+            self.remove(root)
+            raise
+
+    def remove(self, root: str) -> None:
+        """Stop watching a root, keeping watches other roots still need."""
+        recursive = self.roots.pop(root, None)
+        if recursive is None:
+            return
+
+        for path in list(self._wds):
+            if _in_tree(path, root, recursive) and not self._covered(path):
+                self._unwatch(path)
+
+    def wait(self, timeout: float) -> bool:
+        """Wait up to timeout seconds for events to read."""
+        try:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+        except (OSError, ValueError):
+            return False
+        return bool(ready)
+
+    def read(self) -> List[_RawChange]:
+        """Read the queued events and convert them to changes."""
+        try:
+            data = os.read(self._fd, 65536)
+        except (BlockingIOError, OSError):
+            return []
+
+        changes: List[_RawChange] = []
+        offset = 0
+        while offset + self._EVENT.size <= len(data):
+            wd, mask, _, length = self._EVENT.unpack_from(data, offset)
+            offset += self._EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & self.IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+
+            directory = self._paths.get(wd)
+            if directory is None:
+                continue
+
+            if mask & self.IN_IGNORED:
+                # The kernel removed the watch, e.g. its directory was deleted
+                del self._paths[wd]
+                if self._wds.get(directory) == wd:
+                    del self._wds[directory]
+                continue
+
+            if not name:
+                # An event on the watched directory itself
+                if mask & (self.IN_DELETE_SELF | self.IN_MOVE_SELF) and (
+                    directory in self.roots
+                ):
+                    changes.append((directory, ChangeType.DELETED, True))
+                continue
+
+            path = os.path.join(directory, os.fsdecode(name))
+            is_dir = bool(mask & self.IN_ISDIR)
+            if mask & (self.IN_CREATE | self.IN_MOVED_TO):
+                changes.append((path, ChangeType.CREATED, is_dir))
+                if is_dir and self._recursive(directory):
+                    # Entries created before the watch was added aren't
+                    # reported, so everything found is reported as created
+                    try:
+                        self._watch(path)
+                        changes.extend(
+                            (p, ChangeType.CREATED, d)
+                            for p, d in self._watch_tree(path)
+                        )
+                    except FileNotFoundError:
+                        pass
+            elif mask & (self.IN_DELETE | self.IN_MOVED_FROM):
+                changes.append((path, ChangeType.DELETED, is_dir))
+                if is_dir and mask & self.IN_MOVED_FROM:
+                    # Watches follow the moved directory, so drop them
+                    for moved in list(self._wds):
+                        if _in_tree(moved, path, True):
+                            self._unwatch(moved)
+            else:
+                changes.append((path, ChangeType.MODIFIED, is_dir))
+
+        return changes
+
+    def _watch(self, directory: str) -> None:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), self.MASK
+        )
+        if wd < 0:
+            errno = ctypes.get_errno()
+            raise OSError(errno, os.strerror(errno), directory)
+        self._paths[wd] = directory
+        self._wds[directory] = wd
+
+    def _unwatch(self, directory: str) -> None:
+        wd = self._wds.pop(directory, None)
+        if wd is not None:
+            self._paths.pop(wd, None)
+            # Fails harmlessly if the kernel already removed the watch
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _watch_tree(self, directory: str) -> List[Tuple[str, bool]]:
+        """Watch every directory below one.
+
+        Returns:
+            List[Tuple[str, bool]]: The paths found below the directory, and
+            whether each is a directory.
+        """
+        found = []
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            try:
+                with os.scandir(current) as it:
+                    entries = list(it)
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+
+            for entry in entries:
+                is_dir = entry.is_dir(follow_symlinks=False)
+                found.append((entry.path, is_dir))
+                if is_dir:
+                    try:
+                        self._watch(entry.path)
+                    except (FileNotFoundError, NotADirectoryError, PermissionError):
+                        continue
+                    stack.append(entry.path)
+        return found
+
+    def _covered(self, path: str) -> bool:
+        """Check whether a remaining root needs a directory watched."""
+        return any(_in_tree(path, r, rec) for r, rec in self.roots.items())
+
+    def _recursive(self, directory: str) -> bool:
+        """Check whether new directories in a directory need watches."""
+        return any(_in_tree(directory, r, True) for r, rec in self.roots.items() if rec)
+
+
+class _Poller:
+    """Finds changes by comparing snapshots of directory trees.
+
+    Used where inotify isn't available. Each poll re-lists every directory,
+    so it costs as much as a recursive listing of the watched roots.
+    """
+
+    def __init__(self) -> None:
+        self.roots: Dict[str, bool] = {}  # Root -> recursive
+        self._snapshots: Dict[str, Dict[str, Tuple[int, int, int, bool]]] = {}
+
+    def add(self, root: str, recursive: bool) -> None:
+        """Start polling a directory."""
+        self.roots[root] = recursive or self.roots.get(root, False)
+        self._snapshots[root] = self._snapshot(root, self.roots[root])
+
+    def remove(self, root: str) -> None:
+        """Stop polling a directory."""
+        self.roots.pop(root, None)
+        self._snapshots.pop(root, None)
+
+    def poll(self) -> List[_RawChange]:
+        """Get the changes since the previous poll."""
+        changes: List[_RawChange] = []
+        for root, recursive in self.roots.items():
+            old = self._snapshots[root]
+            new = self._snapshot(root, recursive)
+            for path, entry in new.items():
+                previous = old.get(path)
+                if previous is None:
+                    changes.append((path, ChangeType.CREATED, entry[3]))
+                elif previous != entry and not (entry[3] and previous[3]):
+                    # A directory's mtime changes with its entries, which are
+                    # reported themselves
+                    changes.append((path, ChangeType.MODIFIED, entry[3]))
+            for path in old.keys() - new.keys():
+                changes.append((path, ChangeType.DELETED, old[path][3]))
+            self._snapshots[root] = new
+        return changes
+
+    @staticmethod
+    def _snapshot(
+        root: str, recursive: bool
+    ) -> Dict[str, Tuple[int, int, int, bool]]:
+        """Get the mtime, size, inode and type of every entry below a root."""
+        snapshot = {}
+        stack = [root]
+        while stack:
+            try:
+                with os.scandir(stack.pop()) as it:
+                    for entry in it:
+                        try:
+                            st = entry.stat(follow_symlinks=False)
+                        except OSError:
+                            continue
+                        is_dir = stat.S_ISDIR(st.st_mode)
+                        snapshot[entry.path] = (
+                            st.st_mtime_ns,
+                            st.st_size,
+                            st.st_ino,
+                            is_dir,
+                        )
+                        if is_dir and recursive:
+                            stack.append(entry.path)
+            except OSError:
+                continue
+        return snapshot
+
+
+class _FileWatcher:
+    """Watches directories and reports debounced batches of changes.
+
+    Changes are collected until none has arrived for `debounce` seconds, or
+    for at most `max_delay` seconds after the first, then passed to the
+    callback as one batch holding the net change to each path. A burst of
+    writes to a file becomes one change, and a file created and deleted
+    within the window isn't reported at all.
+
+    Directories are watched with inotify on Linux. Roots inotify can't watch,
+    and every root on other platforms, are polled every `poll_interval`.
+    """
+
+    # How long to wait for events when nothing is pending
+    IDLE_WAIT = 0.5
+
+    def __init__(
+        self,
+        callback: Callable[[List[FileChange], bool], None],
+        logger: Any,
+        backend: str = "auto",
+        debounce: float = 0.2,
+        max_delay: float = 2.0,
+        poll_interval: float = 2.0,
+        ignore: Sequence[str] = (),
+    ) -> None:
+        self._callback = callback
+        self._logger = logger
+        self.debounce = debounce
+        self.max_delay = max(max_delay, debounce)
+        self.poll_interval = poll_interval
+        self._ignore = tuple(ignore)
+
+        self._inotify: Optional[_Inotify] = None
+        if backend in ("auto", "inotify"):
+            libc = _Inotify.load()
+            try:
+                self._inotify = _Inotify(libc) if libc is not None else None
+            except OSError as e:
+                self._logger.warning(f"Failed to initialize inotify: {str(e)}")
+            if self._inotify is None and backend == "inotify":
+                self._logger.warning("inotify is not available, polling instead")
+        self._poller = _Poller()
+
+        self._refs: Dict[str, int] = {}  # Root -> number of add() calls
+        self._lock = threading.Lock()  # Guards the backends
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.batches = 0
+        self.changes = 0
+        self.overflows = 0
+
+    @property
+    def backend(self) -> str:
+        return "inotify" if self._inotify is not None else "polling"
+
+    def start(self) -> None:
+        """Start the thread that reads and dispatches changes."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="file-watcher", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the thread and remove every watch."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        with self._lock:
+            if self._inotify is not None:
+                self._inotify.close()
+            self._poller = _Poller()
+            self._refs.clear()
+
+    def add(self, root: str, recursive: bool = True) -> None:
+        """Watch a directory. Each add() needs a matching remove().
+
+        Args:
+            root: The absolute path of the directory.
+            recursive: Also watch every directory below it.
+        """
+        with self._lock:
+            self._refs[root] = self._refs.get(root, 0) + 1
+            if self._inotify is not None:
+                try:
+                    self._inotify.add(root, recursive)
+                    return
+                except OSError as e:
+                    self._logger.warning(
+                        f"Failed to watch {root} with inotify, polling it instead: "
+                        f"{str(e)}",
+                        extra={"file_path": root},
+                    )
+            self._poller.add(root, recursive)
+
+    def remove(self, root: str) -> None:
+        """Stop watching a directory once every add() of it is removed."""
+        with self._lock:
+            refs = self._refs.get(root, 0) - 1
+            if refs > 0:
+                self._refs[root] = refs
+                return
+            self._refs.pop(root, None)
+            if self._inotify is not None:
+                self._inotify.remove(root)
+            self._poller.remove(root)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get watcher statistics."""
+        with self._lock:
+            return {
+                "backend": self.backend,
+                "inotify_roots": (
+                    sorted(self._inotify.roots) if self._inotify is not None else []
+                ),
+                "inotify_watches": (
+                    self._inotify.watch_count if self._inotify is not None else 0
+                ),
+                "polled_roots": sorted(self._poller.roots),
+                "debounce": self.debounce,
+                "max_delay": self.max_delay,
+                "poll_interval": self.poll_interval,
+                "batches": self.batches,
+                "changes": self.changes,
+                "overflows": self.overflows,
+            }
+
+    def _run(self) -> None:
+        pending: Dict[str, FileChange] = {}
+        overflow = False
+        first = last = 0.0
+        next_poll = time.monotonic() + self.poll_interval
+
+        while not self._stop.is_set():
+            now = time.monotonic()
+            if pending or overflow:
+                timeout = min(last + self.debounce, first + self.max_delay) - now
+            else:
+                timeout = self.IDLE_WAIT
+            if self._poller.roots:
+                timeout = min(timeout, next_poll - now)
+            timeout = max(timeout, 0.0)
+
+            # Wait without the lock, so add() and remove() aren't blocked
+            if self._inotify is not None:
+                ready = self._inotify.wait(timeout)
+            else:
+                ready = False
+                self._stop.wait(timeout)
+
+            raw: List[_RawChange] = []
+            overflowed = False
+            try:
+                with self._lock:
+                    if ready and self._inotify is not None:
+                        raw.extend(self._inotify.read())
+                        if self._inotify.overflowed:
+                            # Events were lost; consumers have to rescan
+                            self._inotify.overflowed = False
+                            self.overflows += 1
+                            overflowed = True
+                    if self._poller.roots and time.monotonic() >= next_poll:
+                        raw.extend(self._poller.poll())
+                        next_poll = time.monotonic() + self.poll_interval
+            except Exception as e:
+                self._logger.error(f"Failed to read file changes: {str(e)}")
+
+            now = time.monotonic()
+            if overflowed:
+                if not pending and not overflow:
+                    first = now
+                last = now
+                overflow = True
+            for path, change_type, is_dir in raw:
+                if path.startswith(self._ignore):
+                    continue
+                if not pending and not overflow:
+                    first = now
+                last = now
+                self._coalesce(pending, FileChange(path, change_type, is_dir))
+
+            if (pending or overflow) and (
+                now - last >= self.debounce or now - first >= self.max_delay
+            ):
+                batch = list(pending.values())
+                pending = {}
+                self._dispatch(batch, overflow)
+                overflow = False
+
+    @staticmethod
+    def _coalesce(pending: Dict[str, FileChange], change: FileChange) -> None:
+        """Merge a change into the pending changes to its path."""
+        previous = pending.get(change.path)
+        if previous is None:
+            pending[change.path] = change
+            return
+
+        change_type = _COALESCED.get(
+            (previous.change_type, change.change_type), change.change_type
+        )
+        if change_type is None:
+            del pending[change.path]
+        else:
+            previous.change_type = change_type
+            previous.is_directory = change.is_directory
+
+    def _dispatch(self, batch: List[FileChange], overflow: bool) -> None:
+        self.batches += 1
+        self.changes += len(batch)
+        try:
+            self._callback(batch, overflow)
+        except Exception as e:
+            self._logger.error(f"Failed to handle file changes: {str(e)}")
+
+
+# Values of files.fsync: "none" leaves flushing to the OS, "file" syncs file
+# contents before the rename, and "full" also syncs the directory entry
+_FSYNC_POLICIES = ("none", "file", "full")
+
+
+def _fsync_directory(path: str) -> None:
+    """Make renames in a directory durable, where directories can be opened."""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _atomic_write(path: str, data: bytes, fsync: str) -> None:
+    """Replace a file's contents atomically.
+
+    The data is written to a uniquely named file in the same directory,
+    which is renamed over the file, so readers and a crash see either the
+    old or the new content. Existing permissions are kept.
+
+    Args:
+        path: The absolute path of the file.
+        data: The new content.
+        fsync: One of _FSYNC_POLICIES.
+    """
+    temp_path = f"{path}.{uuid.uuid4().hex[:12]}.tmp"
+    fd = os.open(
+        temp_path,
+        os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+        0o666,
+    )
+    try:
+        try:
+            if hasattr(os, "fchmod"):
+                os.fchmod(fd, stat.S_IMODE(os.stat(path).st_mode))
+        except FileNotFoundError:
+            pass
+
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view) :]
+        if fsync != "none":
+            os.fsync(fd)
+        os.close(fd)
+        fd = -1
+
+        os.replace(temp_path, path)
+    except BaseException:
+        if fd >= 0:
+            os.close(fd)
+        try:
+            os.unlink(temp_path)
+        except OSError:
+            pass
+        raise
+
+    if fsync == "full":
+        _fsync_directory(os.path.dirname(path))
+
+
+class _WriteBehind:
+    """Buffers writes and flushes only the latest content of each file.
+
+    Writes to a file between flushes replace each other in memory, so a file
+    rewritten many times a second is written to disk once per flush. Flushes
+    are atomic, so after a crash each file holds either its previous or its
+    last flushed content; only writes since the last flush are lost. Each
+    file is flushed with the strongest fsync policy of the writes it merged.
+    """
+
+    def __init__(
+        self,
+        write: Callable[[Dict[str, Tuple[bytes, str]]], Set[str]],
+        logger: Any,
+        flush_interval: float = 1.0,
+        max_bytes: int = 8 * 1024 * 1024,
+    ) -> None:
+        self._write = write  # Writes a batch and returns the paths that failed
+        self._logger = logger
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+
+        self._pending: Dict[str, Tuple[bytes, str]] = {}  # Path -> data, fsync
+        self._pending_bytes = 0
+        self._flushing: Set[str] = set()  # Paths of the batch being written
+        self._lock = threading.Lock()  # Guards the pending writes
+        self._flush_lock = threading.Lock()  # One flush at a time
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+        self.writes = 0
+        self.coalesced = 0
+        self.flushes = 0
+        self.files_written = 0
+        self.failures = 0
+
+    def start(self) -> None:
+        """Start the thread that flushes every flush_interval seconds."""
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, name="file-write-behind", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the flush thread and flush what is pending."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=10.0)
+            self._thread = None
+        self.flush()
+
+    def put(self, path: str, data: bytes, fsync: str) -> None:
+        """Buffer the new content of a file, replacing any pending content.
+
+        Args:
+            path: The file's absolute path.
+            data: The new content.
+            fsync: The files.fsync policy to flush it with.
+        """
+        with self._lock:
+            previous = self._pending.get(path)
+            if previous is not None:
+                self._pending_bytes -= len(previous[0])
+                self.coalesced += 1
+                fsync = max(fsync, previous[1], key=_FSYNC_POLICIES.index)
+            self._pending[path] = (data, fsync)
+            self._pending_bytes += len(data)
+            self.writes += 1
+            full = self._pending_bytes >= self.max_bytes
+
+        if full:
+            self.flush()
+
+    def pending(self, path: str) -> bool:
+        """Check whether a path, or a path below it, has unwritten content."""
+        with self._lock:
+            if path in self._pending or path in self._flushing:
+                return True
+            if not self._pending and not self._flushing:
+                return False
+            return any(
+                _in_tree(p, path, True)
+                for paths in (self._pending, self._flushing)
+                for p in paths
+            )
+
+    def flush(self, path: Optional[str] = None) -> int:
+        """Write pending content to disk.
+
+        Returns once any flush already in progress has finished too, so the
+        disk is current for the paths afterwards.
+
+        Args:
+            path: Flush only this path and the paths below it.
+
+        Returns:
+            int: The number of files written.
+        """
+        with self._flush_lock:
+            with self._lock:
+                if path is None:
+                    batch, self._pending = self._pending, {}
+                else:
+                    batch = {
+                        p: entry
+                        for p, entry in self._pending.items()
+                        if _in_tree(p, path, True)
+                    }
+                    for p in batch:
+                        del self._pending[p]
+                self._pending_bytes -= sum(len(e[0]) for e in batch.values())
+                self._flushing = set(batch)
+
+            if not batch:
+                return 0
+
+            try:
+                failed = self._write(batch)
+            except Exception as e:
+                self._logger.error(f"Failed to flush buffered writes: {str(e)}")
+                failed = set(batch)
+
+            with self._lock:
+                self._flushing = set()
+                # Retry failed writes with the next flush, unless newer
+                # content was buffered meanwhile
+                for p in failed:
+                    if p not in self._pending:
+                        self._pending[p] = batch[p]
+                        self._pending_bytes += len(batch[p][0])
+                self.flushes += 1
+                self.files_written += len(batch) - len(failed)
+                self.failures += len(failed)
+            return len(batch) - len(failed)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get write-behind statistics."""
+        with self._lock:
+            return {
+                "flush_interval": self.flush_interval,
+                "pending_files": len(self._pending),
+                "pending_bytes": self._pending_bytes,
+                "writes": self.writes,
+                "coalesced": self.coalesced,
+                "flushes": self.flushes,
+                "files_written": self.files_written,
+                "failures": self.failures,
+            }
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.flush_interval):
+            try:
+                self.flush()
+            except Exception as e:
+                self._logger.error(f"Failed to flush buffered writes: {str(e)}")
+
+
+# ioctl making a file share another's extents on copy-on-write filesystems
+# (btrfs, XFS with reflink, bcachefs), from linux/fs.h
+_FICLONE = 0x40049409
+
+# errnos meaning a copy method isn't supported for a pair of files, so the
+# next one is tried
+_COPY_UNSUPPORTED = {
+    errno.EOPNOTSUPP,
+    errno.ENOTSUP,
+    errno.EXDEV,
+    errno.EINVAL,
+    errno.ENOSYS,
+    errno.ENOTTY,
+}
+
+
+class _CopyEngine:
+    """Copies file contents with the cheapest method the filesystems support.
+
+    Methods are tried in order: a reflink, which shares extents and copies
+    no data; copy_file_range(), which copies inside the kernel and lets the
+    filesystem or an NFS/SMB server offload it; sendfile(), also inside the
+    kernel; and a read/write loop. A method that fails as unsupported
+    between two devices isn't tried for them again.
+    """
+
+    METHODS = ("reflink", "copy_file_range", "sendfile", "userspace")
+    BUFFER_SIZE = 1024 * 1024
+
+    def __init__(self, reflink: bool = True) -> None:
+        linux = sys.platform.startswith("linux")
+        self._available = [
+            m
+            for m, available in (
+                ("reflink", reflink and linux),
+                ("copy_file_range", hasattr(os, "copy_file_range")),
+                # sendfile() only writes to regular files on Linux
+                ("sendfile", linux and hasattr(os, "sendfile")),
+                ("userspace", True),
+            )
+            if available
+        ]
+        self._unsupported: Dict[Tuple[int, int], Set[str]] = {}
+        self._lock = threading.Lock()  # Guards the statistics
+        self.counts: Dict[str, int] = {m: 0 for m in self.METHODS}
+        self.bytes_copied = 0
+
+    def copy(self, src_fd: int, dst_fd: int) -> str:
+        """Copy the contents of one open file to another, empty one.
+
+        Returns:
+            str: The method used.
+        """
+        devices = (os.fstat(src_fd).st_dev, os.fstat(dst_fd).st_dev)
+        unsupported = self._unsupported.get(devices, set())
+        for method in self._available:
+            if method in unsupported:
+                continue
+            try:
+                copied = getattr(self, f"_{method}")(src_fd, dst_fd)
+                if not copied and method != "userspace" and os.fstat(src_fd).st_size:
+                    # Some filesystems report nothing to copy instead of failing
+                    raise OSError(errno.ENOTSUP, f"{method} copied nothing")
+            except OSError as e:
+                if e.errno not in _COPY_UNSUPPORTED or method == "userspace":
+                    raise
+                with self._lock:
+                    self._unsupported.setdefault(devices, set()).add(method)
+                # Start over in case the failed method copied part of the file
+                os.ftruncate(dst_fd, 0)
+                os.lseek(src_fd, 0, os.SEEK_SET)
+                os.lseek(dst_fd, 0, os.SEEK_SET)
+                continue
+
+            with self._lock:
+                self.counts[method] += 1
+                self.bytes_copied += copied
+            return method
+        raise OSError(errno.ENOTSUP, "No copy method available")
+
+    def stats(self) -> Dict[str, Any]:
+        """Get copy statistics."""
+        with self._lock:
+            return {
+                "methods": list(self._available),
+                "copies": dict(self.counts),
+                "bytes_copied": self.bytes_copied,
+            }
+
+    @staticmethod
+    def _reflink(src_fd: int, dst_fd: int) -> int:
+        import fcntl
+
+        fcntl.ioctl(dst_fd, _FICLONE, src_fd)
+        return os.fstat(src_fd).st_size
+
+    @staticmethod
+    def _copy_file_range(src_fd: int, dst_fd: int) -> int:
+        copied = 0
+        while True:
+            count = os.copy_file_range(src_fd, dst_fd, 1 << 30)
+            if not count:
+                return copied
+            copied += count
+
+    @staticmethod
+    def _sendfile(src_fd: int, dst_fd: int) -> int:
+        copied = 0
+        while True:
+            count = os.sendfile(dst_fd, src_fd, copied, 1 << 30)
+            if not count:
+                return copied
+            copied += count
+
+    def _userspace(self, src_fd: int, dst_fd: int) -> int:
+        copied = 0
+        while True:
+            view = memoryview(os.read(src_fd, self.BUFFER_SIZE))
+            if not view:
+                return copied
+            copied += len(view)
+            while view:
+                view = view[os.write(dst_fd, view) :]
+
+
+class _Codec:
+    """A compression format, with the optional package it needs loaded.
+
+    Data compressed in separate blocks forms complete gzip members or zstd
+    or LZ4 frames, and concatenated members and frames decompress as one
+    stream, so large files can be compressed a block per thread.
+    """
+
+    EXTENSIONS = {"gzip": ".gz", "zstd": ".zst", "lz4": ".lz4"}
+    PACKAGES = {"zstd": "zstandard", "lz4": "lz4"}
+    DEFAULT_LEVELS = {"gzip": 6, "zstd": 3, "lz4": 0}
+
+    def __init__(self, name: str, level: Optional[int] = None) -> None:
+        """Load a codec.
+
+        Raises:
+            ValueError: If the codec is unknown.
+            ImportError: If the package the codec needs isn't installed.
+        """
+        if name not in self.EXTENSIONS:
+            raise ValueError(f"Unsupported compression codec: {name}")
+        self.name = name
+        self.extension = self.EXTENSIONS[name]
+        self.level = self.DEFAULT_LEVELS[name] if level is None else level
+        if name == "zstd":
+            import zstandard
+
+            self._module: Any = zstandard
+        elif name == "lz4":
+            import lz4.frame
+
+            self._module = lz4.frame
+        else:
+            self._module = gzip
+
+    @classmethod
+    def name_for(cls, path: str) -> Optional[str]:
+        """Get the codec a file name's extension implies."""
+        if path.endswith(".tgz"):
+            return "gzip"
+        for name, extension in cls.EXTENSIONS.items():
+            if path.endswith(extension):
+                return name
+        return None
+
+    def compress(self, data: bytes) -> bytes:
+        """Compress data as one complete member or frame."""
+        if self.name == "zstd":
+            return self._module.ZstdCompressor(level=self.level).compress(data)
+        if self.name == "lz4":
+            return self._module.compress(data, compression_level=self.level)
+        return gzip.compress(data, compresslevel=self.level, mtime=0)
+
+    def decompress(self, data: bytes) -> bytes:
+        """Decompress data produced by compress()."""
+        if self.name == "zstd":
+            return self._module.ZstdDecompressor().decompress(data)
+        return self._module.decompress(data)
+
+    def reader(self, raw: BinaryIO) -> BinaryIO:
+        """Wrap an open file to read its decompressed content.
+
+        The file stays open when the returned stream is closed.
+        """
+        if self.name == "zstd":
+            return self._module.ZstdDecompressor().stream_reader(
+                raw, read_across_frames=True, closefd=False
+            )
+        if self.name == "lz4":
+            return self._module.LZ4FrameFile(raw, mode="rb")
+        return gzip.GzipFile(fileobj=raw, mode="rb")
+
+    def open(self, path: str) -> BinaryIO:
+        """Open a file to write compressed data to, one stream for all of it."""
+        if self.name == "zstd":
+            compressor = self._module.ZstdCompressor(level=self.level)
+            return self._module.open(path, "wb", cctx=compressor)
+        if self.name == "lz4":
+            return self._module.open(path, "wb", compression_level=self.level)
+        return gzip.open(path, "wb", compresslevel=self.level)
+
+
+class _WorkerPool(concurrent.futures.Executor):
+    """The bounded thread pool the File Manager's parallel operations share.
+
+    Threads are started on demand, up to files.workers in all, however many
+    operations run at once; each operation also keeps no more tasks in
+    flight than its own worker setting. Work started on a pool thread runs
+    inline, so nested operations can't deadlock waiting for a free thread.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: Optional[concurrent.futures.ThreadPoolExecutor] = None
+        self._lock = threading.Lock()  # Guards _executor
+        self._local = threading.local()
+
+    def in_worker(self) -> bool:
+        """Check whether the calling thread is one of the pool's threads."""
+        return getattr(self._local, "worker", False)
+
+    def submit(self, fn: Callable[..., Any], /, *args: Any, **kwargs: Any) -> Any:
+        with self._lock:
+            if self._executor is None:
+                self._executor = concurrent.futures.ThreadPoolExecutor(
+                    max_workers=self.max_workers,
+                    thread_name_prefix="file-worker",
+                    initializer=self._mark_worker,
+                )
+            return self._executor.submit(fn, *args, **kwargs)
+
+    def run(
+        self, function: Callable[[Any], Any], items: Sequence[Any], limit: int
+    ) -> List[Any]:
+        """Apply a function to items with up to limit tasks in flight, in order.
+
+        If a task fails, the tasks not yet started are cancelled, the running
+        ones are waited for, and the exception is raised.
+        """
+        if limit <= 1 or len(items) <= 1 or self.in_worker():
+            return [function(item) for item in items]
+
+        results: List[Any] = [None] * len(items)
+        queue = collections.deque(enumerate(items))
+        pending: Dict[concurrent.futures.Future, int] = {}
+        try:
+            while queue or pending:
+                while queue and len(pending) < limit:
+                    index, item = queue.popleft()
+                    pending[self.submit(function, item)] = index
+                done, _ = concurrent.futures.wait(
+                    pending, return_when=concurrent.futures.FIRST_COMPLETED
+                )
+                for future in done:
+                    results[pending.pop(future)] = future.result()
+        finally:
+            _cancel_and_wait(pending)
+        return results
+
+    def shutdown(self, wait: bool = True, *, cancel_futures: bool = False) -> None:
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    def _mark_worker(self) -> None:
+        self._local.worker = True
+
+
+def _cancel_and_wait(futures: Iterable[concurrent.futures.Future]) -> None:
+    """Cancel futures that haven't started and wait for the rest to finish."""
+    futures = list(futures)
+    for future in futures:
+        future.cancel()
+    concurrent.futures.wait(futures)
+
+
+class _ParallelCompressor(io.RawIOBase):
+    """A writable stream that compresses blocks of its input on a thread pool.
+
+    Each block is compressed into a complete member or frame, and written
+    in order, so the output is a valid stream of the codec; it compresses a
+    little worse than a single stream, as blocks don't share history.
+    Without an executor, blocks are compressed on the writing thread.
+    """
+
+    def __init__(
+        self,
+        raw: BinaryIO,
+        codec: _Codec,
+        executor: Optional[concurrent.futures.Executor],
+        block_size: int,
+        max_pending: int = 8,
+    ) -> None:
+        super().__init__()
+        self._raw = raw
+        self._codec = codec
+        self._executor = executor
+        self._block_size = block_size
+        self._max_pending = max_pending
+        self._buffer = bytearray()
+        self._pending: Deque[concurrent.futures.Future] = collections.deque()
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: Any) -> int:
+        view = memoryview(data).cast("B")
+        size = len(view)
+        if self._buffer:
+            needed = self._block_size - len(self._buffer)
+            self._buffer += view[:needed]
+            view = view[needed:]
+            if len(self._buffer) < self._block_size:
+                return size
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+
+        while len(view) >= self._block_size:
+            self._submit(bytes(view[: self._block_size]))
+            view = view[self._block_size :]
+        self._buffer += view
+        return size
+
+    def finish(self) -> None:
+        """Compress the remaining input and write out every block."""
+        if self._buffer or not self.bytes_in:
+            # Empty input still becomes a valid, empty member or frame
+            self._submit(bytes(self._buffer))
+            self._buffer.clear()
+        while self._pending:
+            self._write_out(self._pending.popleft().result())
+
+    def _submit(self, block: bytes) -> None:
+        self.bytes_in += len(block)
+        if self._executor is None:
+            self._write_out(self._codec.compress(block))
+            return
+
+        self._pending.append(self._executor.submit(self._codec.compress, block))
+        # Bound the memory held by blocks waiting to be written
+        while len(self._pending) > self._max_pending:
+            self._write_out(self._pending.popleft().result())
+
+    def _write_out(self, data: bytes) -> None:
+        self._raw.write(data)
+        self.bytes_out += len(data)
+
+    def close(self) -> None:
+        # Don't leave blocks compressing if the stream is abandoned midway
+        _cancel_and_wait(self._pending)
+        self._pending.clear()
+        super().close()
+
+
+# Archive formats, and the codec compressing the archive as a whole
+_ARCHIVE_FORMATS = {
+    "zip": None,
+    "tar": None,
+    "tar.gz": "gzip",
+    "tar.zst": "zstd",
+    "tar.lz4": "lz4",
+}
+
+
+def _archive_format(path: str) -> Optional[str]:
+    """Get the archive format a file name's extension implies."""
+    if path.endswith(".tgz"):
+        return "tar.gz"
+    for archive_format in sorted(_ARCHIVE_FORMATS, key=len, reverse=True):
+        if path.endswith(f".{archive_format}"):
+            return archive_format
+    return None
+
+
+# Bytes map to one bit each for chunk boundary candidates, and a candidate is
+# where the bits of the preceding bytes spell _CDC_ANCHOR (derived from
+# SHA-256 so boundaries never change between releases)
+_CDC_TABLE = bytes(hashlib.sha256(bytes([i])).digest()[0] & 1 for i in range(256))
+_CDC_ANCHOR = bytes(b & 1 for b in hashlib.sha256(b"qorzen-cdc").digest()[:8])
+
+
+class _Chunker:
+    """Splits files into content-defined chunks.
+
+    A boundary depends only on the bytes just before it, so inserting or
+    removing data moves the boundaries along with it and only the chunks
+    around the edit change. Candidates are found at C speed by mapping each
+    byte to one bit and searching for _CDC_ANCHOR; a candidate becomes a
+    boundary when a CRC of the WINDOW bytes before it is divisible by a
+    divisor chosen for the average size. Chunks are at least min_size and at
+    most max_size bytes.
+    """
+
+    WINDOW = 64
+
+    def __init__(self, avg_size: int = 1024 * 1024) -> None:
+        self.min_size = max(avg_size // 4, 2 * self.WINDOW)
+        self.max_size = max(avg_size * 4, self.min_size)
+        # Candidates are 1 in 2 ** len(_CDC_ANCHOR) positions in random data
+        self._divisor = max((avg_size - self.min_size) >> len(_CDC_ANCHOR), 1)
+
+    def split(self, data: bytes, final: bool) -> List[int]:
+        """Find the chunk boundaries in data.
+
+        Args:
+            data: The data, starting at a chunk boundary.
+            final: Whether data runs to the end of the file. If not, data
+                after the last boundary found belongs to the next call.
+
+        Returns:
+            List[int]: The end offsets of the chunks found.
+        """
+        bits = data.translate(_CDC_TABLE)
+        view = memoryview(data)
+        width = len(_CDC_ANCHOR)
+        size = len(data)
+        ends: List[int] = []
+        start = 0
+        while start < size:
+            limit = start + self.max_size
+            position = start + self.min_size - width
+            end = None
+            while True:
+                position = bits.find(_CDC_ANCHOR, position, min(limit, size))
+                if position < 0:
+                    break
+                candidate = position + width
+                window = view[candidate - self.WINDOW : candidate]
+                if zlib.crc32(window) % self._divisor == 0:
+                    end = candidate
+                    break
+                position += 1
+
+            if end is None:
+                if limit <= size:
+                    end = limit
+                elif final:
+                    end = size
+                else:
+                    break
+            ends.append(end)
+            start = end
+        return ends
+
+    def chunks(self, file: BinaryIO) -> Iterator[bytes]:
+        """Read a file and yield its chunks."""
+        buffer = b""
+        while True:
+            data = file.read(self.max_size * 4)
+            buffer = buffer + data if buffer else data
+            start = 0
+            for end in self.split(buffer, final=not data):
+                yield buffer[start:end]
+                start = end
+            buffer = buffer[start:]
+            if not data:
+                return
+
+
+def _expired_snapshots(
+    snapshots: List[Dict[str, Any]], policy: Dict[str, Optional[int]]
+) -> List[Dict[str, Any]]:
+    """Apply a retention policy to the snapshots of one path.
+
+    Keeps the keep_last newest snapshots, and the newest snapshot of each of
+    the keep_daily/keep_weekly/keep_monthly most recent days, ISO weeks and
+    months that have one. A rule that is 0 or None keeps nothing, and with
+    no rule set every snapshot is kept.
+
+    Returns:
+        List[Dict[str, Any]]: The snapshots the policy doesn't keep.
+    """
+    periods: List[Tuple[int, Callable[[datetime.date], Any]]] = [
+        (policy.get("keep_daily") or 0, lambda d: d),
+        (policy.get("keep_weekly") or 0, lambda d: d.isocalendar()[:2]),
+        (policy.get("keep_monthly") or 0, lambda d: (d.year, d.month)),
+    ]
+    keep_last = policy.get("keep_last") or 0
+    if not keep_last and not any(count for count, _ in periods):
+        return []
+
+    newest_first = sorted(snapshots, key=lambda s: s["created_at"], reverse=True)
+    kept = {s["id"] for s in newest_first[:keep_last]}
+    for count, period_of in periods:
+        seen: Set[Any] = set()
+        for snapshot in newest_first:
+            if len(seen) >= count:
+                break
+            period = period_of(datetime.date.fromtimestamp(snapshot["created_at"]))
+            if period not in seen:
+                seen.add(period)
+                kept.add(snapshot["id"])
+    return [s for s in newest_first if s["id"] not in kept]
+
+
+class _BackupStore:
+    """Content-addressed store of deduplicated backup snapshots.
+
+    File contents are split into chunks stored once under chunks/, named by
+    their SHA-256, and each snapshot is a JSON manifest under snapshots/
+    listing the chunks of every file it covers. Chunk references are counted
+    in memory from the manifests, so removing a snapshot deletes exactly the
+    chunks no other snapshot uses. With a codec, new chunks are stored
+    compressed, under their digest plus the codec's extension, which the
+    manifests record.
+    """
+
+    def __init__(
+        self,
+        root: str,
+        chunker: _Chunker,
+        fsync: str,
+        logger: Any,
+        codec: Optional[_Codec] = None,
+    ) -> None:
+        self.root = root
+        self.chunker = chunker
+        self.codec = codec
+        self._fsync = fsync
+        self._logger = logger
+        self._chunk_dir = os.path.join(root, "chunks")
+        self._snapshot_dir = os.path.join(root, "snapshots")
+        self._snapshots: Dict[str, Dict[str, Any]] = {}
+        self._refs: Dict[str, int] = {}  # Chunk digest -> referencing files
+        self._sizes: Dict[str, int] = {}  # Chunk digest -> bytes on disk
+        self._extensions: Dict[str, str] = {}  # Chunk digest -> codec extension
+        # Chunks used by backups in progress, which pruning mustn't delete
+        self._writing: List[Set[str]] = []
+        self._lock = threading.Lock()  # Guards the maps and counters
+        self.bytes_read = 0
+        self.bytes_written = 0
+        self.files_reused = 0
+
+    def open(self) -> None:
+        """Load the snapshot manifests and count chunk references."""
+        os.makedirs(self._chunk_dir, exist_ok=True)
+        os.makedirs(self._snapshot_dir, exist_ok=True)
+        with os.scandir(self._snapshot_dir) as it:
+            for entry in it:
+                if entry.name.endswith(".tmp"):
+                    # Left behind by a crash during a write
+                    os.unlink(entry.path)
+                    continue
+                try:
+                    with open(entry.path, "rb") as f:
+                        snapshot = json.load(f)
+                except (OSError, ValueError) as e:
+                    self._logger.warning(
+                        f"Skipping unreadable backup manifest {entry.name}: {str(e)}"
+                    )
+                    continue
+                self._snapshots[snapshot["id"]] = snapshot
+                self._count(snapshot, 1)
+
+    def chunk_path(self, digest: str, extension: str = "") -> str:
+        """Get the path a chunk is stored at."""
+        return os.path.join(self._chunk_dir, digest[:2], digest + extension)
+
+    @contextlib.contextmanager
+    def writing(self) -> Iterator[Set[str]]:
+        """Protect the chunks a backup writes or reuses from pruning.
+
+        Yields:
+            Set[str]: The set put_chunk() and reuse() add digests to.
+        """
+        digests: Set[str] = set()
+        with self._lock:
+            self._writing.append(digests)
+        try:
+            yield digests
+        finally:
+            with self._lock:
+                self._writing.remove(digests)
+
+    def put_chunk(self, data: bytes, digests: Set[str]) -> List[Any]:
+        """Store a chunk unless it's already stored.
+
+        Returns:
+            List[Any]: The chunk's manifest entry: its SHA-256, its length,
+            and the extension of the codec it's stored with, or "".
+        """
+        digest = hashlib.sha256(data).hexdigest()
+        with self._lock:
+            digests.add(digest)
+            self.bytes_read += len(data)
+            extension = self._extensions.get(digest) if digest in self._refs else None
+
+        if extension is None:
+            stored, extension = data, ""
+            if self.codec is not None:
+                compressed = self.codec.compress(data)
+                # Incompressible chunks are stored as they are
+                if len(compressed) < len(data):
+                    stored, extension = compressed, self.codec.extension
+
+            path = self.chunk_path(digest, extension)
+            if not os.path.exists(path):
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                _atomic_write(path, stored, self._fsync)
+                with self._lock:
+                    self.bytes_written += len(stored)
+                    self._sizes[digest] = len(stored)
+        return [digest, len(data), extension]
+
+    def reuse(self, chunks: List[List[Any]], digests: Set[str]) -> bool:
+        """Reuse the chunks of an unchanged file from an earlier snapshot.
+
+        Returns:
+            bool: False if a chunk was deleted since, so the file has to be
+            read again.
+        """
+        with self._lock:
+            if any(chunk[0] not in self._refs for chunk in chunks):
+                return False
+            digests.update(chunk[0] for chunk in chunks)
+            self.files_reused += 1
+        return True
+
+    def read_chunk(self, chunk: Sequence[Any]) -> bytes:
+        """Read a chunk and check its content against its digest.
+
+        Args:
+            chunk: The chunk's manifest entry.
+
+        Raises:
+            FileError: If the chunk is missing or corrupt.
+        """
+        digest = chunk[0]
+        extension = chunk[2] if len(chunk) > 2 else ""
+        path = self.chunk_path(digest, extension)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except FileNotFoundError as e:
+            raise FileError(f"Backup chunk is missing: {digest}", file_path=path) from e
+
+        if extension:
+            try:
+                data = _Codec(_Codec.name_for(extension) or extension).decompress(data)
+            except ImportError as e:
+                raise FileError(
+                    f"Backup chunk {digest} needs a codec that isn't installed",
+                    file_path=path,
+                ) from e
+            except Exception as e:
+                raise FileError(
+                    f"Backup chunk is corrupt: {digest}", file_path=path
+                ) from e
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise FileError(f"Backup chunk is corrupt: {digest}", file_path=path)
+        return data
+
+    def add(self, snapshot: Dict[str, Any]) -> None:
+        """Write a snapshot's manifest once all its chunks are stored."""
+        path = os.path.join(self._snapshot_dir, f"{snapshot['id']}.json")
+        data = json.dumps(snapshot, separators=(",", ":")).encode("utf-8")
+        _atomic_write(path, data, self._fsync)
+        with self._lock:
+            self._snapshots[snapshot["id"]] = snapshot
+            self._count(snapshot, 1)
+
+    def get(self, snapshot_id: str) -> Optional[Dict[str, Any]]:
+        """Get a snapshot's manifest."""
+        with self._lock:
+            return self._snapshots.get(snapshot_id)
+
+    def list(
+        self, directory_type: Optional[str] = None, path: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Get the manifests of snapshots, newest first, optionally of one path."""
+        with self._lock:
+            snapshots = [
+                s
+                for s in self._snapshots.values()
+                if (directory_type is None or s["directory_type"] == directory_type)
+                and (path is None or s["path"] == path)
+            ]
+        return sorted(snapshots, key=lambda s: (s["created_at"], s["id"]), reverse=True)
+
+    def remove(self, snapshot_ids: Sequence[str]) -> Tuple[int, int]:
+        """Remove snapshots and delete the chunks only they used.
+
+        Returns:
+            Tuple[int, int]: The number of chunks deleted and bytes freed.
+        """
+        with self._lock:
+            for snapshot_id in snapshot_ids:
+                snapshot = self._snapshots.pop(snapshot_id, None)
+                if snapshot is None:
+                    continue
+                os.unlink(os.path.join(self._snapshot_dir, f"{snapshot_id}.json"))
+                self._count(snapshot, -1)
+
+            unused = [
+                digest
+                for digest, refs in self._refs.items()
+                if refs <= 0 and not any(digest in w for w in self._writing)
+            ]
+            freed = 0
+            for digest in unused:
+                try:
+                    os.unlink(self.chunk_path(digest, self._extensions.pop(digest, "")))
+                except FileNotFoundError:
+                    pass
+                del self._refs[digest]
+                freed += self._sizes.pop(digest, 0)
+        return len(unused), freed
+
+    def collect_garbage(self) -> Tuple[int, int]:
+        """Delete chunk files no snapshot references, left by failed backups.
+
+        Returns:
+            Tuple[int, int]: The number of chunks deleted and bytes freed.
+        """
+        deleted = freed = 0
+        stale_before = time.time() - 3600.0
+        with os.scandir(self._chunk_dir) as shards:
+            shard_paths = [e.path for e in shards if e.is_dir()]
+        for shard_path in shard_paths:
+            with os.scandir(shard_path) as entries:
+                for entry in entries:
+                    try:
+                        st = entry.stat()
+                    except FileNotFoundError:
+                        continue
+                    # Temporary files may belong to a chunk being written
+                    if entry.name.endswith(".tmp") and st.st_mtime > stale_before:
+                        continue
+                    digest = entry.name.split(".", 1)[0]
+                    with self._lock:
+                        if digest in self._refs or any(
+                            digest in w for w in self._writing
+                        ):
+                            continue
+                        try:
+                            os.unlink(entry.path)
+                        except FileNotFoundError:
+                            continue
+                        self._sizes.pop(digest, None)
+                    deleted += 1
+                    freed += st.st_size
+        return deleted, freed
+
+    def stats(self) -> Dict[str, Any]:
+        """Get store statistics."""
+        with self._lock:
+            stored = sum(self._sizes.values())
+            logical = sum(s["size"] for s in self._snapshots.values())
+            return {
+                "path": self.root,
+                "snapshots": len(self._snapshots),
+                "chunks": len(self._refs),
+                "stored_bytes": stored,
+                "logical_bytes": logical,
+                "dedup_ratio": round(logical / stored, 2) if stored else None,
+                "compression": self.codec.name if self.codec is not None else None,
+                "bytes_read": self.bytes_read,
+                "bytes_written": self.bytes_written,
+                "files_reused": self.files_reused,
+            }
+
+    def _count(self, snapshot: Dict[str, Any], delta: int) -> None:
+        """Add or remove a snapshot's chunk references."""
+        for entry in snapshot["files"]:
+            for digest, length, *extension in entry["chunks"]:
+                self._refs[digest] = self._refs.get(digest, 0) + delta
+                self._extensions[digest] = extension[0] if extension else ""
+                if digest not in self._sizes:
+                    self._sizes[digest] = self._stored_size(
+                        digest, self._extensions[digest], length
+                    )
+
+    def _stored_size(self, digest: str, extension: str, length: int) -> int:
+        """Get the size of a chunk on disk, which differs if it's compressed."""
+        if not extension:
+            return length
+        try:
+            return os.path.getsize(self.chunk_path(digest, extension))
+        except OSError:
+            return length
+
+
+class _PathLock:
+    """A path's lock, and how many threads hold or wait for it."""
+
+    __slots__ = ("lock", "refs")
+
+    def __init__(self) -> None:
+        self.lock = threading.RLock()
+        self.refs = 0
+
+
+class _LockTable:
+    """Per-path locks that only exist while held or awaited.
+
+    Paths are spread over stripes, each with its own mutex and table, so
+    threads locking different paths rarely contend, and a path's lock is
+    dropped when its last holder releases it, so memory is bounded by the
+    paths in use rather than every path ever touched.
+
+    With a lock file, each path also holds a POSIX record lock on one of
+    SLOTS bytes of the file, chosen by a stable hash of the path, which
+    excludes other processes sharing the lock file. Record locks belong to
+    the process, so each byte is locked while any thread holds a path that
+    maps to it. Paths are always acquired in (slot, path) order, so callers
+    locking several paths can't deadlock, within or across processes.
+    """
+
+    SLOTS = 4096
+
+    def __init__(self, stripes: int = 64, lock_file: Optional[str] = None) -> None:
+        self._stripes: List[Tuple[threading.Lock, Dict[str, _PathLock]]] = [
+            (threading.Lock(), {}) for _ in range(max(1, stripes))
+        ]
+        self.lock_file = lock_file
+        self._fd = -1
+        self._fcntl: Any = None
+        self._slot_locks: List[threading.Lock] = []
+        self._slot_counts: List[int] = []
+        self.contended = 0  # Acquisitions that had to wait
+
+    def open(self) -> bool:
+        """Open the lock file, if any.
+
+        Returns:
+            bool: False if cross-process locks aren't available here.
+        """
+        if self.lock_file is None:
+            return True
+        try:
+            import fcntl
+        except ImportError:
+            self.lock_file = None
+            return False
+
+        os.makedirs(os.path.dirname(self.lock_file), exist_ok=True)
+        self._fd = os.open(self.lock_file, os.O_RDWR | os.O_CREAT, 0o666)
+        self._fcntl = fcntl
+        self._slot_locks = [threading.Lock() for _ in range(self.SLOTS)]
+        self._slot_counts = [0] * self.SLOTS
+        return True
+
+    def close(self) -> None:
+        """Close the lock file, releasing any record locks still held."""
+        if self._fd >= 0:
+            os.close(self._fd)
+            self._fd = -1
+
+    @contextlib.contextmanager
+    def lock(self, path: str) -> Iterator[None]:
+        """Hold a path's lock."""
+        with self.lock_all([path]):
+            yield
+
+    @contextlib.contextmanager
+    def lock_all(self, paths: Sequence[str]) -> Iterator[None]:
+        """Hold the locks of several paths."""
+        held: List[str] = []
+        try:
+            for path in sorted(set(paths), key=lambda p: (self._slot(p), p)):
+                self._acquire(path)
+                held.append(path)
+            yield
+        finally:
+            for path in reversed(held):
+                self._release(path)
+
+    def active(self) -> int:
+        """Get the number of paths locked or waited for."""
+        return sum(len(table) for _, table in self._stripes)
+
+    def stats(self) -> Dict[str, Any]:
+        """Get lock statistics."""
+        return {
+            "stripes": len(self._stripes),
+            "interprocess": self._fd >= 0,
+            "lock_file": self.lock_file,
+            "contended": self.contended,
+        }
+
+    def _slot(self, path: str) -> int:
+        # hash() differs between processes; the slot has to match
+        return zlib.crc32(path.encode("utf-8", "surrogateescape")) % self.SLOTS
+
+    def _acquire(self, path: str) -> None:
+        mutex, table = self._stripes[hash(path) % len(self._stripes)]
+        with mutex:
+            entry = table.get(path)
+            if entry is None:
+                entry = table[path] = _PathLock()
+            entry.refs += 1
+
+        try:
+            if not entry.lock.acquire(blocking=False):
+                with mutex:
+                    self.contended += 1
+                entry.lock.acquire()
+        except BaseException:
+            self._unref(path, entry, held=False)
+            raise
+
+        if self._fd >= 0:
+            try:
+                self._lock_slot(self._slot(path))
+            except BaseException:
+                self._unref(path, entry, held=True)
+                raise
+
+    def _release(self, path: str) -> None:
+        if self._fd >= 0:
+            self._unlock_slot(self._slot(path))
+        _, table = self._stripes[hash(path) % len(self._stripes)]
+        self._unref(path, table[path], held=True)
+
+    def _unref(self, path: str, entry: _PathLock, held: bool) -> None:
+        """Release a reference to a path's lock, dropping it after the last."""
+        mutex, table = self._stripes[hash(path) % len(self._stripes)]
+        with mutex:
+            if held:
+                entry.lock.release()
+            entry.refs -= 1
+            if not entry.refs:
+                del table[path]
+
+    def _lock_slot(self, slot: int) -> None:
+        with self._slot_locks[slot]:
+            if not self._slot_counts[slot]:
+                self._fcntl.lockf(self._fd, self._fcntl.LOCK_EX, 1, slot)
+            self._slot_counts[slot] += 1
+
+    def _unlock_slot(self, slot: int) -> None:
+        with self._slot_locks[slot]:
+            self._slot_counts[slot] -= 1
+            if not self._slot_counts[slot]:
+                self._fcntl.lockf(self._fd, self._fcntl.LOCK_UN, 1, slot)
+
+
+@dataclass
+class _Watch:
+    """A callback registered with FileManager.watch()."""
+
+    path: str  # The watched file or directory
+    root: str  # The directory the watcher watches for it
+    recursive: bool  # Whether changes below subdirectories match
+    callback: Callable[[List[FileChange]], None]
+
+    def matches(self, path: str) -> bool:
+        """Check whether a change to a path is reported to the callback."""
+        if not _in_tree(path, self.path, True):
+            return False
+        return self.recursive or path == self.path or (
+            os.path.dirname(path) == self.path
+        )
+
+
+class FileManager(QorzenManager):
+    """Manages file system interactions for the application.
+
+    The File Manager is responsible for handling file system operations such as
+    reading, writing, and managing directories. It provides a standardized way
+    for other components to interact with the file system and ensures proper
+    error handling, locking, and organization of files.
+    """
+
+    def __init__(
+        self,
+        config_manager: Any,
+        logger_manager: Any,
+        event_bus_manager: Any = None,
+    ) -> None:
+        """Initialize the File Manager.
+
+        Args:
+            config_manager: The Configuration Manager to use for file settings.
+            logger_manager: The Logging Manager to use for logging.
+            event_bus_manager: The Event Bus Manager to publish file change
+                events to. Optional; changes are only passed to watch()
+                callbacks without it.
+        """
+        super().__init__(name="FileManager")
+        self._config_manager = config_manager
+        self._logger = logger_manager.get_logger("file_manager")
+        self._event_bus = event_bus_manager
+
+        # File paths
+        self._base_directory: Optional[pathlib.Path] = None
+        self._temp_directory: Optional[pathlib.Path] = None
+        self._plugin_data_directory: Optional[pathlib.Path] = None
+        self._backup_directory: Optional[pathlib.Path] = None
+
+        # Map of file extensions to file types
+        self._file_type_mapping: Dict[str, FileType] = {
+            # Text files
+            ".txt": FileType.TEXT,
+            ".md": FileType.TEXT,
+            ".csv": FileType.TEXT,
+            ".json": FileType.TEXT,
+            ".xml": FileType.TEXT,
+            ".html": FileType.TEXT,
+            ".htm": FileType.TEXT,
+            ".css": FileType.TEXT,
+            ".js": FileType.TEXT,
+            ".py": FileType.TEXT,
+            # Config files
+            ".yaml": FileType.CONFIG,
+            ".yml": FileType.CONFIG,
+            ".ini": FileType.CONFIG,
+            ".conf": FileType.CONFIG,
+            ".cfg": FileType.CONFIG,
+            ".toml": FileType.CONFIG,
+            # Log files
+            ".log": FileType.LOG,
+            # Data files
+            ".db": FileType.DATA,
+            ".sqlite": FileType.DATA,
+            ".sqlite3": FileType.DATA,
+            ".parquet": FileType.DATA,
+            ".avro": FileType.DATA,
+            # Image files
+            ".jpg": FileType.IMAGE,
+            ".jpeg": FileType.IMAGE,
+            ".png": FileType.IMAGE,
+            ".gif": FileType.IMAGE,
+            ".bmp": FileType.IMAGE,
+            ".svg": FileType.IMAGE,
+            ".webp": FileType.IMAGE,
+            # Document files
+            ".pdf": FileType.DOCUMENT,
+            ".doc": FileType.DOCUMENT,
+            ".docx": FileType.DOCUMENT,
+            ".xls": FileType.DOCUMENT,
+            ".xlsx": FileType.DOCUMENT,
+            ".ppt": FileType.DOCUMENT,
+            ".pptx": FileType.DOCUMENT,
+            ".odt": FileType.DOCUMENT,
+            ".ods": FileType.DOCUMENT,
+            # Audio files
+            ".mp3": FileType.AUDIO,
+            ".wav": FileType.AUDIO,
+            ".flac": FileType.AUDIO,
+            ".ogg": FileType.AUDIO,
+            ".aac": FileType.AUDIO,
+            # Video files
+            ".mp4": FileType.VIDEO,
+            ".avi": FileType.VIDEO,
+            ".mkv": FileType.VIDEO,
+            ".mov": FileType.VIDEO,
+            ".webm": FileType.VIDEO,
+        }
+
+        # Per-path locks for thread safety, and across processes with
+        # files.locks.interprocess
+        self._locks = _LockTable()
+
+        # The thread pool parallel operations share (files.workers)
+        self._pool = _WorkerPool(16)
+
+        # Threads that scan directories in parallel for recursive listings
+        self._walk_workers: int = 8
+
+        # Copies files with reflinks or in the kernel where possible, and
+        # directory trees on files.copy.workers threads
+        self._copier = _CopyEngine()
+        self._copy_workers: int = 8
+
+        # Streaming compression (files.compression): threads and block size
+        # for parallel compression, and the codec for compressed temp files
+        self._compress_workers: int = 4
+        self._compress_block_size: int = 4 * 1024 * 1024
+        self._compress_temp_files: str = "none"
+        self._compression_lock = threading.Lock()  # Guards the byte counters
+        self._compression_bytes_in = 0
+        self._compression_bytes_out = 0
+
+        # Deduplicated snapshots made by create_backup() (files.backup)
+        self._backup_store: Optional[_BackupStore] = None
+        self._backup_workers: int = 4
+        self._backup_retention: Dict[str, Optional[int]] = {}
+
+        # How writes are synced to disk (files.fsync), and the buffer that
+        # coalesces buffered writes (files.write_behind)
+        self._fsync: str = "none"
+        self._write_behind: Optional[_WriteBehind] = None
+
+        # Persistent content hashes (files.hash_cache) and the threads that
+        # hash files in parallel for compute_hashes()
+        self._hash_cache: Optional[_HashCache] = None
+        self._hash_workers: int = 4
+        self._xxhash_available: Optional[bool] = None
+
+        # Metadata index (files.index) and the thread refreshing it
+        self._index: Optional[_FileIndex] = None
+        self._index_refresh_interval: float = 60.0  # Seconds
+        self._index_thread: Optional[threading.Thread] = None
+        self._index_stop = threading.Event()
+
+        # Change watcher (files.watcher) and the watch() callbacks it serves
+        self._watcher: Optional[_FileWatcher] = None
+        self._watches: Dict[str, _Watch] = {}
+        self._watches_lock = threading.Lock()
+
+    def initialize(self) -> None:
+        """Initialize the File Manager.
+
+        Creates necessary directories and sets up file paths based on configuration.
+
+        Raises:
+            ManagerInitializationError: If initialization fails.
+        """
+        try:
+            # Get configuration
+            file_config = self._config_manager.get("files", {})
+            base_dir = file_config.get("base_directory", "data")
+            temp_dir = file_config.get("temp_directory", "data/temp")
+            plugin_data_dir = file_config.get("plugin_data_directory", "data/plugins")
+            backup_dir = file_config.get("backup_directory", "data/backups")
+            self._pool = _WorkerPool(max(1, file_config.get("workers", 16)))
+            self._walk_workers = max(1, file_config.get("walk_workers", 8))
+            self._hash_workers = max(1, file_config.get("hash_workers", 4))
+            self._fsync = self._check_fsync(file_config.get("fsync", "none"))
+            copy_config = file_config.get("copy", {})
+            self._copier = _CopyEngine(reflink=copy_config.get("reflink", True))
+            self._copy_workers = max(1, copy_config.get("workers", 8))
+            compression_config = file_config.get("compression", {})
+            self._compress_workers = max(1, compression_config.get("workers", 4))
+            self._compress_block_size = max(
+                64 * 1024, compression_config.get("block_size", 4 * 1024 * 1024)
+            )
+            self._compress_temp_files = compression_config.get("temp_files", "none")
+
+            # Convert to absolute paths if not already
+            self._base_directory = pathlib.Path(base_dir).absolute()
+            self._temp_directory = pathlib.Path(temp_dir).absolute()
+            self._plugin_data_directory = pathlib.Path(plugin_data_dir).absolute()
+            self._backup_directory = pathlib.Path(backup_dir).absolute()
+
+            # Create directories if they don't exist
+            os.makedirs(self._base_directory, exist_ok=True)
+            os.makedirs(self._temp_directory, exist_ok=True)
+            os.makedirs(self._plugin_data_directory, exist_ok=True)
+            os.makedirs(self._backup_directory, exist_ok=True)
+
+            self._open_locks(file_config.get("locks", {}))
+
+            hash_cache_config = file_config.get("hash_cache", {})
+            if hash_cache_config.get("enabled", True):
+                self._open_hash_cache(hash_cache_config)
+
+            self._open_backup_store(file_config.get("backup", {}))
+
+            index_config = file_config.get("index", {})
+            if index_config.get("enabled", True):
+                self._open_index(index_config)
+
+            watcher_config = file_config.get("watcher", {})
+            if watcher_config.get("enabled", True):
+                self._start_watcher(watcher_config)
+
+            write_behind_config = file_config.get("write_behind", {})
+            if write_behind_config.get("enabled", True):
+                self._write_behind = _WriteBehind(
+                    self._write_files,
+                    self._logger,
+                    flush_interval=write_behind_config.get("flush_interval", 1.0),
+                    max_bytes=write_behind_config.get("max_bytes", 8 * 1024 * 1024),
+                )
+                self._write_behind.start()
+
+            # Register for config changes
+            self._config_manager.register_listener("files", self._on_config_changed)
+
+            self._logger.info(
+                f"File Manager initialized with base directory: {self._base_directory}"
+            )
+            self._initialized = True
+            self._healthy = True
+
+        except Exception as e:
+            self._logger.error(f"Failed to initialize File Manager: {str(e)}")
+            raise ManagerInitializationError(
+                f"Failed to initialize FileManager: {str(e)}",
+                manager_name=self.name,
+            ) from e
+
+    def get_file_path(self, path: str, directory_type: str = "base") -> pathlib.Path:
+        """Get the absolute path for a file, relative to a specified directory.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base. One of:
+                            "base", "temp", "plugin_data", "backup".
+
+        Returns:
+            pathlib.Path: The absolute path to the file.
+
+        Raises:
+            FileError: If the directory type is invalid or the manager is not initialized.
+        """
+        if not self._initialized:
+            raise FileError(
+                "File Manager not initialized",
+                file_path=path,
+            )
+
+        # Get the base directory for the specified type
+        if directory_type == "base":
+            base_dir = self._base_directory
+        elif directory_type == "temp":
+            base_dir = self._temp_directory
+        elif directory_type == "plugin_data":
+            base_dir = self._plugin_data_directory
+        elif directory_type == "backup":
+            base_dir = self._backup_directory
+        else:
+            raise FileError(
+                f"Invalid directory type: {directory_type}",
+                file_path=path,
+            )
+
+        # Convert the path to an absolute path
+        path_obj = pathlib.Path(path)
+        if path_obj.is_absolute():
+            # Check if the path is within the allowed directories
+            for allowed_dir in [
+                self._base_directory,
+                self._temp_directory,
+                self._plugin_data_directory,
+                self._backup_directory,
+            ]:
+                if str(path_obj).startswith(str(allowed_dir)):
+                    return path_obj
+
+            raise FileError(
+                f"Path is outside of allowed directories: {path}",
+                file_path=path,
+            )
+
+        # Join the path with the base directory
+        return base_dir / path
+
+    def ensure_directory(self, path: str, directory_type: str = "base") -> pathlib.Path:
+        """Ensure that a directory exists, creating it if necessary.
+
+        Args:
+            path: The path to the directory, relative to the specified directory.
+            directory_type: The type of directory to use as the base. One of:
+                            "base", "temp", "plugin_data", "backup".
+
+        Returns:
+            pathlib.Path: The absolute path to the directory.
+
+        Raises:
+            FileError: If the directory cannot be created.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            os.makedirs(full_path, exist_ok=True)
+            return full_path
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to create directory: {str(e)}",
+                file_path=path,
+            ) from e
+
+    def read_text(self, path: str, directory_type: str = "base") -> str:
+        """Read text from a file.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+
+        Returns:
+            str: The text content of the file.
+
+        Raises:
+            FileError: If the file cannot be read.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+
+            # Get a lock for this file
+            lock = self._locks.lock(str(full_path))
+
+            with lock:
+                with open(full_path, "r", encoding="utf-8") as f:
+                    return f.read()
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to read text file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+    def write_text(
+        self,
+        path: str,
+        content: str,
+        directory_type: str = "base",
+        create_dirs: bool = True,
+        fsync: Optional[str] = None,
+        buffered: bool = False,
+    ) -> None:
+        """Write text to a file.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            content: The text content to write.
+            directory_type: The type of directory to use as the base.
+            create_dirs: Whether to create parent directories if they don't exist.
+            fsync: Override files.fsync for this write; see write_binary().
+            buffered: Buffer the write and flush it later; see write_binary().
+
+        Raises:
+            FileError: If the file cannot be written.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._write(
+                full_path, content.encode("utf-8"), create_dirs, fsync, buffered
+            )
+
+        except Exception as e:
+            raise FileError(
                 f"Failed to write text file: {str(e)}",
                 file_path=str(full_path) if "full_path" in locals() else path,
             ) from e
 
-    def read_binary(self, path: str, directory_type: str = "base") -> bytes:
-        """Read binary data from a file.
+    def read_binary(self, path: str, directory_type: str = "base") -> bytes:
+        """Read binary data from a file.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+
+        Returns:
+            bytes: The binary content of the file.
+
+        Raises:
+            FileError: If the file cannot be read.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+
+            # Get a lock for this file
+            lock = self._locks.lock(str(full_path))
+
+            with lock:
+                with open(full_path, "rb") as f:
+                    return f.read()
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to read binary file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+    @contextlib.contextmanager
+    def open_mmap(
+        self, path: str, directory_type: str = "base", sequential: bool = False
+    ) -> Iterator[memoryview]:
+        """Map a file into memory read-only, without copying it.
+
+        Pages are read from the page cache on first access, so slicing the
+        view of a large file costs only the pages touched. Use as a context
+        manager; views sliced from the result must not outlive the block.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+            sequential: Hint that the file will be read front to back, so the
+                kernel reads ahead more aggressively.
+
+        Yields:
+            memoryview: A read-only view of the file's contents.
+
+        Raises:
+            FileError: If the file cannot be mapped.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+            with open(full_path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    # Empty files can't be mapped
+                    mapped = None
+                    view = memoryview(b"")
+                else:
+                    mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                    if sequential and hasattr(mapped, "madvise"):
+                        mapped.madvise(mmap.MADV_SEQUENTIAL)
+                    view = memoryview(mapped)
+        except Exception as e:
+            raise FileError(
+                f"Failed to map file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+        try:
+            yield view
+        finally:
+            view.release()
+            if mapped is not None:
+                try:
+                    mapped.close()
+                except BufferError:
+                    # A slice of the view is still referenced; the mapping
+                    # is closed when it is garbage collected
+                    self._logger.warning(
+                        f"Memory map of {full_path} is still in use",
+                        extra={"file_path": str(full_path)},
+                    )
+
+    def iter_chunks(
+        self,
+        path: str,
+        directory_type: str = "base",
+        chunk_size: int = 1024 * 1024,
+        start: int = 0,
+        end: Optional[int] = None,
+        reuse_buffer: bool = False,
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Read a file, or a range of it, in chunks.
+
+        Memory use stays at one chunk however large the file is.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+            chunk_size: The maximum size of each chunk in bytes.
+            start: The offset to start reading at.
+            end: The offset to stop reading at, or None for the end of file.
+            reuse_buffer: Read every chunk into the same buffer and yield
+                views of it instead of new bytes objects. Each view is only
+                valid until the next chunk is requested.
+
+        Returns:
+            Iterator[Union[bytes, memoryview]]: The chunks, in order.
+
+        Raises:
+            FileError: If the file cannot be opened or the range is invalid.
+        """
+        if chunk_size < 1 or start < 0 or (end is not None and end < start):
+            raise FileError(
+                f"Invalid chunk size or range: {chunk_size}, {start}-{end}",
+                file_path=path,
+            )
+
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+            f = open(full_path, "rb")
+        except Exception as e:
+            raise FileError(
+                f"Failed to read binary file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+        if hasattr(os, "posix_fadvise"):
+            # Ask for more read-ahead; a length of 0 means to the end of file
+            length = 0 if end is None else end - start
+            try:
+                os.posix_fadvise(f.fileno(), start, length, os.POSIX_FADV_SEQUENTIAL)
+            except OSError:
+                pass
+        return self._read_chunks(f, chunk_size, start, end, reuse_buffer)
+
+    @staticmethod
+    def _read_chunks(
+        f: BinaryIO,
+        chunk_size: int,
+        start: int,
+        end: Optional[int],
+        reuse_buffer: bool,
+    ) -> Iterator[Union[bytes, memoryview]]:
+        """Yield chunks of an open file, closing it when done."""
+        with f:
+            f.seek(start)
+            remaining = None if end is None else end - start
+            buffer = memoryview(bytearray(chunk_size)) if reuse_buffer else None
+            while remaining is None or remaining > 0:
+                size = chunk_size if remaining is None else min(chunk_size, remaining)
+                if buffer is not None:
+                    count = f.readinto(buffer[:size])
+                    chunk = buffer[:count]
+                else:
+                    chunk = f.read(size)
+                    count = len(chunk)
+                if not count:
+                    return
+                if remaining is not None:
+                    remaining -= count
+                yield chunk
+
+    def read_range(
+        self, path: str, offset: int, length: int, directory_type: str = "base"
+    ) -> bytes:
+        """Read part of a file without reading the rest.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            offset: The offset to start reading at.
+            length: The number of bytes to read.
+            directory_type: The type of directory to use as the base.
+
+        Returns:
+            bytes: The bytes read; shorter than length if the file ends first.
+
+        Raises:
+            FileError: If the file cannot be read or the range is invalid.
+        """
+        if offset < 0 or length < 0:
+            raise FileError(
+                f"Invalid range: offset {offset}, length {length}", file_path=path
+            )
+
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+            with open(full_path, "rb") as f:
+                if not hasattr(os, "pread"):
+                    f.seek(offset)
+                    return f.read(length)
+
+                # pread doesn't move the file position and may return less
+                # than asked for
+                parts = []
+                while length > 0:
+                    data = os.pread(f.fileno(), length, offset)
+                    if not data:
+                        break
+                    parts.append(data)
+                    offset += len(data)
+                    length -= len(data)
+                return parts[0] if len(parts) == 1 else b"".join(parts)
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to read binary file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+    def write_binary(
+        self,
+        path: str,
+        content: bytes,
+        directory_type: str = "base",
+        create_dirs: bool = True,
+        fsync: Optional[str] = None,
+        buffered: bool = False,
+    ) -> None:
+        """Write binary data to a file.
+
+        The file is replaced atomically: readers, and the file after a
+        crash, see either the old or the new content.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            content: The binary content to write.
+            directory_type: The type of directory to use as the base.
+            create_dirs: Whether to create parent directories if they don't exist.
+            fsync: Override files.fsync for this write: "none", "file" to sync
+                the content before it replaces the file, or "full" to also
+                sync the directory so the replacement survives a crash.
+            buffered: Keep the content in memory and write it with the next
+                write-behind flush, synced as fsync asks. Later writes to
+                the file before then replace it, so only the last is
+                written. Reads through the File Manager flush it first.
+                Ignored if files.write_behind is disabled.
+
+        Raises:
+            FileError: If the file cannot be written.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._write(full_path, bytes(content), create_dirs, fsync, buffered)
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to write binary file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+    def _write(
+        self,
+        full_path: pathlib.Path,
+        data: bytes,
+        create_dirs: bool,
+        fsync: Optional[str],
+        buffered: bool,
+    ) -> None:
+        """Write a file directly or through the write-behind buffer."""
+        fsync = self._check_fsync(fsync) if fsync is not None else self._fsync
+
+        # Create parent directories if needed
+        if create_dirs:
+            os.makedirs(full_path.parent, exist_ok=True)
+
+        if buffered and self._write_behind is not None:
+            self._write_behind.put(str(full_path), data, fsync)
+            return
+
+        # A buffered write flushed later would overwrite this one
+        self._sync_pending(full_path)
+
+        with self._locks.lock(str(full_path)):
+            _atomic_write(str(full_path), data, fsync)
+
+        self._update_index(full_path)
+
+    def _write_files(self, batch: Dict[str, Tuple[bytes, str]]) -> Set[str]:
+        """Write a batch of buffered writes, syncing each directory once.
+
+        Args:
+            batch: The content and fsync policy of each path.
+
+        Returns:
+            Set[str]: The paths that failed and should be retried.
+        """
+        written = []
+        failed = set()
+        sync_directories = set()
+        for path, (data, fsync) in batch.items():
+            try:
+                with self._locks.lock(path):
+                    _atomic_write(path, data, "file" if fsync == "full" else fsync)
+                written.append(path)
+                if fsync == "full":
+                    sync_directories.add(os.path.dirname(path))
+            except FileNotFoundError as e:
+                # The directory was removed; retrying can't succeed
+                self._logger.warning(
+                    f"Dropped buffered write to {path}: {str(e)}",
+                    extra={"file_path": path},
+                )
+            except OSError as e:
+                self._logger.error(
+                    f"Failed to flush buffered write to {path}: {str(e)}",
+                    extra={"file_path": path},
+                )
+                failed.add(path)
+
+        for directory in sync_directories:
+            try:
+                _fsync_directory(directory)
+            except OSError as e:
+                self._logger.warning(f"Failed to sync {directory}: {str(e)}")
+
+        self._update_index(*written)
+        return failed
+
+    def _sync_pending(self, path: Union[str, pathlib.Path]) -> None:
+        """Flush buffered writes to a path, or below it, before it is used."""
+        if self._write_behind is not None and self._write_behind.pending(str(path)):
+            self._write_behind.flush(str(path))
+
+    def flush_writes(self) -> int:
+        """Write every buffered write to disk now.
+
+        Returns:
+            int: The number of files written.
+        """
+        if self._write_behind is None:
+            return 0
+        return self._write_behind.flush()
+
+    @staticmethod
+    def _check_fsync(policy: str) -> str:
+        """Check an fsync policy name.
+
+        Raises:
+            FileError: If the policy is unknown.
+        """
+        if policy not in _FSYNC_POLICIES:
+            raise FileError(
+                f"Invalid fsync policy: {policy}. "
+                f"Expected one of {', '.join(_FSYNC_POLICIES)}"
+            )
+        return policy
+
+    def list_files(
+        self,
+        path: str = "",
+        directory_type: str = "base",
+        recursive: bool = False,
+        include_dirs: bool = True,
+        pattern: Optional[str] = None,
+    ) -> List[FileInfo]:
+        """List files in a directory.
+
+        Directories are read with os.scandir(), so each entry costs a single
+        stat() call. Recursive listings scan subdirectories in parallel on up
+        to files.walk_workers threads; use iter_files() to stream very large
+        trees instead.
+
+        Args:
+            path: The path to the directory, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+            recursive: Whether to list files in subdirectories recursively.
+            include_dirs: Whether to include directories in the results.
+            pattern: Optional glob pattern to filter files by name. A pattern
+                containing "/" is matched against the path relative to the
+                listed directory, ignoring a leading "**/".
+
+        Returns:
+            List[FileInfo]: Information about the files in the directory.
+
+        Raises:
+            FileError: If the directory cannot be listed.
+        """
+        root = self._get_directory(path, directory_type)
+
+        try:
+            if not recursive or self._walk_workers == 1 or self._pool.in_worker():
+                return list(self._walk(root, recursive, include_dirs, pattern))
+
+            # One task per directory, so large subtrees are spread across
+            # workers instead of landing on one
+            def scan(directory: str) -> Tuple[List[FileInfo], List[str]]:
+                subdirs: List[str] = []
+                infos = list(
+                    self._scan_directory(
+                        directory, root, include_dirs, pattern, subdirs
+                    )
+                )
+                return infos, subdirs
+
+            result: List[FileInfo] = []
+            queue: Deque[str] = collections.deque([root])
+            pending: Set[concurrent.futures.Future] = set()
+            try:
+                while queue or pending:
+                    while queue and len(pending) < self._walk_workers:
+                        pending.add(self._pool.submit(scan, queue.popleft()))
+                    done, pending = concurrent.futures.wait(
+                        pending, return_when=concurrent.futures.FIRST_COMPLETED
+                    )
+                    for future in done:
+                        infos, subdirs = future.result()
+                        result.extend(infos)
+                        queue.extend(subdirs)
+            finally:
+                _cancel_and_wait(pending)
+
+            return result
+
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to list directory: {str(e)}",
+                file_path=root,
+            ) from e
+
+    def iter_files(
+        self,
+        path: str = "",
+        directory_type: str = "base",
+        recursive: bool = False,
+        include_dirs: bool = True,
+        pattern: Optional[str] = None,
+    ) -> Iterator[FileInfo]:
+        """Iterate over files in a directory without building a list.
+
+        The streaming counterpart of list_files(). Only the directories still
+        to be visited are held in memory, so memory use stays flat for trees
+        with millions of files.
+
+        Args:
+            path: The path to the directory, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+            recursive: Whether to descend into subdirectories.
+            include_dirs: Whether to include directories in the results.
+            pattern: Optional glob pattern to filter files by name; see
+                list_files().
+
+        Returns:
+            Iterator[FileInfo]: Information about each file, depth first.
+
+        Raises:
+            FileError: If the directory cannot be listed.
+        """
+        root = self._get_directory(path, directory_type)
+        return self._walk(root, recursive, include_dirs, pattern)
+
+    def _get_directory(self, path: str, directory_type: str) -> str:
+        """Resolve a path that must be an existing directory.
+
+        Raises:
+            FileError: If the path is not a directory.
+        """
+        full_path = self.get_file_path(path, directory_type)
+        self._sync_pending(full_path)
+        if not full_path.is_dir():
+            raise FileError(
+                f"Path is not a directory: {full_path}",
+                file_path=str(full_path),
+            )
+        return str(full_path)
+
+    def _walk(
+        self,
+        root: str,
+        recursive: bool,
+        include_dirs: bool,
+        pattern: Optional[str],
+    ) -> Iterator[FileInfo]:
+        """Walk a directory tree depth first with an explicit stack."""
+        stack = [root]
+        while stack:
+            subdirs: Optional[List[str]] = [] if recursive else None
+            yield from self._scan_directory(
+                stack.pop(), root, include_dirs, pattern, subdirs
+            )
+            if subdirs:
+                stack.extend(reversed(subdirs))
+
+    def _scan_directory(
+        self,
+        directory: str,
+        root: str,
+        include_dirs: bool,
+        pattern: Optional[str],
+        subdirs: Optional[List[str]] = None,
+    ) -> Iterator[FileInfo]:
+        """Read one directory, yielding its entries as FileInfo.
+
+        The entry type comes from the directory listing itself, so the only
+        system call per entry is the stat() for size and times. The File
+        Manager's own databases are skipped.
+
+        Args:
+            directory: The directory to read.
+            root: The directory being listed, for matching relative paths.
+            include_dirs: Whether to yield directories.
+            pattern: Optional glob pattern to filter entries.
+            subdirs: If given, subdirectories to descend into are appended to
+                it. Symlinks to directories are listed but not followed.
+
+        Raises:
+            FileError: If root itself cannot be read. Unreadable
+                subdirectories are logged and skipped.
+        """
+        try:
+            iterator = os.scandir(directory)
+        except OSError as e:
+            if directory == root:
+                raise FileError(
+                    f"Failed to list directory: {str(e)}", file_path=directory
+                ) from e
+            self._logger.warning(
+                f"Failed to list {directory}: {str(e)}",
+                extra={"file_path": directory},
+            )
+            return
+
+        internal = self._internal_files()
+        with iterator:
+            for entry in iterator:
+                if entry.path in internal:
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                    if subdirs is not None and is_dir and not entry.is_symlink():
+                        subdirs.append(entry.path)
+
+                    if is_dir and not include_dirs:
+                        continue
+                    if pattern and not self._match_pattern(
+                        entry.name, entry.path, root, pattern
+                    ):
+                        continue
+
+                    stat = entry.stat()
+                    yield FileInfo(
+                        path=entry.path,
+                        name=entry.name,
+                        size=stat.st_size,
+                        created_at=stat.st_ctime,
+                        modified_at=stat.st_mtime,
+                        file_type=self._file_type_for(entry.name, is_dir),
+                        is_directory=is_dir,
+                        metadata={},
+                    )
+
+                except OSError as e:
+                    self._logger.warning(
+                        f"Failed to get info for {entry.path}: {str(e)}",
+                        extra={"file_path": entry.path},
+                    )
+
+    def _internal_files(self) -> Set[str]:
+        """Get the paths of the File Manager's own database files.
+
+        They default to the base directory, so listings and archives skip them.
+        """
+        internal: Set[str] = set()
+        for db in (self._index, self._hash_cache):
+            if db is not None:
+                internal.update(db.path + s for s in ("", "-wal", "-shm", "-journal"))
+        return internal
+
+    @staticmethod
+    def _match_pattern(name: str, path: str, root: str, pattern: str) -> bool:
+        """Check whether an entry below root matches a list_files() pattern."""
+        if "/" not in pattern:
+            return fnmatch.fnmatch(name, pattern)
+
+        while pattern.startswith("**/"):
+            pattern = pattern[3:]
+        relative = os.path.relpath(path, root).replace(os.sep, "/")
+        return pathlib.PurePosixPath(relative).match(pattern)
+
+    def _open_locks(self, locks_config: Dict[str, Any]) -> None:
+        """Create the per-path lock table.
+
+        Args:
+            locks_config: The files.locks settings.
+        """
+        lock_file = None
+        if locks_config.get("interprocess", False):
+            lock_file = locks_config.get("path") or os.path.join(
+                self._base_directory, ".file_locks"
+            )
+        self._locks = _LockTable(
+            stripes=locks_config.get("stripes", 64),
+            lock_file=str(pathlib.Path(lock_file).absolute()) if lock_file else None,
+        )
+        if not self._locks.open():
+            self._logger.warning(
+                "Cross-process file locks need fcntl, which isn't available "
+                "on this platform; locking within this process only"
+            )
+
+    def _open_hash_cache(self, hash_cache_config: Dict[str, Any]) -> None:
+        """Open the persistent content hash cache.
+
+        Args:
+            hash_cache_config: The files.hash_cache settings.
+        """
+        cache_path = hash_cache_config.get("path") or os.path.join(
+            self._base_directory, ".file_hashes.db"
+        )
+        self._hash_cache = _HashCache(
+            str(pathlib.Path(cache_path).absolute()),
+            max_entries=hash_cache_config.get("max_entries", 100000),
+        )
+        self._hash_cache.open()
+
+    def _open_backup_store(self, backup_config: Dict[str, Any]) -> None:
+        """Open the store of backup snapshots in the backup directory.
+
+        Args:
+            backup_config: The files.backup settings.
+        """
+        self._backup_workers = max(1, backup_config.get("workers", 4))
+        self._backup_retention = dict(backup_config.get("retention", {}))
+        codec = None
+        if backup_config.get("compression", "none") != "none":
+            try:
+                codec = self._get_codec(backup_config["compression"])
+            except FileError as e:
+                self._logger.warning(f"Storing backups uncompressed: {str(e)}")
+
+        self._backup_store = _BackupStore(
+            os.path.join(self._backup_directory, ".store"),
+            _Chunker(backup_config.get("chunk_size", 1024 * 1024)),
+            self._fsync,
+            self._logger,
+            codec=codec,
+        )
+        self._backup_store.open()
+
+    def _open_index(self, index_config: Dict[str, Any]) -> None:
+        """Open the metadata index and start the thread that refreshes it.
+
+        Args:
+            index_config: The files.index settings.
+        """
+        index_path = index_config.get("path") or os.path.join(
+            self._base_directory, ".file_index.db"
+        )
+        self._index = _FileIndex(
+            str(pathlib.Path(index_path).absolute()),
+            [
+                str(d)
+                for d in (
+                    self._base_directory,
+                    self._temp_directory,
+                    self._plugin_data_directory,
+                    self._backup_directory,
+                )
+            ],
+            self._file_type_for,
+            self._logger,
+            hash_files=index_config.get("hash_files", False),
+            tombstone_retention=index_config.get("tombstone_retention_days", 7)
+            * 86400.0,
+            hash_file=lambda path: self._hash_path(path, "sha256"),
+            excluded=[
+                path
+                for path in (
+                    self._hash_cache.path if self._hash_cache is not None else None,
+                    self._backup_store.root,
+                    self._locks.lock_file,
+                )
+                if path is not None
+            ],
+        )
+        self._index.open()
+
+        self._index_refresh_interval = index_config.get("refresh_interval", 60.0)
+        self._index_stop.clear()
+        self._index_thread = threading.Thread(
+            target=self._index_worker, name="file-index", daemon=True
+        )
+        self._index_thread.start()
+
+    def _index_worker(self) -> None:
+        """Build the index, then refresh it until the manager shuts down."""
+        while True:
+            try:
+                self._index.refresh()
+            except Exception as e:
+                self._logger.error(f"Failed to refresh file index: {str(e)}")
+
+            if self._index_refresh_interval <= 0 or self._index_stop.wait(
+                self._index_refresh_interval
+            ):
+                return
+
+    def _update_index(self, *paths: Union[str, pathlib.Path]) -> None:
+        """Re-index paths changed through the File Manager."""
+        if self._index is None:
+            return
+
+        for path in paths:
+            try:
+                self._index.update(str(path))
+            except Exception as e:
+                self._logger.warning(
+                    f"Failed to update file index for {path}: {str(e)}",
+                    extra={"file_path": str(path)},
+                )
+
+    def _start_watcher(self, watcher_config: Dict[str, Any]) -> None:
+        """Start watching the managed directories for changes.
+
+        Args:
+            watcher_config: The files.watcher settings.
+        """
+        self._watcher = _FileWatcher(
+            self._on_file_changes,
+            self._logger,
+            backend=watcher_config.get("backend", "auto"),
+            debounce=watcher_config.get("debounce_ms", 200) / 1000.0,
+            max_delay=watcher_config.get("max_delay_ms", 2000) / 1000.0,
+            poll_interval=watcher_config.get("poll_interval", 2.0),
+            # Index writes would otherwise be reported and re-indexed forever
+            ignore=[
+                db.path for db in (self._index, self._hash_cache) if db is not None
+            ]
+            + [self._backup_store.root],
+        )
+
+        directories = {
+            str(d)
+            for d in (
+                self._base_directory,
+                self._temp_directory,
+                self._plugin_data_directory,
+                self._backup_directory,
+            )
+        }
+        for directory in sorted(directories):
+            if not any(directory.startswith(d + os.sep) for d in directories):
+                self._watcher.add(directory)
+        self._watcher.start()
+
+        self._logger.info(f"Watching files for changes with {self._watcher.backend}")
+
+    def _on_file_changes(self, changes: List[FileChange], overflow: bool) -> None:
+        """Apply a batch of changes to the index and pass it on.
+
+        Runs on the watcher thread. If the inotify queue overflowed, changes
+        were lost, so the index is refreshed in full and every watch()
+        callback gets at least a change to its own path to rescan.
+
+        Args:
+            changes: The net change to each path that changed.
+            overflow: Whether changes were lost.
+        """
+        if self._index is not None:
+            if overflow:
+                try:
+                    self._index.refresh(full=True)
+                except Exception as e:
+                    self._logger.error(f"Failed to refresh file index: {str(e)}")
+            else:
+                self._update_index(*(c.path for c in changes))
+
+        if self._event_bus is not None:
+            try:
+                self._event_bus.publish(
+                    event_type="files/changed",
+                    source="file_manager",
+                    payload={
+                        "changes": [c.to_dict() for c in changes],
+                        "overflow": overflow,
+                    },
+                )
+            except EventBusError as e:
+                self._logger.warning(f"Failed to publish file changes: {str(e)}")
+
+        with self._watches_lock:
+            watches = list(self._watches.values())
+        for watch in watches:
+            matched = [c for c in changes if watch.matches(c.path)]
+            if overflow and not matched:
+                matched = [
+                    FileChange(
+                        watch.path, ChangeType.MODIFIED, os.path.isdir(watch.path)
+                    )
+                ]
+            if not matched:
+                continue
+            try:
+                watch.callback(matched)
+            except Exception as e:
+                self._logger.error(
+                    f"File watch callback for {watch.path} failed: {str(e)}",
+                    extra={"file_path": watch.path},
+                )
+
+    def watch(
+        self,
+        path: Union[str, pathlib.Path],
+        callback: Callable[[List[FileChange]], None],
+        recursive: bool = True,
+        directory_type: str = "base",
+    ) -> str:
+        """Call a function whenever a file or directory changes.
+
+        The callback runs on the watcher thread with the debounced changes
+        to the path, or to what is below it for a directory. Changes in the
+        managed directories are also published as files/changed events.
+
+        Args:
+            path: The file or directory to watch. Relative paths are relative
+                to directory_type; absolute paths may be outside the managed
+                directories, e.g. the configuration file.
+            callback: The function to call with a list of FileChange.
+            recursive: For a directory, also report changes in subdirectories.
+            directory_type: The type of directory a relative path is in.
+
+        Returns:
+            str: The watch ID to pass to unwatch().
+
+        Raises:
+            FileError: If the watcher isn't running or the path doesn't exist.
+        """
+        if self._watcher is None:
+            raise FileError("File watcher is not running", file_path=str(path))
+
+        target = pathlib.Path(path)
+        if target.is_absolute():
+            target = target.absolute()
+        else:
+            target = self.get_file_path(str(path), directory_type)
+
+        if not target.exists():
+            raise FileError(
+                f"Cannot watch a path that does not exist: {target}",
+                file_path=str(target),
+            )
+
+        is_dir = target.is_dir()
+        watch = _Watch(
+            path=str(target),
+            root=str(target) if is_dir else str(target.parent),
+            recursive=recursive and is_dir,
+            callback=callback,
+        )
+        self._watcher.add(watch.root, watch.recursive)
+
+        watch_id = str(uuid.uuid4())
+        with self._watches_lock:
+            self._watches[watch_id] = watch
+        return watch_id
+
+    def unwatch(self, watch_id: str) -> bool:
+        """Remove a callback added with watch().
+
+        Args:
+            watch_id: The ID returned by watch().
+
+        Returns:
+            bool: Whether the watch existed.
+        """
+        with self._watches_lock:
+            watch = self._watches.pop(watch_id, None)
+        if watch is None:
+            return False
+
+        if self._watcher is not None:
+            self._watcher.remove(watch.root)
+        return True
+
+    def _use_index(self) -> bool:
+        """Check whether queries can be answered from the index."""
+        return self._index is not None and self._index.ready
+
+    def _info_from_row(self, row: Tuple[Any, ...]) -> FileInfo:
+        """Convert an index row to FileInfo."""
+        return FileInfo(
+            path=row[0],
+            name=row[2],
+            size=row[4],
+            created_at=row[7],
+            modified_at=row[6],
+            file_type=FileType(row[9]),
+            is_directory=row[3] != _FileIndex.FILE,
+            content_hash=row[10],
+            metadata={"inode": row[8]},
+        )
+
+    def refresh_index(self, full: bool = False) -> Dict[str, Any]:
+        """Bring the metadata index up to date with the disk.
+
+        Args:
+            full: Restat every file, catching files modified in place without
+                going through the File Manager.
+
+        Returns:
+            Dict[str, Any]: Counts of directories checked and listed, and of
+                entries added, updated and removed.
+
+        Raises:
+            FileError: If the index is disabled or cannot be refreshed.
+        """
+        if self._index is None:
+            raise FileError("File index is not enabled", file_path="")
+
+        try:
+            return self._index.refresh(full=full)
+        except Exception as e:
+            raise FileError(
+                f"Failed to refresh file index: {str(e)}", file_path=self._index.path
+            ) from e
+
+    def list_indexed_files(
+        self,
+        path: str = "",
+        directory_type: str = "base",
+        recursive: bool = False,
+        include_dirs: bool = True,
+        pattern: Optional[str] = None,
+    ) -> List[FileInfo]:
+        """List files from the metadata index instead of the disk.
+
+        Takes the same arguments as list_files(), and falls back to it while
+        the index is disabled or still being built. Results are as fresh as
+        the last refresh, plus any changes made through the File Manager.
+
+        Returns:
+            List[FileInfo]: Information about the files in the directory.
+
+        Raises:
+            FileError: If the directory cannot be listed.
+        """
+        if not self._use_index():
+            return self.list_files(
+                path, directory_type, recursive, include_dirs, pattern
+            )
+
+        # Like list_files(), a missing directory is an error, not an empty one
+        root = self._get_directory(path, directory_type)
+        result = []
+        for row in self._index.list(root, recursive):
+            if not include_dirs and row[3] != _FileIndex.FILE:
+                continue
+            if pattern and not self._match_pattern(row[2], row[0], root, pattern):
+                continue
+            result.append(self._info_from_row(row))
+        return result
+
+    def get_directory_size(self, path: str = "", directory_type: str = "base") -> int:
+        """Get the total size of the files below a directory.
+
+        Answered from the metadata index when it is available.
+
+        Args:
+            path: The path to the directory, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+
+        Returns:
+            int: The total size in bytes.
+
+        Raises:
+            FileError: If the size cannot be determined.
+        """
+        if self._use_index():
+            return self._index.size(str(self.get_file_path(path, directory_type)))[0]
+
+        return sum(
+            f.size
+            for f in self.iter_files(
+                path, directory_type, recursive=True, include_dirs=False
+            )
+        )
+
+    def get_changed_files(
+        self, since: float, path: str = "", directory_type: str = "base"
+    ) -> Dict[str, Any]:
+        """Get the files added, modified or deleted since a point in time.
+
+        Changes are timed by when the index noticed them, so pass the time of
+        the previous call (or of a refresh_index()) to get every change once.
+
+        Args:
+            since: A time.time() timestamp.
+            path: The path to the directory, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+
+        Returns:
+            Dict[str, Any]: "changed", a list of FileInfo for added or
+                modified files, and "deleted", a list of deleted paths.
+
+        Raises:
+            FileError: If the index is disabled.
+        """
+        if self._index is None:
+            raise FileError("File index is not enabled", file_path=path)
+
+        root = str(self.get_file_path(path, directory_type))
+        changed, deleted = self._index.changed_since(since, root)
+        return {
+            "changed": [self._info_from_row(row) for row in changed],
+            "deleted": deleted,
+        }
+
+    def get_file_info(self, path: str, directory_type: str = "base") -> FileInfo:
+        """Get information about a file.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+
+        Returns:
+            FileInfo: Information about the file.
+
+        Raises:
+            FileError: If the file information cannot be retrieved.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+
+            if not full_path.exists():
+                raise FileError(
+                    f"File does not exist: {full_path}",
+                    file_path=str(full_path),
+                )
+
+            stat = full_path.stat()
+
+            return FileInfo(
+                path=str(full_path),
+                name=full_path.name,
+                size=stat.st_size,
+                created_at=stat.st_ctime,
+                modified_at=stat.st_mtime,
+                file_type=self._get_file_type(full_path),
+                is_directory=full_path.is_dir(),
+                metadata={},
+            )
+
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to get file info: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+    def delete_file(self, path: str, directory_type: str = "base") -> None:
+        """Delete a file.
+
+        Args:
+            path: The path to the file, relative to the specified directory.
+            directory_type: The type of directory to use as the base.
+
+        Raises:
+            FileError: If the file cannot be deleted.
+        """
+        try:
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+
+            if not full_path.exists():
+                raise FileError(
+                    f"File does not exist: {full_path}",
+                    file_path=str(full_path),
+                )
+
+            # Get a lock for this file
+            lock = self._locks.lock(str(full_path))
+
+            with lock:
+                if full_path.is_dir():
+                    shutil.rmtree(full_path)
+                else:
+                    os.remove(full_path)
+
+            self._update_index(full_path)
+
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to delete file: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
+            ) from e
+
+    def copy_file(
+        self,
+        source_path: str,
+        dest_path: str,
+        source_dir_type: str = "base",
+        dest_dir_type: str = "base",
+        overwrite: bool = False,
+    ) -> None:
+        """Copy a file from one location to another.
+
+        Args:
+            source_path: The path to the source file.
+            dest_path: The path to the destination file.
+            source_dir_type: The type of directory to use as the base for the source.
+            dest_dir_type: The type of directory to use as the base for the destination.
+            overwrite: Whether to overwrite the destination file if it exists.
+
+        Raises:
+            FileError: If the file cannot be copied.
+        """
+        try:
+            source_full_path = self.get_file_path(source_path, source_dir_type)
+            dest_full_path = self.get_file_path(dest_path, dest_dir_type)
+            self._sync_pending(source_full_path)
+            self._sync_pending(dest_full_path)
+
+            if not source_full_path.exists():
+                raise FileError(
+                    f"Source file does not exist: {source_full_path}",
+                    file_path=str(source_full_path),
+                )
+
+            if dest_full_path.exists() and not overwrite:
+                raise FileError(
+                    f"Destination file already exists: {dest_full_path}",
+                    file_path=str(dest_full_path),
+                )
+
+            # Create parent directories if needed
+            os.makedirs(dest_full_path.parent, exist_ok=True)
+
+            # Lock both files; the lock table acquires them in a consistent
+            # order to avoid deadlocks
+            paths = [str(source_full_path), str(dest_full_path)]
+            with self._locks.lock_all(paths):
+                if source_full_path.is_dir():
+                    self._copy_tree(
+                        str(source_full_path), str(dest_full_path), overwrite
+                    )
+                else:
+                    self._copy_one(str(source_full_path), str(dest_full_path))
+
+            self._update_index(dest_full_path)
+
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to copy file: {str(e)}",
+                file_path=f"{source_path} -> {dest_path}",
+            ) from e
+
+    def _copy_one(self, source: str, dest: str) -> str:
+        """Copy a file's contents and metadata, like shutil.copy2().
+
+        The copy is made with the copy engine into a temporary file that
+        replaces the destination atomically.
+
+        Returns:
+            str: The destination path.
+        """
+        temp_path = f"{dest}.{uuid.uuid4().hex[:12]}.tmp"
+        try:
+            with open(source, "rb") as src:
+                fd = os.open(
+                    temp_path,
+                    os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+                    0o666,
+                )
+                try:
+                    self._copier.copy(src.fileno(), fd)
+                    if self._fsync != "none":
+                        os.fsync(fd)
+                finally:
+                    os.close(fd)
+            shutil.copystat(source, temp_path)
+            os.replace(temp_path, dest)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        return dest
+
+    def _copy_tree(self, source: str, dest: str, dirs_exist_ok: bool) -> None:
+        """Copy a directory tree, like shutil.copytree(), copying files in parallel.
+
+        Directories are created first, then files are copied on
+        files.copy.workers threads, and directory metadata is copied last,
+        so copying files doesn't change it.
+        """
+        directories = []
+        files = []
+        stack = [(source, dest)]
+        while stack:
+            src_dir, dest_dir = stack.pop()
+            os.makedirs(dest_dir, exist_ok=dirs_exist_ok)
+            directories.append((src_dir, dest_dir))
+            with os.scandir(src_dir) as it:
+                for entry in it:
+                    target = os.path.join(dest_dir, entry.name)
+                    # Symlinks are followed, as copytree() does by default
+                    if entry.is_dir():
+                        stack.append((entry.path, target))
+                    else:
+                        files.append((entry.path, target))
+
+        self._pool.run(lambda pair: self._copy_one(*pair), files, self._copy_workers)
+
+        for src_dir, dest_dir in reversed(directories):
+            shutil.copystat(src_dir, dest_dir)
+
+    def move_file(
+        self,
+        source_path: str,
+        dest_path: str,
+        source_dir_type: str = "base",
+        dest_dir_type: str = "base",
+        overwrite: bool = False,
+    ) -> None:
+        """Move a file from one location to another.
 
         Args:
-            path: The path to the file, relative to the specified directory.
+            source_path: The path to the source file.
+            dest_path: The path to the destination file.
+            source_dir_type: The type of directory to use as the base for the source.
+            dest_dir_type: The type of directory to use as the base for the destination.
+            overwrite: Whether to overwrite the destination file if it exists.
+
+        Raises:
+            FileError: If the file cannot be moved.
+        """
+        try:
+            source_full_path = self.get_file_path(source_path, source_dir_type)
+            dest_full_path = self.get_file_path(dest_path, dest_dir_type)
+            self._sync_pending(source_full_path)
+            self._sync_pending(dest_full_path)
+
+            if not source_full_path.exists():
+                raise FileError(
+                    f"Source file does not exist: {source_full_path}",
+                    file_path=str(source_full_path),
+                )
+
+            if dest_full_path.exists() and not overwrite:
+                raise FileError(
+                    f"Destination file already exists: {dest_full_path}",
+                    file_path=str(dest_full_path),
+                )
+
+            # Create parent directories if needed
+            os.makedirs(dest_full_path.parent, exist_ok=True)
+
+            # Lock both files; the lock table acquires them in a consistent
+            # order to avoid deadlocks
+            paths = [str(source_full_path), str(dest_full_path)]
+            with self._locks.lock_all(paths):
+                # Use shutil.move for both files and directories; moves
+                # across filesystems copy with the copy engine
+                shutil.move(
+                    source_full_path, dest_full_path, copy_function=self._copy_one
+                )
+
+            self._update_index(source_full_path, dest_full_path)
+
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to move file: {str(e)}",
+                file_path=f"{source_path} -> {dest_path}",
+            ) from e
+
+    def create_backup(self, path: str, directory_type: str = "base") -> str:
+        """Back up a file or directory as a deduplicated snapshot.
+
+        Files are split into content-defined chunks, and only chunks the
+        backup store doesn't hold yet are written, so backing up data that
+        changed a little costs about the changed bytes. Files whose size,
+        mtime and inode match the previous snapshot of the same path aren't
+        read at all. The path's snapshots are then pruned by the
+        files.backup.retention policy.
+
+        Args:
+            path: The path to the file or directory to back up.
             directory_type: The type of directory to use as the base.
 
         Returns:
-            bytes: The binary content of the file.
+            str: The ID of the snapshot, for restore_backup().
 
         Raises:
-            FileError: If the file cannot be read.
+            FileError: If the backup cannot be created.
         """
         try:
-            full_path = self.get_file_path(path, directory_type)
+            source_full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(source_full_path)
 
-            # Get a lock for this file
-            lock = self._get_file_lock(str(full_path))
+            if not source_full_path.exists():
+                raise FileError(
+                    f"Source file does not exist: {source_full_path}",
+                    file_path=str(source_full_path),
+                )
 
-            with lock:
-                with open(full_path, "rb") as f:
-                    return f.read()
+            store = self._backup_store
+            key = self._backup_key(source_full_path, directory_type)
+            created_at = time.time()
+            snapshot_id = (
+                f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(created_at))}"
+                f"-{uuid.uuid4().hex[:8]}"
+            )
+
+            # Files unchanged since the previous snapshot keep its chunks
+            parent = next(iter(store.list(directory_type, key)), None)
+            previous = {f["path"]: f for f in parent["files"]} if parent else {}
+            reuse_before = (
+                int((parent["created_at"] - _HashCache.RACY_SECONDS) * 1e9)
+                if parent
+                else 0
+            )
+
+            is_directory = source_full_path.is_dir()
+            if is_directory:
+                files, directories = self._backup_sources(str(source_full_path))
+            else:
+                files, directories = [(str(source_full_path), "")], []
+
+            with store.writing() as digests:
+                entries = self._map_parallel(
+                    lambda item: self._backup_file(
+                        *item, previous.get(item[1]), reuse_before, digests
+                    ),
+                    files,
+                )
+                store.add(
+                    {
+                        "id": snapshot_id,
+                        "created_at": created_at,
+                        "directory_type": directory_type,
+                        "path": key,
+                        "is_directory": is_directory,
+                        "directories": directories,
+                        "files": entries,
+                        "size": sum(e["size"] for e in entries),
+                    }
+                )
+
+            try:
+                self.prune_backups(path, directory_type)
+            except Exception as e:
+                self._logger.warning(
+                    f"Failed to prune backups of {path}: {str(e)}",
+                    extra={"file_path": path},
+                )
+
+            return snapshot_id
+
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
 
         except Exception as e:
             raise FileError(
-                f"Failed to read binary file: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
+                f"Failed to create backup: {str(e)}",
+                file_path=path,
             ) from e
 
-    def write_binary(
+    def _backup_key(self, full_path: pathlib.Path, directory_type: str) -> str:
+        """Get the path snapshots of a file are recorded under."""
+        key = full_path.relative_to(self.get_file_path("", directory_type)).as_posix()
+        return "" if key == "." else key
+
+    def _backup_sources(self, root: str) -> Tuple[List[Tuple[str, str]], List[str]]:
+        """List the files and directories of a tree to back up.
+
+        The backup directory and the File Manager's databases are skipped.
+
+        Returns:
+            Tuple[List[Tuple[str, str]], List[str]]: The absolute and relative
+            path of each file, and the relative path of each directory.
+        """
+        excluded = {str(self._backup_directory), *self._internal_files()}
+
+        files: List[Tuple[str, str]] = []
+        directories: List[str] = []
+        stack = [(root, "")]
+        while stack:
+            directory, rel_dir = stack.pop()
+            with os.scandir(directory) as it:
+                for entry in it:
+                    if entry.path in excluded:
+                        continue
+                    rel_path = f"{rel_dir}/{entry.name}" if rel_dir else entry.name
+                    # Symlinked files are followed; symlinked directories aren't
+                    if entry.is_dir(follow_symlinks=False):
+                        directories.append(rel_path)
+                        stack.append((entry.path, rel_path))
+                    elif entry.is_file():
+                        files.append((entry.path, rel_path))
+        return files, directories
+
+    def _backup_file(
         self,
-        path: str,
-        content: bytes,
-        directory_type: str = "base",
-        create_dirs: bool = True,
-    ) -> None:
-        """Write binary data to a file.
+        full_path: str,
+        rel_path: str,
+        previous: Optional[Dict[str, Any]],
+        reuse_before: int,
+        digests: Set[str],
+    ) -> Dict[str, Any]:
+        """Store a file's chunks and get its snapshot entry.
 
         Args:
-            path: The path to the file, relative to the specified directory.
-            content: The binary content to write.
+            full_path: The absolute path of the file.
+            rel_path: The path recorded in the snapshot.
+            previous: The file's entry in the previous snapshot, if any.
+            reuse_before: The mtime_ns before which an unchanged entry is
+                reused; later writes may not have changed the mtime.
+            digests: The chunks of the backup in progress.
+
+        Returns:
+            Dict[str, Any]: The file's entry.
+        """
+        store = self._backup_store
+        with open(full_path, "rb") as f:
+            st = os.fstat(f.fileno())
+            if (
+                previous is not None
+                and (previous["size"], previous["mtime_ns"], previous["inode"])
+                == (st.st_size, st.st_mtime_ns, st.st_ino)
+                and st.st_mtime_ns < reuse_before
+                and store.reuse(previous["chunks"], digests)
+            ):
+                return previous
+
+            chunks = [
+                store.put_chunk(chunk, digests) for chunk in store.chunker.chunks(f)
+            ]
+            mtime_ns = st.st_mtime_ns
+            after = os.fstat(f.fileno())
+            if (after.st_size, after.st_mtime_ns) != (st.st_size, st.st_mtime_ns):
+                self._logger.warning(
+                    f"File changed while being backed up: {full_path}",
+                    extra={"file_path": full_path},
+                )
+                mtime_ns = 0  # Never reused by the next backup
+
+        return {
+            "path": rel_path,
+            "size": sum(chunk[1] for chunk in chunks),
+            "mode": stat.S_IMODE(st.st_mode),
+            "mtime_ns": mtime_ns,
+            "inode": st.st_ino,
+            "chunks": chunks,
+        }
+
+    def _map_parallel(
+        self, function: Callable[[Any], Any], items: Sequence[Any]
+    ) -> List[Any]:
+        """Apply a function to items on files.backup.workers threads, in order."""
+        return self._pool.run(function, items, self._backup_workers)
+
+    def list_backups(
+        self, path: Optional[str] = None, directory_type: str = "base"
+    ) -> List[Dict[str, Any]]:
+        """List backup snapshots, newest first.
+
+        Args:
+            path: Only list snapshots of this file or directory. None lists
+                every snapshot in the directory type.
             directory_type: The type of directory to use as the base.
-            create_dirs: Whether to create parent directories if they don't exist.
+
+        Returns:
+            List[Dict[str, Any]]: The ID, creation time, path, file count and
+            size of each snapshot.
+        """
+        key = None
+        if path is not None:
+            full_path = self.get_file_path(path, directory_type)
+            key = self._backup_key(full_path, directory_type)
+
+        return [
+            {
+                "id": s["id"],
+                "created_at": s["created_at"],
+                "directory_type": s["directory_type"],
+                "path": s["path"],
+                "is_directory": s["is_directory"],
+                "files": len(s["files"]),
+                "size": s["size"],
+            }
+            for s in self._backup_store.list(directory_type, key)
+        ]
+
+    def restore_backup(
+        self,
+        snapshot_id: str,
+        dest_path: Optional[str] = None,
+        dest_dir_type: Optional[str] = None,
+        overwrite: bool = False,
+    ) -> str:
+        """Restore a backup snapshot.
+
+        Every chunk is checked against its SHA-256 as it's read, and each
+        file is written to a temporary file that replaces the destination
+        with its original permissions and mtime.
+
+        Args:
+            snapshot_id: The ID returned by create_backup().
+            dest_path: Where to restore the file or directory. Defaults to
+                the path it was backed up from.
+            dest_dir_type: The type of directory to use as the base for the
+                destination. Defaults to the snapshot's.
+            overwrite: Whether to overwrite existing files.
+
+        Returns:
+            str: The absolute path of the restored file or directory.
 
         Raises:
-            FileError: If the file cannot be written.
+            FileError: If the snapshot doesn't exist, a file exists and
+                overwrite is False, or the backup is damaged.
         """
         try:
-            full_path = self.get_file_path(path, directory_type)
+            snapshot = self._backup_store.get(snapshot_id)
+            if snapshot is None:
+                raise FileError(f"Backup snapshot not found: {snapshot_id}")
 
-            # Create parent directories if needed
-            if create_dirs:
-                os.makedirs(full_path.parent, exist_ok=True)
+            dest_full_path = self.get_file_path(
+                snapshot["path"] if dest_path is None else dest_path,
+                dest_dir_type or snapshot["directory_type"],
+            )
+            self._sync_pending(dest_full_path)
+            targets = [
+                (entry, dest_full_path.joinpath(entry["path"]))
+                for entry in snapshot["files"]
+            ]
+
+            if not overwrite:
+                for _, target in targets:
+                    if target.exists():
+                        raise FileError(
+                            f"Destination file already exists: {target}",
+                            file_path=str(target),
+                        )
 
-            # Get a lock for this file
-            lock = self._get_file_lock(str(full_path))
+            if snapshot["is_directory"]:
+                os.makedirs(dest_full_path, exist_ok=True)
+                for directory in snapshot["directories"]:
+                    os.makedirs(dest_full_path.joinpath(directory), exist_ok=True)
+            else:
+                os.makedirs(dest_full_path.parent, exist_ok=True)
 
-            with lock:
-                # Write to a temporary file, then rename to ensure atomic write
-                temp_path = str(full_path) + ".tmp"
-                with open(temp_path, "wb") as f:
-                    f.write(content)
+            self._map_parallel(lambda item: self._restore_file(*item), targets)
+            self._update_index(dest_full_path)
+            return str(dest_full_path)
 
-                # Rename the temporary file to the target file
-                os.replace(temp_path, full_path)
+        except FileError:
+            # Re-raise FileError exceptions
+            raise
 
         except Exception as e:
             raise FileError(
-                f"Failed to write binary file: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
+                f"Failed to restore backup: {str(e)}",
+                file_path=snapshot_id,
             ) from e
 
-    def list_files(
+    def _restore_file(self, entry: Dict[str, Any], target: pathlib.Path) -> None:
+        """Write a file from its snapshot entry."""
+        os.makedirs(target.parent, exist_ok=True)
+        temp_path = f"{target}.{uuid.uuid4().hex[:12]}.tmp"
+        fd = os.open(
+            temp_path,
+            os.O_WRONLY | os.O_CREAT | os.O_EXCL | getattr(os, "O_BINARY", 0),
+            0o666,
+        )
+        try:
+            try:
+                for chunk in entry["chunks"]:
+                    view = memoryview(self._backup_store.read_chunk(chunk))
+                    while view:
+                        view = view[os.write(fd, view) :]
+                if hasattr(os, "fchmod"):
+                    os.fchmod(fd, entry["mode"])
+                if self._fsync != "none":
+                    os.fsync(fd)
+            finally:
+                os.close(fd)
+            if entry["mtime_ns"]:
+                os.utime(temp_path, ns=(entry["mtime_ns"], entry["mtime_ns"]))
+            os.replace(temp_path, target)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    def prune_backups(
         self,
-        path: str = "",
+        path: Optional[str] = None,
         directory_type: str = "base",
-        recursive: bool = False,
-        include_dirs: bool = True,
-        pattern: Optional[str] = None,
-    ) -> List[FileInfo]:
-        """List files in a directory.
+        keep_last: Optional[int] = None,
+        keep_daily: Optional[int] = None,
+        keep_weekly: Optional[int] = None,
+        keep_monthly: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """Remove backup snapshots by a retention policy.
+
+        The policy applies to the snapshots of each backed up path separately.
+        Chunks no remaining snapshot uses are deleted. Pruning every path also
+        deletes chunks left behind by failed backups.
 
         Args:
-            path: The path to the directory, relative to the specified directory.
-            directory_type: The type of directory to use as the base.
-            recursive: Whether to list files in subdirectories recursively.
-            include_dirs: Whether to include directories in the results.
-            pattern: Optional glob pattern to filter files by name.
+            path: Only prune snapshots of this file or directory. None prunes
+                the snapshots of every path.
+            directory_type: The type of directory path is relative to.
+            keep_last: Keep this many of the newest snapshots.
+            keep_daily: Keep the newest snapshot of this many days.
+            keep_weekly: Keep the newest snapshot of this many weeks.
+            keep_monthly: Keep the newest snapshot of this many months.
+                Without any keep_* argument, files.backup.retention applies.
 
         Returns:
-            List[FileInfo]: Information about the files in the directory.
+            Dict[str, Any]: The IDs of the removed snapshots, and the number
+            of chunks deleted and bytes freed.
 
         Raises:
-            FileError: If the directory cannot be listed.
+            FileError: If the backups cannot be pruned.
         """
+        policy: Dict[str, Optional[int]] = {
+            "keep_last": keep_last,
+            "keep_daily": keep_daily,
+            "keep_weekly": keep_weekly,
+            "keep_monthly": keep_monthly,
+        }
+        if all(value is None for value in policy.values()):
+            policy = self._backup_retention
+
         try:
-            full_path = self.get_file_path(path, directory_type)
+            store = self._backup_store
+            if path is None:
+                snapshots = store.list()
+            else:
+                full_path = self.get_file_path(path, directory_type)
+                snapshots = store.list(
+                    directory_type, self._backup_key(full_path, directory_type)
+                )
 
-            if not full_path.is_dir():
-                raise FileError(
-                    f"Path is not a directory: {full_path}",
-                    file_path=str(full_path),
+            groups: Dict[Tuple[str, str], List[Dict[str, Any]]] = {}
+            for snapshot in snapshots:
+                group = (snapshot["directory_type"], snapshot["path"])
+                groups.setdefault(group, []).append(snapshot)
+            removed = [
+                snapshot["id"]
+                for group in groups.values()
+                for snapshot in _expired_snapshots(group, policy)
+            ]
+
+            chunks_deleted, bytes_freed = store.remove(removed)
+            if path is None:
+                orphans, orphan_bytes = store.collect_garbage()
+                chunks_deleted += orphans
+                bytes_freed += orphan_bytes
+
+            if removed:
+                self._logger.info(
+                    f"Pruned {len(removed)} backup snapshots, "
+                    f"freeing {bytes_freed} bytes"
                 )
+            return {
+                "removed": removed,
+                "chunks_deleted": chunks_deleted,
+                "bytes_freed": bytes_freed,
+            }
 
-            result: List[FileInfo] = []
+        except Exception as e:
+            raise FileError(
+                f"Failed to prune backups: {str(e)}",
+                file_path=path,
+            ) from e
 
-            # Function to process a single file or directory
-            def process_path(p: pathlib.Path) -> None:
-                try:
-                    stat = p.stat()
-                    is_dir = p.is_dir()
+    def create_temp_file(
+        self, prefix: str = "", suffix: str = "", compress: Optional[bool] = None
+    ) -> Tuple[str, BinaryIO]:
+        """Create a temporary file in the temp directory.
 
-                    if is_dir and not include_dirs:
-                        return
+        Args:
+            prefix: Optional prefix for the filename.
+            suffix: Optional suffix for the filename.
+            compress: Whether data written to the file is compressed, with the
+                files.compression.temp_files codec, or gzip if that's "none".
+                The codec's extension is added to the name, and the file is
+                read back with open_compressed(). Defaults to whether
+                temp_files names a codec.
 
-                    file_info = FileInfo(
-                        path=str(p),
-                        name=p.name,
-                        size=stat.st_size,
-                        created_at=stat.st_ctime,
-                        modified_at=stat.st_mtime,
-                        file_type=self._get_file_type(p),
-                        is_directory=is_dir,
-                        metadata={},
-                    )
+        Returns:
+            Tuple[str, BinaryIO]: The path to the temp file and an open file
+            object; write-only if compressed.
 
-                    result.append(file_info)
+        Raises:
+            FileError: If the temporary file cannot be created.
+        """
+        try:
+            codec = None
+            if compress is None:
+                compress = self._compress_temp_files != "none"
+            if compress:
+                codec = self._get_codec(
+                    "gzip"
+                    if self._compress_temp_files == "none"
+                    else self._compress_temp_files
+                )
+                suffix += codec.extension
 
-                except Exception as e:
-                    self._logger.warning(
-                        f"Failed to get info for {p}: {str(e)}",
-                        extra={"file_path": str(p)},
-                    )
+            # Generate a unique filename
+            temp_name = f"{prefix}{int(time.time())}_{os.urandom(4).hex()}{suffix}"
+            temp_path = self.get_file_path(temp_name, "temp")
+
+            # Create parent directory if needed
+            os.makedirs(temp_path.parent, exist_ok=True)
+
+            # Open the file
+            if codec is not None:
+                file_obj = codec.open(str(temp_path))
+            else:
+                file_obj = open(temp_path, "wb+")
+
+            return str(temp_path), file_obj
+
+        except Exception as e:
+            raise FileError(
+                f"Failed to create temporary file: {str(e)}",
+                file_path=temp_name
+                if "temp_name" in locals()
+                else f"{prefix}*{suffix}",
+            ) from e
+
+    def _get_codec(self, name: str, level: Optional[int] = None) -> _Codec:
+        """Load a compression codec.
+
+        Raises:
+            FileError: If the codec is unknown or its package isn't installed.
+        """
+        try:
+            return _Codec(name, level)
+        except ValueError as e:
+            raise FileError(str(e)) from e
+        except ImportError as e:
+            package = _Codec.PACKAGES[name]
+            self._logger.error(
+                f"Failed to import {package}. Please install with "
+                f"'pip install {package}'"
+            )
+            raise FileError(f"The {name} codec requires {package}") from e
+
+    @contextlib.contextmanager
+    def _atomic_output(self, full_path: pathlib.Path) -> Iterator[BinaryIO]:
+        """Stream a file into a temporary file that replaces it on success."""
+        os.makedirs(full_path.parent, exist_ok=True)
+        temp_path = f"{full_path}.{uuid.uuid4().hex[:12]}.tmp"
+        try:
+            with open(temp_path, "xb") as raw:
+                yield raw
+                raw.flush()
+                if self._fsync != "none":
+                    os.fsync(raw.fileno())
+            with self._locks.lock(str(full_path)):
+                os.replace(temp_path, full_path)
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+        self._update_index(full_path)
+
+    @contextlib.contextmanager
+    def _compressing(
+        self, raw: BinaryIO, codec: _Codec, parallel: bool
+    ) -> Iterator[_ParallelCompressor]:
+        """Compress what's written to the stream into raw.
+
+        Args:
+            raw: The file to write the compressed data to.
+            codec: The codec to compress with.
+            parallel: Whether to compress blocks on files.compression.workers
+                threads; not worth it for data smaller than a block.
+        """
+        executor = None
+        if parallel and self._compress_workers > 1 and not self._pool.in_worker():
+            executor = self._pool
+        stream = _ParallelCompressor(
+            raw,
+            codec,
+            executor,
+            self._compress_block_size,
+            max_pending=2 * self._compress_workers,
+        )
+        try:
+            yield stream
+            stream.finish()
+        finally:
+            stream.close()
+            with self._compression_lock:
+                self._compression_bytes_in += stream.bytes_in
+                self._compression_bytes_out += stream.bytes_out
+
+    def compress_file(
+        self,
+        path: str,
+        dest_path: Optional[str] = None,
+        directory_type: str = "base",
+        dest_dir_type: Optional[str] = None,
+        codec: str = "gzip",
+        level: Optional[int] = None,
+        remove_source: bool = False,
+    ) -> str:
+        """Compress a file, streaming it block by block.
+
+        Files larger than files.compression.block_size are compressed a block
+        per thread on files.compression.workers threads. Each block becomes a
+        complete gzip member or zstd/LZ4 frame, which standard tools read as
+        one stream.
+
+        Args:
+            path: The path to the file to compress.
+            dest_path: The path of the compressed file. Defaults to path with
+                the codec's extension (.gz, .zst or .lz4) added.
+            directory_type: The type of directory to use as the base.
+            dest_dir_type: The type of directory to use as the base for the
+                destination. Defaults to directory_type.
+            codec: The codec: gzip, or zstd or lz4 if installed.
+            level: The compression level. Defaults to the codec's default.
+            remove_source: Whether to delete the file once it's compressed.
+
+        Returns:
+            str: The absolute path of the compressed file.
+
+        Raises:
+            FileError: If the file cannot be compressed.
+        """
+        try:
+            compression = self._get_codec(codec, level)
+            source_full_path = self.get_file_path(path, directory_type)
+            dest_full_path = self.get_file_path(
+                path + compression.extension if dest_path is None else dest_path,
+                dest_dir_type or directory_type,
+            )
+            self._sync_pending(source_full_path)
+            self._sync_pending(dest_full_path)
 
-            # List the directory
-            if recursive:
-                # Use pathlib.Path.glob with recursive option
-                pattern_to_use = pattern or "**/*"
-                for p in full_path.glob(pattern_to_use):
-                    process_path(p)
-            else:
-                # Use pathlib.Path.iterdir for non-recursive listing
-                for p in full_path.iterdir():
-                    if pattern and not p.match(pattern):
-                        continue
-                    process_path(p)
+            with open(source_full_path, "rb") as src:
+                parallel = os.fstat(src.fileno()).st_size > self._compress_block_size
+                with self._atomic_output(dest_full_path) as raw:
+                    with self._compressing(raw, compression, parallel) as stream:
+                        shutil.copyfileobj(src, stream, self._compress_block_size)
 
-            return result
+            if remove_source:
+                self.delete_file(path, directory_type)
+            return str(dest_full_path)
 
         except FileError:
             # Re-raise FileError exceptions
@@ -492,44 +4724,70 @@ class FileManager(QorzenManager):
 
         except Exception as e:
             raise FileError(
-                f"Failed to list directory: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
+                f"Failed to compress file: {str(e)}",
+                file_path=path,
             ) from e
 
-    def get_file_info(self, path: str, directory_type: str = "base") -> FileInfo:
-        """Get information about a file.
+    def decompress_file(
+        self,
+        path: str,
+        dest_path: Optional[str] = None,
+        directory_type: str = "base",
+        dest_dir_type: Optional[str] = None,
+        codec: Optional[str] = None,
+        remove_source: bool = False,
+    ) -> str:
+        """Decompress a file, streaming it.
 
         Args:
-            path: The path to the file, relative to the specified directory.
+            path: The path to the compressed file.
+            dest_path: The path of the decompressed file. Defaults to path
+                without the codec's extension.
             directory_type: The type of directory to use as the base.
+            dest_dir_type: The type of directory to use as the base for the
+                destination. Defaults to directory_type.
+            codec: The codec. Defaults to the one path's extension names.
+            remove_source: Whether to delete the compressed file afterwards.
 
         Returns:
-            FileInfo: Information about the file.
+            str: The absolute path of the decompressed file.
 
         Raises:
-            FileError: If the file information cannot be retrieved.
+            FileError: If the file cannot be decompressed.
         """
         try:
-            full_path = self.get_file_path(path, directory_type)
-
-            if not full_path.exists():
+            codec = codec or _Codec.name_for(path)
+            if codec is None:
                 raise FileError(
-                    f"File does not exist: {full_path}",
-                    file_path=str(full_path),
+                    f"Unknown compression codec for {path}", file_path=path
                 )
+            compression = self._get_codec(codec)
 
-            stat = full_path.stat()
+            if dest_path is None:
+                if path.endswith(".tgz"):
+                    dest_path = path[: -len(".tgz")] + ".tar"
+                elif path.endswith(compression.extension):
+                    dest_path = path[: -len(compression.extension)]
+                else:
+                    raise FileError(
+                        f"No destination given for {path}", file_path=path
+                    )
 
-            return FileInfo(
-                path=str(full_path),
-                name=full_path.name,
-                size=stat.st_size,
-                created_at=stat.st_ctime,
-                modified_at=stat.st_mtime,
-                file_type=self._get_file_type(full_path),
-                is_directory=full_path.is_dir(),
-                metadata={},
+            source_full_path = self.get_file_path(path, directory_type)
+            dest_full_path = self.get_file_path(
+                dest_path, dest_dir_type or directory_type
             )
+            self._sync_pending(source_full_path)
+            self._sync_pending(dest_full_path)
+
+            with open(source_full_path, "rb") as raw:
+                with compression.reader(raw) as reader:
+                    with self._atomic_output(dest_full_path) as dest:
+                        shutil.copyfileobj(reader, dest, self._compress_block_size)
+
+            if remove_source:
+                self.delete_file(path, directory_type)
+            return str(dest_full_path)
 
         except FileError:
             # Re-raise FileError exceptions
@@ -537,105 +4795,163 @@ class FileManager(QorzenManager):
 
         except Exception as e:
             raise FileError(
-                f"Failed to get file info: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
+                f"Failed to decompress file: {str(e)}",
+                file_path=path,
             ) from e
 
-    def delete_file(self, path: str, directory_type: str = "base") -> None:
-        """Delete a file.
+    @contextlib.contextmanager
+    def open_compressed(
+        self,
+        path: str,
+        mode: str = "rb",
+        directory_type: str = "base",
+        codec: Optional[str] = None,
+        level: Optional[int] = None,
+    ) -> Iterator[BinaryIO]:
+        """Open a compressed file as a stream of its uncompressed content.
+
+        Reading decompresses as the stream is read. Writing compresses blocks
+        on files.compression.workers threads into a temporary file, which
+        replaces the file when the block exits without an error.
 
         Args:
             path: The path to the file, relative to the specified directory.
+            mode: "rb" to read or "wb" to write.
             directory_type: The type of directory to use as the base.
+            codec: The codec. Defaults to the one path's extension names.
+            level: The compression level when writing.
+
+        Yields:
+            BinaryIO: The uncompressed stream.
 
         Raises:
-            FileError: If the file cannot be deleted.
+            FileError: If the file cannot be opened.
         """
+        stack = contextlib.ExitStack()
         try:
-            full_path = self.get_file_path(path, directory_type)
-
-            if not full_path.exists():
+            if mode not in ("rb", "wb"):
+                raise FileError(f"Unsupported mode for compressed files: {mode}")
+            codec = codec or _Codec.name_for(path)
+            if codec is None:
                 raise FileError(
-                    f"File does not exist: {full_path}",
-                    file_path=str(full_path),
+                    f"Unknown compression codec for {path}", file_path=path
                 )
+            compression = self._get_codec(codec, level)
 
-            # Get a lock for this file
-            lock = self._get_file_lock(str(full_path))
-
-            with lock:
-                if full_path.is_dir():
-                    shutil.rmtree(full_path)
-                else:
-                    os.remove(full_path)
-
-            # Release the lock
-            self._release_file_lock(str(full_path))
-
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+            if mode == "rb":
+                raw = stack.enter_context(open(full_path, "rb"))
+                stream: BinaryIO = stack.enter_context(compression.reader(raw))
+            else:
+                raw = stack.enter_context(self._atomic_output(full_path))
+                stream = stack.enter_context(self._compressing(raw, compression, True))
         except FileError:
-            # Re-raise FileError exceptions
+            stack.close()
             raise
-
         except Exception as e:
+            stack.close()
             raise FileError(
-                f"Failed to delete file: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
+                f"Failed to open compressed file: {str(e)}",
+                file_path=path,
             ) from e
 
-    def copy_file(
+        with stack:
+            yield stream
+
+    def create_archive(
         self,
-        source_path: str,
-        dest_path: str,
-        source_dir_type: str = "base",
-        dest_dir_type: str = "base",
-        overwrite: bool = False,
-    ) -> None:
-        """Copy a file from one location to another.
+        paths: Sequence[str],
+        archive_path: str,
+        directory_type: str = "base",
+        archive_dir_type: Optional[str] = None,
+        archive_format: Optional[str] = None,
+        level: Optional[int] = None,
+    ) -> str:
+        """Create a zip or tar archive of files and directories.
+
+        Files are streamed into the archive, and members are named by their
+        path relative to the directory type's root. Compressed tar archives
+        are compressed in blocks on files.compression.workers threads; zip
+        members are deflated one after another.
 
         Args:
-            source_path: The path to the source file.
-            dest_path: The path to the destination file.
-            source_dir_type: The type of directory to use as the base for the source.
-            dest_dir_type: The type of directory to use as the base for the destination.
-            overwrite: Whether to overwrite the destination file if it exists.
+            paths: The files and directories to archive.
+            archive_path: The path of the archive.
+            directory_type: The type of directory paths are relative to.
+            archive_dir_type: The type of directory to use as the base for
+                the archive. Defaults to directory_type.
+            archive_format: zip, tar, tar.gz, tar.zst or tar.lz4. Defaults to
+                the one archive_path's extension names.
+            level: The compression level.
+
+        Returns:
+            str: The absolute path of the archive.
 
         Raises:
-            FileError: If the file cannot be copied.
+            FileError: If the archive cannot be created.
         """
         try:
-            source_full_path = self.get_file_path(source_path, source_dir_type)
-            dest_full_path = self.get_file_path(dest_path, dest_dir_type)
-
-            if not source_full_path.exists():
-                raise FileError(
-                    f"Source file does not exist: {source_full_path}",
-                    file_path=str(source_full_path),
-                )
-
-            if dest_full_path.exists() and not overwrite:
+            archive_format = archive_format or _archive_format(archive_path)
+            if archive_format not in _ARCHIVE_FORMATS:
                 raise FileError(
-                    f"Destination file already exists: {dest_full_path}",
-                    file_path=str(dest_full_path),
+                    f"Unsupported archive format for {archive_path}",
+                    file_path=archive_path,
                 )
+            codec_name = _ARCHIVE_FORMATS[archive_format]
+            codec = self._get_codec(codec_name, level) if codec_name else None
+
+            root = self.get_file_path("", directory_type)
+            internal = self._internal_files()
+            members = []
+            for path in paths:
+                full_path = self.get_file_path(path, directory_type)
+                self._sync_pending(full_path)
+                if not full_path.exists():
+                    raise FileError(
+                        f"File does not exist: {full_path}",
+                        file_path=str(full_path),
+                    )
+                if str(full_path) not in internal:
+                    members.append(
+                        (full_path, full_path.relative_to(root).as_posix())
+                    )
+            # Member names of the File Manager's databases, for tar's filter
+            internal_names = {
+                os.path.relpath(p, root).replace(os.sep, "/") for p in internal
+            }
 
-            # Create parent directories if needed
-            os.makedirs(dest_full_path.parent, exist_ok=True)
-
-            # Get locks for both files
-            source_lock = self._get_file_lock(str(source_full_path))
-            dest_lock = self._get_file_lock(str(dest_full_path))
-
-            # Acquire locks in a consistent order to avoid deadlocks
-            first_lock, second_lock = sorted([source_lock, dest_lock], key=id)
-
-            with first_lock:
-                with second_lock:
-                    if source_full_path.is_dir():
-                        shutil.copytree(
-                            source_full_path, dest_full_path, dirs_exist_ok=overwrite
-                        )
-                    else:
-                        shutil.copy2(source_full_path, dest_full_path)
+            archive_full_path = self.get_file_path(
+                archive_path, archive_dir_type or directory_type
+            )
+            with self._atomic_output(archive_full_path) as raw:
+                if archive_format == "zip":
+                    with zipfile.ZipFile(
+                        raw, "w", zipfile.ZIP_DEFLATED, compresslevel=level
+                    ) as archive:
+                        for full_path, name in members:
+                            self._add_to_zip(archive, full_path, name, internal)
+                else:
+                    with contextlib.ExitStack() as stack:
+                        stream: BinaryIO = raw
+                        if codec is not None:
+                            stream = stack.enter_context(
+                                self._compressing(raw, codec, True)
+                            )
+                        with tarfile.open(fileobj=stream, mode="w|") as archive:
+                            for full_path, name in members:
+                                archive.add(
+                                    str(full_path),
+                                    arcname=name,
+                                    filter=lambda info: (
+                                        None
+                                        if os.path.normpath(info.name)
+                                        in internal_names
+                                        else info
+                                    ),
+                                )
+
+            return str(archive_full_path)
 
         except FileError:
             # Re-raise FileError exceptions
@@ -643,64 +4959,96 @@ class FileManager(QorzenManager):
 
         except Exception as e:
             raise FileError(
-                f"Failed to copy file: {str(e)}",
-                file_path=f"{source_path} -> {dest_path}",
+                f"Failed to create archive: {str(e)}",
+                file_path=archive_path,
             ) from e
 
-    def move_file(
-        self,
-        source_path: str,
-        dest_path: str,
-        source_dir_type: str = "base",
-        dest_dir_type: str = "base",
-        overwrite: bool = False,
+    @staticmethod
+    def _add_to_zip(
+        archive: zipfile.ZipFile,
+        full_path: pathlib.Path,
+        name: str,
+        excluded: Set[str],
     ) -> None:
-        """Move a file from one location to another.
+        """Add a file or directory tree to a zip archive, skipping excluded paths."""
+        archive.write(full_path, name)
+        if not full_path.is_dir():
+            return
+        for directory, dirnames, filenames in os.walk(full_path):
+            rel_dir = pathlib.Path(directory).relative_to(full_path).as_posix()
+            prefix = name if rel_dir == "." else f"{name}/{rel_dir}"
+            for entry in sorted(dirnames) + sorted(filenames):
+                entry_path = os.path.join(directory, entry)
+                if entry_path not in excluded:
+                    archive.write(entry_path, f"{prefix}/{entry}")
+
+    def extract_archive(
+        self,
+        archive_path: str,
+        dest_path: str = "",
+        directory_type: str = "base",
+        dest_dir_type: Optional[str] = None,
+        archive_format: Optional[str] = None,
+    ) -> List[str]:
+        """Extract a zip or tar archive, streaming its members.
+
+        Members that would be written outside the destination, through
+        absolute paths, ".." or links, are rejected, as are device files.
 
         Args:
-            source_path: The path to the source file.
-            dest_path: The path to the destination file.
-            source_dir_type: The type of directory to use as the base for the source.
-            dest_dir_type: The type of directory to use as the base for the destination.
-            overwrite: Whether to overwrite the destination file if it exists.
+            archive_path: The path of the archive.
+            dest_path: The directory to extract into.
+            directory_type: The type of directory to use as the base.
+            dest_dir_type: The type of directory to use as the base for the
+                destination. Defaults to directory_type.
+            archive_format: zip, tar, tar.gz, tar.zst or tar.lz4. Defaults to
+                the one archive_path's extension names.
+
+        Returns:
+            List[str]: The names of the extracted members.
 
         Raises:
-            FileError: If the file cannot be moved.
+            FileError: If the archive cannot be extracted.
         """
         try:
-            source_full_path = self.get_file_path(source_path, source_dir_type)
-            dest_full_path = self.get_file_path(dest_path, dest_dir_type)
-
-            if not source_full_path.exists():
-                raise FileError(
-                    f"Source file does not exist: {source_full_path}",
-                    file_path=str(source_full_path),
-                )
-
-            if dest_full_path.exists() and not overwrite:
+            archive_format = archive_format or _archive_format(archive_path)
+            if archive_format not in _ARCHIVE_FORMATS:
                 raise FileError(
-                    f"Destination file already exists: {dest_full_path}",
-                    file_path=str(dest_full_path),
+                    f"Unsupported archive format for {archive_path}",
+                    file_path=archive_path,
                 )
+            codec_name = _ARCHIVE_FORMATS[archive_format]
+            codec = self._get_codec(codec_name) if codec_name else None
 
-            # Create parent directories if needed
-            os.makedirs(dest_full_path.parent, exist_ok=True)
-
-            # Get locks for both files
-            source_lock = self._get_file_lock(str(source_full_path))
-            dest_lock = self._get_file_lock(str(dest_full_path))
-
-            # Acquire locks in a consistent order to avoid deadlocks
-            first_lock, second_lock = sorted([source_lock, dest_lock], key=id)
-
-            with first_lock:
-                with second_lock:
-                    # Use shutil.move for both files and directories
-                    shutil.move(source_full_path, dest_full_path)
+            archive_full_path = self.get_file_path(archive_path, directory_type)
+            dest_full_path = self.get_file_path(
+                dest_path, dest_dir_type or directory_type
+            )
+            self._sync_pending(archive_full_path)
+            self._sync_pending(dest_full_path)
+            os.makedirs(dest_full_path, exist_ok=True)
+
+            names = []
+            if archive_format == "zip":
+                # zipfile drops absolute and ".." components itself
+                with zipfile.ZipFile(archive_full_path) as archive:
+                    for member in archive.infolist():
+                        archive.extract(member, dest_full_path)
+                        names.append(member.filename)
+            else:
+                with contextlib.ExitStack() as stack:
+                    stream: BinaryIO = stack.enter_context(
+                        open(archive_full_path, "rb")
+                    )
+                    if codec is not None:
+                        stream = stack.enter_context(codec.reader(stream))
+                    with tarfile.open(fileobj=stream, mode="r|") as archive:
+                        for member in archive:
+                            archive.extract(member, dest_full_path, filter="data")
+                            names.append(member.name)
 
-            # Release locks
-            self._release_file_lock(str(source_full_path))
-            self._release_file_lock(str(dest_full_path))
+            self._update_index(dest_full_path)
+            return names
 
         except FileError:
             # Re-raise FileError exceptions
@@ -708,53 +5056,58 @@ class FileManager(QorzenManager):
 
         except Exception as e:
             raise FileError(
-                f"Failed to move file: {str(e)}",
-                file_path=f"{source_path} -> {dest_path}",
+                f"Failed to extract archive: {str(e)}",
+                file_path=archive_path,
             ) from e
 
-    def create_backup(self, path: str, directory_type: str = "base") -> str:
-        """Create a backup of a file in the backup directory.
+    def _compression_stats(self) -> Dict[str, Any]:
+        """Get statistics about files.compression."""
+        with self._compression_lock:
+            bytes_in = self._compression_bytes_in
+            bytes_out = self._compression_bytes_out
+        return {
+            "workers": self._compress_workers,
+            "block_size": self._compress_block_size,
+            "temp_files": self._compress_temp_files,
+            "bytes_in": bytes_in,
+            "bytes_out": bytes_out,
+            "ratio": round(bytes_in / bytes_out, 2) if bytes_out else None,
+        }
+
+    def compute_file_hash(
+        self, path: str, directory_type: str = "base", algorithm: str = "sha256"
+    ) -> str:
+        """Compute the hash of a file's contents.
+
+        Hashes are cached by the file's device, inode, size and mtime, so an
+        unchanged file is only read once.
 
         Args:
-            path: The path to the file to back up.
+            path: The path to the file.
             directory_type: The type of directory to use as the base.
+            algorithm: One of "sha256", "sha1", "md5", "blake2b" and
+                "xxh3_128", or "fast" for the fastest available digest that
+                is good enough for deduplication.
 
         Returns:
-            str: The path to the backup file, relative to the backup directory.
+            str: The hexadecimal hash of the file.
 
         Raises:
-            FileError: If the backup cannot be created.
+            FileError: If the hash cannot be computed.
         """
         try:
-            source_full_path = self.get_file_path(path, directory_type)
+            full_path = self.get_file_path(path, directory_type)
+            self._sync_pending(full_path)
+            algorithm = self._resolve_hash_algorithm(algorithm)
 
-            if not source_full_path.exists():
+            if not full_path.exists() or full_path.is_dir():
                 raise FileError(
-                    f"Source file does not exist: {source_full_path}",
-                    file_path=str(source_full_path),
+                    f"Cannot compute hash for non-existent or directory: {full_path}",
+                    file_path=str(full_path),
                 )
 
-            # Generate a backup filename with timestamp
-            backup_name = (
-                f"{source_full_path.stem}_{int(time.time())}{source_full_path.suffix}"
-            )
-
-            # Backup subdirectory structure mirrors the original path relative to the base
-            rel_path = source_full_path.relative_to(
-                self.get_file_path("", directory_type)
-            )
-            backup_path = rel_path.parent / backup_name
-
-            # Copy the file to the backup location
-            self.copy_file(
-                source_path=str(source_full_path),
-                dest_path=str(backup_path),
-                source_dir_type=directory_type,
-                dest_dir_type="backup",
-                overwrite=True,
-            )
-
-            return str(backup_path)
+            # No file lock: a write during the read is detected and re-read
+            return self._hash_path(str(full_path), algorithm)
 
         except FileError:
             # Re-raise FileError exceptions
@@ -762,89 +5115,136 @@ class FileManager(QorzenManager):
 
         except Exception as e:
             raise FileError(
-                f"Failed to create backup: {str(e)}",
-                file_path=path,
+                f"Failed to compute file hash: {str(e)}",
+                file_path=str(full_path) if "full_path" in locals() else path,
             ) from e
 
-    def create_temp_file(
-        self, prefix: str = "", suffix: str = ""
-    ) -> Tuple[str, BinaryIO]:
-        """Create a temporary file in the temp directory.
+    def compute_hashes(
+        self,
+        paths: Sequence[str],
+        directory_type: str = "base",
+        algorithm: str = "sha256",
+    ) -> Dict[str, Optional[str]]:
+        """Compute the hashes of many files in parallel.
+
+        Cached hashes are looked up in one pass and only the remaining files
+        are read, on files.hash_workers threads.
 
         Args:
-            prefix: Optional prefix for the filename.
-            suffix: Optional suffix for the filename.
+            paths: The paths to the files.
+            directory_type: The type of directory to use as the base.
+            algorithm: The digest to use, as for compute_file_hash().
 
         Returns:
-            Tuple[str, BinaryIO]: The path to the temp file and an open file object.
+            Dict[str, Optional[str]]: The hexadecimal hash of each path, or
+            None for paths that don't exist, are directories or can't be read.
 
         Raises:
-            FileError: If the temporary file cannot be created.
+            FileError: If the algorithm is not supported.
         """
-        try:
-            # Generate a unique filename
-            temp_name = f"{prefix}{int(time.time())}_{os.urandom(4).hex()}{suffix}"
-            temp_path = self.get_file_path(temp_name, "temp")
+        algorithm = self._resolve_hash_algorithm(algorithm)
+        result: Dict[str, Optional[str]] = {}
+        stats: Dict[str, Tuple[str, os.stat_result]] = {}
+        for path in paths:
+            result[path] = None
+            try:
+                full_path = str(self.get_file_path(path, directory_type))
+                self._sync_pending(full_path)
+                st = os.stat(full_path)
+            except (FileError, OSError):
+                continue
+            if stat.S_ISREG(st.st_mode):
+                stats[path] = (full_path, st)
+
+        cached: Dict[Tuple[int, int, int, int, str], str] = {}
+        if self._hash_cache is not None:
+            cached = self._hash_cache.get_many(
+                [_HashCache.key(st, algorithm) for _, st in stats.values()]
+            )
 
-            # Create parent directory if needed
-            os.makedirs(temp_path.parent, exist_ok=True)
+        misses = []
+        for path, (full_path, st) in stats.items():
+            digest = cached.get(_HashCache.key(st, algorithm))
+            if digest is not None:
+                result[path] = digest
+            else:
+                misses.append((path, full_path))
+        if not misses:
+            return result
 
-            # Open the file
-            file_obj = open(temp_path, "wb+")
+        def hash_one(
+            item: Tuple[str, str],
+        ) -> Optional[Tuple[str, Optional[os.stat_result]]]:
+            path, full_path = item
+            try:
+                return _hash_version(full_path, algorithm)
+            except OSError as e:
+                self._logger.warning(
+                    f"Failed to hash {path}: {str(e)}", extra={"file_path": path}
+                )
+                return None
 
-            return str(temp_path), file_obj
+        new_entries = []
+        hashed = self._pool.run(hash_one, misses, self._hash_workers)
+        for (path, _), version in zip(misses, hashed):
+            if version is None:
+                continue
+            digest, st = version
+            result[path] = digest
+            if st is not None:
+                new_entries.append((_HashCache.key(st, algorithm), digest))
 
-        except Exception as e:
-            raise FileError(
-                f"Failed to create temporary file: {str(e)}",
-                file_path=temp_name
-                if "temp_name" in locals()
-                else f"{prefix}*{suffix}",
-            ) from e
+        if self._hash_cache is not None and new_entries:
+            self._hash_cache.put_many(new_entries)
+        return result
 
-    def compute_file_hash(self, path: str, directory_type: str = "base") -> str:
-        """Compute the SHA-256 hash of a file's contents.
+    def _hash_path(self, path: str, algorithm: str) -> str:
+        """Hash a file through the hash cache.
 
-        Args:
-            path: The path to the file.
-            directory_type: The type of directory to use as the base.
+        Raises:
+            OSError: If the file can't be read.
+        """
+        if self._hash_cache is None:
+            return _hash_version(path, algorithm)[0]
 
-        Returns:
-            str: The hexadecimal hash of the file.
+        key = _HashCache.key(os.stat(path), algorithm)
+        digest = self._hash_cache.get_many([key]).get(key)
+        if digest is not None:
+            return digest
+
+        digest, st = _hash_version(path, algorithm)
+        if st is not None:
+            self._hash_cache.put_many([(_HashCache.key(st, algorithm), digest)])
+        return digest
+
+    def _resolve_hash_algorithm(self, algorithm: str) -> str:
+        """Check a hash algorithm name and resolve "fast".
 
         Raises:
-            FileError: If the hash cannot be computed.
+            FileError: If the algorithm is unknown or needs a missing package.
         """
-        try:
-            full_path = self.get_file_path(path, directory_type)
-
-            if not full_path.exists() or full_path.is_dir():
-                raise FileError(
-                    f"Cannot compute hash for non-existent or directory: {full_path}",
-                    file_path=str(full_path),
-                )
+        if self._xxhash_available is None:
+            try:
+                import xxhash  # noqa: F401
 
-            # Get a lock for this file
-            lock = self._get_file_lock(str(full_path))
+                self._xxhash_available = True
+            except ImportError:
+                self._xxhash_available = False
 
-            with lock:
-                # Compute the hash in chunks to handle large files
-                hasher = hashlib.sha256()
-                with open(full_path, "rb") as f:
-                    for chunk in iter(lambda: f.read(65536), b""):
-                        hasher.update(chunk)
+        if algorithm == "fast":
+            # blake2b is the fastest hashlib digest without SHA extensions
+            return "xxh3_128" if self._xxhash_available else "blake2b"
 
-                return hasher.hexdigest()
+        if algorithm not in _HASH_ALGORITHMS:
+            raise FileError(f"Unsupported hash algorithm: {algorithm}")
 
-        except FileError:
-            # Re-raise FileError exceptions
-            raise
+        if algorithm == "xxh3_128" and not self._xxhash_available:
+            self._logger.error(
+                "Failed to import xxhash. Please install with 'pip install xxhash'"
+            )
+            raise FileError("The xxh3_128 hash algorithm requires xxhash")
 
-        except Exception as e:
-            raise FileError(
-                f"Failed to compute file hash: {str(e)}",
-                file_path=str(full_path) if "full_path" in locals() else path,
-            ) from e
+        return algorithm
 
     def _get_file_type(self, path: pathlib.Path) -> FileType:
         """Determine the type of a file based on its extension.
@@ -855,39 +5255,23 @@ class FileManager(QorzenManager):
         Returns:
             FileType: The type of the file.
         """
-        if path.is_dir():
-            return FileType.UNKNOWN
-
-        extension = path.suffix.lower()
-        return self._file_type_mapping.get(extension, FileType.UNKNOWN)
+        return self._file_type_for(path.name, path.is_dir())
 
-    def _get_file_lock(self, path: str) -> threading.RLock:
-        """Get a lock for a file path, creating one if it doesn't exist.
+    def _file_type_for(self, name: str, is_dir: bool) -> FileType:
+        """Determine the type of a file from its name, without touching the disk.
 
         Args:
-            path: The absolute path to the file.
+            name: The name of the file.
+            is_dir: Whether the file is a directory.
 
         Returns:
-            threading.RLock: A lock for the file.
+            FileType: The type of the file.
         """
-        with self._locks_lock:
-            if path not in self._file_locks:
-                self._file_locks[path] = threading.RLock()
-
-            return self._file_locks[path]
-
-    def _release_file_lock(self, path: str) -> None:
-        """Release a file lock if it exists and is not currently held.
+        if is_dir:
+            return FileType.UNKNOWN
 
-        Args:
-            path: The absolute path to the file.
-        """
-        with self._locks_lock:
-            if path in self._file_locks:
-                # We can't easily check if a lock is held, so we'll just remove it
-                # from the dictionary if the file no longer exists
-                if not os.path.exists(path):
-                    del self._file_locks[path]
+        extension = os.path.splitext(name)[1].lower()
+        return self._file_type_mapping.get(extension, FileType.UNKNOWN)
 
     def _on_config_changed(self, key: str, value: Any) -> None:
         """Handle configuration changes for the file system.
@@ -916,9 +5300,32 @@ class FileManager(QorzenManager):
         try:
             self._logger.info("Shutting down File Manager")
 
-            # Clear file locks
-            with self._locks_lock:
-                self._file_locks.clear()
+            # Flush buffered writes while the index is still open
+            if self._write_behind is not None:
+                self._write_behind.stop()
+                self._write_behind = None
+
+            # Stop the watcher first; it updates the index
+            if self._watcher is not None:
+                self._watcher.stop()
+                self._watcher = None
+            with self._watches_lock:
+                self._watches.clear()
+
+            if self._index is not None:
+                self._index_stop.set()
+                if self._index_thread is not None:
+                    self._index_thread.join(timeout=10.0)
+                    self._index_thread = None
+                self._index.close()
+                self._index = None
+
+            if self._hash_cache is not None:
+                self._hash_cache.close()
+                self._hash_cache = None
+            self._backup_store = None
+            self._pool.shutdown()
+            self._locks.close()
 
             # Unregister config listener
             self._config_manager.unregister_listener("files", self._on_config_changed)
@@ -953,8 +5360,7 @@ class FileManager(QorzenManager):
                 disk_percent = 0
 
             # Count active locks
-            with self._locks_lock:
-                lock_count = len(self._file_locks)
+            lock_count = self._locks.active()
 
             status.update(
                 {
@@ -971,6 +5377,35 @@ class FileManager(QorzenManager):
                         "percent_used": round(disk_percent, 2),
                     },
                     "active_locks": lock_count,
+                    "locks": self._locks.stats(),
+                    "index": (
+                        self._index.stats()
+                        if self._index is not None
+                        else {"enabled": False}
+                    ),
+                    "fsync": self._fsync,
+                    "copy": {**self._copier.stats(), "workers": self._copy_workers},
+                    "compression": self._compression_stats(),
+                    "backup": {
+                        **self._backup_store.stats(),
+                        "workers": self._backup_workers,
+                        "retention": dict(self._backup_retention),
+                    },
+                    "write_behind": (
+                        self._write_behind.stats()
+                        if self._write_behind is not None
+                        else {"enabled": False}
+                    ),
+                    "hash_cache": (
+                        self._hash_cache.stats()
+                        if self._hash_cache is not None
+                        else {"enabled": False}
+                    ),
+                    "watcher": (
+                        {**self._watcher.stats(), "watches": len(self._watches)}
+                        if self._watcher is not None
+                        else {"enabled": False}
+                    ),
                 }
             )
 
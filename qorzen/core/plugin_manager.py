@@ -19,6 +19,7 @@ from qorzen.utils.exceptions import (
     ManagerShutdownError,
     PluginError,
 )
+from qorzen.utils.pagination import paginate_keys
 
 
 class PluginState(Enum):
@@ -849,6 +850,36 @@ class PluginManager(QorzenManager):
 
         return [self.get_plugin_info(plugin_name) for plugin_name in self._plugins]
 
+    def list_plugins(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of discovered plugins, sorted by name.
+
+        Args:
+            limit: The maximum number of plugins on the page.
+            cursor: The next_cursor of the previous page, or None for the
+                first page.
+
+        Returns:
+            Dict[str, Any]: Plugin information dictionaries under "items" and
+                the cursor of the next page under "next_cursor", which is
+                None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed or limit is not positive.
+        """
+        if not self._initialized:
+            return {"items": [], "next_cursor": None}
+
+        # Installations have tens of plugins, so sorting per call is cheap
+        keys, next_cursor = paginate_keys(
+            sorted((name,) for name in self._plugins), limit, cursor
+        )
+        return {
+            "items": [self.get_plugin_info(name) for (name,) in keys],
+            "next_cursor": next_cursor,
+        }
+
     def get_active_plugins(self) -> List[Dict[str, Any]]:
         """Get information about all active plugins.
 
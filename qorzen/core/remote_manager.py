@@ -456,8 +456,13 @@ class AsyncHTTPService(RemoteService):
             name: Unique name of the service.
             base_url: Base URL of the service.
             protocol: The protocol (HTTP or HTTPS).
-            **kwargs: Additional arguments passed to RemoteService.
+            **kwargs: Additional arguments passed to RemoteService. A
+                ``thread_manager`` keyword may be given so that synchronous
+                wrappers run on its managed event loop.
         """
+        # Thread Manager whose managed event loop runs the sync wrappers
+        self._thread_manager = kwargs.pop("thread_manager", None)
+
         super().__init__(name, protocol, base_url, **kwargs)
 
         # Health check endpoint
@@ -467,6 +472,28 @@ class AsyncHTTPService(RemoteService):
         self.verify_ssl = kwargs.get("verify_ssl", True)
         self.follow_redirects = kwargs.get("follow_redirects", True)
 
+    def _run_sync(self, coro: Any) -> Any:
+        """Run a coroutine to completion from synchronous code.
+
+        Uses the Thread Manager's managed event loop when available so the
+        async client and its connection pool survive between calls. Falls back
+        to a throwaway event loop otherwise.
+
+        Args:
+            coro: The coroutine to run.
+
+        Returns:
+            Any: The result of the coroutine.
+        """
+        if self._thread_manager is not None and self._thread_manager.initialized:
+            return self._thread_manager.run_coroutine(coro)
+
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(coro)
+        finally:
+            loop.close()
+
     def _initialize_client(self) -> None:
         """Initialize the async HTTP client."""
         self._client = httpx.AsyncClient(
@@ -545,12 +572,7 @@ class AsyncHTTPService(RemoteService):
         Returns:
             bool: True if the service is healthy, False otherwise.
         """
-        # Run the async health check in a new event loop
-        loop = asyncio.new_event_loop()
-        try:
-            return loop.run_until_complete(self.check_health_async())
-        finally:
-            loop.close()
+        return self._run_sync(self.check_health_async())
 
     @retry(
         retry=retry_if_exception_type(httpx.HTTPError),
@@ -736,12 +758,7 @@ class AsyncHTTPService(RemoteService):
     def close(self) -> None:
         """Close the async HTTP client."""
         if self._client is not None:
-            # Run the async close in a new event loop
-            loop = asyncio.new_event_loop()
-            try:
-                loop.run_until_complete(self.close_async())
-            finally:
-                loop.close()
+            self._run_sync(self.close_async())
 
 
 class RemoteServicesManager(QorzenManager):
@@ -916,6 +933,7 @@ class RemoteServicesManager(QorzenManager):
                 health_check_path=service_config.get("health_check_path", "/health"),
                 verify_ssl=service_config.get("verify_ssl", True),
                 follow_redirects=service_config.get("follow_redirects", True),
+                thread_manager=self._thread_manager,
             )
 
         else:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import bisect
 import datetime
 import hashlib
 import os
@@ -14,13 +15,17 @@ from typing import Any, Callable, Dict, List, Optional, Set, Tuple, Union, cast
 
 import jwt
 from passlib.context import CryptContext
+from sqlalchemy import select
 
 from qorzen.core.base import QorzenManager
+from qorzen.models.user import User as UserRecord
+from qorzen.models.user import user_roles
 from qorzen.utils.exceptions import (
     ManagerInitializationError,
     ManagerShutdownError,
     SecurityError,
 )
+from qorzen.utils.pagination import paginate_keys
 
 
 class UserRole(Enum):
@@ -55,7 +60,9 @@ class Permission:
     name: str  # Human-readable name of the permission
     description: str  # Description of what the permission allows
     resource: str  # The resource this permission applies to
-    action: str  # The action this permission allows (create, read, update, delete, etc.)
+    action: (
+        str  # The action this permission allows (create, read, update, delete, etc.)
+    )
     roles: List[UserRole] = field(
         default_factory=list
     )  # Roles that have this permission
@@ -113,6 +120,8 @@ class SecurityManager(QorzenManager):
         self._users: Dict[str, User] = {}
         self._username_to_id: Dict[str, str] = {}
         self._email_to_id: Dict[str, str] = {}
+        # (created_at, id) of every user in order, for paginated listing
+        self._user_order: List[Tuple[datetime.datetime, str]] = []
         self._permissions: Dict[str, Permission] = {}
 
         # Blacklisted tokens (for revoked tokens)
@@ -410,6 +419,7 @@ class SecurityManager(QorzenManager):
             self._users[user_id] = user
             self._username_to_id[username.lower()] = user_id
             self._email_to_id[email.lower()] = user_id
+            bisect.insort(self._user_order, (user.created_at, user_id))
 
             self._logger.info(
                 f"Created user '{username}'",
@@ -920,6 +930,8 @@ class SecurityManager(QorzenManager):
 
             # Remove user
             del self._users[user_id]
+            index = bisect.bisect_left(self._user_order, (user.created_at, user_id))
+            del self._user_order[index]
 
             # Revoke all tokens for this user
             self._revoke_user_tokens(user_id)
@@ -959,19 +971,7 @@ class SecurityManager(QorzenManager):
 
         if self._use_memory_storage:
             for user in self._users.values():
-                result.append(
-                    {
-                        "id": user.id,
-                        "username": user.username,
-                        "email": user.email,
-                        "roles": [role.value for role in user.roles],
-                        "active": user.active,
-                        "created_at": user.created_at.isoformat(),
-                        "last_login": user.last_login.isoformat()
-                        if user.last_login
-                        else None,
-                    }
-                )
+                result.append(self._user_summary(user))
 
         else:
             # TODO: Implement database-backed user listing
@@ -979,6 +979,106 @@ class SecurityManager(QorzenManager):
 
         return result
 
+    def list_users(
+        self, limit: int = 100, cursor: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Get one page of users, oldest first.
+
+        Pages use keyset pagination on (created_at, id), so users created or
+        deleted between requests don't shift later pages.
+
+        Args:
+            limit: The maximum number of users on the page.
+            cursor: The next_cursor of the previous page, or None for the
+                first page.
+
+        Returns:
+            Dict[str, Any]: User information dictionaries under "items" and
+                the cursor of the next page under "next_cursor", which is
+                None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed or limit is not positive.
+        """
+        if not self._initialized:
+            return {"items": [], "next_cursor": None}
+
+        if not self._use_memory_storage:
+            return self._list_database_users(limit, cursor)
+
+        keys, next_cursor = paginate_keys(self._user_order, limit, cursor)
+        return {
+            "items": [self._user_summary(self._users[user_id]) for _, user_id in keys],
+            "next_cursor": next_cursor,
+        }
+
+    def _list_database_users(self, limit: int, cursor: Optional[str]) -> Dict[str, Any]:
+        """Get one page of users from the database, oldest first.
+
+        Args:
+            limit: The maximum number of users on the page.
+            cursor: The next_cursor of the previous page, or None.
+
+        Returns:
+            Dict[str, Any]: The page, shaped like list_users().
+
+        Raises:
+            ValueError: If the cursor is malformed or limit is not positive.
+        """
+        users = UserRecord.__table__
+        page = self._db_manager.paginate(
+            select(
+                users.c.id,
+                users.c.username,
+                users.c.email,
+                users.c.active,
+                users.c.created_at,
+                users.c.last_login,
+            ),
+            [users.c.created_at, users.c.id],
+            limit=limit,
+            cursor=cursor,
+        )
+
+        roles: Dict[Any, List[str]] = {row["id"]: [] for row in page["items"]}
+        if roles:
+            for row in self._db_manager.execute(
+                select(user_roles.c.user_id, user_roles.c.role).where(
+                    user_roles.c.user_id.in_(list(roles))
+                )
+            ):
+                roles[row["user_id"]].append(row["role"].value)
+
+        return {
+            "items": [
+                {
+                    "id": str(row["id"]),
+                    "username": row["username"],
+                    "email": row["email"],
+                    "roles": roles[row["id"]],
+                    "active": row["active"],
+                    "created_at": row["created_at"].isoformat(),
+                    "last_login": (
+                        row["last_login"].isoformat() if row["last_login"] else None
+                    ),
+                }
+                for row in page["items"]
+            ],
+            "next_cursor": page["next_cursor"],
+        }
+
+    def _user_summary(self, user: User) -> Dict[str, Any]:
+        """Get the information about a user shown in user listings."""
+        return {
+            "id": user.id,
+            "username": user.username,
+            "email": user.email,
+            "roles": [role.value for role in user.roles],
+            "active": user.active,
+            "created_at": user.created_at.isoformat(),
+            "last_login": user.last_login.isoformat() if user.last_login else None,
+        }
+
     def get_all_permissions(self) -> List[Dict[str, Any]]:
         """Get information about all permissions.
 
@@ -1374,6 +1474,7 @@ class SecurityManager(QorzenManager):
                 self._users.clear()
                 self._username_to_id.clear()
                 self._email_to_id.clear()
+                self._user_order.clear()
 
             # Clear token data
             with self._token_blacklist_lock:
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import concurrent.futures
 import functools
 import threading
@@ -7,7 +8,18 @@ import time
 import uuid
 from dataclasses import dataclass, field
 from enum import Enum
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple, TypeVar, cast
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Dict,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    TypeVar,
+    cast,
+)
 
 from qorzen.core.base import QorzenManager
 from qorzen.utils.exceptions import (
@@ -46,6 +58,122 @@ class TaskInfo:
     priority: int = 0  # Priority (higher numbers run first)
     future: Optional[concurrent.futures.Future] = None  # Future object for the task
     metadata: Dict[str, Any] = field(default_factory=dict)  # Additional task metadata
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, repr=False, compare=False
+    )  # Guards status transitions of this task only
+
+    def transition(
+        self,
+        to_status: TaskStatus,
+        from_statuses: Tuple[TaskStatus, ...],
+        exception: Optional[Exception] = None,
+    ) -> bool:
+        """Atomically move the task to a new status.
+
+        The transition only happens if the task is currently in one of the
+        expected states, so racing updates (e.g. a cancel arriving while the
+        task starts) resolve to exactly one winner.
+
+        Args:
+            to_status: The status to move to.
+            from_statuses: The statuses the task must currently be in.
+            exception: The exception to record for a failed task.
+
+        Returns:
+            bool: True if the transition was applied, False otherwise.
+        """
+        with self._lock:
+            if self.status not in from_statuses:
+                return False
+
+            self.status = to_status
+            if to_status == TaskStatus.RUNNING:
+                self.started_at = time.time()
+            else:
+                self.completed_at = time.time()
+            if exception is not None:
+                self.exception = exception
+
+            return True
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Get a consistent dictionary snapshot of the task.
+
+        Returns:
+            Dict[str, Any]: The task information.
+        """
+        with self._lock:
+            result = {
+                "task_id": self.task_id,
+                "name": self.name,
+                "status": self.status.value,
+                "created_at": self.created_at,
+                "started_at": self.started_at,
+                "completed_at": self.completed_at,
+                "submitter": self.submitter,
+                "priority": self.priority,
+                "metadata": self.metadata,
+            }
+
+            if self.exception:
+                result["error"] = str(self.exception)
+
+            return result
+
+
+class _TaskRegistry:
+    """Sharded map of task IDs to task information.
+
+    Each shard has its own lock, so submissions from many threads only contend
+    when they hash to the same shard. Lookups don't take a lock at all since a
+    single dict read is atomic.
+    """
+
+    def __init__(self, shard_count: int = 16) -> None:
+        """Initialize the registry.
+
+        Args:
+            shard_count: Number of independently locked shards.
+        """
+        self._shards: List[Tuple[threading.Lock, Dict[str, TaskInfo]]] = [
+            (threading.Lock(), {}) for _ in range(max(1, shard_count))
+        ]
+
+    def _shard(self, task_id: str) -> Tuple[threading.Lock, Dict[str, TaskInfo]]:
+        return self._shards[hash(task_id) % len(self._shards)]
+
+    def add(self, task_info: TaskInfo) -> None:
+        """Register a task."""
+        lock, tasks = self._shard(task_info.task_id)
+        with lock:
+            tasks[task_info.task_id] = task_info
+
+    def get(self, task_id: str) -> Optional[TaskInfo]:
+        """Get a task by ID, or None if it isn't registered."""
+        return self._shard(task_id)[1].get(task_id)
+
+    def remove(self, task_id: str) -> Optional[TaskInfo]:
+        """Unregister a task, returning it if it was registered."""
+        lock, tasks = self._shard(task_id)
+        with lock:
+            return tasks.pop(task_id, None)
+
+    def snapshot(self) -> List[TaskInfo]:
+        """Get a list of all registered tasks, locking one shard at a time."""
+        result: List[TaskInfo] = []
+        for lock, tasks in self._shards:
+            with lock:
+                result.extend(tasks.values())
+        return result
+
+    def clear(self) -> None:
+        """Unregister all tasks."""
+        for lock, tasks in self._shards:
+            with lock:
+                tasks.clear()
+
+    def __len__(self) -> int:
+        return sum(len(tasks) for _, tasks in self._shards)
 
 
 class ThreadManager(QorzenManager):
@@ -73,18 +201,19 @@ class ThreadManager(QorzenManager):
         self._max_workers = 4
         self._thread_name_prefix = "nexus-worker"
 
-        # Task tracking
-        self._tasks: Dict[str, TaskInfo] = {}
-        self._tasks_lock = threading.RLock()
+        # Task tracking, sharded to keep workers from serializing on one lock
+        self._task_shards = 16
+        self._tasks = _TaskRegistry(self._task_shards)
 
         # Periodic task scheduling
         self._periodic_tasks: Dict[str, Tuple[float, Callable, List, Dict]] = {}
         self._periodic_stop_event = threading.Event()
         self._periodic_thread: Optional[threading.Thread] = None
 
-        # Active tasks counter
-        self._active_tasks = 0
-        self._active_tasks_lock = threading.RLock()
+        # Managed asyncio event loop for coroutine tasks (started on first use)
+        self._async_loop: Optional[asyncio.AbstractEventLoop] = None
+        self._async_thread: Optional[threading.Thread] = None
+        self._async_loop_lock = threading.Lock()
 
     def initialize(self) -> None:
         """Initialize the Thread Manager.
@@ -102,6 +231,8 @@ class ThreadManager(QorzenManager):
             self._thread_name_prefix = thread_config.get(
                 "thread_name_prefix", "nexus-worker"
             )
+            self._task_shards = thread_config.get("task_shards", 16)
+            self._tasks = _TaskRegistry(self._task_shards)
 
             # Create thread pool
             self._thread_pool = concurrent.futures.ThreadPoolExecutor(
@@ -185,30 +316,15 @@ class ThreadManager(QorzenManager):
         # Wrap the function to update task status
         @functools.wraps(func)
         def _task_wrapper(*args, **kwargs):
-            with self._tasks_lock:
-                if task_id in self._tasks:
-                    self._tasks[task_id].status = TaskStatus.RUNNING
-                    self._tasks[task_id].started_at = time.time()
-
-            with self._active_tasks_lock:
-                self._active_tasks += 1
+            task_info.transition(TaskStatus.RUNNING, (TaskStatus.PENDING,))
 
             try:
                 result = func(*args, **kwargs)
-
-                with self._tasks_lock:
-                    if task_id in self._tasks:
-                        self._tasks[task_id].status = TaskStatus.COMPLETED
-                        self._tasks[task_id].completed_at = time.time()
-
+                task_info.transition(TaskStatus.COMPLETED, (TaskStatus.RUNNING,))
                 return result
 
             except Exception as e:
-                with self._tasks_lock:
-                    if task_id in self._tasks:
-                        self._tasks[task_id].status = TaskStatus.FAILED
-                        self._tasks[task_id].exception = e
-                        self._tasks[task_id].completed_at = time.time()
+                task_info.transition(TaskStatus.FAILED, (TaskStatus.RUNNING,), e)
 
                 self._logger.error(
                     f"Task {task_name} failed: {str(e)}",
@@ -222,18 +338,12 @@ class ThreadManager(QorzenManager):
                 # Re-raise the exception to be captured by the Future
                 raise
 
-            finally:
-                with self._active_tasks_lock:
-                    self._active_tasks -= 1
-
         try:
-            # Submit the wrapped task to the thread pool
-            future = self._thread_pool.submit(_task_wrapper, *args, **kwargs)
-            task_info.future = future
+            # Register before submitting so status queries never miss the task
+            self._tasks.add(task_info)
 
-            # Store task info
-            with self._tasks_lock:
-                self._tasks[task_id] = task_info
+            # Submit the wrapped task to the thread pool
+            task_info.future = self._thread_pool.submit(_task_wrapper, *args, **kwargs)
 
             self._logger.debug(
                 f"Submitted task {task_name}",
@@ -247,6 +357,7 @@ class ThreadManager(QorzenManager):
             return task_id
 
         except Exception as e:
+            self._tasks.remove(task_id)
             self._logger.error(
                 f"Failed to submit task {task_name}: {str(e)}",
                 extra={"submitter": submitter},
@@ -268,21 +379,17 @@ class ThreadManager(QorzenManager):
         if not self._initialized:
             return False
 
-        with self._tasks_lock:
-            if task_id not in self._tasks:
-                return False
-
-            task_info = self._tasks[task_id]
-
-            if task_info.status != TaskStatus.PENDING:
-                # Task already running, completed, or failed
-                return False
+        task_info = self._tasks.get(task_id)
+        if task_info is None or task_info.status != TaskStatus.PENDING:
+            # Unknown task, or already running, completed, or failed
+            return False
 
-            if task_info.future and task_info.future.cancel():
-                task_info.status = TaskStatus.CANCELLED
-                task_info.completed_at = time.time()
-                self._logger.debug(f"Cancelled task {task_info.name}")
-                return True
+        if task_info.future and task_info.future.cancel():
+            task_info.transition(
+                TaskStatus.CANCELLED, (TaskStatus.PENDING, TaskStatus.RUNNING)
+            )
+            self._logger.debug(f"Cancelled task {task_info.name}")
+            return True
 
         return False
 
@@ -298,29 +405,12 @@ class ThreadManager(QorzenManager):
         if not self._initialized:
             return None
 
-        with self._tasks_lock:
-            if task_id not in self._tasks:
-                return None
-
-            task_info = self._tasks[task_id]
-
-            # Return a dictionary representation of the task info
-            result = {
-                "task_id": task_info.task_id,
-                "name": task_info.name,
-                "status": task_info.status.value,
-                "created_at": task_info.created_at,
-                "started_at": task_info.started_at,
-                "completed_at": task_info.completed_at,
-                "submitter": task_info.submitter,
-                "priority": task_info.priority,
-                "metadata": task_info.metadata,
-            }
-
-            if task_info.exception:
-                result["error"] = str(task_info.exception)
+        task_info = self._tasks.get(task_id)
+        if task_info is None:
+            return None
 
-            return result
+        # Return a dictionary representation of the task info
+        return task_info.to_dict()
 
     def get_task_result(self, task_id: str, timeout: Optional[float] = None) -> Any:
         """Get the result of a task, waiting for it to complete if necessary.
@@ -339,30 +429,26 @@ class ThreadManager(QorzenManager):
         if not self._initialized:
             raise ThreadManagerError("Manager not initialized", thread_id=task_id)
 
-        with self._tasks_lock:
-            if task_id not in self._tasks:
-                raise ThreadManagerError(f"Task {task_id} not found", thread_id=task_id)
+        task_info = self._tasks.get(task_id)
+        if task_info is None:
+            raise ThreadManagerError(f"Task {task_id} not found", thread_id=task_id)
 
-            task_info = self._tasks[task_id]
-
-            if task_info.status == TaskStatus.FAILED:
-                if task_info.exception:
-                    raise task_info.exception
-                raise ThreadManagerError(f"Task {task_id} failed", thread_id=task_id)
+        if task_info.status == TaskStatus.FAILED:
+            if task_info.exception:
+                raise task_info.exception
+            raise ThreadManagerError(f"Task {task_id} failed", thread_id=task_id)
 
-            if task_info.status == TaskStatus.CANCELLED:
-                raise ThreadManagerError(
-                    f"Task {task_id} was cancelled", thread_id=task_id
-                )
+        if task_info.status == TaskStatus.CANCELLED:
+            raise ThreadManagerError(f"Task {task_id} was cancelled", thread_id=task_id)
 
-            if not task_info.future:
-                raise ThreadManagerError(
-                    f"Task {task_id} has no future object",
-                    thread_id=task_id,
-                )
+        if not task_info.future:
+            raise ThreadManagerError(
+                f"Task {task_id} has no future object",
+                thread_id=task_id,
+            )
 
-            # Get the future for the task
-            future = task_info.future
+        # Get the future for the task
+        future = task_info.future
 
         # Wait for the future to complete
         try:
@@ -376,6 +462,229 @@ class ThreadManager(QorzenManager):
                 thread_id=task_id,
             ) from e
 
+    def get_event_loop(self) -> asyncio.AbstractEventLoop:
+        """Get the managed asyncio event loop, starting it if necessary.
+
+        The loop runs forever in a dedicated background thread, so clients that
+        are bound to a loop (HTTP connection pools, async database engines) can
+        be reused across calls instead of being rebuilt for every request.
+
+        Returns:
+            asyncio.AbstractEventLoop: The running managed event loop.
+
+        Raises:
+            ThreadManagerError: If the manager is not initialized.
+        """
+        if not self._initialized:
+            raise ThreadManagerError("Manager not initialized", thread_id=None)
+
+        with self._async_loop_lock:
+            if self._async_loop is not None and self._async_loop.is_running():
+                return self._async_loop
+
+            loop = asyncio.new_event_loop()
+            loop_ready = threading.Event()
+
+            def _run_loop() -> None:
+                asyncio.set_event_loop(loop)
+                loop.call_soon(loop_ready.set)
+                loop.run_forever()
+
+            self._async_thread = threading.Thread(
+                target=_run_loop,
+                name=f"{self._thread_name_prefix}-asyncio",
+                daemon=True,
+            )
+            self._async_thread.start()
+            loop_ready.wait()
+
+            self._async_loop = loop
+            self._logger.debug("Managed asyncio event loop started")
+
+            return loop
+
+    def submit_coroutine(
+        self,
+        coro: Coroutine[Any, Any, T],
+        *,
+        name: Optional[str] = None,
+        submitter: str = "unknown",
+        priority: int = 0,
+        metadata: Optional[Dict[str, Any]] = None,
+    ) -> str:
+        """Submit a coroutine to be executed on the managed event loop.
+
+        The coroutine is tracked like any other task, so its status and result
+        are available through get_task_info(), get_task_result() and cancel_task().
+
+        Args:
+            coro: The coroutine object to execute.
+            name: Human-readable name for the task (for logging and monitoring).
+            submitter: Who/what submitted the task (for logging and monitoring).
+            priority: Priority of the task (informational for coroutine tasks).
+            metadata: Additional metadata for the task.
+
+        Returns:
+            str: A unique ID for the submitted task.
+
+        Raises:
+            ThreadManagerError: If the manager is not initialized or the coroutine
+                cannot be submitted.
+        """
+        if not self._initialized:
+            coro.close()
+            raise ThreadManagerError(
+                "Cannot submit tasks before initialization",
+                thread_id=None,
+            )
+
+        # Generate task ID and name
+        task_id = str(uuid.uuid4())
+        task_name = name or f"coroutine-{task_id[:8]}"
+
+        task_info = TaskInfo(
+            task_id=task_id,
+            name=task_name,
+            status=TaskStatus.PENDING,
+            submitter=submitter,
+            priority=priority,
+            metadata={**(metadata or {}), "coroutine": True},
+        )
+
+        async def _coroutine_wrapper() -> T:
+            task_info.transition(TaskStatus.RUNNING, (TaskStatus.PENDING,))
+
+            try:
+                result = await coro
+                task_info.transition(TaskStatus.COMPLETED, (TaskStatus.RUNNING,))
+                return result
+
+            except asyncio.CancelledError:
+                task_info.transition(
+                    TaskStatus.CANCELLED, (TaskStatus.PENDING, TaskStatus.RUNNING)
+                )
+                raise
+
+            except Exception as e:
+                task_info.transition(TaskStatus.FAILED, (TaskStatus.RUNNING,), e)
+
+                self._logger.error(
+                    f"Task {task_name} failed: {str(e)}",
+                    extra={
+                        "task_id": task_id,
+                        "submitter": submitter,
+                        "error": str(e),
+                    },
+                )
+                raise
+
+        try:
+            loop = self.get_event_loop()
+
+            # Register before scheduling so status queries never miss the task
+            self._tasks.add(task_info)
+
+            task_info.future = asyncio.run_coroutine_threadsafe(
+                _coroutine_wrapper(), loop
+            )
+
+            self._logger.debug(
+                f"Submitted coroutine {task_name}",
+                extra={"task_id": task_id, "submitter": submitter},
+            )
+
+            return task_id
+
+        except Exception as e:
+            coro.close()
+            self._tasks.remove(task_id)
+
+            self._logger.error(
+                f"Failed to submit coroutine {task_name}: {str(e)}",
+                extra={"submitter": submitter},
+            )
+            raise ThreadManagerError(
+                f"Failed to submit coroutine: {str(e)}",
+                thread_id=task_id,
+            ) from e
+
+    def run_coroutine(
+        self, coro: Coroutine[Any, Any, T], timeout: Optional[float] = None
+    ) -> T:
+        """Run a coroutine on the managed event loop and wait for its result.
+
+        This is the blocking counterpart of submit_coroutine() for synchronous
+        callers. The coroutine is not tracked as a task.
+
+        Args:
+            coro: The coroutine object to execute.
+            timeout: Maximum time in seconds to wait. If None, wait indefinitely.
+
+        Returns:
+            T: The result of the coroutine.
+
+        Raises:
+            ThreadManagerError: If called from the managed loop itself, which
+                would deadlock, or if the manager is not initialized.
+            concurrent.futures.TimeoutError: If the coroutine doesn't complete
+                within the timeout.
+        """
+        if self._async_thread is threading.current_thread():
+            coro.close()
+            raise ThreadManagerError(
+                "run_coroutine() cannot be called from the managed event loop",
+                thread_id=threading.current_thread().name,
+            )
+
+        try:
+            loop = self.get_event_loop()
+        except ThreadManagerError:
+            coro.close()
+            raise
+
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout=timeout)
+        except concurrent.futures.TimeoutError:
+            future.cancel()
+            raise
+
+    def _stop_async_loop(self) -> None:
+        """Cancel outstanding coroutines and stop the managed event loop."""
+        with self._async_loop_lock:
+            loop = self._async_loop
+            thread = self._async_thread
+            self._async_loop = None
+            self._async_thread = None
+
+        if loop is None:
+            return
+
+        async def _cancel_outstanding() -> None:
+            current = asyncio.current_task()
+            pending = [t for t in asyncio.all_tasks() if t is not current]
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+            await loop.shutdown_asyncgens()
+
+        if loop.is_running():
+            try:
+                asyncio.run_coroutine_threadsafe(_cancel_outstanding(), loop).result(
+                    timeout=2.0
+                )
+            except Exception as e:
+                self._logger.warning(
+                    f"Error cancelling coroutines on managed loop: {str(e)}"
+                )
+            loop.call_soon_threadsafe(loop.stop)
+
+        if thread and thread.is_alive():
+            thread.join(timeout=2.0)
+
+        if not loop.is_running():
+            loop.close()
+
     def schedule_periodic_task(
         self,
         interval: float,
@@ -509,21 +818,22 @@ class ThreadManager(QorzenManager):
                 self._periodic_thread.join(timeout=2.0)
 
             # Cancel all pending tasks
-            with self._tasks_lock:
-                for task_id, task_info in list(self._tasks.items()):
-                    if task_info.status == TaskStatus.PENDING:
-                        if task_info.future:
-                            task_info.future.cancel()
-                            task_info.status = TaskStatus.CANCELLED
-                            task_info.completed_at = time.time()
+            for task_info in self._tasks.snapshot():
+                if task_info.status == TaskStatus.PENDING and task_info.future:
+                    if task_info.future.cancel():
+                        task_info.transition(
+                            TaskStatus.CANCELLED, (TaskStatus.PENDING,)
+                        )
+
+            # Stop the managed event loop
+            self._stop_async_loop()
 
             # Shut down thread pool
             if self._thread_pool is not None:
                 self._thread_pool.shutdown(wait=True, cancel_futures=True)
 
             # Clear task tracking
-            with self._tasks_lock:
-                self._tasks.clear()
+            self._tasks.clear()
 
             # Clear periodic tasks
             self._periodic_tasks.clear()
@@ -556,21 +866,25 @@ class ThreadManager(QorzenManager):
         if self._initialized:
             # Count tasks by status
             task_counts = {status.value: 0 for status in TaskStatus}
-            with self._tasks_lock:
-                for task_info in self._tasks.values():
-                    task_counts[task_info.status.value] += 1
+            tasks = self._tasks.snapshot()
+            for task_info in tasks:
+                task_counts[task_info.status.value] += 1
 
             status.update(
                 {
                     "thread_pool": {
                         "max_workers": self._max_workers,
-                        "active_tasks": self._active_tasks,
+                        "active_tasks": task_counts[TaskStatus.RUNNING.value],
                     },
                     "tasks": {
-                        "total": len(self._tasks),
+                        "total": len(tasks),
                         "by_status": task_counts,
                     },
                     "periodic_tasks": len(self._periodic_tasks),
+                    "async_loop": {
+                        "running": self._async_loop is not None
+                        and self._async_loop.is_running(),
+                    },
                 }
             )
 
@@ -2,7 +2,16 @@
 
 import enum
 
-from sqlalchemy import JSON, Column, DateTime, Enum, ForeignKey, Integer, String
+from sqlalchemy import (
+    JSON,
+    Column,
+    DateTime,
+    Enum,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+)
 from sqlalchemy.sql import func
 
 from qorzen.models.base import Base
@@ -29,6 +38,12 @@ class AuditLog(Base):
     """Audit log model for tracking system events and user actions."""
 
     __tablename__ = "audit_logs"
+    __table_args__ = (
+        # Time-range queries, optionally narrowed to a user
+        Index("ix_audit_logs_timestamp_user_id", "timestamp", "user_id"),
+        # History of a single resource
+        Index("ix_audit_logs_resource", "resource_type", "resource_id"),
+    )
 
     id = Column(Integer, primary_key=True)
     timestamp = Column(DateTime, default=func.now(), nullable=False)
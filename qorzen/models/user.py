@@ -8,6 +8,7 @@ from sqlalchemy import (
     DateTime,
     Enum,
     ForeignKey,
+    Index,
     Integer,
     String,
     Table,
@@ -39,6 +40,10 @@ class User(Base, TimestampMixin):
     """User model for authentication and authorization."""
 
     __tablename__ = "users"
+    __table_args__ = (
+        # Stable sort key for paginated user listings
+        Index("ix_users_created_at_id", "created_at", "id"),
+    )
 
     id = Column(Integer, primary_key=True)
     username = Column(String(32), unique=True, nullable=False)
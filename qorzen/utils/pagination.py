@@ -0,0 +1,143 @@
+"""Cursor helpers for keyset pagination.
+
+A cursor is an opaque, URL-safe string holding the sort key of the last item
+on a page. The next page starts right after that key, so fetching page N
+costs the same as fetching page 1, and items added or removed between
+requests don't shift later pages the way OFFSET does.
+"""
+
+from __future__ import annotations
+
+import base64
+import bisect
+import datetime
+import json
+import numbers
+from typing import Any, List, Optional, Sequence, Tuple
+
+# Marks values JSON can't represent directly
+_DATETIME_TAG = "$dt"
+_DATE_TAG = "$d"
+
+
+def _encode_value(value: Any) -> Any:
+    """Convert a key value to a JSON-compatible value."""
+    if isinstance(value, datetime.datetime):
+        return {_DATETIME_TAG: value.isoformat()}
+    if isinstance(value, datetime.date):
+        return {_DATE_TAG: value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    """Convert a JSON value back to a key value."""
+    if isinstance(value, dict):
+        if _DATETIME_TAG in value:
+            return datetime.datetime.fromisoformat(value[_DATETIME_TAG])
+        if _DATE_TAG in value:
+            return datetime.date.fromisoformat(value[_DATE_TAG])
+    return value
+
+
+def encode_cursor(key: Sequence[Any]) -> str:
+    """Encode a sort key as a cursor.
+
+    Args:
+        key: The sort key values of the last item on a page.
+
+    Returns:
+        str: A URL-safe cursor string.
+    """
+    data = json.dumps([_encode_value(v) for v in key], separators=(",", ":"))
+    return base64.urlsafe_b64encode(data.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _matches_type(value: Any, expected: Optional[type]) -> bool:
+    """Check a decoded key value against the type of its sort column."""
+    if expected is None or value is None:
+        return True
+    if expected is datetime.date:
+        # A datetime is a date, but the two can't be compared
+        return type(value) is datetime.date
+    if issubclass(expected, numbers.Number):
+        return isinstance(value, numbers.Number)
+    return isinstance(value, expected)
+
+
+def decode_cursor(
+    cursor: str,
+    size: Optional[int] = None,
+    types: Optional[Sequence[Optional[type]]] = None,
+) -> Tuple[Any, ...]:
+    """Decode a cursor back to a sort key.
+
+    Args:
+        cursor: A cursor returned by encode_cursor().
+        size: The expected number of key values, if known.
+        types: The expected type of each key value, if known; None entries
+            accept any type. A cursor from another listing would otherwise
+            fail only when its values are compared.
+
+    Returns:
+        Tuple[Any, ...]: The sort key values.
+
+    Raises:
+        ValueError: If the cursor is malformed, has the wrong size or holds
+            values of the wrong type.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except (ValueError, UnicodeError) as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+    if not isinstance(values, list) or (size is not None and len(values) != size):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+
+    try:
+        key = tuple(_decode_value(v) for v in values)
+    except ValueError as e:
+        raise ValueError(f"Invalid cursor: {cursor!r}") from e
+
+    if types is not None and not all(map(_matches_type, key, types)):
+        raise ValueError(f"Invalid cursor: {cursor!r}")
+    return key
+
+
+def paginate_keys(
+    keys: Sequence[Tuple[Any, ...]], limit: int, cursor: Optional[str] = None
+) -> Tuple[List[Tuple[Any, ...]], Optional[str]]:
+    """Get a page of keys from a sorted sequence of unique sort keys.
+
+    Used for in-memory collections that keep a sorted key index, so a page
+    costs a binary search plus the page itself.
+
+    Args:
+        keys: Unique sort keys in ascending order.
+        limit: The maximum number of keys on the page.
+        cursor: The cursor of the previous page, or None for the first page.
+
+    Returns:
+        Tuple[List[Tuple[Any, ...]], Optional[str]]: The keys on the page, and
+        the cursor of the next page or None if this is the last page.
+
+    Raises:
+        ValueError: If the cursor is malformed or limit is not positive.
+    """
+    if limit < 1:
+        raise ValueError("limit must be at least 1")
+
+    start = 0
+    if cursor is not None:
+        types = None
+        if keys:
+            types = [type(v) if v is not None else None for v in keys[0]]
+        key = decode_cursor(cursor, len(types) if types else None, types)
+        start = bisect.bisect_right(keys, key)
+
+    page = list(keys[start : start + limit])
+    next_cursor = None
+    if start + limit < len(keys):
+        next_cursor = encode_cursor(page[-1])
+
+    return page, next_cursor
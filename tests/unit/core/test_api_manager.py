@@ -375,3 +375,62 @@ def test_api_shutdown(api_manager):
     assert api_manager._app is None
     assert not api_manager.initialized
     assert not api_manager.healthy
+
+
+def test_db_session_dependency(config_manager_mock, api_manager_dependencies, tmp_path):
+    from fastapi import Depends, FastAPI
+    from fastapi.testclient import TestClient
+    from sqlalchemy import text
+
+    from qorzen.core.database_manager import DatabaseManager
+
+    (
+        logger_manager,
+        security_manager,
+        event_bus_manager,
+        thread_manager,
+        registry,
+    ) = api_manager_dependencies
+
+    db_config_manager = MagicMock()
+    db_config_manager.get.return_value = {
+        "type": "sqlite",
+        "name": str(tmp_path / "api.db"),
+    }
+    db_mgr = DatabaseManager(db_config_manager, logger_manager)
+    db_mgr.initialize()
+    db_mgr.execute_raw("CREATE TABLE notes (id INTEGER PRIMARY KEY, body TEXT)")
+
+    api_mgr = APIManager(
+        config_manager_mock,
+        logger_manager,
+        security_manager,
+        event_bus_manager,
+        thread_manager,
+        registry,
+        database_manager=db_mgr,
+    )
+    api_mgr._app = FastAPI()
+    api_mgr._add_database_lifecycle()
+
+    @api_mgr._app.post("/notes")
+    async def add_note(body: str, session=Depends(api_mgr.db_session)):
+        await session.execute(text("INSERT INTO notes (body) VALUES (:b)"), {"b": body})
+        result = await session.execute(text("SELECT COUNT(*) FROM notes"))
+        return {"count": result.scalar_one()}
+
+    try:
+        # The route must not fall back to the sync session
+        with patch.object(db_mgr, "session", side_effect=AssertionError):
+            with TestClient(api_mgr._app) as client:
+                assert db_mgr.status()["database"]["event_loop_bound"] is True
+                for expected in (1, 2):
+                    response = client.post("/notes", params={"body": "x"})
+                    assert response.status_code == 200
+                    assert response.json() == {"count": expected}
+
+        # The server stopping unbinds the engine; the writes were committed
+        assert db_mgr.status()["database"]["event_loop_bound"] is False
+        assert db_mgr.execute_raw("SELECT COUNT(*) AS n FROM notes") == [{"n": 2}]
+    finally:
+        db_mgr.shutdown()
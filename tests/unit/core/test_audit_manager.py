@@ -0,0 +1,339 @@
+"""Unit tests for the Audit Manager."""
+
+import datetime
+import json
+import threading
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from qorzen.core.audit_manager import AuditManager
+from qorzen.core.database_manager import DatabaseManager
+from qorzen.core.event_model import Event
+from qorzen.models.audit import AuditActionType
+from qorzen.utils.exceptions import DatabaseError
+
+
+@pytest.fixture
+def audit_config(tmp_path):
+    """Create a config manager with audit and database settings."""
+    values = {
+        "database": {"type": "sqlite", "name": str(tmp_path / "audit.db")},
+        "audit": {
+            "enabled": True,
+            "batch_size": 10,
+            "flush_interval": 60.0,
+            "max_buffer": 20,
+            "spill_file": str(tmp_path / "audit_spill.jsonl"),
+        },
+    }
+    config_manager = MagicMock()
+    config_manager.get.side_effect = lambda key, default=None: values.get(key, default)
+    return config_manager
+
+
+@pytest.fixture
+def database_manager(audit_config):
+    """Create a DatabaseManager backed by a file SQLite database."""
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_manager = DatabaseManager(audit_config, logger_manager)
+    db_manager.initialize()
+    yield db_manager
+    db_manager.shutdown()
+
+
+@pytest.fixture
+def audit_manager(audit_config, database_manager):
+    """Create an AuditManager for testing."""
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    audit_mgr = AuditManager(
+        audit_config, logger_manager, MagicMock(), database_manager
+    )
+    audit_mgr.initialize()
+    yield audit_mgr
+    audit_mgr.shutdown()
+
+
+def _count_rows(audit_manager):
+    return len(audit_manager.query(limit=1000))
+
+
+def test_events_recorded_in_batches(audit_manager):
+    """Test that matching events are buffered and written in one flush."""
+    for i in range(5):
+        audit_manager._on_event(
+            Event.create(
+                event_type="security/user_created",
+                source="security_manager",
+                payload={"user_id": f"uuid-{i}", "username": f"user{i}"},
+            )
+        )
+
+    # Events outside the configured patterns are ignored
+    audit_manager._on_event(Event.create(event_type="config/changed", source="test"))
+
+    assert audit_manager.status()["buffer"]["size"] == 5
+    assert _count_rows(audit_manager) == 0
+
+    assert audit_manager.flush() == 5
+    assert _count_rows(audit_manager) == 5
+
+    row = audit_manager.query(resource_id="uuid-0")[0]
+    assert row["action_type"] == AuditActionType.CREATE
+    assert row["resource_type"] == "user"
+    assert row["resource_id"] == "uuid-0"
+    assert row["user_name"] == "user0"
+    assert row["user_id"] is None
+
+    status = audit_manager.status()
+    assert status["rows"]["received"] == 5
+    assert status["rows"]["written"] == 5
+    assert status["flush"]["batches"] == 1
+
+
+def test_api_request_action_type(audit_manager):
+    """Test that API request events map HTTP methods to audit actions."""
+    audit_manager._on_event(
+        Event.create(
+            event_type="api/request",
+            source="api_manager",
+            payload={"method": "DELETE", "path": "/api/v1/users/1", "status_code": 200},
+        )
+    )
+    audit_manager.flush()
+
+    row = audit_manager.query()[0]
+    assert row["action_type"] == AuditActionType.DELETE
+    assert row["resource_id"] == "/api/v1/users/1"
+
+
+def test_full_buffer_spills_to_disk(audit_manager, tmp_path):
+    """Test that a full buffer is spilled and replayed later."""
+    for i in range(25):
+        audit_manager.record(AuditActionType.CUSTOM, "test", resource_id=str(i))
+
+    status = audit_manager.status()
+    assert status["backpressure"]["events"] == 1
+    assert status["rows"]["spilled"] == 21
+    assert status["buffer"]["size"] == 4
+    assert status["buffer"]["high_water"] == 20
+
+    spill_file = tmp_path / "audit_spill.jsonl"
+    lines = spill_file.read_text().splitlines()
+    assert len(lines) == 21
+    assert json.loads(lines[0])["action_type"] == "CUSTOM"
+
+    audit_manager.flush()
+    audit_manager._replay_spill()
+
+    assert not spill_file.exists()
+    assert _count_rows(audit_manager) == 25
+    assert audit_manager.status()["rows"]["replayed"] == 21
+
+
+def test_failed_flush_spills_rows(audit_manager, tmp_path):
+    """Test that rows are spilled when the database write fails."""
+    audit_manager._db_manager = MagicMock()
+    audit_manager._db_manager.bulk_insert.side_effect = DatabaseError(
+        "write failed", details={"rows_committed": 2}
+    )
+
+    for i in range(5):
+        audit_manager.record(AuditActionType.CUSTOM, "test", resource_id=str(i))
+
+    assert audit_manager.flush() == -1
+
+    lines = (tmp_path / "audit_spill.jsonl").read_text().splitlines()
+    assert [json.loads(line)["resource_id"] for line in lines] == ["2", "3", "4"]
+
+    status = audit_manager.status()
+    assert status["flush"]["failures"] == 1
+    assert status["rows"]["written"] == 2
+    assert status["rows"]["spilled"] == 3
+    assert status["healthy"] is False
+
+
+def test_spill_replayed_on_startup(audit_config, database_manager, tmp_path):
+    """Test that rows spilled by a previous run are written on startup."""
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    first = AuditManager(audit_config, logger_manager, MagicMock(), database_manager)
+    first.initialize()
+    first._spill(
+        [
+            {
+                "timestamp": datetime.datetime.now(),
+                "user_id": None,
+                "user_name": None,
+                "action_type": AuditActionType.LOGIN,
+                "resource_type": "user",
+                "resource_id": "abc",
+                "description": None,
+                "ip_address": None,
+                "user_agent": None,
+                "details": {"source": "crash"},
+            }
+        ]
+    )
+    first._initialized = False  # Simulate a crash: nothing is flushed
+
+    second = AuditManager(audit_config, logger_manager, MagicMock(), database_manager)
+    second.initialize()
+    try:
+        second._replay_spill()
+        assert _count_rows(second) == 1
+        assert not (tmp_path / "audit_spill.jsonl").exists()
+    finally:
+        second.shutdown()
+        first._stop_event.set()
+
+
+def test_shutdown_flushes_buffer(audit_config, database_manager):
+    """Test that buffered rows are written on shutdown."""
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    event_bus = MagicMock()
+    event_bus.subscribe.return_value = "audit_manager"
+
+    audit_mgr = AuditManager(audit_config, logger_manager, event_bus, database_manager)
+    audit_mgr.initialize()
+    event_bus.subscribe.assert_called_once()
+
+    audit_mgr.record(AuditActionType.SYSTEM, "app", description="shutdown")
+    audit_mgr.shutdown()
+
+    event_bus.unsubscribe.assert_called_once_with("audit_manager")
+    assert _count_rows(audit_mgr) == 1
+
+
+def test_rollover_partitions(audit_manager, database_manager):
+    """Test that SQLite rows go to one table per month and queries prune them."""
+    october = datetime.datetime(2026, 10, 18, 12, 0)
+    september = datetime.datetime(2026, 9, 30, 23, 59)
+
+    audit_manager.record(AuditActionType.LOGIN, "user", "a", timestamp=september)
+    audit_manager.record(AuditActionType.LOGIN, "user", "b", timestamp=october)
+    audit_manager.record(AuditActionType.LOGOUT, "user", "a", timestamp=october)
+    audit_manager.flush()
+
+    assert audit_manager.status()["partitions"]["mode"] == "rollover"
+    tables = database_manager.execute_raw(
+        "SELECT name FROM sqlite_master WHERE type = 'table' "
+        "AND name LIKE 'audit_logs_p%' ORDER BY name",
+        use_primary=True,
+    )
+    assert {"audit_logs_p202609", "audit_logs_p202610"} <= {t["name"] for t in tables}
+
+    # Partitions are created with the composite indexes
+    indexes = database_manager.execute_raw(
+        "SELECT name FROM sqlite_master WHERE type = 'index' "
+        "AND tbl_name = 'audit_logs_p202610'",
+        use_primary=True,
+    )
+    assert "ix_audit_logs_p202610_timestamp_user_id" in {i["name"] for i in indexes}
+
+    # Only the October partition overlaps this range
+    partitions = audit_manager._partitions.tables_for_range(
+        datetime.datetime(2026, 10, 1), datetime.datetime(2026, 11, 1)
+    )
+    assert [t.name for t in partitions] == ["audit_logs_p202610", "audit_logs"]
+
+    rows = audit_manager.query(start=datetime.datetime(2026, 10, 1))
+    assert [row["resource_id"] for row in rows] == ["a", "b"]
+
+    rows = audit_manager.query(resource_type="user", resource_id="a")
+    assert [row["action_type"] for row in rows] == [
+        AuditActionType.LOGOUT,
+        AuditActionType.LOGIN,
+    ]
+    assert len(audit_manager.query(limit=2)) == 2
+
+
+def test_partition_tables_from_threads(audit_manager):
+    """Test that threads defining the same new partition table share it."""
+    partitions = audit_manager._partitions
+    names = [f"audit_logs_p2001{month:02d}" for month in range(1, 13)]
+    barrier = threading.Barrier(8)
+    results = []
+    errors = []
+
+    def define():
+        barrier.wait()
+        try:
+            results.append([partitions.table(name) for name in names])
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=define) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    assert all(tables == results[0] for tables in results)
+
+
+def test_retention_drops_partitions(audit_manager):
+    """Test that partitions past the retention period are dropped."""
+    # Wait for the flush thread's startup maintenance, so it can't drop the
+    # old partition before the explicit run below
+    deadline = time.monotonic() + 5.0
+    while audit_manager._last_maintenance is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+
+    now = datetime.datetime.now()
+    old = now - datetime.timedelta(days=400)
+
+    audit_manager.record(AuditActionType.CUSTOM, "test", "old", timestamp=old)
+    audit_manager.record(AuditActionType.CUSTOM, "test", "new", timestamp=now)
+    audit_manager.flush()
+    old_partition = audit_manager._partitions.name_for(old)
+
+    audit_manager._retention_days = 365
+    result = audit_manager.maintain_partitions()
+
+    assert result["dropped"] == [old_partition]
+    # The current and next month exist after maintenance
+    assert audit_manager._partitions.name_for(now) not in result["dropped"]
+    assert audit_manager.status()["partitions"]["count"] == 2
+
+    assert [row["resource_id"] for row in audit_manager.query()] == ["new"]
+
+
+def test_replay_drops_expired_rows(audit_manager):
+    """Test that replayed rows past retention don't recreate partitions."""
+    now = datetime.datetime.now()
+    old = now - datetime.timedelta(days=400)
+    audit_manager._retention_days = 365
+
+    rows = [
+        {
+            "timestamp": timestamp,
+            "user_id": None,
+            "user_name": None,
+            "action_type": AuditActionType.CUSTOM,
+            "resource_type": "test",
+            "resource_id": resource_id,
+            "description": None,
+            "ip_address": None,
+            "user_agent": None,
+            "details": None,
+        }
+        for timestamp, resource_id in ((old, "old"), (now, "new"))
+    ]
+    audit_manager._spill(rows)
+    audit_manager._replay_spill()
+
+    assert [row["resource_id"] for row in audit_manager.query()] == ["new"]
+    status = audit_manager.status()
+    assert status["partitions"]["rows_expired"] == 1
+    assert audit_manager._partitions.name_for(old) not in (
+        audit_manager._partitions._known
+    )
@@ -7,6 +7,7 @@ import os
 import tempfile
 from pathlib import Path
 from typing import Any, Callable, Dict, Generator, List, Optional
+from unittest.mock import MagicMock
 
 import pytest
 import yaml
@@ -1200,3 +1201,56 @@ def test_config_manager_listener_wildcard() -> None:
     assert len(all_changes) == 0
 
     manager.shutdown()
+
+
+def test_config_manager_reloads_changed_file(tmp_path: Path) -> None:
+    """Test that edits to the config file are picked up and notified."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(yaml.safe_dump({"app": {"name": "Before"}}))
+
+    manager = ConfigManager(config_path=config_file)
+    manager.initialize()
+
+    changes: List[tuple[str, Any]] = []
+    manager.register_listener("app", lambda key, value: changes.append((key, value)))
+
+    config_file.write_text(yaml.safe_dump({"app": {"name": "After"}}))
+    os.utime(config_file, ns=(0, 0))  # Make sure the mtime differs
+
+    # get() checks the file's mtime at most every FILE_CHECK_INTERVAL
+    manager._file_checked_at = 0.0
+    assert manager.get("app.name") == "After"
+    assert [key for key, _ in changes] == ["app"]
+
+    # An invalid file keeps the current configuration
+    config_file.write_text("key: [unclosed")
+    with pytest.raises(ConfigurationError):
+        manager.reload()
+    assert manager.get("app.name") == "After"
+
+    # So does a file left empty or truncated mid-save
+    for content in ("", "# nothing yet\n"):
+        config_file.write_text(content)
+        with pytest.raises(ConfigurationError):
+            manager.reload()
+        assert manager.get("app.name") == "After"
+    assert [key for key, _ in changes] == ["app"]
+
+
+def test_config_manager_watch_file(tmp_path: Path) -> None:
+    """Test that a File Manager watch replaces the mtime checks."""
+    config_file = tmp_path / "config.yaml"
+    config_file.write_text(yaml.safe_dump({"app": {"name": "Before"}}))
+
+    manager = ConfigManager(config_path=config_file)
+    manager.initialize()
+
+    file_manager = MagicMock()
+    file_manager.watch.return_value = "watch-id"
+    assert manager.watch_file(file_manager) is True
+    path, callback = file_manager.watch.call_args.args
+    assert path == config_file.absolute()
+
+    config_file.write_text(yaml.safe_dump({"app": {"name": "After"}}))
+    callback([])
+    assert manager.get("app.name") == "After"
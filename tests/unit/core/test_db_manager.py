@@ -1,14 +1,18 @@
 """Unit tests for the Database Manager."""
 
+import asyncio
 import tempfile
+import threading
+import time
 from unittest.mock import MagicMock, patch
 
 import pytest
 import sqlalchemy as sa
 from sqlalchemy.orm import declarative_base
 
-from qorzen.core.database_manager import Base, DatabaseManager
+from qorzen.core.database_manager import Base, DatabaseManager, ResultFormat
 from qorzen.utils.exceptions import DatabaseError, ManagerInitializationError
+from qorzen.utils.pagination import encode_cursor
 
 
 # Create a simple test model
@@ -238,3 +242,725 @@ def test_operations_without_initialization():
 
     with pytest.raises(DatabaseError):
         db_mgr.execute(sa.text("SELECT 1"))
+
+
+class UpsertModel(Base):
+    __tablename__ = "upsert_models"
+
+    key = sa.Column(sa.String(50), primary_key=True)
+    value = sa.Column(sa.Integer, nullable=True)
+
+
+def test_bulk_insert(db_manager):
+    """Test inserting many rows in chunks."""
+    rows = [{"name": f"bulk-{i}", "value": i} for i in range(25)]
+
+    inserted = db_manager.bulk_insert(TestModel, rows, chunk_size=10)
+    assert inserted == 25
+
+    results = db_manager.execute_raw(
+        "SELECT COUNT(*) AS n FROM test_models WHERE name LIKE 'bulk-%'"
+    )
+    assert results[0]["n"] == 25
+
+    # Tables can also be referenced by name
+    assert db_manager.bulk_insert("test_models", [{"name": "by-name"}]) == 1
+    assert db_manager.bulk_insert(TestModel, []) == 0
+
+
+def test_bulk_insert_error(db_manager):
+    """Test that a failing chunk raises DatabaseError."""
+    rows = [{"name": "ok", "value": 1}, {"name": None, "value": 2}]
+
+    with pytest.raises(DatabaseError):
+        db_manager.bulk_insert(TestModel, rows)
+
+
+def test_bulk_upsert(db_manager):
+    """Test inserting and updating rows on conflict."""
+    db_manager.bulk_upsert(
+        UpsertModel, [{"key": "a", "value": 1}, {"key": "b", "value": 2}], ["key"]
+    )
+    db_manager.bulk_upsert(
+        UpsertModel, [{"key": "b", "value": 20}, {"key": "c", "value": 3}], ["key"]
+    )
+
+    results = db_manager.execute_raw(
+        "SELECT key, value FROM upsert_models ORDER BY key"
+    )
+    assert [(r["key"], r["value"]) for r in results] == [("a", 1), ("b", 20), ("c", 3)]
+
+    with pytest.raises(DatabaseError):
+        db_manager.bulk_upsert(UpsertModel, [{"key": "a", "value": 1}], [])
+
+
+def test_stream(db_manager):
+    """Test streaming query results row by row and in batches."""
+    db_manager.bulk_insert(
+        TestModel, [{"name": f"stream-{i}", "value": i} for i in range(10)]
+    )
+
+    query = sa.select(TestModel).order_by(TestModel.value)
+    rows = list(db_manager.stream(query, batch_size=3))
+    assert [r["value"] for r in rows] == list(range(10))
+
+    batches = list(
+        db_manager.stream(
+            "SELECT value FROM test_models ORDER BY value", batch_size=4, batched=True
+        )
+    )
+    assert [len(b) for b in batches] == [4, 4, 2]
+    assert batches[0][0] == {"value": 0}
+
+    with pytest.raises(DatabaseError):
+        list(db_manager.stream("SELECT * FROM nonexistent_table"))
+
+
+def test_result_formats(db_manager):
+    """Test returning results as tuples and columns instead of dictionaries."""
+    db_manager.bulk_insert(
+        TestModel, [{"name": f"fmt-{i}", "value": i} for i in range(3)]
+    )
+    sql = "SELECT name, value FROM test_models ORDER BY value"
+
+    tuples = db_manager.execute_raw(sql, result_format="tuples")
+    assert tuples.columns == ["name", "value"]
+    assert tuples.rows == [("fmt-0", 0), ("fmt-1", 1), ("fmt-2", 2)]
+    assert tuples.to_dicts()[1] == {"name": "fmt-1", "value": 1}
+
+    columns = db_manager.execute(
+        sa.select(TestModel.name, TestModel.value).order_by(TestModel.value),
+        result_format=ResultFormat.COLUMNS,
+    )
+    assert list(columns["name"]) == ["fmt-0", "fmt-1", "fmt-2"]
+    assert list(columns["value"]) == [0, 1, 2]
+
+    empty = db_manager.execute_raw(
+        "SELECT name FROM test_models WHERE 1 = 0", result_format="columns"
+    )
+    assert list(empty["name"]) == []
+
+    with pytest.raises(DatabaseError):
+        db_manager.execute_raw(sql, result_format="invalid")
+
+
+def test_query_cache(db_config):
+    """Test that cached results are served until a write invalidates them."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {
+        **db_config,
+        "query_cache": {"enabled": True, "max_entries": 10, "ttl_seconds": 60},
+    }
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+    db_mgr.create_tables()
+
+    try:
+        db_mgr.bulk_insert(TestModel, [{"name": "cached", "value": 1}])
+        query = sa.select(TestModel.name, TestModel.value).where(
+            TestModel.name == "cached"
+        )
+
+        first = db_mgr.execute(query)
+        first[0]["value"] = 999  # Mutating a result must not affect the cache
+        assert db_mgr.execute(query) == [{"name": "cached", "value": 1}]
+        assert db_mgr.status()["query_cache"]["hits"] == 1
+
+        # A write through the ORM invalidates the cached result
+        with db_mgr.session() as session:
+            session.query(TestModel).filter_by(name="cached").update({"value": 2})
+        assert db_mgr.execute(query)[0]["value"] == 2
+
+        # So does a raw write, for raw reads of the same table
+        sql = "SELECT COUNT(*) AS n FROM test_models"
+        assert db_mgr.execute_raw(sql)[0]["n"] == 1
+        db_mgr.bulk_insert(TestModel, [{"name": "other"}])
+        assert db_mgr.execute_raw(sql)[0]["n"] == 2
+
+        # Raw reads whose tables can't all be found are not cached
+        with db_mgr.session() as session:
+            session.execute(sa.text("CREATE TABLE other_items (id INTEGER)"))
+            session.execute(sa.text("INSERT INTO other_items VALUES (1)"))
+        sql = "SELECT COUNT(*) AS n FROM test_models, other_items"
+        assert db_mgr.execute_raw(sql)[0]["n"] == 2
+        with db_mgr.session() as session:
+            session.execute(sa.text("INSERT INTO other_items VALUES (2)"))
+        assert db_mgr.execute_raw(sql)[0]["n"] == 4
+
+        columns = db_mgr.execute(query, result_format="columns")
+        columns["name"][0] = "mutated"
+        assert list(db_mgr.execute(query, result_format="columns")["name"]) == [
+            "cached"
+        ]
+
+        # Bypassing the cache always hits the database
+        hits = db_mgr.status()["query_cache"]["hits"]
+        db_mgr.execute_raw(sql, cache=False)
+        assert db_mgr.status()["query_cache"]["hits"] == hits
+
+        assert db_mgr.invalidate_cache(["test_models"]) >= 1
+    finally:
+        db_mgr.shutdown()
+
+
+def test_query_stats(db_config):
+    """Test per-statement statistics and the slow query log."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {
+        **db_config,
+        "query_stats": {"slow_query_ms": 0, "explain_slow_queries": True},
+    }
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+    db_mgr.create_tables()
+
+    try:
+        db_mgr.bulk_insert(
+            TestModel, [{"name": f"s-{i}", "value": i} for i in range(5)]
+        )
+        db_mgr.reset_query_stats()
+
+        # Statements differing only in literal values share a fingerprint
+        for i in range(3):
+            db_mgr.execute_raw(f"SELECT name FROM test_models WHERE value = {i}")
+
+        stats = db_mgr.get_query_stats(order_by="count")
+        assert stats[0]["count"] == 3
+        assert stats[0]["rows"] == 3
+        assert stats[0]["statement"] == "SELECT name FROM test_models WHERE value = ?"
+        assert stats[0]["p50_ms"] <= stats[0]["p99_ms"] <= stats[0]["max_time_ms"]
+        assert stats[0]["plan"]  # EXPLAIN captured for the slow SELECT
+
+        slow = db_mgr.get_slow_queries()
+        assert len(slow) == 3
+        assert slow[0]["fingerprint"] == stats[0]["fingerprint"]
+
+        with pytest.raises(DatabaseError):
+            db_mgr.execute_raw("SELECT * FROM nonexistent_table")
+        errors = [s for s in db_mgr.get_query_stats() if s["errors"]]
+        assert errors[0]["statement"] == "SELECT * FROM nonexistent_table"
+
+        queries = db_mgr.status()["queries"]
+        assert queries["slow_threshold_ms"] == 0
+        assert queries["top_statements"]
+    finally:
+        db_mgr.shutdown()
+
+
+def test_read_replicas(db_config, tmp_path):
+    """Test that reads go to replicas and fall back to the primary."""
+    primary = str(tmp_path / "primary.db")
+    config_manager = MagicMock()
+    config_manager.get.return_value = {
+        **db_config,
+        "name": primary,
+        "replicas": [
+            {"name": primary, "label": "replica-a"},
+            {"name": str(tmp_path / "missing" / "replica.db"), "label": "replica-b"},
+        ],
+    }
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+    db_mgr.create_tables()
+
+    try:
+        db_mgr.bulk_insert(TestModel, [{"name": "replicated", "value": 1}])
+
+        for _ in range(4):
+            results = db_mgr.execute_raw("SELECT name FROM test_models")
+            assert results == [{"name": "replicated"}]
+
+        assert len(list(db_mgr.stream(sa.select(TestModel)))) == 1
+        db_mgr.execute_raw("SELECT name FROM test_models", use_primary=True)
+
+        replicas = db_mgr.status()["replicas"]
+        by_name = {r["name"]: r for r in replicas["replicas"]}
+
+        # The unreachable replica is taken out of rotation
+        assert by_name["replica-a"]["healthy"] is True
+        assert by_name["replica-a"]["reads"] >= 4
+        assert by_name["replica-b"]["healthy"] is False
+        assert replicas["primary_reads"] == 1
+        assert by_name["replica-a"]["pool"]["checkout_wait"]["checkouts"] > 0
+
+        # Locking reads always go to the primary
+        db_mgr.execute(sa.select(TestModel.name).with_for_update())
+        assert len(list(db_mgr.stream(sa.select(TestModel).with_for_update()))) == 1
+        assert not DatabaseManager._is_read_statement(
+            "SELECT name FROM test_models WHERE id = 1 FOR SHARE"
+        )
+        replicas = db_mgr.status()["replicas"]["replicas"]
+        reads = {r["name"]: r["reads"] for r in replicas}
+        assert reads["replica-a"] == by_name["replica-a"]["reads"]
+    finally:
+        db_mgr.shutdown()
+
+
+def test_sqlite_profile(db_config, tmp_path):
+    """Test WAL mode and group-committed writes on a file database."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {
+        **db_config,
+        "name": str(tmp_path / "profile.db"),
+        "sqlite": {"writer": {"group_commit_ms": 20}},
+    }
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+    db_mgr.create_tables()
+
+    try:
+        mode = db_mgr.execute_raw("PRAGMA journal_mode")[0]["journal_mode"]
+        assert mode == "wal"
+
+        def add(i):
+            return lambda session: session.add(TestModel(name=f"w-{i}", value=i))
+
+        errors = []
+
+        def writer(start):
+            for i in range(start, start + 10):
+                try:
+                    db_mgr.write(add(i), timeout=10)
+                except Exception as e:
+                    errors.append(e)
+
+        threads = [threading.Thread(target=writer, args=(n * 10,)) for n in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+
+        assert errors == []
+        count = db_mgr.execute_raw("SELECT COUNT(*) AS n FROM test_models")[0]["n"]
+        assert count == 80
+
+        # A failing write doesn't roll back the others in its batch
+        good = db_mgr.submit_write(add(100))
+        bad = db_mgr.submit_write(lambda s: s.add(TestModel(name=None)))
+        assert good.result(timeout=10) is None
+        with pytest.raises(Exception):
+            bad.result(timeout=10)
+
+        # Raw writes are committed through the writer connection
+        writer_checkouts = db_mgr.status()["pool"]["writer"]["checkout_wait"]
+        db_mgr.execute_raw("UPDATE test_models SET value = -1 WHERE name = 'w-0'")
+        row = db_mgr.execute_raw("SELECT value FROM test_models WHERE name = 'w-0'")
+        assert row == [{"value": -1}]
+        writer_pool = db_mgr.status()["pool"]["writer"]
+        assert (
+            writer_pool["checkout_wait"]["checkouts"]
+            == writer_checkouts["checkouts"] + 1
+        )
+
+        writer_stats = db_mgr.status()["sqlite"]["writer"]
+        assert writer_stats["writes"] == 81
+        assert writer_stats["failed"] == 1
+        assert writer_stats["batches"] < writer_stats["writes"]
+    finally:
+        db_mgr.shutdown()
+
+
+def test_sqlite_memory_sessions(db_manager):
+    """Test that threads take turns on the in-memory database connection."""
+    errors = []
+
+    def writer(start):
+        for i in range(start, start + 20):
+            try:
+                with db_manager.session() as session:
+                    session.add(TestModel(name=f"m-{i}", value=i))
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=writer, args=(n * 20,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert errors == []
+    count = db_manager.execute_raw("SELECT COUNT(*) AS n FROM test_models")[0]["n"]
+    assert count == 80
+
+
+def test_sqlite_memory_nested_statements(db_manager):
+    """Test statements run inside a session on the in-memory database."""
+    count_sql = "SELECT COUNT(*) AS n FROM test_models"
+
+    with db_manager.session() as session:
+        session.add(TestModel(name="outer", value=1))
+        session.flush()
+        db_manager.execute_raw("INSERT INTO test_models (name) VALUES ('raw')")
+        db_manager.bulk_insert(TestModel, [{"name": "bulk", "value": 2}])
+        # Reads see the session's uncommitted writes and leave them in place
+        assert db_manager.execute_raw(count_sql) == [{"n": 3}]
+
+        # A nested checkout of the connection joins the open transaction
+        with db_manager._engine.connect() as connection:
+            connection.execute(sa.text("SELECT 1"))
+    assert db_manager.execute_raw(count_sql) == [{"n": 3}]
+
+    # Rolling the session back rolls back what ran inside it
+    with pytest.raises(ValueError):
+        with db_manager.session() as session:
+            session.add(TestModel(name="lost", value=1))
+            db_manager.execute_raw("INSERT INTO test_models (name) VALUES ('lost')")
+            raise ValueError("boom")
+    assert db_manager.execute_raw(count_sql) == [{"n": 3}]
+
+    # Another thread waits until the last checkout is returned
+    seen = []
+    with db_manager._engine.connect() as outer:
+        with db_manager._engine.connect():
+            pass
+        reader = threading.Thread(
+            target=lambda: seen.append(db_manager.execute_raw(count_sql))
+        )
+        reader.start()
+        reader.join(0.2)
+        assert seen == []
+        outer.rollback()
+    reader.join(5)
+    assert seen == [[{"n": 3}]]
+
+
+def test_sqlite_nested_writes(db_config, tmp_path):
+    """Test writes inside a session on a file database's single writer."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {
+        **db_config,
+        "name": str(tmp_path / "nested.db"),
+        "sqlite": {"writer_timeout": 2.0},
+    }
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+    db_mgr.create_tables()
+    count_sql = "SELECT COUNT(*) AS n FROM test_models"
+
+    try:
+        started = time.monotonic()
+        with db_mgr.session() as session:
+            session.add(TestModel(name="outer", value=1))
+            session.flush()
+            db_mgr.execute_raw("INSERT INTO test_models (name) VALUES ('raw')")
+            db_mgr.bulk_insert(
+                TestModel, [{"name": f"bulk-{i}", "value": i} for i in range(5)], 2
+            )
+            # Readers don't see the session's writes before it commits
+            assert db_mgr.execute_raw(count_sql) == [{"n": 0}]
+        assert time.monotonic() - started < 2.0
+        assert db_mgr.execute_raw(count_sql) == [{"n": 7}]
+
+        with pytest.raises(ValueError):
+            with db_mgr.session() as session:
+                session.add(TestModel(name="lost", value=1))
+                db_mgr.execute_raw("INSERT INTO test_models (name) VALUES ('lost')")
+                raise ValueError("boom")
+        assert db_mgr.execute_raw(count_sql) == [{"n": 7}]
+
+        # Holding the writer outside a session fails fast instead of waiting
+        started = time.monotonic()
+        with db_mgr._writer_engine.connect():
+            with pytest.raises(DatabaseError, match="already holds"):
+                db_mgr.execute_raw("INSERT INTO test_models (name) VALUES ('x')")
+        assert time.monotonic() - started < 2.0
+    finally:
+        db_mgr.shutdown()
+
+
+def test_statement_cache(db_manager):
+    """Test that repeated raw SQL reuses its text() construct."""
+    sql = "SELECT COUNT(*) AS n FROM test_models WHERE value > :v"
+    before = db_manager.status()["statement_cache"]
+
+    for i in range(5):
+        assert db_manager.execute_raw(sql, {"v": i})[0]["n"] == 0
+
+    after = db_manager.status()["statement_cache"]
+    assert after["misses"] == before["misses"] + 1
+    assert after["hits"] == before["hits"] + 4
+    assert db_manager._text_cache.get(sql) is db_manager._text_cache.get(sql)
+
+
+def test_paginate(db_manager):
+    """Test keyset pagination over a table."""
+    db_manager.bulk_insert(
+        TestModel, [{"name": f"item{i}", "value": i % 3} for i in range(10)]
+    )
+    order_by = [TestModel.value, TestModel.id]
+
+    names = []
+    cursor = None
+    pages = 0
+    while True:
+        page = db_manager.paginate(
+            sa.select(TestModel.id, TestModel.name, TestModel.value),
+            order_by,
+            limit=4,
+            cursor=cursor,
+        )
+        names.extend(row["name"] for row in page["items"])
+        pages += 1
+        cursor = page["next_cursor"]
+        if cursor is None:
+            break
+
+    assert pages == 3
+    assert names == [
+        f"item{i}" for i in sorted(range(10), key=lambda i: (i % 3, i + 1))
+    ]
+
+    # Descending order continues below the cursor
+    first = db_manager.paginate(
+        sa.select(TestModel), [TestModel.id], limit=3, descending=True
+    )
+    assert [row["id"] for row in first["items"]] == [10, 9, 8]
+    second = db_manager.paginate(
+        sa.select(TestModel),
+        [TestModel.id],
+        limit=3,
+        cursor=first["next_cursor"],
+        descending=True,
+    )
+    assert [row["id"] for row in second["items"]] == [7, 6, 5]
+
+    with pytest.raises(ValueError):
+        db_manager.paginate(sa.select(TestModel), order_by, cursor="bogus")
+    with pytest.raises(ValueError):
+        db_manager.paginate(
+            sa.select(TestModel), order_by, cursor=encode_cursor(["x", "y"])
+        )
+
+    # Rows are read by position, so labels that differ from the key work
+    labeled = sa.select(TestModel.id.label("item_id"), TestModel.name)
+    first = db_manager.paginate(labeled, [TestModel.id], limit=3)
+    assert [row["item_id"] for row in first["items"]] == [1, 2, 3]
+    second = db_manager.paginate(
+        labeled, [TestModel.id], limit=3, cursor=first["next_cursor"]
+    )
+    assert [row["item_id"] for row in second["items"]] == [4, 5, 6]
+
+    with pytest.raises(ValueError):
+        db_manager.paginate(sa.select(TestModel.name), [TestModel.id])
+
+
+def test_pool_monitor(db_config, tmp_path):
+    """Test long-held connection detection and pool exhaustion events."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {
+        **db_config,
+        "name": str(tmp_path / "pool.db"),
+        "sqlite": {"writer": {"enabled": False}},
+        "pool_monitor": {
+            "leak_threshold_seconds": 0.05,
+            "check_interval": 0,
+            "exhaustion_event_interval": 60.0,
+        },
+    }
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    event_bus = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager, event_bus)
+    db_mgr.initialize()
+    db_mgr.create_tables()
+
+    def published(event_type):
+        return [
+            c.kwargs["payload"]
+            for c in event_bus.publish.call_args_list
+            if c.kwargs["event_type"] == event_type
+        ]
+
+    try:
+        connection = db_mgr.get_engine().connect()
+        time.sleep(0.1)
+
+        leaks = db_mgr.check_connection_leaks()
+        assert [leak["pool"] for leak in leaks] == ["primary"]
+        assert any("test_pool_monitor" in frame for frame in leaks[0]["stack"])
+        assert len(published("database/connection_leak")) == 1
+
+        # A long-held connection is only reported once
+        db_mgr.check_connection_leaks()
+        assert len(published("database/connection_leak")) == 1
+
+        held = db_mgr.status()["pool"]["checkout_wait"]["held"]
+        assert held["checked_out"] == 1
+        assert len(held["long_held"]) == 1
+        connection.close()
+
+        held = db_mgr.status()["pool"]["checkout_wait"]["held"]
+        assert held["checked_out"] == 0
+        assert held["checkins"] >= 1
+        assert held["max_ms"] >= 100
+
+        # The writer pool has one connection, so a second session queues
+        holding = threading.Event()
+
+        def hold_writer():
+            with db_mgr.session() as session:
+                session.execute(sa.text("SELECT 1"))
+                holding.set()
+                time.sleep(0.2)
+
+        thread = threading.Thread(target=hold_writer)
+        thread.start()
+        assert holding.wait(5)
+        with db_mgr.session() as session:
+            session.execute(sa.text("SELECT 1"))
+        thread.join()
+
+        events = published("database/pool_exhausted")
+        assert len(events) == 1
+        assert events[0]["pool"] == "primary-writer"
+        assert events[0]["waited_ms"] >= 10
+        assert events[0]["checkedout"] == 1
+
+        wait = db_mgr.status()["pool"]["writer"]["checkout_wait"]
+        assert wait["contended"] == 1
+        assert sum(wait["wait_histogram_ms"].values()) == wait["checkouts"]
+
+        # Opening a slow new connection is not waiting for the pool
+        engine = db_mgr.get_engine()
+        sa.event.listen(engine, "connect", lambda *args: time.sleep(0.05))
+        engine.dispose()
+        with engine.connect() as connection:
+            connection.execute(sa.text("SELECT 1"))
+        wait = db_mgr.status()["pool"]["checkout_wait"]
+        assert wait["contended"] == 0
+        assert wait["max_wait_ms"] < 50
+        assert [e["pool"] for e in published("database/pool_exhausted")] == [
+            "primary-writer"
+        ]
+    finally:
+        db_mgr.shutdown()
+
+
+def test_async_path(db_config, tmp_path):
+    """Test async sessions, bulk writes and streaming on a file database."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {**db_config, "name": str(tmp_path / "a.db")}
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+
+    async def run():
+        async with db_mgr.async_session() as session:
+            session.add(TestModel(name="committed", value=1))
+
+        # An exception rolls the session back
+        with pytest.raises(ValueError):
+            async with db_mgr.async_session() as session:
+                session.add(TestModel(name="rolled-back", value=2))
+                await session.flush()
+                raise ValueError("boom")
+
+        with pytest.raises(DatabaseError):
+            async with db_mgr.async_session() as session:
+                session.add(TestModel(name=None))
+
+        rows = [{"name": f"bulk-{i}", "value": i} for i in range(25)]
+        assert await db_mgr.bulk_insert_async(TestModel, rows, chunk_size=10) == 25
+
+        names = [
+            row["name"]
+            async for row in db_mgr.stream_async(
+                "SELECT name FROM test_models ORDER BY id", batch_size=7
+            )
+        ]
+        assert names[0] == "committed"
+        assert "rolled-back" not in names
+        assert len(names) == 26
+
+        result = await db_mgr.execute_async(
+            sa.select(sa.func.count().label("n")).select_from(TestModel.__table__)
+        )
+        assert result == [{"n": 26}]
+
+        db_mgr.bind_event_loop(asyncio.get_running_loop())
+
+    try:
+        db_mgr.create_tables()
+        asyncio.run(run())
+
+        status = db_mgr.status()
+        assert status["database"]["event_loop_bound"] is True
+        assert status["sessions"]["async_active"] == 0
+        assert status["queries"]["failed"] >= 2
+
+        # Once bound, other event loops can't use the async engine
+        with pytest.raises(DatabaseError):
+            asyncio.run(db_mgr.execute_async(sa.text("SELECT 1")))
+    finally:
+        db_mgr.shutdown()
+
+    assert db_mgr.status()["initialized"] is False
+
+
+def test_async_writes_share_sqlite_writer(db_config, tmp_path):
+    """Test async writes alongside sync writes on a SQLite file."""
+    config_manager = MagicMock()
+    config_manager.get.return_value = {**db_config, "name": str(tmp_path / "w.db")}
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_mgr = DatabaseManager(config_manager, logger_manager)
+    db_mgr.initialize()
+
+    def sync_writes():
+        for i in range(20):
+            with db_mgr.session() as session:
+                session.add(TestModel(name=f"sync-{i}", value=i))
+
+    async def run():
+        writer = asyncio.get_running_loop().run_in_executor(None, sync_writes)
+        bulk = [
+            db_mgr.bulk_insert_async(
+                TestModel,
+                [{"name": f"bulk-{n}-{i}", "value": i} for i in range(50)],
+                chunk_size=5,
+            )
+            for n in range(4)
+        ]
+        assert await asyncio.gather(*bulk) == [50] * 4
+
+        # Async sessions use their own connections and wait on busy_timeout
+        for i in range(10):
+            async with db_mgr.async_session() as session:
+                session.add(TestModel(name=f"session-{i}", value=i))
+        await writer
+
+    try:
+        db_mgr.create_tables()
+        checkouts = db_mgr.status()["pool"]["writer"]["checkout_wait"]["checkouts"]
+        asyncio.run(run())
+
+        # Bulk chunks went through the single writer connection
+        assert (
+            db_mgr.status()["pool"]["writer"]["checkout_wait"]["checkouts"]
+            >= checkouts + 24
+        )
+        result = db_mgr.execute(
+            sa.select(sa.func.count().label("n")).select_from(TestModel.__table__)
+        )
+        assert result == [{"n": 230}]
+    finally:
+        db_mgr.shutdown()
@@ -1,14 +1,28 @@
 """Unit tests for the File Manager."""
 
+import errno
+import gzip
+import hashlib
+import io
 import os
 import shutil
+import stat
+import tarfile
 import tempfile
+import threading
+import time
 from pathlib import Path
 from unittest.mock import MagicMock, patch
 
 import pytest
 
-from qorzen.core.file_manager import FileManager, FileType
+from qorzen.core.file_manager import (
+    ChangeType,
+    FileManager,
+    FileType,
+    _BackupStore,
+    _expired_snapshots,
+)
 from qorzen.utils.exceptions import FileError
 
 
@@ -33,6 +47,7 @@ def file_config(temp_root_dir):
         "temp_directory": temp_dir,
         "plugin_data_directory": plugin_dir,
         "backup_directory": backup_dir,
+        "watcher": {"enabled": False},
     }
 
 
@@ -201,6 +216,39 @@ def test_list_files(file_manager, temp_root_dir):
     assert len(files) == 2  # Just the txt files in the root
 
 
+def test_iter_files(file_manager):
+    """Test the streaming walker and the parallel recursive listing."""
+    for i in range(3):
+        file_manager.write_text(f"tree/a{i}/data.txt", "x" * i)
+        file_manager.write_text(f"tree/a{i}/b/deep{i}.log", "log")
+    file_manager.write_text("tree/top.yaml", "key: value")
+
+    streamed = list(file_manager.iter_files("tree", recursive=True))
+    listed = file_manager.list_files("tree", recursive=True)
+    assert sorted(f.path for f in streamed) == sorted(f.path for f in listed)
+    assert len(listed) == 13  # 7 files + 6 directories
+
+    by_name = {f.name: f for f in listed}
+    assert by_name["top.yaml"].file_type == FileType.CONFIG
+    assert by_name["deep1.log"].file_type == FileType.LOG
+    assert by_name["a2"].is_directory
+    assert by_name["data.txt"].size in (0, 1, 2)
+
+    # Name patterns match at any depth in recursive listings
+    logs = file_manager.list_files("tree", recursive=True, pattern="*.log")
+    assert sorted(f.name for f in logs) == ["deep0.log", "deep1.log", "deep2.log"]
+
+    # Path patterns match relative to the listed directory
+    files = file_manager.list_files("tree", recursive=True, pattern="**/a1/*.txt")
+    assert [f.name for f in files] == ["data.txt"]
+
+    files = list(file_manager.iter_files("tree", include_dirs=False))
+    assert [f.name for f in files] == ["top.yaml"]
+
+    with pytest.raises(FileError):
+        file_manager.iter_files("tree/top.yaml")
+
+
 def test_delete_file(file_manager, temp_root_dir):
     """Test deleting files and directories."""
     # Create test files and directories
@@ -268,21 +316,31 @@ def test_copy_move_file(file_manager, temp_root_dir):
 
 
 def test_create_backup(file_manager, temp_root_dir):
-    """Test creating file backups."""
+    """Test creating and restoring file backups."""
     # Create test file
     test_content = "File to backup"
     file_manager.write_text("backup_me.txt", test_content)
 
     # Create backup
-    backup_path = file_manager.create_backup("backup_me.txt")
+    snapshot_id = file_manager.create_backup("backup_me.txt")
+    backups = file_manager.list_backups("backup_me.txt")
+    assert [b["id"] for b in backups] == [snapshot_id]
+    assert backups[0]["size"] == len(test_content)
 
-    # Check backup file exists
-    backup_dir = os.path.join(temp_root_dir, "data", "backups")
-    assert os.path.exists(os.path.join(backup_dir, backup_path))
+    # Restoring over the changed file requires overwrite
+    file_manager.write_text("backup_me.txt", "Changed")
+    with pytest.raises(FileError):
+        file_manager.restore_backup(snapshot_id)
+    file_manager.restore_backup(snapshot_id, overwrite=True)
+    assert file_manager.read_text("backup_me.txt") == test_content
+
+    # Or restore it elsewhere
+    restored = file_manager.restore_backup(snapshot_id, "restored.txt", "temp")
+    assert restored == os.path.join(temp_root_dir, "data", "temp", "restored.txt")
+    assert file_manager.read_text("restored.txt", "temp") == test_content
 
-    # Verify backup content
-    backup_content = file_manager.read_text(backup_path, "backup")
-    assert backup_content == test_content
+    with pytest.raises(FileError):
+        file_manager.restore_backup("missing")
 
 
 def test_get_file_info(file_manager, temp_root_dir):
@@ -316,3 +374,661 @@ def test_file_manager_status(file_manager):
     assert "directories" in status
     assert "disk_usage" in status
     assert "active_locks" in status
+
+
+def test_metadata_index(file_manager, temp_root_dir):
+    """Test that listings, sizes and changes are answered from the index."""
+    file_manager.refresh_index()
+    assert file_manager.status()["index"]["ready"] is True
+
+    file_manager.write_text("docs/a.txt", "alpha")
+    file_manager.write_binary("docs/b.bin", b"\x00" * 10)
+
+    files = file_manager.list_indexed_files("docs")
+    assert sorted((f.name, f.size) for f in files) == [("a.txt", 5), ("b.bin", 10)]
+    assert file_manager.get_directory_size("docs") == 15
+
+    # Files created behind the File Manager's back appear after a refresh
+    since = time.time()
+    os.makedirs(os.path.join(temp_root_dir, "data", "docs", "sub"))
+    with open(os.path.join(temp_root_dir, "data", "docs", "sub", "c.log"), "w") as f:
+        f.write("log")
+    assert "c.log" not in {f.name for f in file_manager.list_indexed_files("docs")}
+
+    counts = file_manager.refresh_index()
+    # docs was created by write_text() but only indexed with its parent
+    assert counts["added"] == 3  # docs, sub and c.log
+
+    names = {f.name for f in file_manager.list_indexed_files("docs", recursive=True)}
+    assert names == {"a.txt", "b.bin", "sub", "c.log"}
+    with pytest.raises(FileError):
+        file_manager.list_indexed_files("missing")
+    with pytest.raises(FileError):
+        file_manager.list_indexed_files("docs/a.txt")
+    logs = file_manager.list_indexed_files("docs", recursive=True, pattern="*.log")
+    assert [f.file_type for f in logs] == [FileType.LOG]
+
+    file_manager.delete_file("docs/a.txt")
+    changes = file_manager.get_changed_files(since, "docs")
+    assert {f.name for f in changes["changed"]} == {"sub", "c.log"}
+    assert [os.path.basename(p) for p in changes["deleted"]] == ["a.txt"]
+
+    # A second refresh with nothing changed lists no directories again
+    time.sleep(0.01)
+    file_manager._index.RACY_SECONDS = 0
+    file_manager.refresh_index()
+    assert file_manager.refresh_index()["listed"] == 0
+
+    # The File Manager's own database files aren't listed as user files
+    listed = {f.name for f in file_manager.list_files(recursive=True)}
+    assert not [n for n in listed if n.startswith((".file_index", ".file_hashes"))]
+
+
+@pytest.mark.parametrize("backend", ["inotify", "polling"])
+def test_file_watcher(file_config, backend):
+    """Test that bursts of changes are debounced into one batch per watch."""
+    file_config["watcher"] = {
+        "enabled": True,
+        "backend": backend,
+        "debounce_ms": 100,
+        "poll_interval": 0.05,
+    }
+    config_manager = MagicMock()
+    config_manager.get.return_value = file_config
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    event_bus = MagicMock()
+    docs = Path(file_config["base_directory"]) / "docs"
+    os.makedirs(docs)
+
+    file_mgr = FileManager(config_manager, logger_manager, event_bus)
+    file_mgr.initialize()
+    try:
+        assert file_mgr.status()["watcher"]["backend"] == backend
+        file_mgr.refresh_index()
+
+        batches = []
+        watch_id = file_mgr.watch("docs", batches.append)
+
+        def wait_for_batch():
+            deadline = time.monotonic() + 5
+            while not batches and time.monotonic() < deadline:
+                time.sleep(0.02)
+            time.sleep(0.3)  # Nothing else should follow
+            return batches.pop(0)
+
+        # Several writes become one change, and a file that is created and
+        # deleted within the window isn't reported
+        for i in range(5):
+            (docs / "a.txt").write_text(f"version {i}")
+        (docs / "tmp.txt").write_text("scratch")
+        (docs / "tmp.txt").unlink()
+        os.makedirs(docs / "sub")
+        (docs / "sub" / "b.txt").write_text("b")
+
+        changes = {c.path: c.change_type for c in wait_for_batch()}
+        assert changes == {
+            str(docs / "a.txt"): ChangeType.CREATED,
+            str(docs / "sub"): ChangeType.CREATED,
+            str(docs / "sub" / "b.txt"): ChangeType.CREATED,
+        }
+        assert batches == []
+
+        # Changes are published and applied to the index
+        event = event_bus.publish.call_args.kwargs
+        assert event["event_type"] == "files/changed"
+        assert len(event["payload"]["changes"]) == 3
+        names = {f.name for f in file_mgr.list_indexed_files("docs", recursive=True)}
+        assert names == {"a.txt", "sub", "b.txt"}
+
+        # A file watch only sees its own file
+        file_batches = []
+        file_watch_id = file_mgr.watch("docs/a.txt", file_batches.append)
+        (docs / "a.txt").write_text("changed")
+        (docs / "sub" / "b.txt").unlink()
+
+        changes = {c.path: c.change_type for c in wait_for_batch()}
+        assert changes == {
+            str(docs / "a.txt"): ChangeType.MODIFIED,
+            str(docs / "sub" / "b.txt"): ChangeType.DELETED,
+        }
+        assert [[c.path for c in b] for b in file_batches] == [[str(docs / "a.txt")]]
+
+        assert file_mgr.unwatch(file_watch_id) is True
+        assert file_mgr.unwatch(watch_id) is True
+        assert file_mgr.unwatch(watch_id) is False
+        assert file_mgr.status()["watcher"]["watches"] == 0
+
+        with pytest.raises(FileError):
+            file_mgr.watch("missing", batches.append)
+    finally:
+        file_mgr.shutdown()
+
+
+def test_hash_cache(file_manager):
+    """Test that hashes of unchanged files come from the cache."""
+    file_manager._hash_cache.RACY_SECONDS = 0
+    file_manager.write_text("a.txt", "alpha")
+    file_manager.write_text("b.txt", "beta")
+    file_manager.ensure_directory("docs")
+
+    expected = hashlib.sha256(b"alpha").hexdigest()
+    assert file_manager.compute_file_hash("a.txt") == expected
+    assert file_manager.compute_file_hash("a.txt") == expected
+    stats = file_manager.status()["hash_cache"]
+    assert (stats["hits"], stats["misses"], stats["entries"]) == (1, 1, 1)
+
+    # A new version of the file is hashed again
+    file_manager.write_text("a.txt", "changed")
+    assert file_manager.compute_file_hash("a.txt") == (
+        hashlib.sha256(b"changed").hexdigest()
+    )
+
+    hashes = file_manager.compute_hashes(["a.txt", "b.txt", "docs", "missing.txt"])
+    assert hashes == {
+        "a.txt": hashlib.sha256(b"changed").hexdigest(),
+        "b.txt": hashlib.sha256(b"beta").hexdigest(),
+        "docs": None,
+        "missing.txt": None,
+    }
+    assert file_manager.status()["hash_cache"]["hits"] == 2
+
+    fast = file_manager.compute_hashes(["a.txt", "b.txt"], algorithm="fast")
+    assert len(set(fast.values())) == 2
+    assert fast["a.txt"] != hashes["a.txt"]
+
+    with pytest.raises(FileError):
+        file_manager.compute_file_hash("a.txt", algorithm="crc32")
+
+
+def test_mmap_and_chunked_reads(file_manager):
+    """Test reading files through a memory map, in chunks and by range."""
+    data = bytes(range(256)) * 40
+    file_manager.write_binary("data.bin", data)
+    file_manager.write_binary("empty.bin", b"")
+
+    with file_manager.open_mmap("data.bin", sequential=True) as view:
+        assert view.readonly
+        assert len(view) == len(data)
+        assert view[256:260] == data[256:260]
+    with file_manager.open_mmap("empty.bin") as view:
+        assert len(view) == 0
+
+    chunks = list(file_manager.iter_chunks("data.bin", chunk_size=4096))
+    assert [len(c) for c in chunks] == [4096, 4096, 2048]
+    assert b"".join(chunks) == data
+
+    # Reused buffers yield views that are only valid until the next chunk
+    copied = [
+        bytes(c)
+        for c in file_manager.iter_chunks(
+            "data.bin", chunk_size=1000, start=100, end=2600, reuse_buffer=True
+        )
+    ]
+    assert [len(c) for c in copied] == [1000, 1000, 500]
+    assert b"".join(copied) == data[100:2600]
+
+    assert file_manager.read_range("data.bin", 10000, 500) == data[10000:]
+    assert file_manager.read_range("data.bin", 20000, 10) == b""
+
+    with pytest.raises(FileError):
+        file_manager.read_range("data.bin", -1, 10)
+    with pytest.raises(FileError):
+        file_manager.iter_chunks("missing.bin")
+    with pytest.raises(FileError):
+        with file_manager.open_mmap("missing.bin"):
+            pass
+
+
+def test_atomic_and_buffered_writes(file_manager, temp_root_dir):
+    """Test atomic writes and coalescing of buffered writes."""
+    path = os.path.join(temp_root_dir, "data", "state.json")
+
+    file_manager.write_text("state.json", "v0", fsync="full")
+    os.chmod(path, 0o600)
+    # Writes leave flushing to the OS unless a sync is asked for
+    with patch("os.fsync", wraps=os.fsync) as fsync:
+        file_manager.write_text("state.json", "v1")
+        assert fsync.call_count == 0
+        file_manager.write_text("state.json", "v1", fsync="file")
+        assert fsync.call_count == 1
+    assert os.stat(path).st_mode & 0o777 == 0o600  # Permissions are kept
+    assert [n for n in os.listdir(os.path.dirname(path)) if n.endswith(".tmp")] == []
+
+    with pytest.raises(FileError):
+        file_manager.write_text("state.json", "v2", fsync="sometimes")
+
+    # Buffered writes stay in memory, and only the last one is written
+    for i in range(10):
+        file_manager.write_text("state.json", f"buffered {i}", buffered=True)
+    with open(path) as f:
+        assert f.read() == "v1"
+    status = file_manager.status()["write_behind"]
+    assert (status["pending_files"], status["coalesced"]) == (1, 9)
+
+    # Reads through the File Manager see the buffered content
+    assert file_manager.read_text("state.json") == "buffered 9"
+    with open(path) as f:
+        assert f.read() == "buffered 9"
+
+    file_manager.write_binary("a.bin", b"a", buffered=True)
+    file_manager.write_binary("b.bin", b"b", buffered=True)
+    assert {f.name for f in file_manager.list_files()} >= {"a.bin", "b.bin"}
+
+    # A direct write isn't overwritten by an older buffered one
+    file_manager.write_text("state.json", "buffered", buffered=True)
+    file_manager.write_text("state.json", "direct")
+    assert file_manager.flush_writes() == 0
+    assert file_manager.read_text("state.json") == "direct"
+
+    status = file_manager.status()["write_behind"]
+    assert status["pending_files"] == 0
+    assert status["files_written"] == 4
+
+    # Buffered writes are flushed with the strongest fsync they asked for
+    with patch("os.fsync", wraps=os.fsync) as fsync:
+        file_manager.write_text("state.json", "synced", fsync="full", buffered=True)
+        file_manager.write_text("state.json", "latest", buffered=True)
+        file_manager.write_text("other.txt", "unsynced", buffered=True)
+        assert fsync.call_count == 0
+        assert file_manager.flush_writes() == 2
+        # The file's content, then its directory
+        assert fsync.call_count == 2
+    assert file_manager.read_text("state.json") == "latest"
+
+
+def test_copy_engine(file_manager, temp_root_dir):
+    """Test that trees are copied with metadata and methods fall back."""
+    for i in range(5):
+        file_manager.write_binary(f"tree/sub{i % 2}/f{i}.bin", bytes([i]) * 1000)
+    source = os.path.join(temp_root_dir, "data", "tree", "sub0", "f0.bin")
+    os.utime(source, (1000000000, 1000000000))
+
+    file_manager.copy_file("tree", "copy")
+    copied = os.path.join(temp_root_dir, "data", "copy", "sub0", "f0.bin")
+    assert os.stat(copied).st_mtime == 1000000000
+    for i in range(5):
+        assert file_manager.read_binary(f"copy/sub{i % 2}/f{i}.bin") == (
+            bytes([i]) * 1000
+        )
+
+    copy_status = file_manager.status()["copy"]
+    assert sum(copy_status["copies"].values()) == 5
+    assert copy_status["bytes_copied"] == 5000
+
+    # Methods that fail as unsupported aren't tried again for those devices
+    engine = file_manager._copier
+    fail = OSError(errno.EXDEV, "Invalid cross-device link")
+    with patch.object(engine, "_reflink", side_effect=fail), patch.object(
+        engine, "_copy_file_range", side_effect=fail
+    ), patch.object(engine, "_sendfile", side_effect=fail):
+        file_manager.copy_file("tree/sub1/f1.bin", "f1.bin")
+        file_manager.copy_file("tree/sub1/f3.bin", "f1.bin", overwrite=True)
+        assert engine._reflink.call_count in (0, 1)
+        assert engine._copy_file_range.call_count in (0, 1)
+    assert file_manager.read_binary("f1.bin") == bytes([3]) * 1000
+    assert engine.counts["userspace"] == 2
+
+
+def test_shared_worker_pool(config_manager_mock, file_config):
+    """Test that parallel operations share one bounded thread pool."""
+    file_config["workers"] = 2
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    file_manager = FileManager(config_manager_mock, logger_manager)
+    file_manager.initialize()
+    try:
+        for i in range(20):
+            file_manager.write_binary(f"tree/d{i % 4}/f{i}.bin", bytes([i]) * 1000)
+        paths = [f"tree/d{i % 4}/f{i}.bin" for i in range(20)]
+
+        errors = []
+
+        def work(n):
+            try:
+                assert len(file_manager.list_files("tree", recursive=True)) == 24
+                file_manager.copy_file("tree", f"copy{n}")
+                assert len(file_manager.compute_hashes(paths)) == 20
+                file_manager.create_backup("tree")
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=work, args=(n,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join(30.0)
+        assert not errors
+        names = [t.name for t in threading.enumerate()]
+        assert len([n for n in names if n.startswith("file-worker")]) <= 2
+        assert len(file_manager.list_backups("tree")) == 4
+
+        # Operations started on a pool thread run inline instead of waiting
+        listings = file_manager._pool.run(
+            lambda _: len(file_manager.list_files("tree", recursive=True)),
+            range(4),
+            4,
+        )
+        assert listings == [24] * 4
+    finally:
+        file_manager.shutdown()
+    assert not [t for t in threading.enumerate() if t.name.startswith("file-worker")]
+
+
+def test_incremental_backup(config_manager_mock, file_config, temp_root_dir):
+    """Test that backups store changed chunks only and are pruned."""
+    file_config["backup"] = {"chunk_size": 16384, "retention": {"keep_last": 2}}
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    file_manager = FileManager(config_manager_mock, logger_manager)
+    file_manager.initialize()
+
+    try:
+        data = os.urandom(1024 * 1024)
+        file_manager.write_binary("tree/big.bin", data)
+        file_manager.write_text("tree/sub/small.txt", "small")
+        small = os.path.join(temp_root_dir, "data", "tree", "sub", "small.txt")
+        os.chmod(small, 0o600)
+        os.utime(small, (1000000000, 1000000000))
+        file_manager.ensure_directory("tree/empty")
+
+        first = file_manager.create_backup("tree")
+        stats = file_manager.status()["backup"]
+        assert stats["bytes_written"] == len(data) + 5
+
+        # An insertion only changes the chunks around it
+        data = data[:500000] + b"inserted" + data[500000:]
+        file_manager.write_binary("tree/big.bin", data)
+        second = file_manager.create_backup("tree")
+        stats = file_manager.status()["backup"]
+        assert stats["bytes_written"] - (1024 * 1024 + 5) < 200000
+        assert stats["files_reused"] == 1  # small.txt isn't read again
+        assert stats["dedup_ratio"] > 1.5
+
+        # Keeping the last two removes the first snapshot and its own chunks
+        third = file_manager.create_backup("tree")
+        backups = file_manager.list_backups("tree")
+        assert [b["id"] for b in backups] == [third, second]
+        assert file_manager.status()["backup"]["stored_bytes"] == len(data) + 5
+        with pytest.raises(FileError):
+            file_manager.restore_backup(first, "first")
+
+        file_manager.restore_backup(second, "restored")
+        assert file_manager.read_binary("restored/big.bin") == data
+        assert file_manager.read_text("restored/sub/small.txt") == "small"
+        restored = os.path.join(temp_root_dir, "data", "restored", "sub", "small.txt")
+        assert os.stat(restored).st_mtime == 1000000000
+        assert stat.S_IMODE(os.stat(restored).st_mode) == 0o600
+        assert os.path.isdir(os.path.join(temp_root_dir, "data", "restored", "empty"))
+
+        # Damaged chunks are detected on restore
+        store = file_manager._backup_store
+        digest = store.get(second)["files"][0]["chunks"][0][0]
+        with open(store.chunk_path(digest), "r+b") as f:
+            f.write(b"X")
+        with pytest.raises(FileError):
+            file_manager.restore_backup(second, "damaged")
+
+        result = file_manager.prune_backups(keep_last=1)
+        assert result["removed"] == [second]
+    finally:
+        file_manager.shutdown()
+
+
+def test_backup_retention_policy():
+    """Test that retention keeps the newest snapshot of each period."""
+    day = 86400.0
+    now = time.time()
+    snapshots = [
+        {"id": name, "created_at": now - age * day}
+        for name, age in [("a", 0), ("b", 0.01), ("c", 1), ("d", 2), ("e", 40)]
+    ]
+
+    expired = _expired_snapshots(snapshots, {"keep_last": 1, "keep_daily": 2})
+    assert {s["id"] for s in expired} == {"b", "d", "e"}
+
+    expired = _expired_snapshots(snapshots, {"keep_monthly": 2})
+    assert "a" not in {s["id"] for s in expired}
+    assert "e" not in {s["id"] for s in expired}
+
+    assert _expired_snapshots(snapshots, {}) == []
+
+
+def test_lock_table(file_manager):
+    """Test that path locks are dropped once released and serialize threads."""
+    for i in range(50):
+        file_manager.write_text(f"locks/file{i}.txt", str(i))
+        file_manager.read_text(f"locks/file{i}.txt")
+    file_manager.copy_file("locks/file0.txt", "locks/copy.txt")
+    file_manager.move_file("locks/copy.txt", "locks/moved.txt")
+    file_manager.delete_file("locks/moved.txt")
+    assert file_manager.status()["active_locks"] == 0
+
+    locks = file_manager._locks
+    holding = threading.Event()
+    release = threading.Event()
+
+    def hold():
+        with locks.lock("/a"):
+            holding.set()
+            release.wait(5.0)
+
+    thread = threading.Thread(target=hold)
+    thread.start()
+    holding.wait(5.0)
+    # Another thread waits for the holder
+    acquired = []
+
+    def wait():
+        with locks.lock("/a"):
+            acquired.append(True)
+
+    waiter = threading.Thread(target=wait)
+    waiter.start()
+    waiter.join(0.2)
+    assert not acquired and locks.active() == 1
+    release.set()
+    thread.join(5.0)
+    waiter.join(5.0)
+    assert acquired and locks.active() == 0
+    assert locks.stats()["contended"] == 1
+
+
+def _hold_lock(lock_file, path, holding, release):
+    from qorzen.core.file_manager import _LockTable
+
+    table = _LockTable(lock_file=lock_file)
+    table.open()
+    with table.lock(path):
+        holding.set()
+        release.wait(10.0)
+    table.close()
+
+
+@pytest.mark.skipif(
+    not hasattr(os, "fork"), reason="Cross-process locks need fcntl and fork"
+)
+def test_interprocess_locks(config_manager_mock, file_config, temp_root_dir):
+    """Test that file locks exclude other processes sharing the lock file."""
+    import multiprocessing
+
+    file_config["locks"] = {"interprocess": True}
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    file_manager = FileManager(config_manager_mock, logger_manager)
+    file_manager.initialize()
+
+    try:
+        lock_file = os.path.join(temp_root_dir, "data", ".file_locks")
+        assert file_manager.status()["locks"]["lock_file"] == lock_file
+        path = str(file_manager.get_file_path("shared.txt"))
+
+        context = multiprocessing.get_context("fork")
+        holding = context.Event()
+        release = context.Event()
+        process = context.Process(
+            target=_hold_lock, args=(lock_file, path, holding, release)
+        )
+        process.start()
+        try:
+            assert holding.wait(10.0)
+            writer = threading.Thread(
+                target=file_manager.write_text, args=("shared.txt", "mine")
+            )
+            writer.start()
+            writer.join(0.3)
+            assert writer.is_alive()  # Blocked by the other process
+            assert not os.path.exists(path)
+
+            # Other paths aren't blocked
+            file_manager.write_text("other.txt", "free")
+
+            release.set()
+            writer.join(10.0)
+            assert file_manager.read_text("shared.txt") == "mine"
+        finally:
+            release.set()
+            process.join(10.0)
+    finally:
+        file_manager.shutdown()
+
+
+@pytest.fixture
+def compressing_file_manager(config_manager_mock, file_config):
+    """Create a FileManager compressing small blocks, backups and temp files."""
+    file_config["compression"] = {
+        "workers": 4,
+        "block_size": 65536,
+        "temp_files": "gzip",
+    }
+    file_config["backup"] = {"compression": "gzip"}
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    file_mgr = FileManager(config_manager_mock, logger_manager)
+    file_mgr.initialize()
+    yield file_mgr
+    file_mgr.shutdown()
+
+
+def test_compress_file(compressing_file_manager, temp_root_dir):
+    """Test streaming and parallel compression."""
+    file_manager = compressing_file_manager
+    data = b"".join(b"line %d of the log\n" % i for i in range(50000))
+    file_manager.write_binary("app.log", data)
+
+    # Blocks are separate gzip members that read back as one stream
+    compressed = file_manager.compress_file("app.log", remove_source=True)
+    assert compressed == os.path.join(temp_root_dir, "data", "app.log.gz")
+    assert not os.path.exists(os.path.join(temp_root_dir, "data", "app.log"))
+    with open(compressed, "rb") as f:
+        assert gzip.decompress(f.read()) == data
+    stats = file_manager.status()["compression"]
+    assert stats["bytes_in"] == len(data)
+    assert stats["ratio"] > 5
+
+    file_manager.decompress_file("app.log.gz")
+    assert file_manager.read_binary("app.log") == data
+
+    with file_manager.open_compressed("stream.gz", "wb") as f:
+        for i in range(1000):
+            f.write(b"%d\n" % i)
+    with file_manager.open_compressed("stream.gz") as f:
+        assert f.read().split() == [b"%d" % i for i in range(1000)]
+
+    # Nothing is left behind when writing fails
+    with pytest.raises(RuntimeError):
+        with file_manager.open_compressed("failed.gz", "wb") as f:
+            f.write(b"partial")
+            raise RuntimeError("failed")
+    assert not os.path.exists(os.path.join(temp_root_dir, "data", "failed.gz"))
+    assert not [n for n in os.listdir(file_manager.get_file_path("")) if ".tmp" in n]
+
+    with pytest.raises(FileError):
+        file_manager.compress_file("app.log", codec="rar")
+    with pytest.raises(FileError):
+        file_manager.decompress_file("app.log")
+
+    # Temp files and backup chunks are compressed as configured
+    temp_path, temp_file = file_manager.create_temp_file(suffix=".log")
+    with temp_file:
+        temp_file.write(data)
+    assert temp_path.endswith(".log.gz")
+    with open(temp_path, "rb") as f:
+        assert gzip.decompress(f.read()) == data
+
+    snapshot_id = file_manager.create_backup("app.log")
+    chunks = file_manager._backup_store.get(snapshot_id)["files"][0]["chunks"]
+    assert {chunk[2] for chunk in chunks} == {".gz"}
+    backup = file_manager.status()["backup"]
+    assert backup["bytes_written"] < len(data) / 5
+    # Stored bytes count the compressed chunks, also when the store is reopened
+    assert backup["stored_bytes"] == backup["bytes_written"]
+    assert backup["dedup_ratio"] > 5
+    store = file_manager._backup_store
+    reopened = _BackupStore(store.root, store.chunker, "none", MagicMock())
+    reopened.open()
+    assert reopened.stats()["stored_bytes"] == backup["stored_bytes"]
+    file_manager.restore_backup(snapshot_id, "restored.log")
+    assert file_manager.read_binary("restored.log") == data
+
+
+@pytest.mark.parametrize("archive_name", ["out.tar.gz", "out.tar", "out.zip"])
+def test_archives(compressing_file_manager, archive_name):
+    """Test creating and extracting archives."""
+    file_manager = compressing_file_manager
+    big = os.urandom(200000)
+    file_manager.write_binary("export/data/big.bin", big)
+    file_manager.write_text("export/data/sub/notes.txt", "notes")
+    file_manager.write_text("readme.txt", "readme")
+
+    file_manager.create_archive(["export", "readme.txt"], archive_name, "base", "temp")
+    names = file_manager.extract_archive(archive_name, "extracted", "temp")
+
+    assert "readme.txt" in names
+    assert file_manager.read_binary("extracted/export/data/big.bin", "temp") == big
+    assert (
+        file_manager.read_text("extracted/export/data/sub/notes.txt", "temp") == "notes"
+    )
+    assert file_manager.read_text("extracted/readme.txt", "temp") == "readme"
+
+
+@pytest.mark.parametrize("archive_name", ["out.tar", "out.zip"])
+def test_archive_skips_internal_files(
+    config_manager_mock, file_config, temp_root_dir, archive_name
+):
+    """Test that the File Manager's databases are left out of archives."""
+    index_path = os.path.join(temp_root_dir, "data", "export", ".file_index.db")
+    cache_path = os.path.join(temp_root_dir, "data", "export", ".file_hashes.db")
+    file_config["index"] = {"path": index_path}
+    file_config["hash_cache"] = {"path": cache_path}
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+    file_manager = FileManager(config_manager_mock, logger_manager)
+    file_manager.initialize()
+
+    try:
+        file_manager.write_text("export/notes.txt", "notes")
+        file_manager.refresh_index()
+        file_manager.compute_hashes(["export/notes.txt"])
+        assert os.path.exists(index_path) and os.path.exists(cache_path)
+
+        file_manager.create_archive(["export"], archive_name, "base", "temp")
+        names = file_manager.extract_archive(archive_name, "extracted", "temp")
+        assert "export/notes.txt" in names
+        assert not [n for n in names if ".file_index" in n or ".file_hashes" in n]
+    finally:
+        file_manager.shutdown()
+
+
+def test_extract_archive_rejects_traversal(file_manager, temp_root_dir):
+    """Test that archive members can't escape the destination."""
+    archive_path = os.path.join(temp_root_dir, "data", "evil.tar")
+    with tarfile.open(archive_path, "w") as archive:
+        info = tarfile.TarInfo("../escaped.txt")
+        info.size = 4
+        archive.addfile(info, io.BytesIO(b"evil"))
+
+    with pytest.raises(FileError):
+        file_manager.extract_archive("evil.tar", "extracted")
+    assert not os.path.exists(os.path.join(temp_root_dir, "data", "escaped.txt"))
@@ -1,5 +1,6 @@
 """Unit tests for the Plugin Manager."""
 
+import dataclasses
 import os
 import shutil
 import sys
@@ -239,6 +240,20 @@ def test_get_all_plugins(plugin_manager):
     assert plugins[0]["name"] == "test_plugin"
 
 
+def test_list_plugins(plugin_manager):
+    """Test paging through plugins."""
+    info = plugin_manager._plugins["test_plugin"]
+    for name in ("b_plugin", "a_plugin"):
+        plugin_manager._plugins[name] = dataclasses.replace(info, name=name)
+
+    first = plugin_manager.list_plugins(limit=2)
+    assert [p["name"] for p in first["items"]] == ["a_plugin", "b_plugin"]
+
+    second = plugin_manager.list_plugins(limit=2, cursor=first["next_cursor"])
+    assert [p["name"] for p in second["items"]] == ["test_plugin"]
+    assert second["next_cursor"] is None
+
+
 def test_get_active_plugins(plugin_manager):
     """Test getting active plugins."""
     # Initially no plugins are active
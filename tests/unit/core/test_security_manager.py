@@ -7,8 +7,13 @@ from unittest.mock import MagicMock, patch
 import jwt
 import pytest
 
+from qorzen.core.database_manager import DatabaseManager
 from qorzen.core.security_manager import SecurityManager, UserRole
+from qorzen.models.user import User as UserRecord
+from qorzen.models.user import UserRole as UserRecordRole
+from qorzen.models.user import user_roles
 from qorzen.utils.exceptions import SecurityError
+from qorzen.utils.pagination import encode_cursor
 
 
 @pytest.fixture
@@ -410,6 +415,103 @@ def test_get_all_users(security_manager):
     assert "user2" in usernames
 
 
+def test_list_users(security_manager):
+    """Test paging through users in creation order."""
+    with patch.object(security_manager._pwd_context, "hash", return_value="hashed"):
+        created = [
+            security_manager.create_user(
+                username=f"page{i}",
+                email=f"page{i}@example.com",
+                password="PageUser123!",
+                roles=[UserRole.USER],
+            )
+            for i in range(5)
+        ]
+
+    # The default admin, if any, was created first
+    first = security_manager.list_users(limit=100)
+    ids = [user["id"] for user in first["items"]]
+    assert ids[-5:] == created
+    assert first["next_cursor"] is None
+
+    page = security_manager.list_users(limit=2)
+    seen = [user["id"] for user in page["items"]]
+    security_manager.delete_user(created[-1])
+    while page["next_cursor"]:
+        page = security_manager.list_users(limit=2, cursor=page["next_cursor"])
+        seen.extend(user["id"] for user in page["items"])
+
+    assert seen == ids[:-1]
+
+    with pytest.raises(ValueError):
+        security_manager.list_users(cursor="bogus")
+
+
+def test_list_users_from_database(config_manager_mock):
+    """Test paging through users stored in the database."""
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    db_config = MagicMock()
+    db_config.get.return_value = {"type": "sqlite", "name": ":memory:"}
+    db_manager = DatabaseManager(db_config, logger_manager)
+    db_manager.initialize()
+    UserRecord.__table__.create(db_manager.get_engine())
+    user_roles.create(db_manager.get_engine())
+
+    created = datetime.datetime(2026, 10, 18, 12, 0)
+    db_manager.bulk_insert(
+        UserRecord.__table__,
+        [
+            {
+                "id": i,
+                "username": f"db{i}",
+                "email": f"db{i}@example.com",
+                "hashed_password": "hashed",
+                "active": True,
+                # Two users share a creation time; the ID breaks the tie
+                "created_at": created + datetime.timedelta(minutes=i // 2),
+                "updated_at": created,
+            }
+            for i in range(1, 6)
+        ],
+    )
+    db_manager.bulk_insert(
+        user_roles,
+        [
+            {"user_id": 1, "role": UserRecordRole.ADMIN},
+            {"user_id": 1, "role": UserRecordRole.USER},
+        ],
+    )
+
+    security_mgr = SecurityManager(
+        config_manager_mock, logger_manager, MagicMock(), db_manager
+    )
+    security_mgr.initialize()
+
+    try:
+        page = security_mgr.list_users(limit=2)
+        assert [user["username"] for user in page["items"]] == ["db1", "db2"]
+        assert sorted(page["items"][0]["roles"]) == ["admin", "user"]
+        assert page["items"][0]["id"] == "1"
+        assert page["items"][0]["last_login"] is None
+
+        seen = [user["username"] for user in page["items"]]
+        while page["next_cursor"]:
+            page = security_mgr.list_users(limit=2, cursor=page["next_cursor"])
+            seen.extend(user["username"] for user in page["items"])
+        assert seen == [f"db{i}" for i in range(1, 6)]
+
+        # A cursor from another listing is rejected, not compared
+        with pytest.raises(ValueError):
+            security_mgr.list_users(cursor=encode_cursor(["db3"]))
+        with pytest.raises(ValueError):
+            security_mgr.list_users(cursor=encode_cursor(["x", 1]))
+    finally:
+        security_mgr.shutdown()
+        db_manager.shutdown()
+
+
 def test_get_all_permissions(security_manager):
     """Test retrieving all permissions."""
     permissions = security_manager.get_all_permissions()
@@ -1,5 +1,7 @@
 """Unit tests for the Thread Manager."""
 
+import asyncio
+import threading
 import time
 from unittest.mock import MagicMock, patch
 
@@ -191,6 +193,105 @@ def test_scheduler_shutdown(config_manager):
     assert counter["value"] == value_at_shutdown
 
 
+def test_concurrent_submissions(thread_manager):
+    """Test that task bookkeeping stays consistent under concurrent submits."""
+    task_ids = []
+    ids_lock = threading.Lock()
+
+    def submitter():
+        for i in range(50):
+            task_id = thread_manager.submit_task(lambda x: x, i)
+            with ids_lock:
+                task_ids.append(task_id)
+
+    threads = [threading.Thread(target=submitter) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    for task_id in task_ids:
+        thread_manager.get_task_result(task_id, timeout=5.0)
+
+    status = thread_manager.status()
+    assert status["tasks"]["total"] == 400
+    assert status["tasks"]["by_status"][TaskStatus.COMPLETED.value] == 400
+    assert status["thread_pool"]["active_tasks"] == 0
+
+
+def test_submit_coroutine(thread_manager):
+    """Test submitting a coroutine to the managed event loop."""
+
+    async def test_coroutine(value):
+        await asyncio.sleep(0.01)
+        return value * 3
+
+    task_id = thread_manager.submit_coroutine(test_coroutine(7), name="coro_task")
+    assert task_id is not None
+
+    # Result is available through the usual task API
+    assert thread_manager.get_task_result(task_id, timeout=2.0) == 21
+
+    task_info = thread_manager.get_task_info(task_id)
+    assert task_info["name"] == "coro_task"
+    assert task_info["status"] == TaskStatus.COMPLETED.value
+
+    # The same loop is reused for every coroutine
+    loop = thread_manager.get_event_loop()
+    other_id = thread_manager.submit_coroutine(_current_loop(), name="loop_check")
+    assert thread_manager.get_task_result(other_id, timeout=2.0) is loop
+
+
+async def _current_loop():
+    return asyncio.get_running_loop()
+
+
+def test_failing_coroutine(thread_manager):
+    """Test handling of a failing coroutine."""
+
+    async def failing_coroutine():
+        raise ValueError("Coroutine error")
+
+    task_id = thread_manager.submit_coroutine(failing_coroutine())
+
+    # Wait for coroutine to complete
+    time.sleep(0.1)
+
+    with pytest.raises(ValueError, match="Coroutine error"):
+        thread_manager.get_task_result(task_id, timeout=2.0)
+
+    task_info = thread_manager.get_task_info(task_id)
+    assert task_info["status"] == TaskStatus.FAILED.value
+    assert "Coroutine error" in task_info["error"]
+
+
+def test_run_coroutine(thread_manager):
+    """Test running a coroutine synchronously on the managed loop."""
+
+    async def add(a, b):
+        await asyncio.sleep(0)
+        return a + b
+
+    assert thread_manager.run_coroutine(add(2, 3), timeout=2.0) == 5
+
+
+def test_async_loop_stopped_on_shutdown(config_manager):
+    """Test that the managed event loop is stopped on shutdown."""
+    logger_manager = MagicMock()
+    logger_manager.get_logger.return_value = MagicMock()
+
+    thread_mgr = ThreadManager(config_manager, logger_manager)
+    thread_mgr.initialize()
+
+    loop = thread_mgr.get_event_loop()
+    assert loop.is_running()
+    assert thread_mgr.status()["async_loop"]["running"] is True
+
+    thread_mgr.shutdown()
+    assert not loop.is_running()
+    assert loop.is_closed()
+
+
 def test_thread_manager_status(thread_manager):
     """Test getting status from ThreadManager."""
     status = thread_manager.status()
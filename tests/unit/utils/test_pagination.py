@@ -0,0 +1,61 @@
+"""Unit tests for the pagination helpers."""
+
+import datetime
+
+import pytest
+
+from qorzen.utils.pagination import decode_cursor, encode_cursor, paginate_keys
+
+
+def test_cursor_round_trip():
+    """Test that cursors preserve the key values and their types."""
+    key = (datetime.datetime(2026, 10, 18, 12, 30, 5, 123), "abc", 42, None)
+
+    cursor = encode_cursor(key)
+    assert "=" not in cursor
+    assert decode_cursor(cursor) == key
+    assert decode_cursor(cursor, 4) == key
+
+
+def test_invalid_cursor():
+    """Test that malformed cursors are rejected."""
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor!")
+
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([1, 2]), 3)
+
+    # Well-formed, but with values of the wrong type for the sort key
+    moment = datetime.datetime(2026, 10, 18)
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor(["x", 1]), 2, [datetime.datetime, int])
+    with pytest.raises(ValueError):
+        decode_cursor(encode_cursor([moment]), 1, [datetime.date])
+    assert decode_cursor(encode_cursor([1, None]), 2, [float, str]) == (1, None)
+
+
+def test_paginate_keys():
+    """Test paging through sorted keys."""
+    keys = [(i,) for i in range(10)]
+
+    page, cursor = paginate_keys(keys, 4)
+    assert page == [(0,), (1,), (2,), (3,)]
+
+    page, cursor = paginate_keys(keys, 4, cursor)
+    assert page == [(4,), (5,), (6,), (7,)]
+
+    page, cursor = paginate_keys(keys, 4, cursor)
+    assert page == [(8,), (9,)]
+    assert cursor is None
+
+    # A key removed since the previous page doesn't shift the next one
+    page, cursor = paginate_keys(keys, 5)
+    del keys[4]
+    page, cursor = paginate_keys(keys, 5, cursor)
+    assert page == [(5,), (6,), (7,), (8,), (9,)]
+
+    with pytest.raises(ValueError):
+        paginate_keys(keys, 0)
+
+    with pytest.raises(ValueError):
+        paginate_keys(keys, 5, encode_cursor(["5"]))